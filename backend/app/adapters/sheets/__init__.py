@@ -1,5 +1,34 @@
 # backend/app/adapters/sheets/__init__.py
-from app.adapters.sheets.client import get_sheets_client, get_cached, set_cached, invalidate_cache
-from app.adapters.sheets.log_main import LogMainAdapter
-from app.adapters.sheets.tier_status import TierStatusAdapter
-from app.adapters.sheets.cico import CicoMonthAdapter
+# Exports resolve on first access (PEP 562): importing one submodule, e.g. the governor,
+# must not pull in gspread, pandas and every adapter.
+import importlib
+
+_EXPORTS = {
+    "get_sheets_client": "app.adapters.sheets.client",
+    "get_spreadsheet": "app.adapters.sheets.client",
+    "get_cached": "app.adapters.sheets.client",
+    "set_cached": "app.adapters.sheets.client",
+    "invalidate_cache": "app.adapters.sheets.client",
+    "get_cache_stats": "app.adapters.sheets.client",
+    "get_or_load": "app.adapters.sheets.client",
+    "aget_or_load": "app.adapters.sheets.client",
+    "AsyncSheetsClient": "app.adapters.sheets.async_client",
+    "get_async_sheets_client": "app.adapters.sheets.async_client",
+    "RangeLoad": "app.adapters.sheets.batch_loader",
+    "batch_load": "app.adapters.sheets.batch_loader",
+    "abatch_load": "app.adapters.sheets.batch_loader",
+    "LogMainAdapter": "app.adapters.sheets.log_main",
+    "TierStatusAdapter": "app.adapters.sheets.tier_status",
+    "CicoMonthAdapter": "app.adapters.sheets.cico",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
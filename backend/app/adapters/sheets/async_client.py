@@ -0,0 +1,178 @@
+# backend/app/adapters/sheets/async_client.py
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+import gspread
+import httpx
+from app.core.config import settings
+from app.adapters.sheets.client import get_sheets_credentials
+from app.adapters.sheets.governor import sheets_governor, request_kind
+
+SHEETS_API_BASE = "https://sheets.googleapis.com/v4/spreadsheets"
+TOKEN_REFRESH_MARGIN = 60  # seconds before expiry at which the access token is renewed
+MAX_CONNECTIONS = 20
+REQUEST_TIMEOUT = 30.0  # stays under the 60s Vercel function limit
+
+
+class AsyncSheetsClient:
+    """
+    Non-blocking client for the Sheets values API, for `async def` endpoints.
+
+    Uses one pooled httpx.AsyncClient (keep-alive connections reused across requests)
+    authorized with the same service account as the gspread client. Covers values
+    get / batchGet for reads and batchUpdate / append for writes. Requests are paced
+    and retried by sheets_governor; API errors raise gspread's APIError, so callers
+    handle both clients the same way.
+
+    get_all_values() / get_all_records() return exactly what the gspread Worksheet
+    methods of the same name (and safe_get_all_records) return.
+    """
+
+    def __init__(self, credentials, spreadsheet_id: str, max_connections: int = MAX_CONNECTIONS,
+                 timeout: float = REQUEST_TIMEOUT):
+        self.credentials = credentials
+        self.spreadsheet_id = spreadsheet_id
+        self._http = httpx.AsyncClient(
+            base_url=f"{SHEETS_API_BASE}/{spreadsheet_id}",
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._token: Optional[str] = None
+        self._token_expires = 0.0
+        self._token_lock = asyncio.Lock()
+        self.requests = 0
+
+    async def _access_token(self) -> str:
+        if self._token and time.time() < self._token_expires - TOKEN_REFRESH_MARGIN:
+            return self._token
+        async with self._token_lock:
+            if not self._token or time.time() >= self._token_expires - TOKEN_REFRESH_MARGIN:
+                # oauth2client refreshes over a blocking HTTP call
+                info = await asyncio.to_thread(self.credentials.get_access_token)
+                self._token = info.access_token
+                self._token_expires = time.time() + (info.expires_in or 0)
+        return self._token
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        # Same read/write budgets, priority and 429/5xx backoff as the gspread client
+        return await sheets_governor.arun(request_kind(method, path), lambda: self._send(method, path, **kwargs))
+
+    async def _send(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        headers = {"Authorization": f"Bearer {await self._access_token()}"}
+        self.requests += 1
+        response = await self._http.request(method, path, headers=headers, **kwargs)
+        if response.status_code == 401:
+            # Token revoked or expired early: renew once and retry
+            self._token = None
+            headers["Authorization"] = f"Bearer {await self._access_token()}"
+            self.requests += 1
+            response = await self._http.request(method, path, headers=headers, **kwargs)
+        if response.is_error:
+            raise gspread.exceptions.APIError(response)
+        return response.json()
+
+    async def values_get(self, range_name: str, value_render_option: str = "FORMATTED_VALUE") -> Dict[str, Any]:
+        return await self._request("GET", f"/values/{quote(range_name, safe='')}",
+                                   params={"valueRenderOption": value_render_option})
+
+    async def values_batch_get(self, ranges: List[str], value_render_option: str = "FORMATTED_VALUE") -> List[Dict[str, Any]]:
+        """One ValueRange dict per requested range, in request order."""
+        if not ranges:
+            return []
+        response = await self._request("GET", "/values:batchGet",
+                                       params=[("ranges", r) for r in ranges] + [("valueRenderOption", value_render_option)])
+        return response.get("valueRanges", [])
+
+    async def values_batch_update(self, data: List[Dict[str, Any]], value_input_option: str = "RAW") -> Dict[str, Any]:
+        return await self._request("POST", "/values:batchUpdate",
+                                   json={"valueInputOption": value_input_option, "data": data})
+
+    async def values_append(self, range_name: str, rows: List[List[Any]], value_input_option: str = "RAW") -> Dict[str, Any]:
+        return await self._request("POST", f"/values/{quote(range_name, safe='')}:append",
+                                   params={"valueInputOption": value_input_option}, json={"values": rows})
+
+    async def get_all_values(self, title: str) -> List[List[Any]]:
+        response = await self.values_get(gspread.utils.absolute_range_name(title))
+        return padded_values(response)
+
+    async def get_all_records(self, title: str) -> List[Dict[str, Any]]:
+        return records_from_values(await self.get_all_values(title))
+
+    async def aclose(self):
+        await self._http.aclose()
+
+
+def is_missing_sheet_error(e: Exception) -> bool:
+    """True for the 400 the API returns when a range names a worksheet that does not exist."""
+    return isinstance(e, gspread.exceptions.APIError) and e.code == 400 and "Unable to parse range" in str(e)
+
+
+def padded_values(value_range: Dict[str, Any]) -> List[List[Any]]:
+    """Rows of a ValueRange padded to a rectangle, as gspread's Worksheet.get() returns them."""
+    values = value_range.get("values", [[]])
+    try:
+        return gspread.utils.fill_gaps(values)
+    except KeyError:
+        return [[]]
+
+
+def records_from_values(values: List[List[Any]]) -> List[Dict[str, Any]]:
+    """
+    safe_get_all_records() over already fetched values: get_all_records() semantics, or
+    raw strings keyed by the non-empty headers when the header row has duplicates.
+    """
+    if not values or values == [[]]:
+        return []
+    keys = values[0]
+    if len(set(keys)) == len(keys):
+        return [dict(zip(keys, gspread.utils.numericise_all(row))) for row in values[1:]]
+    if len(values) < 2:
+        return []
+    records = []
+    for row in values[1:]:
+        record = {}
+        for ci, h in enumerate(keys):
+            if ci < len(row) and h:
+                record[h] = row[ci]
+        records.append(record)
+    return records
+
+
+_async_client: Optional[AsyncSheetsClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_async_sheets_client() -> Optional[AsyncSheetsClient]:
+    """
+    Shared client for the running event loop (httpx pools are bound to one loop).
+    Returns None without credentials or outside a running loop; callers then fall back
+    to the gspread path in a worker thread.
+    """
+    global _async_client, _async_client_loop
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    client = _async_client
+    if client is not None and _async_client_loop is loop and client.spreadsheet_id == _spreadsheet_id():
+        return client
+    credentials = get_sheets_credentials()
+    if credentials is None or not settings.SHEET_URL:
+        return None
+    client = AsyncSheetsClient(credentials, _spreadsheet_id())
+    _async_client, _async_client_loop = client, loop
+    return client
+
+
+async def close_async_sheets_client():
+    global _async_client, _async_client_loop
+    client = _async_client
+    if client is not None and _async_client_loop is asyncio.get_running_loop():
+        _async_client, _async_client_loop = None, None
+        await client.aclose()
+
+
+def _spreadsheet_id() -> str:
+    return gspread.utils.extract_id_from_url(settings.SHEET_URL)
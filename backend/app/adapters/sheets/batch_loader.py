@@ -0,0 +1,130 @@
+# backend/app/adapters/sheets/batch_loader.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from gspread.utils import absolute_range_name
+from app.adapters.sheets.client import get_spreadsheet, get_or_load, aget_or_load, is_cached
+from app.adapters.sheets.async_client import get_async_sheets_client
+
+# (worksheet title, A1 range inside it or None for the whole sheet)
+SheetRange = Tuple[str, Optional[str]]
+
+
+class RangeLoad:
+    """
+    One cache entry that can be filled from ranges of a shared values.batchGet.
+
+    build(value_ranges) receives one ValueRange dict per entry of ranges, in order
+    (None for a range whose worksheet does not exist) and returns the value to cache.
+    loader / aloader are the entry's regular loaders, used when the batch read fails.
+    ttl / depends_on / cache_if / persist are passed to get_or_load() unchanged.
+    """
+    __slots__ = ("key", "ranges", "build", "loader", "aloader", "ttl", "depends_on", "cache_if", "persist")
+
+    def __init__(self, key: str, ranges: Sequence[SheetRange], build: Callable[[List[Optional[dict]]], Any],
+                 loader: Callable[[], Any], aloader: Optional[Callable[[], Awaitable[Any]]] = None,
+                 ttl: Optional[int] = None, depends_on: Optional[List[str]] = None,
+                 cache_if: Optional[Callable[[Any], bool]] = None, persist: bool = False):
+        self.key = key
+        self.ranges = list(ranges)
+        self.build = build
+        self.loader = loader
+        self.aloader = aloader
+        self.ttl = ttl
+        self.depends_on = depends_on
+        self.cache_if = cache_if
+        self.persist = persist
+
+    def options(self) -> Dict[str, Any]:
+        return {"ttl": self.ttl, "depends_on": self.depends_on, "cache_if": self.cache_if, "persist": self.persist}
+
+
+def _plan(loads: List[RangeLoad], titles: set) -> List[str]:
+    """A1 ranges to request, skipping worksheets that do not exist (they would fail the whole call)."""
+    wanted = []
+    for load in loads:
+        for title, rng in load.ranges:
+            if title in titles:
+                wanted.append(absolute_range_name(title, rng) if rng else absolute_range_name(title))
+    return list(dict.fromkeys(wanted))
+
+
+def _split(loads: List[RangeLoad], titles: set, fetched: Dict[str, dict]) -> Dict[str, List[Optional[dict]]]:
+    by_key = {}
+    for load in loads:
+        parts = []
+        for title, rng in load.ranges:
+            if title not in titles:
+                parts.append(None)
+            else:
+                parts.append(fetched.get(absolute_range_name(title, rng) if rng else absolute_range_name(title), {}))
+        by_key[load.key] = parts
+    return by_key
+
+
+def _worksheet_titles() -> set:
+    sheet = get_spreadsheet()
+    if sheet is None:
+        return set()
+    # Served from the session's worksheet index; a cold index costs one metadata call
+    return {ws.title for ws in sheet.worksheets()}
+
+
+def batch_load(loads: List[RangeLoad], force: bool = False) -> Dict[str, Any]:
+    """
+    Fill several cache entries with a single spreadsheets.values.batchGet.
+
+    Entries already in memory are skipped (unless force); the ranges of the others are
+    requested together and each entry is stored through get_or_load(), so concurrent
+    readers of the same key still share one result. Returns key -> value for every load.
+    If the batch read fails, each missing entry falls back to its own loader.
+    """
+    pending = [l for l in loads if force or not is_cached(l.key, l.ttl)]
+    parts: Dict[str, List[Optional[dict]]] = {}
+    if pending:
+        try:
+            titles = _worksheet_titles()
+            ranges = _plan(pending, titles)
+            fetched = {}
+            if ranges:
+                response = get_spreadsheet().values_batch_get(ranges)
+                fetched = dict(zip(ranges, response.get("valueRanges", [])))
+            parts = _split(pending, titles, fetched)
+        except Exception as e:
+            print(f"Batch sheet read failed, loading one by one: {e}")
+
+    results = {}
+    for load in loads:
+        if load.key in parts:
+            value_ranges = parts[load.key]
+            results[load.key] = get_or_load(load.key, lambda l=load, v=value_ranges: l.build(v),
+                                            force=force, **load.options())
+        else:
+            results[load.key] = get_or_load(load.key, load.loader, force=force, **load.options())
+    return results
+
+
+async def abatch_load(loads: List[RangeLoad], force: bool = False) -> Dict[str, Any]:
+    """batch_load() for async endpoints: one batchGet over the async client; builds run in worker threads."""
+    pending = [l for l in loads if force or not is_cached(l.key, l.ttl)]
+    parts: Dict[str, List[Optional[dict]]] = {}
+    client = get_async_sheets_client()
+    if pending and client is None:
+        return await asyncio.to_thread(batch_load, loads, force)
+    if pending:
+        try:
+            titles = await asyncio.to_thread(_worksheet_titles)
+            ranges = _plan(pending, titles)
+            value_ranges = await client.values_batch_get(ranges) if ranges else []
+            parts = _split(pending, titles, dict(zip(ranges, value_ranges)))
+        except Exception as e:
+            print(f"Batch sheet read failed, loading one by one: {e}")
+
+    async def fill(load: RangeLoad):
+        if load.key in parts:
+            value_ranges = parts[load.key]
+            return await aget_or_load(load.key, lambda: load.build(value_ranges), force=force, **load.options())
+        return await aget_or_load(load.key, load.loader, force=force, aloader=load.aloader, **load.options())
+
+    values = await asyncio.gather(*[fill(load) for load in loads])
+    return {load.key: value for load, value in zip(loads, values)}
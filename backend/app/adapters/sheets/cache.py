@@ -0,0 +1,467 @@
+# backend/app/adapters/sheets/cache.py
+
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+from app.core.config import settings
+from app.adapters.sheets.snapshot import SnapshotStore
+from app.adapters.sheets.governor import background_priority
+
+DEFAULT_TTL = 60  # seconds
+DEFAULT_MAX_ENTRIES = 1024  # ~12 months x 4 CICO keys + per-student BIP entries
+FLIGHT_WAIT_TIMEOUT = 55  # stay under the 60s Vercel function limit
+
+
+class _Entry:
+    __slots__ = ("data", "timestamp", "ttl", "depends_on")
+
+    def __init__(self, data: Any, ttl: Optional[float], depends_on: Iterable[str]):
+        self.data = data
+        self.timestamp = time.time()
+        self.ttl = ttl
+        self.depends_on = tuple(depends_on or ())
+
+
+class _Flight:
+    """One in-progress load that concurrent callers for the same key wait on."""
+    __slots__ = ("event", "result", "error", "stale")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.stale = False
+
+
+def _cache_not_none(value: Any) -> bool:
+    return value is not None
+
+
+class _LoadSpec:
+    """How to (re)load and store one key; shared by foreground and background loads."""
+    __slots__ = ("loader", "ttl", "depends_on", "cache_if", "persist")
+
+    def __init__(self, loader, ttl, depends_on, cache_if, persist):
+        self.loader = loader
+        self.ttl = ttl
+        self.depends_on = tuple(depends_on or ())
+        self.cache_if = cache_if
+        self.persist = persist
+
+
+class SheetCache:
+    """
+    Process-wide cache for sheet reads and values derived from them.
+
+    Keys are namespaced strings ("sheet:tier-status", "sheet:cico:raw:2026:03", ...)
+    and invalidation works on key prefixes. An entry may declare the source keys it
+    was derived from (depends_on), and prefix rules can be registered with link();
+    invalidating a source then also drops every dependent entry, transitively.
+    Size is bounded by max_entries with least-recently-used eviction.
+
+    get_or_load() adds single-flight loading: on a miss only one caller runs the
+    loader and every concurrent caller for the same key receives its result.
+
+    Stale-while-revalidate: a key with a stale policy (see set_stale_policy) keeps
+    being served after its TTL (soft) until stale_ttl (hard, measured from when it
+    was stored) while one background thread reloads it. Only past the hard TTL does
+    a caller block on the load. Explicit invalidation always drops the value.
+
+    Snapshots: keys loaded with persist=True are also written to snapshot_store (if
+    attached). A cold miss restores the snapshot and, once past its TTL, serves it
+    as stale while the background refresh runs. Invalidation deletes snapshots too.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, default_ttl: float = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._links: Dict[str, Set[str]] = {}
+        self._inflight: Dict[str, _Flight] = {}
+        self._stale_policies: Dict[str, float] = {}
+        self.snapshot_store = None
+        self.snapshot_max_age = 0.0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.stale_hits = 0
+        self.background_refreshes = 0
+        self.snapshot_restores = 0
+
+    def get(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """Return the cached value, or None if missing/expired. An explicit ttl overrides the entry's."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                max_age = ttl if ttl is not None else (entry.ttl if entry.ttl is not None else self.default_ttl)
+                if time.time() - entry.timestamp < max_age:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.data
+            self.misses += 1
+            return None
+
+    def has(self, key: str, ttl: Optional[float] = None) -> bool:
+        """
+        True if get_or_load(key) would answer from memory (fresh, or inside its stale
+        window). Does not count as a hit or miss and does not touch the LRU order.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            age = time.time() - entry.timestamp
+            max_age = ttl if ttl is not None else (entry.ttl if entry.ttl is not None else self.default_ttl)
+            return age < max_age or age < self._stale_ttl_for(key)
+
+    def peek(self, key: str, ttl: Optional[float] = None) -> Optional[Any]:
+        """The value has() reports on, or None. Like has(), leaves the stats and LRU order alone."""
+        with self._lock:
+            if not self.has(key, ttl=ttl):
+                return None
+            return self._entries[key].data
+
+    def set(self, key: str, data: Any, ttl: Optional[float] = None, depends_on: Iterable[str] = ()):
+        with self._lock:
+            self._entries[key] = _Entry(data, ttl, depends_on)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        depends_on: Iterable[str] = (),
+        force: bool = False,
+        cache_if: Callable[[Any], bool] = _cache_not_none,
+        stale_ttl: Optional[float] = None,
+        persist: bool = False,
+    ) -> Any:
+        """
+        Return the cached value for key, or load it once for all concurrent callers.
+        force skips the cache read but still joins a load already in flight.
+        Results failing cache_if (e.g. empty lists from an error path) are returned
+        but not stored. A loader exception is re-raised in every waiting caller.
+        stale_ttl overrides the registered stale policy for this key (0 disables it).
+        persist keeps an on-disk snapshot of the value for cold starts.
+        """
+        spec = _LoadSpec(loader, ttl, depends_on, cache_if, persist)
+        if not force:
+            state, cached = self._lookup(key, ttl, stale_ttl, spec if persist else None)
+            if state is not None and cache_if(cached):
+                if state == "stale":
+                    self._refresh_in_background(key, spec)
+                return cached
+
+        flight, leader = self._join_flight(key, ttl, force, cache_if)
+        if flight is None:
+            return self.get(key, ttl=ttl)
+        if not leader:
+            if not flight.event.wait(FLIGHT_WAIT_TIMEOUT):
+                # Leader is stuck; fall back to loading ourselves
+                return loader()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        return self._run_flight(key, flight, spec)
+
+    async def aget_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None,
+        depends_on: Iterable[str] = (),
+        force: bool = False,
+        cache_if: Callable[[Any], bool] = _cache_not_none,
+        stale_ttl: Optional[float] = None,
+        persist: bool = False,
+        aloader: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        """
+        Async get_or_load(). With aloader (a coroutine function) a miss is loaded on the
+        event loop itself; otherwise the blocking load and the wait both run off the event
+        loop. Either way the flight is shared with sync callers of the same key. loader
+        stays the one used for background (stale) refreshes.
+        """
+        if not force:
+            # Memory only here; a snapshot restore reads disk, so it happens in the thread
+            state, cached = self._lookup(key, ttl, stale_ttl)
+            if state is not None and cache_if(cached):
+                if state == "stale":
+                    self._refresh_in_background(key, _LoadSpec(loader, ttl, depends_on, cache_if, persist))
+                return cached
+        if aloader is None:
+            return await asyncio.to_thread(
+                self.get_or_load, key, loader, ttl, depends_on, force, cache_if, stale_ttl, persist
+            )
+
+        spec = _LoadSpec(loader, ttl, depends_on, cache_if, persist)
+        if not force and persist and self.snapshot_store is not None:
+            # Miss already counted by the memory lookup above
+            state, cached = await asyncio.to_thread(self._restore_snapshot, key, spec, False)
+            if state is not None and cache_if(cached):
+                if state == "stale":
+                    self._refresh_in_background(key, spec)
+                return cached
+
+        flight, leader = self._join_flight(key, ttl, force, cache_if)
+        if flight is None:
+            return self.get(key, ttl=ttl)
+        if not leader:
+            if not await asyncio.to_thread(flight.event.wait, FLIGHT_WAIT_TIMEOUT):
+                return await aloader()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            result = await aloader()
+            self._store_flight_result(key, flight, spec, result)
+            return result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self._end_flight(key, flight)
+
+    def set_stale_policy(self, key_prefix: str, stale_ttl: float):
+        """
+        Serve keys under key_prefix for up to stale_ttl seconds after storage while refreshing.
+        The longest matching prefix wins, so stale_ttl=0 opts a sub-namespace out.
+        """
+        with self._lock:
+            self._stale_policies[key_prefix] = max(0.0, float(stale_ttl or 0))
+
+    def _stale_ttl_for(self, key: str) -> float:
+        best_prefix, best_ttl = "", 0.0
+        for prefix, value in self._stale_policies.items():
+            if key.startswith(prefix) and len(prefix) >= len(best_prefix):
+                best_prefix, best_ttl = prefix, value
+        return best_ttl
+
+    def _lookup(self, key: str, ttl: Optional[float], stale_ttl: Optional[float],
+                restore: Optional[_LoadSpec] = None):
+        """Returns ("fresh" | "stale" | None, data)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                age = time.time() - entry.timestamp
+                max_age = ttl if ttl is not None else (entry.ttl if entry.ttl is not None else self.default_ttl)
+                if age < max_age:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return "fresh", entry.data
+                hard = stale_ttl if stale_ttl is not None else self._stale_ttl_for(key)
+                if hard and age < hard:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    return "stale", entry.data
+            if entry is not None or restore is None or self.snapshot_store is None:
+                self.misses += 1
+                return None, None
+        return self._restore_snapshot(key, restore)
+
+    def _restore_snapshot(self, key: str, spec: _LoadSpec, count_miss: bool = True):
+        snapshot = self.snapshot_store.load(key)
+        with self._lock:
+            if snapshot is not None and key not in self._entries:
+                data, fetched_at = snapshot
+                age = time.time() - fetched_at
+                if age < self.snapshot_max_age:
+                    # Keep the original fetch time so the TTL/stale checks stay honest
+                    entry = _Entry(data, spec.ttl, spec.depends_on)
+                    entry.timestamp = fetched_at
+                    self._entries[key] = entry
+                    self.snapshot_restores += 1
+                    max_age = spec.ttl if spec.ttl is not None else self.default_ttl
+                    return ("fresh" if age < max_age else "stale"), data
+            if count_miss:
+                self.misses += 1
+            return None, None
+
+    def _refresh_in_background(self, key: str, spec: _LoadSpec):
+        with self._lock:
+            if key in self._inflight:
+                return
+            flight = _Flight()
+            self._inflight[key] = flight
+            self.loads += 1
+            self.background_refreshes += 1
+
+        def run():
+            try:
+                with background_priority():
+                    self._run_flight(key, flight, spec)
+            except Exception as e:
+                print(f"Background cache refresh failed for {key}: {e}")
+
+        threading.Thread(target=run, name=f"cache-refresh:{key}", daemon=True).start()
+
+    def _join_flight(self, key, ttl, force, cache_if):
+        with self._lock:
+            if not force:
+                # Re-check under the lock: a leader may have just stored the value
+                entry = self._entries.get(key)
+                if entry is not None:
+                    max_age = ttl if ttl is not None else (entry.ttl if entry.ttl is not None else self.default_ttl)
+                    if time.time() - entry.timestamp < max_age and cache_if(entry.data):
+                        return None, False
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight, False
+            flight = _Flight()
+            self._inflight[key] = flight
+            self.loads += 1
+            return flight, True
+
+    def _run_flight(self, key: str, flight: _Flight, spec: _LoadSpec):
+        try:
+            result = spec.loader()
+            self._store_flight_result(key, flight, spec, result)
+            return result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            self._end_flight(key, flight)
+
+    def _store_flight_result(self, key: str, flight: _Flight, spec: _LoadSpec, result: Any):
+        flight.result = result
+        stored = False
+        with self._lock:
+            # Skip storing if the key was invalidated while we were loading
+            if not flight.stale and spec.cache_if(result):
+                self.set(key, result, ttl=spec.ttl, depends_on=spec.depends_on)
+                stored = True
+        if stored and spec.persist and self.snapshot_store is not None:
+            threading.Thread(
+                target=self.snapshot_store.save, args=(key, result),
+                name=f"cache-snapshot:{key}", daemon=True,
+            ).start()
+
+    def _end_flight(self, key: str, flight: _Flight):
+        with self._lock:
+            self._inflight.pop(key, None)
+        flight.event.set()
+
+    def link(self, source_prefix: str, *dependent_prefixes: str):
+        """Declare that keys under dependent_prefixes are derived from keys under source_prefix."""
+        with self._lock:
+            self._links.setdefault(source_prefix, set()).update(dependent_prefixes)
+
+    def invalidate(self, key_prefix: str = "") -> int:
+        """Drop every key starting with key_prefix plus everything depending on them. Returns count."""
+        removed = 0
+        seen: Set[str] = set()
+        with self._lock:
+            if not key_prefix:
+                removed = len(self._entries)
+                self._entries.clear()
+                for flight in self._inflight.values():
+                    flight.stale = True
+                seen.add("")
+
+            pending: List[str] = [key_prefix] if key_prefix else []
+            while pending:
+                prefix = pending.pop()
+                if prefix in seen:
+                    continue
+                seen.add(prefix)
+
+                for source, dependents in self._links.items():
+                    if prefix.startswith(source) or source.startswith(prefix):
+                        pending.extend(dependents)
+
+                doomed = [k for k in self._entries if k.startswith(prefix)]
+                for k in doomed:
+                    self._entries.pop(k, None)
+                    removed += 1
+                    pending.append(k)
+
+                for k, entry in list(self._entries.items()):
+                    if any(dep.startswith(prefix) or prefix.startswith(dep) for dep in entry.depends_on):
+                        self._entries.pop(k, None)
+                        removed += 1
+                        pending.append(k)
+
+                for k, flight in self._inflight.items():
+                    if k.startswith(prefix):
+                        flight.stale = True
+
+            self.invalidations += removed
+
+        if self.snapshot_store is not None:
+            # A snapshot must never bring back data this process invalidated (e.g. after a write)
+            for prefix in sorted(seen):
+                if not any(prefix != other and prefix.startswith(other) for other in seen):
+                    self.snapshot_store.delete_prefix(prefix)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "loads": self.loads,
+                "coalesced": self.coalesced,
+                "stale_hits": self.stale_hits,
+                "background_refreshes": self.background_refreshes,
+                "snapshot_restores": self.snapshot_restores,
+                "in_flight": len(self._inflight),
+            }
+
+
+sheet_cache = SheetCache()
+
+# Derived data that must not outlive the sheets it was built from.
+# fetch_all_records fills missing student codes from the TierStatus BeAble mapping,
+# and the CICO report joins TierStatus rows.
+sheet_cache.link("sheet:tier-status", "sheet:log-main:records", "sheet:cico:report")
+
+# Stale-while-revalidate windows (hard TTL, seconds since the value was stored).
+# Past the soft TTL these are served immediately while one background reload runs.
+# Raw sheet values that other keys are built from stay strict, so a background
+# rebuild of a derived key never starts from stale input.
+STALE_TTLS = {
+    "sheet:log-main": 900,
+    "sheet:tier-status": 900,
+    "sheet:tier-status:raw": 0,
+    "sheet:cico": 900,
+    "sheet:cico:raw": 0,
+}
+
+
+def _parse_stale_overrides(raw: str) -> Dict[str, float]:
+    overrides = {}
+    for part in (raw or "").split(","):
+        if "=" not in part:
+            continue
+        prefix, _, value = part.partition("=")
+        try:
+            overrides[prefix.strip()] = float(value)
+        except ValueError:
+            print(f"Ignoring invalid CACHE_STALE_TTLS entry: {part}")
+    return overrides
+
+
+for _prefix, _stale_ttl in {**STALE_TTLS, **_parse_stale_overrides(settings.CACHE_STALE_TTLS)}.items():
+    sheet_cache.set_stale_policy(_prefix, _stale_ttl)
+
+if settings.CACHE_SNAPSHOTS_ENABLED:
+    sheet_cache.snapshot_store = SnapshotStore(settings.CACHE_DIR)
+    sheet_cache.snapshot_max_age = settings.CACHE_SNAPSHOT_MAX_AGE
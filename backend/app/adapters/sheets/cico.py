@@ -1,12 +1,13 @@
 # backend/app/adapters/sheets/cico.py
 
+import asyncio
 from datetime import date
 from typing import List, Dict, Any, Optional
 import re
-import pandas as pd
 from app.core.config import settings
 from app.domain.models import CicoObservation
-from app.adapters.sheets.client import get_sheets_client, safe_get_all_values, get_cached, set_cached
+from app.adapters.sheets.client import get_sheets_client, get_spreadsheet, safe_get_all_values, get_or_load, aget_or_load
+from app.adapters.sheets.async_client import get_async_sheets_client
 
 class CicoMonthAdapter:
     @staticmethod
@@ -15,7 +16,7 @@ class CicoMonthAdapter:
         if not client or not settings.SHEET_URL:
             return None
         try:
-            sheet = client.open_by_url(settings.SHEET_URL)
+            sheet = get_spreadsheet()
             month_name = f"{month}월"
             return sheet.worksheet(month_name)
         except Exception as e:
@@ -25,18 +26,39 @@ class CicoMonthAdapter:
     @classmethod
     def fetch_observations(cls, month: int, force_refresh: bool = False) -> List[CicoObservation]:
         cache_key = f"sheet:cico:{month}"
-        if not force_refresh:
-            cached = get_cached(cache_key)
-            if cached is not None:
-                return cached
+        return get_or_load(cache_key, lambda: cls._load_observations(month), force=force_refresh) or []
 
+    @classmethod
+    async def afetch_observations(cls, month: int, force_refresh: bool = False) -> List[CicoObservation]:
+        """fetch_observations() for async endpoints; a miss is read over the pooled async client."""
+        cache_key = f"sheet:cico:{month}"
+        return await aget_or_load(cache_key, lambda: cls._load_observations(month), force=force_refresh,
+                                  aloader=lambda: cls._aload_observations(month)) or []
+
+    @classmethod
+    def _load_observations(cls, month: int) -> Optional[List[CicoObservation]]:
         ws = cls.get_worksheet(month)
         if not ws:
-            return []
+            return None
+        return cls._parse_observations(month, safe_get_all_values(ws))
 
-        all_values = safe_get_all_values(ws)
+    @classmethod
+    async def _aload_observations(cls, month: int) -> Optional[List[CicoObservation]]:
+        client = get_async_sheets_client()
+        if client is None:
+            return await asyncio.to_thread(cls._load_observations, month)
+        try:
+            all_values = await client.get_all_values(f"{month}월")
+        except Exception as e:
+            # Same outcome as the sync path: a missing or unreadable month is "no data"
+            print(f"Error opening CICO worksheet for month {month}: {e}")
+            return None
+        return cls._parse_observations(month, all_values)
+
+    @classmethod
+    def _parse_observations(cls, month: int, all_values: List[List[Any]]) -> Optional[List[CicoObservation]]:
         if not all_values or len(all_values) < 2:
-            return []
+            return None
 
         headers = all_values[0]
         observations = []
@@ -137,5 +159,4 @@ class CicoMonthAdapter:
                     source_column=col_i + 1
                 ))
 
-        set_cached(cache_key, observations)
         return observations
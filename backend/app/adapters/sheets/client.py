@@ -3,21 +3,27 @@
 import os
 import json
 import time
-from typing import Optional, List, Dict, Any
+import threading
+from typing import Optional, List, Dict, Any, Callable, Awaitable
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from app.core.config import settings
+from app.adapters.sheets.cache import sheet_cache
+from app.adapters.sheets.governor import GovernedHTTPClient
 
 _sheets_client = None
-_cache: Dict[str, Dict[str, Any]] = {}
-CACHE_TTL = 60  # 60 seconds default TTL
+_sheets_credentials = None
+
+_spreadsheet_session = None
+_spreadsheet_lock = threading.Lock()
+WORKSHEET_INDEX_TTL = 300  # Sheet titles rarely change; creation/deletion invalidates explicitly
 
 def get_sheets_client() -> Optional[gspread.Client]:
     """
     Authenticates with Google Sheets API and returns the authorized client.
     Prioritizes GOOGLE_SERVICE_ACCOUNT_JSON env var, fallbacks to local credentials file.
     """
-    global _sheets_client
+    global _sheets_client, _sheets_credentials
     if _sheets_client is not None:
         return _sheets_client
 
@@ -29,7 +35,8 @@ def get_sheets_client() -> Optional[gspread.Client]:
         try:
             creds_dict = json.loads(env_creds)
             creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-            _sheets_client = gspread.authorize(creds)
+            _sheets_client = gspread.authorize(creds, http_client=GovernedHTTPClient)
+            _sheets_credentials = creds
             return _sheets_client
         except Exception as e:
             print(f"Error loading credentials from env: {e}")
@@ -39,7 +46,8 @@ def get_sheets_client() -> Optional[gspread.Client]:
     if os.path.exists(settings.GOOGLE_CREDENTIALS_FILE):
         try:
             creds = ServiceAccountCredentials.from_json_keyfile_name(settings.GOOGLE_CREDENTIALS_FILE, scope)
-            _sheets_client = gspread.authorize(creds)
+            _sheets_client = gspread.authorize(creds, http_client=GovernedHTTPClient)
+            _sheets_credentials = creds
             return _sheets_client
         except Exception as e:
             print(f"Error loading credentials file: {e}")
@@ -49,40 +57,204 @@ def get_sheets_client() -> Optional[gspread.Client]:
     return None
 
 
-def get_cached(key: str, ttl: int = CACHE_TTL) -> Optional[Any]:
+def get_sheets_credentials() -> Optional[ServiceAccountCredentials]:
+    """Service-account credentials behind get_sheets_client() (None when unavailable)."""
+    if get_sheets_client() is None:
+        return None
+    return _sheets_credentials
+
+
+class SpreadsheetSession:
+    """
+    Process-wide handle on the configured spreadsheet.
+    Opens the spreadsheet once and keeps a title -> Worksheet index so that
+    sheet.worksheet(title) / sheet.worksheets() do not each cost a metadata call.
+    Any other attribute is delegated to the wrapped gspread Spreadsheet.
+    """
+
+    def __init__(self, spreadsheet: gspread.Spreadsheet, url_key: str = "", index_ttl: int = WORKSHEET_INDEX_TTL):
+        self._spreadsheet = spreadsheet
+        self.url_key = url_key
+        self._index_ttl = index_ttl
+        self._worksheets: List[gspread.Worksheet] = []
+        self._by_title: Dict[str, gspread.Worksheet] = {}
+        self._index_ts = 0.0
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._spreadsheet, name)
+
+    @property
+    def spreadsheet(self) -> gspread.Spreadsheet:
+        return self._spreadsheet
+
+    def _index(self) -> List[gspread.Worksheet]:
+        with self._lock:
+            if not self._index_ts or (time.time() - self._index_ts) >= self._index_ttl:
+                worksheets = self._spreadsheet.worksheets()
+                self._worksheets = list(worksheets)
+                self._by_title = {}
+                for ws in self._worksheets:
+                    # Same semantics as gspread: first sheet with a given title wins
+                    self._by_title.setdefault(ws.title, ws)
+                self._index_ts = time.time()
+            return self._worksheets
+
+    def invalidate(self):
+        """Drop the worksheet index; the next lookup re-reads sheet metadata."""
+        with self._lock:
+            self._worksheets = []
+            self._by_title = {}
+            self._index_ts = 0.0
+
+    def worksheets(self, exclude_hidden: bool = False) -> List[gspread.Worksheet]:
+        worksheets = list(self._index())
+        if exclude_hidden:
+            worksheets = [ws for ws in worksheets if not ws.isSheetHidden]
+        return worksheets
+
+    def worksheet(self, title: str) -> gspread.Worksheet:
+        with self._lock:
+            self._index()
+            ws = self._by_title.get(title)
+        if ws is None:
+            raise gspread.WorksheetNotFound(title)
+        return ws
+
+    def add_worksheet(self, title: str, rows: int, cols: int, index: Optional[int] = None) -> gspread.Worksheet:
+        try:
+            ws = self._spreadsheet.add_worksheet(title=title, rows=rows, cols=cols, index=index)
+        except gspread.exceptions.APIError as e:
+            # Sheet was created elsewhere after our index was built
+            if "already exists" in str(e):
+                self.invalidate()
+                return self.worksheet(title)
+            raise
+        with self._lock:
+            if index is not None or not self._index_ts:
+                self.invalidate()
+            else:
+                self._worksheets.append(ws)
+                self._by_title.setdefault(ws.title, ws)
+        return ws
+
+    def del_worksheet(self, worksheet: gspread.Worksheet):
+        try:
+            return self._spreadsheet.del_worksheet(worksheet)
+        finally:
+            self.invalidate()
+
+    def duplicate_sheet(self, *args, **kwargs):
+        try:
+            return self._spreadsheet.duplicate_sheet(*args, **kwargs)
+        finally:
+            self.invalidate()
+
+
+def get_spreadsheet() -> Optional[SpreadsheetSession]:
+    """
+    Returns the shared SpreadsheetSession for settings.SHEET_URL.
+    Returns None when credentials are unavailable; errors opening the URL propagate
+    the same way client.open_by_url() did.
+    """
+    global _spreadsheet_session
+    session = _spreadsheet_session
+    if session is not None and session.url_key == settings.SHEET_URL:
+        return session
+
+    client = get_sheets_client()
+    if not client:
+        return None
+
+    with _spreadsheet_lock:
+        session = _spreadsheet_session
+        if session is None or session.url_key != settings.SHEET_URL:
+            session = SpreadsheetSession(client.open_by_url(settings.SHEET_URL), url_key=settings.SHEET_URL)
+            _spreadsheet_session = session
+    return session
+
+
+def invalidate_worksheet_index():
+    """Forget cached worksheet titles (e.g. after sheets were added outside the app)."""
+    session = _spreadsheet_session
+    if session is not None:
+        session.invalidate()
+
+
+def get_cached(key: str, ttl: Optional[int] = None) -> Optional[Any]:
+    """Read from the shared sheet cache. ttl overrides the TTL the entry was stored with."""
     try:
-        now = time.time()
-        entry = _cache.get(key)
-        if entry and (now - float(entry.get("timestamp", 0)) < ttl):
-            return entry.get("data")
+        return sheet_cache.get(key, ttl=ttl)
     except Exception as e:
         print(f"get_cached error: {e}")
     return None
 
 
-def set_cached(key: str, data: Any):
+def is_cached(key: str, ttl: Optional[int] = None) -> bool:
+    """True if get_or_load(key) would be served from memory without calling its loader."""
     try:
-        _cache[key] = {
-            "data": data,
-            "timestamp": time.time()
-        }
+        return sheet_cache.has(key, ttl=ttl)
+    except Exception as e:
+        print(f"is_cached error: {e}")
+    return False
+
+
+def peek_cached(key: str, ttl: Optional[int] = None) -> Optional[Any]:
+    """The value is_cached() reports on, without counting a hit or miss (for identity checks)."""
+    try:
+        return sheet_cache.peek(key, ttl=ttl)
+    except Exception as e:
+        print(f"peek_cached error: {e}")
+    return None
+
+
+def set_cached(key: str, data: Any, ttl: Optional[int] = None, depends_on: Optional[List[str]] = None):
+    try:
+        sheet_cache.set(key, data, ttl=ttl, depends_on=depends_on or ())
     except Exception as e:
         print(f"set_cached error: {e}")
 
 
 def invalidate_cache(key_prefix: str = ""):
-    global _cache
     try:
-        if not key_prefix:
-            _cache.clear()
-        else:
-            keys_to_remove = [k for k in _cache if k.startswith(key_prefix)]
-            for k in keys_to_remove:
-                _cache.pop(k, None)
+        sheet_cache.invalidate(key_prefix)
     except Exception as e:
         print(f"invalidate_cache error: {e}")
 
 
+def get_or_load(key: str, loader: Callable[[], Any], ttl: Optional[int] = None,
+                depends_on: Optional[List[str]] = None, force: bool = False,
+                cache_if: Optional[Callable[[Any], bool]] = None, persist: bool = False) -> Any:
+    """
+    Single-flight cached load: concurrent callers on a cold key share one loader() call.
+    Use from sync code (including endpoints run in the threadpool).
+    persist=True also keeps an on-disk snapshot that a cold process serves while refreshing.
+    """
+    kwargs = {"cache_if": cache_if} if cache_if else {}
+    return sheet_cache.get_or_load(key, loader, ttl=ttl, depends_on=depends_on or (), force=force,
+                                   persist=persist, **kwargs)
+
+
+async def aget_or_load(key: str, loader: Callable[[], Any], ttl: Optional[int] = None,
+                       depends_on: Optional[List[str]] = None, force: bool = False,
+                       cache_if: Optional[Callable[[Any], bool]] = None, persist: bool = False,
+                       aloader: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+    """
+    Async variant of get_or_load() for `async def` endpoints; never blocks the event loop.
+    aloader (coroutine function, e.g. built on AsyncSheetsClient) loads a miss on the loop
+    itself instead of running loader() in a worker thread.
+    """
+    kwargs = {"cache_if": cache_if} if cache_if else {}
+    return await sheet_cache.aget_or_load(key, loader, ttl=ttl, depends_on=depends_on or (), force=force,
+                                          persist=persist, aloader=aloader, **kwargs)
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    return sheet_cache.stats()
+
+
 def safe_get_all_records(ws) -> List[Dict[str, Any]]:
     """
     Safely fetch all records from a worksheet.
@@ -106,16 +278,13 @@ def safe_get_all_records(ws) -> List[Dict[str, Any]]:
         return records
 
 
-def safe_get_all_values(ws, retries: int = 3) -> List[List[Any]]:
+def safe_get_all_values(ws) -> List[List[Any]]:
     """
-    Safely fetch all raw rows from a worksheet with transient retry.
+    Safely fetch all raw rows from a worksheet.
+    Transient errors (429/5xx) are already retried with backoff by the Sheets governor.
     """
-    for i in range(retries):
-        try:
-            return ws.get_all_values()
-        except Exception as e:
-            if i == retries - 1:
-                print(f"safe_get_all_values failed after {retries} retries: {e}")
-                return []
-            time.sleep(0.5)
-    return []
+    try:
+        return ws.get_all_values()
+    except Exception as e:
+        print(f"safe_get_all_values failed: {e}")
+        return []
@@ -0,0 +1,310 @@
+# backend/app/adapters/sheets/governor.py
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Optional
+import gspread
+import httpx
+import requests
+from gspread.http_client import HTTPClient
+from app.core.config import settings
+
+READ = "read"
+WRITE = "write"
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+POLL_SECONDS = 0.25  # how often a background caller re-checks while interactive callers wait
+
+# Priority of the Sheets calls made by the current thread / task. Request handlers run
+# INTERACTIVE (the default); cache refresh and write-queue worker threads switch to
+# BACKGROUND. asyncio.to_thread() copies the context, so worker-thread calls made on
+# behalf of a request keep its priority.
+_priority: ContextVar[str] = ContextVar("sheets_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def background_priority():
+    """Run the enclosed Sheets calls as background traffic."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def is_retryable_error(e: Exception) -> bool:
+    """Rate limit (429), request timeout (408), server (5xx) and connection errors."""
+    if isinstance(e, gspread.exceptions.APIError):
+        code = getattr(e, "code", None)
+        return code in (408, 429) or (isinstance(code, int) and code >= 500)
+    return isinstance(e, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                          httpx.TransportError, ConnectionError, TimeoutError))
+
+
+def is_write_retryable_error(e: Exception) -> bool:
+    """
+    Write failures that are safe to resend: the API rejected the call outright (429/503).
+    After a timeout, another 5xx or a dropped connection the write may already have been
+    applied, and resending an append would double its rows.
+    """
+    return isinstance(e, gspread.exceptions.APIError) and getattr(e, "code", None) in (429, 503)
+
+
+def _retry_after(e: Exception) -> Optional[float]:
+    response = getattr(e, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Requests-per-minute budget. Holds up to one minute's worth of tokens and refills
+    continuously; a call takes one token. Background calls may not dip into the last
+    `reserve` tokens, which stay available to interactive calls.
+    """
+
+    def __init__(self, per_minute: float, reserve_fraction: float = 0.0):
+        self.capacity = max(1.0, float(per_minute))
+        self.rate = self.capacity / 60.0
+        self.reserve = self.capacity * max(0.0, min(reserve_fraction, 0.9))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, floor: float = 0.0) -> float:
+        """Take a token if more than `floor` would remain; otherwise return the seconds to wait."""
+        now = time.monotonic()
+        self._refill(now)
+        if self.tokens >= 1.0 + floor:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 + floor - self.tokens) / self.rate
+
+    def drain(self):
+        """Spend the whole budget (after a 429: the quota window is already used up)."""
+        self._refill(time.monotonic())
+        self.tokens = min(self.tokens, 0.0)
+
+
+class SheetsGovernor:
+    """
+    Central pacing for every Sheets API call (gspread via GovernedHTTPClient, and
+    AsyncSheetsClient).
+
+    - Separate read and write token buckets sized to the per-minute quotas; a caller
+      without a token waits (up to max_wait, then goes ahead and lets the API decide).
+    - Interactive calls come first: background calls leave the reserve untouched and
+      do not take tokens while an interactive caller is waiting for one.
+    - 429 / 408 / 5xx / connection errors are retried with exponential backoff and full
+      jitter (Retry-After is honoured when sent). A 429 also drains the bucket so every
+      caller slows down, not just the one that was rejected. Writes are only retried
+      when the API rejected them outright (429 / 503), so an append is never doubled.
+    """
+
+    def __init__(self, reads_per_minute: float = 60, writes_per_minute: float = 60,
+                 background_reserve: float = 0.2, max_retries: int = 5, backoff: float = 0.5,
+                 max_backoff: float = 16.0, max_wait: float = 20.0, enabled: bool = True):
+        self.enabled = enabled
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_wait = max_wait
+        self._buckets = {
+            READ: TokenBucket(reads_per_minute, background_reserve),
+            WRITE: TokenBucket(writes_per_minute, background_reserve),
+        }
+        self._waiting = {READ: 0, WRITE: 0}  # interactive callers currently waiting for a token
+        self._lock = threading.Lock()
+
+        self.calls = {READ: 0, WRITE: 0}
+        self.calls_by_priority = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.throttled = {READ: 0, WRITE: 0}
+        self.throttle_seconds = 0.0
+        self.throttle_timeouts = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    # ── token budget ─────────────────────────────────────────
+    def _try_acquire(self, kind: str, priority: str) -> float:
+        with self._lock:
+            bucket = self._buckets[kind]
+            if priority == BACKGROUND:
+                if self._waiting[kind]:
+                    return POLL_SECONDS
+                return bucket.try_take(bucket.reserve)
+            return bucket.try_take()
+
+    def _begin_wait(self, kind: str, priority: str, waited: bool):
+        with self._lock:
+            if not waited:
+                self.throttled[kind] += 1
+                if priority == INTERACTIVE:
+                    self._waiting[kind] += 1
+
+    def _end_wait(self, kind: str, priority: str, waited: float, timed_out: bool):
+        with self._lock:
+            if waited:
+                self.throttle_seconds += waited
+                if priority == INTERACTIVE:
+                    self._waiting[kind] -= 1
+            if timed_out:
+                self.throttle_timeouts += 1
+            self.calls[kind] += 1
+            self.calls_by_priority[priority] += 1
+
+    def acquire(self, kind: str):
+        """Block until a token for `kind` is available (or max_wait has passed)."""
+        if not self.enabled:
+            return
+        priority = current_priority()
+        waited, timed_out = 0.0, False
+        while True:
+            delay = self._try_acquire(kind, priority)
+            if delay <= 0:
+                break
+            if waited >= self.max_wait:
+                timed_out = True
+                break
+            self._begin_wait(kind, priority, waited > 0)
+            step = min(delay, POLL_SECONDS if priority == BACKGROUND else delay, self.max_wait - waited)
+            time.sleep(step)
+            waited += step
+        self._end_wait(kind, priority, waited, timed_out)
+
+    async def aacquire(self, kind: str):
+        """acquire() for coroutines: waits with asyncio.sleep instead of blocking the loop."""
+        if not self.enabled:
+            return
+        priority = current_priority()
+        waited, timed_out = 0.0, False
+        while True:
+            delay = self._try_acquire(kind, priority)
+            if delay <= 0:
+                break
+            if waited >= self.max_wait:
+                timed_out = True
+                break
+            self._begin_wait(kind, priority, waited > 0)
+            step = min(delay, POLL_SECONDS if priority == BACKGROUND else delay, self.max_wait - waited)
+            await asyncio.sleep(step)
+            waited += step
+        self._end_wait(kind, priority, waited, timed_out)
+
+    # ── retries ──────────────────────────────────────────────
+    def _should_retry(self, kind: str, e: Exception, attempt: int) -> bool:
+        if not self.enabled or attempt > self.max_retries or not is_retryable_error(e):
+            return False
+        if kind == WRITE:
+            return is_write_retryable_error(e)
+        return True
+
+    def _note_failure(self, kind: str, e: Exception, attempt: int) -> Optional[float]:
+        """Record a failed call; returns the backoff delay if it should be retried."""
+        code = getattr(e, "code", None)
+        with self._lock:
+            self.last_error = f"{kind}: {e}"[:300]
+            if code == 429:
+                self.rate_limited += 1
+                self._buckets[kind].drain()
+            if not self._should_retry(kind, e, attempt):
+                self.failures += 1
+                return None
+            self.retries += 1
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+        retry_after = _retry_after(e)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        print(f"[SheetsGovernor] {kind} call failed ({code or type(e).__name__}); "
+              f"retry {attempt}/{self.max_retries} in {delay:.1f}s")
+        return delay
+
+    def run(self, kind: str, fn: Callable[[], Any]) -> Any:
+        """Call fn() within the budget for `kind`, retrying transient failures."""
+        attempt = 0
+        while True:
+            self.acquire(kind)
+            try:
+                return fn()
+            except Exception as e:
+                attempt += 1
+                delay = self._note_failure(kind, e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+
+    async def arun(self, kind: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """run() for coroutine functions."""
+        attempt = 0
+        while True:
+            await self.aacquire(kind)
+            try:
+                return await fn()
+            except Exception as e:
+                attempt += 1
+                delay = self._note_failure(kind, e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+
+    # ── metrics ──────────────────────────────────────────────
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {}
+            for kind, bucket in self._buckets.items():
+                bucket._refill(time.monotonic())
+                buckets[kind] = {"per_minute": bucket.capacity, "available": round(bucket.tokens, 2),
+                                 "background_reserve": round(bucket.reserve, 2), "waiting": self._waiting[kind]}
+            return {
+                "enabled": self.enabled,
+                "buckets": buckets,
+                "calls": dict(self.calls),
+                "calls_by_priority": dict(self.calls_by_priority),
+                "throttled": dict(self.throttled),
+                "throttle_seconds": round(self.throttle_seconds, 3),
+                "throttle_timeouts": self.throttle_timeouts,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "failures": self.failures,
+                "last_error": self.last_error,
+            }
+
+
+def request_kind(method: str, url: str) -> str:
+    """Reads are GETs plus the POST-based batchGetByDataFilter; everything else spends write quota."""
+    if method.upper() == "GET" or ":batchGetByDataFilter" in str(url):
+        return READ
+    return WRITE
+
+
+class GovernedHTTPClient(HTTPClient):
+    """gspread HTTP client whose every request goes through sheets_governor."""
+
+    def request(self, method: str, endpoint: str, *args, **kwargs):
+        return sheets_governor.run(request_kind(method, endpoint),
+                                   lambda: super(GovernedHTTPClient, self).request(method, endpoint, *args, **kwargs))
+
+
+sheets_governor = SheetsGovernor(
+    reads_per_minute=settings.SHEETS_READS_PER_MINUTE,
+    writes_per_minute=settings.SHEETS_WRITES_PER_MINUTE,
+    background_reserve=settings.SHEETS_BACKGROUND_RESERVE,
+    max_retries=settings.SHEETS_MAX_RETRIES,
+    enabled=settings.SHEETS_GOVERNOR_ENABLED,
+)
@@ -1,12 +1,12 @@
 # backend/app/adapters/sheets/log_main.py
 
+import asyncio
 from datetime import date, datetime
 from typing import List, Dict, Any, Optional
 import re
-import pandas as pd
 from app.core.config import settings
 from app.domain.models import BehaviorEvent, SafetyFlags, FunctionEstimate, FunctionCode
-from app.adapters.sheets.client import get_sheets_client, safe_get_all_records, get_cached, set_cached
+from app.adapters.sheets.client import get_sheets_client, get_spreadsheet, get_or_load, aget_or_load
 from app.services.normalize import (
     parse_time_slots,
     normalize_location,
@@ -15,7 +15,9 @@ from app.services.normalize import (
     parse_occurrence
 )
 
-CACHE_KEY_LOG_MAIN = "sheet:log-main"
+CACHE_KEY_LOG_MAIN = "sheet:log-main:events"
+# Worksheet that backs BehaviorEvents, first existing title wins
+LOG_MAIN_TITLES = ["Log_Main", "BehaviorLogs1", "BehaviorLogs", "설문지 응답 시트1"]
 
 LEGACY_TO_CANONICAL_FUNCTION = {
     "ESCAPE_DEMAND": FunctionCode.ESCAPE_DEMAND,
@@ -32,8 +34,8 @@ class LogMainAdapter:
         if not client or not settings.SHEET_URL:
             return None
         try:
-            sheet = client.open_by_url(settings.SHEET_URL)
-            for title in ["Log_Main", "BehaviorLogs1", "BehaviorLogs", "설문지 응답 시트1"]:
+            sheet = get_spreadsheet()
+            for title in LOG_MAIN_TITLES:
                 try:
                     return sheet.worksheet(title)
                 except Exception:
@@ -45,26 +47,26 @@ class LogMainAdapter:
             return None
 
     @classmethod
-    def fetch_events(cls, force_refresh: bool = False) -> List[BehaviorEvent]:
-        if not force_refresh:
-            cached = get_cached(CACHE_KEY_LOG_MAIN)
-            if cached is not None:
-                return cached
-
-        ws = cls.get_worksheet()
-        if not ws:
-            return []
+    def _load_events(cls) -> Optional[List[BehaviorEvent]]:
+        # Built from the shared Log_Main ingest instead of a second sheet download
+        from app.services.event_store import fetch_log_events
+        return fetch_log_events()
 
-        raw_records = safe_get_all_records(ws)
-        events = []
+    @classmethod
+    def fetch_events(cls, force_refresh: bool = False) -> List[BehaviorEvent]:
+        return get_or_load(CACHE_KEY_LOG_MAIN, cls._load_events, force=force_refresh) or []
 
-        for idx, row in enumerate(raw_records):
-            event = cls._normalize_row(row, row_idx=idx + 2)
-            if event:
-                events.append(event)
+    @classmethod
+    async def _aload_events(cls) -> Optional[List[BehaviorEvent]]:
+        # Log_Main is synced on the event loop (async client); event building runs in a worker thread
+        from app.services.sheets import afetch_all_records
+        await afetch_all_records()
+        return await asyncio.to_thread(cls._load_events)
 
-        set_cached(CACHE_KEY_LOG_MAIN, events)
-        return events
+    @classmethod
+    async def afetch_events(cls, force_refresh: bool = False) -> List[BehaviorEvent]:
+        return await aget_or_load(CACHE_KEY_LOG_MAIN, cls._load_events, force=force_refresh,
+                                  aloader=cls._aload_events) or []
 
     @classmethod
     def _normalize_row(cls, row: Dict[str, Any], row_idx: int) -> Optional[BehaviorEvent]:
@@ -84,6 +86,7 @@ class LogMainAdapter:
             return None
 
         try:
+            import pandas as pd
             event_date = pd.to_datetime(clean_date_str).date()
         except Exception:
             return None
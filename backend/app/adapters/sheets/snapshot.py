@@ -0,0 +1,127 @@
+# backend/app/adapters/sheets/snapshot.py
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Optional, Tuple
+
+SNAPSHOT_DB_NAME = "sheet_snapshots.sqlite3"
+
+
+class SnapshotStore:
+    """
+    On-disk snapshots of normalized sheet data (SQLite, one row per cache key).
+    Lets a cold process (e.g. a fresh Vercel lambda) answer from the last fetched
+    data in milliseconds while the cache revalidates it in the background.
+
+    Each row keeps the zlib-compressed JSON payload, the time it was fetched from
+    Google Sheets and a content hash, so unchanged data is not rewritten.
+    Every failure is logged and treated as "no snapshot"; the store never breaks a request.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.path = os.path.join(cache_dir, SNAPSHOT_DB_NAME)
+        self._lock = threading.Lock()
+        self._ready = False
+        self._disabled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._disabled:
+            return None
+        try:
+            if not self._ready:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=2, check_same_thread=False)
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS snapshots ("
+                    " key TEXT PRIMARY KEY,"
+                    " payload BLOB NOT NULL,"
+                    " fetched_at REAL NOT NULL,"
+                    " content_hash TEXT NOT NULL)"
+                )
+                conn.commit()
+                try:
+                    # Users rows include password hashes
+                    os.chmod(self.path, 0o600)
+                except OSError:
+                    pass
+                self._ready = True
+            return conn
+        except Exception as e:
+            print(f"Snapshot store unavailable at {self.path}: {e}")
+            self._disabled = True
+            return None
+
+    def load(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Returns (data, fetched_at) or None."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT payload, fetched_at FROM snapshots WHERE key = ?", (key,)
+                ).fetchone()
+                if not row:
+                    return None
+                return json.loads(zlib.decompress(row[0]).decode("utf-8")), float(row[1])
+            except Exception as e:
+                print(f"Snapshot load failed for {key}: {e}")
+                return None
+            finally:
+                conn.close()
+
+    def save(self, key: str, data: Any, fetched_at: Optional[float] = None):
+        fetched_at = fetched_at or time.time()
+        try:
+            raw = json.dumps(data, ensure_ascii=False, default=str, separators=(",", ":")).encode("utf-8")
+        except Exception as e:
+            print(f"Snapshot encode failed for {key}: {e}")
+            return
+        content_hash = hashlib.sha256(raw).hexdigest()
+
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                row = conn.execute("SELECT content_hash FROM snapshots WHERE key = ?", (key,)).fetchone()
+                if row and row[0] == content_hash:
+                    conn.execute("UPDATE snapshots SET fetched_at = ? WHERE key = ?", (fetched_at, key))
+                else:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO snapshots (key, payload, fetched_at, content_hash) VALUES (?, ?, ?, ?)",
+                        (key, zlib.compress(raw, 1), fetched_at, content_hash),
+                    )
+                conn.commit()
+            except Exception as e:
+                print(f"Snapshot save failed for {key}: {e}")
+            finally:
+                conn.close()
+
+    def delete_prefix(self, key_prefix: str = ""):
+        with self._lock:
+            if not self._ready and not os.path.exists(self.path):
+                return
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                if key_prefix:
+                    # substr() instead of LIKE: keys contain '_' and ':'
+                    conn.execute(
+                        "DELETE FROM snapshots WHERE substr(key, 1, ?) = ?", (len(key_prefix), key_prefix)
+                    )
+                else:
+                    conn.execute("DELETE FROM snapshots")
+                conn.commit()
+            except Exception as e:
+                print(f"Snapshot delete failed for {key_prefix!r}: {e}")
+            finally:
+                conn.close()
@@ -1,12 +1,17 @@
 # backend/app/adapters/sheets/tier_status.py
 
+import asyncio
 from typing import List, Dict, Any, Optional
 import gspread
 from app.core.config import settings
 from app.domain.models import StudentProfile, TierSnapshot, TierCode
-from app.adapters.sheets.client import get_sheets_client, safe_get_all_records, get_cached, set_cached
+from app.adapters.sheets.client import get_sheets_client, get_spreadsheet, safe_get_all_records, get_or_load, aget_or_load
+from app.adapters.sheets.async_client import get_async_sheets_client, is_missing_sheet_error, padded_values, records_from_values
+from app.adapters.sheets.batch_loader import RangeLoad
 
-CACHE_KEY_TIER_STATUS = "sheet:tier-status"
+CACHE_KEY_TIER_STATUS = "sheet:tier-status:students"
+CACHE_KEY_TIER_STATUS_RAW = "sheet:tier-status:raw"
+TIER_STATUS_SHEET = "TierStatus"
 
 class TierStatusAdapter:
     @staticmethod
@@ -15,34 +20,80 @@ class TierStatusAdapter:
         if not client or not settings.SHEET_URL:
             return None
         try:
-            sheet = client.open_by_url(settings.SHEET_URL)
-            return sheet.worksheet("TierStatus")
+            sheet = get_spreadsheet()
+            return sheet.worksheet(TIER_STATUS_SHEET)
         except Exception as e:
             print(f"Error opening TierStatus worksheet: {e}")
             return None
 
     @classmethod
-    def fetch_students(cls, force_refresh: bool = False) -> List[StudentProfile]:
-        if not force_refresh:
-            cached = get_cached(CACHE_KEY_TIER_STATUS)
-            if cached is not None:
-                return cached
+    def fetch_raw_records(cls, force_refresh: bool = False, ws=None) -> List[Dict[str, Any]]:
+        """
+        Raw TierStatus rows as returned by get_all_records(), shared by
+        fetch_students() and services.sheets.fetch_student_status().
+        Callers must not mutate the returned dicts.
+        """
+        return get_or_load(CACHE_KEY_TIER_STATUS_RAW, lambda: cls._load_raw_records(ws), force=force_refresh) or []
 
-        ws = cls.get_worksheet()
-        if not ws:
-            return []
+    @classmethod
+    async def afetch_raw_records(cls, force_refresh: bool = False) -> List[Dict[str, Any]]:
+        """fetch_raw_records() for async endpoints; a miss is read over the pooled async client."""
+        return await aget_or_load(CACHE_KEY_TIER_STATUS_RAW, cls._load_raw_records, force=force_refresh,
+                                  aloader=cls._aload_raw_records) or []
 
-        raw_records = safe_get_all_records(ws)
-        students = []
+    @classmethod
+    def _load_raw_records(cls, ws=None) -> Optional[List[Dict[str, Any]]]:
+        target_ws = ws or cls.get_worksheet()
+        if not target_ws:
+            return None
+        return safe_get_all_records(target_ws)
+
+    @classmethod
+    async def _aload_raw_records(cls) -> Optional[List[Dict[str, Any]]]:
+        client = get_async_sheets_client()
+        if client is None:
+            return await asyncio.to_thread(cls._load_raw_records)
+        try:
+            return await client.get_all_records(TIER_STATUS_SHEET)
+        except gspread.exceptions.APIError as e:
+            if not is_missing_sheet_error(e):
+                raise
+            print(f"Error opening TierStatus worksheet: {e}")
+            return None
 
+    @classmethod
+    def raw_records_range_load(cls) -> RangeLoad:
+        """The raw-records cache entry as part of a multi-sheet batch read (see batch_loader)."""
+        def build(value_ranges):
+            if value_ranges[0] is None:
+                print(f"Error opening TierStatus worksheet: '{TIER_STATUS_SHEET}' not found")
+                return None
+            return records_from_values(padded_values(value_ranges[0]))
+        return RangeLoad(CACHE_KEY_TIER_STATUS_RAW, [(TIER_STATUS_SHEET, None)], build,
+                         loader=cls._load_raw_records, aloader=cls._aload_raw_records)
+
+    @classmethod
+    def _load_students(cls, force_refresh: bool = False) -> List[StudentProfile]:
+        raw_records = cls.fetch_raw_records(force_refresh=force_refresh)
+        students = []
         for row in raw_records:
             student = cls._normalize_student(row)
             if student:
                 students.append(student)
-
-        set_cached(CACHE_KEY_TIER_STATUS, students)
         return students
 
+    @classmethod
+    def fetch_students(cls, force_refresh: bool = False) -> List[StudentProfile]:
+        return get_or_load(CACHE_KEY_TIER_STATUS, lambda: cls._load_students(force_refresh),
+                           depends_on=[CACHE_KEY_TIER_STATUS_RAW], force=force_refresh)
+
+    @classmethod
+    async def afetch_students(cls, force_refresh: bool = False) -> List[StudentProfile]:
+        # Sheet read on the event loop; only the (CPU) profile build runs in a worker thread
+        await cls.afetch_raw_records(force_refresh=force_refresh)
+        return await aget_or_load(CACHE_KEY_TIER_STATUS, cls._load_students,
+                                  depends_on=[CACHE_KEY_TIER_STATUS_RAW], force=force_refresh)
+
     @classmethod
     def _normalize_student(cls, row: Dict[str, Any]) -> Optional[StudentProfile]:
         s_code = str(row.get("학생코드") or row.get("Code") or row.get("학번") or "").strip()
@@ -0,0 +1,356 @@
+# backend/app/adapters/sheets/write_queue.py
+
+import atexit
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from app.core.config import settings
+from app.adapters.sheets.governor import background_priority, is_retryable_error, is_write_retryable_error
+
+MAX_BACKOFF_SECONDS = 30.0
+
+OnFlushed = Optional[Callable[[], None]]
+OnFailed = Optional[Callable[[Exception], None]]
+
+
+class _Op:
+    """One queued row append or range update plus the callbacks of every caller that wrote it."""
+    __slots__ = ("values", "on_flushed", "on_failed")
+
+    def __init__(self, values: Any, on_flushed: OnFlushed = None, on_failed: OnFailed = None):
+        self.values = values
+        self.on_flushed = [on_flushed] if on_flushed else []
+        self.on_failed = [on_failed] if on_failed else []
+
+
+class _Bucket:
+    """Pending writes for one worksheet."""
+    __slots__ = ("ws", "appends", "updates", "first_at", "last_at", "attempts", "not_before")
+
+    def __init__(self, ws):
+        self.ws = ws
+        self.appends: List[_Op] = []
+        # (value_input_option, A1 range) -> op; a later write to the same range replaces the earlier one
+        self.updates: "OrderedDict[tuple, _Op]" = OrderedDict()
+        self.first_at = time.time()
+        self.last_at = self.first_at
+        self.attempts = 0
+        self.not_before = 0.0
+
+    def __len__(self) -> int:
+        return len(self.appends) + len(self.updates)
+
+    def due_at(self, debounce: float, max_delay: float) -> float:
+        # Debounced: wait for a quiet period, but never hold a write longer than max_delay
+        return max(min(self.last_at + debounce, self.first_at + max_delay), self.not_before)
+
+
+def _call_all(callbacks, *args):
+    for cb in callbacks:
+        try:
+            cb(*args)
+        except Exception as e:
+            print(f"[WriteQueue] callback error: {e}")
+
+
+class SheetWriteQueue:
+    """
+    Write-behind queue for Sheets mutations.
+
+    Callers enqueue row appends and range updates and return right away. Writes are
+    grouped per worksheet and, after a short quiet period (debounce, capped by
+    max_delay), each worksheet's batch goes out as at most one append_rows() call
+    plus one batch_update() per value input option. Several writes to the same range
+    collapse into the last one.
+
+    Rate-limit (429), server (5xx) and connection errors are retried with exponential
+    backoff; the batch is merged back in front of anything queued meanwhile. Row appends
+    are only resent after an outright rejection (429/503, see is_write_retryable_error);
+    after any other failure they may already be in the sheet, so they are dropped. After
+    max_retries, or on any other error, the batch is dropped and on_failed runs.
+    on_flushed runs once a write has reached the sheet (cache invalidation goes there,
+    so readers never cache the sheet before it contains the write).
+
+    When disabled (debounce <= 0 or WRITE_QUEUE_ENABLED off, e.g. on serverless hosts
+    that freeze the process between requests) every enqueue is flushed inline, still
+    with retries, so a dropped write has reached on_failed before the enqueue call
+    returns: callers collect failures with on_failed=failed.append and report them.
+    flush() drains the queue synchronously and returns the errors it dropped; it also
+    runs at exit.
+    """
+
+    def __init__(self, debounce: float = 0.3, max_delay: float = 2.0, max_retries: int = 5,
+                 backoff: float = 0.5, enabled: bool = True):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.enabled = enabled and debounce > 0
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+        self.enqueued = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.api_calls = 0
+        self.written = 0
+        self.retries = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+        self.last_flush_at: Optional[float] = None
+
+    # ── enqueue ──────────────────────────────────────────────
+    def append_row(self, ws, row: List[Any], on_flushed: OnFlushed = None, on_failed: OnFailed = None):
+        """Queue ws.append_row(row) (RAW)."""
+        self.append_rows(ws, [row], on_flushed=on_flushed, on_failed=on_failed)
+
+    def append_rows(self, ws, rows: List[List[Any]], on_flushed: OnFlushed = None, on_failed: OnFailed = None):
+        """Queue ws.append_rows(rows) (RAW). The rows stay contiguous and in order; callbacks fire once."""
+        if not rows:
+            if on_flushed:
+                _call_all([on_flushed])
+            return
+        with self._cond:
+            appends = self._bucket(ws).appends
+            for i, row in enumerate(rows):
+                last = i == len(rows) - 1
+                appends.append(_Op(list(row), on_flushed if last else None, on_failed if last else None))
+            self.enqueued += len(rows)
+        self._schedule(ws.title)
+
+    def update(self, ws, data: List[Dict[str, Any]], value_input_option: str = "RAW",
+               on_flushed: OnFlushed = None, on_failed: OnFailed = None):
+        """
+        Queue ws.batch_update(data, value_input_option=...). data uses the batch_update
+        shape: [{"range": "B5", "values": [["O"]]}, ...]. Callbacks fire once every range
+        in data has been written (or dropped).
+        """
+        if not data:
+            if on_flushed:
+                _call_all([on_flushed])
+            return
+        pending = {"left": len(data), "error": None}
+        lock = threading.Lock()
+
+        def part_flushed():
+            with lock:
+                pending["left"] -= 1
+                done = pending["left"] == 0 and pending["error"] is None
+            if done and on_flushed:
+                on_flushed()
+
+        def part_failed(e):
+            with lock:
+                first = pending["error"] is None
+                pending["error"] = e
+            if first and on_failed:
+                on_failed(e)
+
+        with self._cond:
+            bucket = self._bucket(ws)
+            for item in data:
+                key = (value_input_option, item["range"])
+                op = _Op(item["values"], part_flushed, part_failed)
+                prev = bucket.updates.pop(key, None)
+                if prev is not None:
+                    # Superseded before it was sent: the newer value carries both callers' callbacks
+                    op.on_flushed = prev.on_flushed + op.on_flushed
+                    op.on_failed = prev.on_failed + op.on_failed
+                    self.coalesced += 1
+                bucket.updates[key] = op
+                self.enqueued += 1
+        self._schedule(ws.title)
+
+    def _bucket(self, ws) -> _Bucket:
+        bucket = self._buckets.get(ws.title)
+        if bucket is None:
+            bucket = _Bucket(ws)
+            self._buckets[ws.title] = bucket
+        else:
+            bucket.ws = ws
+            bucket.last_at = time.time()
+        return bucket
+
+    def _schedule(self, title: str):
+        if not self.enabled:
+            self.flush(title)
+            return
+        with self._cond:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="sheet-write-queue", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+
+    # ── flushing ─────────────────────────────────────────────
+    def _run(self):
+        # Deferred writes yield the Sheets budget to interactive requests (see governor)
+        with background_priority():
+            self._loop()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while True:
+                    now = time.time()
+                    due = [t for t, b in self._buckets.items() if b.due_at(self.debounce, self.max_delay) <= now]
+                    if due:
+                        break
+                    wake = min((b.due_at(self.debounce, self.max_delay) for b in self._buckets.values()), default=None)
+                    self._cond.wait(None if wake is None else max(0.0, wake - now))
+            for title in due:
+                try:
+                    self._flush_title(title, wait_backoff=False)
+                except Exception as e:
+                    print(f"[WriteQueue] flush error for '{title}': {e}")
+
+    def flush(self, title: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send pending writes now (one worksheet or all), retrying inline with backoff.
+        Returns the remaining depth and the errors of the writes dropped meanwhile (their
+        on_failed callbacks have run by then).
+        """
+        errors: List[Exception] = []
+        with self._cond:
+            titles = [title] if title is not None else list(self._buckets)
+        for t in titles:
+            for _ in range(self.max_retries + 1):
+                if not self._flush_title(t, wait_backoff=True, errors=errors):
+                    break
+        return {"depth": self.depth(), "errors": [str(e) for e in errors]}
+
+    def _flush_title(self, title: str, wait_backoff: bool, errors: Optional[List[Exception]] = None) -> bool:
+        """Sends one worksheet's batch. Returns True if it was requeued for a retry."""
+        with self._send_lock:
+            with self._cond:
+                bucket = self._buckets.get(title)
+                if bucket is None or not len(bucket):
+                    self._buckets.pop(title, None)
+                    return False
+                if bucket.not_before > time.time() and not wait_backoff:
+                    return False
+                del self._buckets[title]
+            if bucket.not_before > time.time():
+                time.sleep(bucket.not_before - time.time())
+            try:
+                self._send(bucket)
+                return False
+            except Exception as e:
+                return self._handle_failure(title, bucket, e, errors)
+
+    def _send(self, bucket: _Bucket):
+        ws = bucket.ws
+        self.flushes += 1
+        if bucket.appends:
+            ws.append_rows([op.values for op in bucket.appends])
+            self.api_calls += 1
+            done, bucket.appends = bucket.appends, []
+            self.written += len(done)
+            for op in done:
+                _call_all(op.on_flushed)
+
+        options = list(dict.fromkeys(opt for opt, _ in bucket.updates))
+        for option in options:
+            keys = [k for k in bucket.updates if k[0] == option]
+            ws.batch_update([{"range": rng, "values": bucket.updates[(opt, rng)].values} for opt, rng in keys],
+                            value_input_option=option)
+            self.api_calls += 1
+            done = [bucket.updates.pop(k) for k in keys]
+            self.written += len(done)
+            for op in done:
+                _call_all(op.on_flushed)
+        self.last_flush_at = time.time()
+
+    def _drop(self, title: str, ops: List[_Op], e: Exception, reason: str = "",
+              errors: Optional[List[Exception]] = None):
+        self.failed += len(ops)
+        if errors is not None:
+            errors.append(e)
+        print(f"[WriteQueue] dropping {len(ops)} write(s) to '{title}'{reason}: {e}")
+        for op in ops:
+            _call_all(op.on_failed, e)
+
+    def _handle_failure(self, title: str, bucket: _Bucket, e: Exception,
+                        errors: Optional[List[Exception]] = None) -> bool:
+        self.last_error = f"{title}: {e}"
+        bucket.attempts += 1
+        if bucket.appends and is_retryable_error(e) and not is_write_retryable_error(e):
+            # The append may already have landed (timeout, 5xx): resending it would double the rows.
+            # Range updates are idempotent, so those can still be retried below.
+            dropped, bucket.appends = bucket.appends, []
+            self._drop(title, dropped, e, " (append may have been applied)", errors)
+            if not bucket.updates:
+                return False
+        if is_retryable_error(e) and bucket.attempts <= self.max_retries:
+            self.retries += 1
+            delay = min(MAX_BACKOFF_SECONDS, self.backoff * (2 ** (bucket.attempts - 1)))
+            print(f"[WriteQueue] '{title}' write failed ({e}); retry {bucket.attempts}/{self.max_retries} in {delay:.1f}s")
+            with self._cond:
+                newer = self._buckets.pop(title, None)
+                if newer is not None:
+                    # Writes queued while this batch was in flight go after it; newer range values win
+                    bucket.ws = newer.ws
+                    bucket.appends.extend(newer.appends)
+                    for key, op in newer.updates.items():
+                        prev = bucket.updates.pop(key, None)
+                        if prev is not None:
+                            op.on_flushed = prev.on_flushed + op.on_flushed
+                            op.on_failed = prev.on_failed + op.on_failed
+                        bucket.updates[key] = op
+                    bucket.last_at = newer.last_at
+                bucket.not_before = time.time() + delay
+                self._buckets[title] = bucket
+                self._buckets.move_to_end(title, last=False)
+                self._cond.notify()
+            return True
+
+        self._drop(title, bucket.appends + list(bucket.updates.values()), e, errors=errors)
+        return False
+
+    # ── metrics ──────────────────────────────────────────────
+    def depth(self) -> int:
+        with self._cond:
+            return sum(len(b) for b in self._buckets.values())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.time()
+            buckets = {
+                title: {"appends": len(b.appends), "updates": len(b.updates), "attempts": b.attempts,
+                        "age_seconds": round(now - b.first_at, 3)}
+                for title, b in self._buckets.items()
+            }
+            return {
+                "enabled": self.enabled,
+                "debounce_seconds": self.debounce,
+                "depth": sum(len(b) for b in self._buckets.values()),
+                "oldest_age_seconds": max((v["age_seconds"] for v in buckets.values()), default=0.0),
+                "worksheets": buckets,
+                "enqueued": self.enqueued,
+                "coalesced": self.coalesced,
+                "flushes": self.flushes,
+                "api_calls": self.api_calls,
+                "written": self.written,
+                "retries": self.retries,
+                "failed": self.failed,
+                "last_error": self.last_error,
+                "last_flush_at": self.last_flush_at,
+            }
+
+
+sheet_write_queue = SheetWriteQueue(
+    debounce=settings.WRITE_QUEUE_DEBOUNCE_SECONDS,
+    max_delay=settings.WRITE_QUEUE_MAX_DELAY_SECONDS,
+    max_retries=settings.WRITE_QUEUE_MAX_RETRIES,
+    enabled=settings.WRITE_QUEUE_ENABLED,
+)
+
+
+def _flush_at_exit():
+    if sheet_write_queue.depth():
+        sheet_write_queue.flush()
+
+
+atexit.register(_flush_at_exit)
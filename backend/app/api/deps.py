@@ -4,8 +4,6 @@ from typing import Optional, Dict, Any, List
 from fastapi import Request, HTTPException, status, Depends
 from app.core.config import settings
 from app.core.security import decode_access_token
-from app.services.sheets import get_user_by_id, fetch_student_status
-from app.adapters.sheets.tier_status import TierStatusAdapter
 
 # Canonical class normalization mapping
 CLASS_MAP = {
@@ -74,44 +72,51 @@ def normalize_role(role_val: Optional[str]) -> str:
     return r
 
 
+def _is_inactive(user: Dict[str, Any]) -> bool:
+    is_active = str(user.get("Active", "true")).strip().lower()
+    return is_active in ["false", "0", "inactive", "x", "no"]
+
+
+def _build_user_context(user_id: str, user: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(user_id),
+        "sub": str(user_id),
+        "role": normalize_role(user.get("Role", "teacher")),
+        "class_id": str(user.get("ClassID", "")).strip(),
+        "class_name": str(user.get("ClassName", "")).strip(),
+        "name": str(user.get("Name", "")).strip(),
+        "active": True
+    }
+
+
 async def get_current_user_optional(request: Request) -> Optional[Dict[str, Any]]:
     """
     Extracts session token from HttpOnly cookie and resolves current active user.
     Returns user context or None if unauthenticated.
     """
+    from app.services.user_directory import user_directory
     token: Optional[str] = request.cookies.get(settings.AUTH_COOKIE_NAME)
     if not token:
         return None
 
     try:
+        cached = user_directory.cached_session(token)
+        if cached:
+            return cached
+
         payload = decode_access_token(token)
         user_id = payload.get("sub")
         if not user_id:
             return None
 
         # Revalidate with current user store
-        user = get_user_by_id(user_id)
-        if not user:
+        user = user_directory.get(user_id)
+        if not user or _is_inactive(user):
             return None
 
-        is_active = str(user.get("Active", "true")).strip().lower()
-        if is_active in ["false", "0", "inactive", "x", "no"]:
-            return None
-
-        current_role = normalize_role(user.get("Role", "teacher"))
-        current_class_id = str(user.get("ClassID", "")).strip()
-        current_class_name = str(user.get("ClassName", "")).strip()
-        current_name = str(user.get("Name", "")).strip()
-
-        return {
-            "id": str(user_id),
-            "sub": str(user_id),
-            "role": current_role,
-            "class_id": current_class_id,
-            "class_name": current_class_name,
-            "name": current_name,
-            "active": True
-        }
+        context = _build_user_context(user_id, user)
+        user_directory.remember_session(token, payload, context)
+        return context
     except Exception:
         return None
 
@@ -124,6 +129,8 @@ async def get_current_user(request: Request) -> Dict[str, Any]:
     3. Revalidates user against current Users store (prevents stale role/class privilege escalation).
     4. Rejects inactive or deleted users with HTTP 401.
     """
+    from app.services.user_directory import user_directory
+    from app.services.sheets import afetch_all_users
     token: Optional[str] = request.cookies.get(settings.AUTH_COOKIE_NAME)
     if not token:
         raise HTTPException(
@@ -131,6 +138,11 @@ async def get_current_user(request: Request) -> Dict[str, Any]:
             detail="Authentication session required. Please log in."
         )
 
+    # Same token verified moments ago against the same Users data
+    cached = user_directory.cached_session(token)
+    if cached:
+        return cached
+
     payload = decode_access_token(token)
     user_id = payload.get("sub")
     if not user_id:
@@ -140,7 +152,9 @@ async def get_current_user(request: Request) -> Dict[str, Any]:
         )
 
     # Live / cached Users lookup to prevent stale privileges and check active state
-    user = get_user_by_id(user_id)
+    # (a cold Users cache is filled without blocking the event loop)
+    await afetch_all_users()
+    user = user_directory.get(user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -148,27 +162,15 @@ async def get_current_user(request: Request) -> Dict[str, Any]:
         )
 
     # Check Active flag
-    is_active = str(user.get("Active", "true")).strip().lower()
-    if is_active in ["false", "0", "inactive", "x", "no"]:
+    if _is_inactive(user):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User account is deactivated."
         )
 
-    current_role = normalize_role(user.get("Role", "teacher"))
-    current_class_id = str(user.get("ClassID", "")).strip()
-    current_class_name = str(user.get("ClassName", "")).strip()
-    current_name = str(user.get("Name", "")).strip()
-
-    return {
-        "id": str(user_id),
-        "sub": str(user_id),
-        "role": current_role,
-        "class_id": current_class_id,
-        "class_name": current_class_name,
-        "name": current_name,
-        "active": True
-    }
+    context = _build_user_context(user_id, user)
+    user_directory.remember_session(token, payload, context)
+    return context
 
 
 async def require_authenticated_user(current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
@@ -198,24 +200,9 @@ async def require_teacher_or_admin(current_user: Dict[str, Any] = Depends(get_cu
 
 def get_student_class_code(student_code: str) -> Optional[str]:
     """Look up a student's canonical class code strictly by student_code from TierStatus roster."""
-    if not student_code:
-        return None
-    s_clean = str(student_code).strip()
-
-    # 1. Check TierStatusAdapter (strictly by student_code)
-    students = TierStatusAdapter.fetch_students()
-    for s in students:
-        if s.student_code.strip() == s_clean:
-            return normalize_class_identifier(s.class_name)
-
-    # 2. Check fetch_student_status (strictly by student_code fields)
-    raw_statuses = fetch_student_status()
-    for row in raw_statuses:
-        rc = str(row.get("학생코드") or row.get("Code") or row.get("학번") or "").strip()
-        if rc == s_clean:
-            return normalize_class_identifier(row.get("학급") or row.get("Class") or "")
-
-    return None
+    from app.services.roster_index import get_roster_entry
+    entry = get_roster_entry(student_code)
+    return entry.class_code if entry else None
 
 
 def check_student_scope(student_code: str, current_user: Dict[str, Any]) -> None:
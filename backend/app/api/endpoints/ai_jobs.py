@@ -0,0 +1,66 @@
+# backend/app/api/endpoints/ai_jobs.py
+
+from fastapi import APIRouter, HTTPException, Depends
+from typing import Any, Awaitable, Callable, Dict
+from app.api.deps import require_authenticated_user, require_admin
+from app.core.config import settings
+
+router = APIRouter()
+
+
+def _is_admin(user: Dict[str, Any]) -> bool:
+    return str(user.get("role", "")).lower() in ["admin", "superadmin"]
+
+
+def _job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    view = {k: job.get(k) for k in ("kind", "status", "result", "error", "created_at", "started_at", "finished_at")}
+    view["job_id"] = job["id"]
+    view["poll_url"] = f"/api/v1/ai-jobs/{job['id']}"
+    return view
+
+
+async def submit_ai_job(handler: Callable[..., Awaitable[Dict[str, Any]]], kind: str, result_key: str,
+                        **kwargs) -> Dict[str, Any]:
+    """
+    Background-job variant of an AI endpoint.
+    Runs the regular handler with the LLM call captured (same scope checks, data and prompt),
+    queues the prompt on ai_job_queue and returns the job right away; poll GET /ai-jobs/{job_id}.
+    Answers 501 when AI_JOBS_ENABLED is off (serverless hosts, where no worker would run it).
+    """
+    if not settings.AI_JOBS_ENABLED:
+        raise HTTPException(
+            status_code=501,
+            detail="이 서버에서는 백그라운드 AI 작업을 지원하지 않습니다. 일반 또는 /stream 엔드포인트를 사용하세요.",
+        )
+    from app.services.ai_jobs import ai_job_queue
+    from app.services.llm_stream import capturing_prompts
+
+    current_user = kwargs["current_user"]
+    owner = str(current_user.get("id") or current_user.get("sub") or "")
+    with capturing_prompts() as prompts:
+        result = await handler(**kwargs)
+    if prompts:
+        system_prompt, user_prompt, max_tokens = prompts[-1]
+        job = ai_job_queue.submit(kind, owner, system_prompt, user_prompt, max_tokens,
+                                  regenerate=bool(kwargs.get("regenerate")))
+    else:
+        job = ai_job_queue.complete(kind, owner, str((result or {}).get(result_key) or ""))
+    return _job_view(job)
+
+
+@router.get("/{job_id}")
+async def get_ai_job(job_id: str, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    """AI 보고서 작업 상태·결과 조회 (제출한 사용자 또는 관리자)"""
+    from app.services.ai_jobs import ai_job_queue, job_owners
+    job = ai_job_queue.get(job_id)
+    owner = str(current_user.get("id") or current_user.get("sub") or "")
+    if job is None or not (_is_admin(current_user) or owner in job_owners(job)):
+        raise HTTPException(status_code=404, detail="AI 작업을 찾을 수 없습니다.")
+    return _job_view(job)
+
+
+@router.get("")
+async def list_ai_jobs(current_admin: Dict[str, Any] = Depends(require_admin)):
+    """Recent AI jobs (without results) and worker pool counters (Admin only)."""
+    from app.services.ai_jobs import ai_job_queue
+    return {"stats": ai_job_queue.stats(), "jobs": ai_job_queue.recent()}
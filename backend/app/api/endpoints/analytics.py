@@ -1,26 +1,8 @@
+import asyncio
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
-from app.services.analysis import get_analytics_data
-from app.services.sheets import (
-    fetch_all_records, get_beable_code_mapping, get_tier3_report_data,
-    fetch_student_status, fetch_meeting_notes, get_monthly_cico_data,
-    normalize_date_string
-)
-from app.services.normalize import (
-    normalize_behavior_log, calculate_data_quality_report
-)
-from app.services.contagion import analyze_peer_contagion
-from app.services.ai_insight import (
-    generate_bcba_comprehensive_analysis,
-    generate_bcba_section_analysis,
-    generate_bcba_cico_analysis,
-    generate_bcba_meeting_minutes,
-    generate_bcba_tier3_analysis,
-    generate_bcba_student_analysis,
-    generate_peer_contagion_analysis
-)
 from app.api.deps import require_authenticated_user, require_admin, check_student_scope, normalize_class_identifier
 
 router = APIRouter()
@@ -30,24 +12,40 @@ router = APIRouter()
 # ============================================================
 def _filter_by_date(records: list, start_date: str = None, end_date: str = None) -> list:
     """Filter records by date range. Returns all records if no dates provided."""
+    from app.services.sheets import normalize_date_string
+    from app.services.event_index import get_event_index
     if not start_date or not end_date:
         return records
 
-    sd = normalize_date_string(start_date)
-    ed = normalize_date_string(end_date)
+    index = get_event_index(records)
+    rows = index.rows_in_date_range(normalize_date_string(start_date), normalize_date_string(end_date))
+    return index.records_at(records, rows)
 
-    filtered = []
-    for r in records:
-        rd = normalize_date_string(r.get("date", r.get("행동발생날짜", r.get("발생날짜", r.get("행동발생 날짜", "")))))
-        if rd and sd <= rd <= ed:
-            filtered.append(r)
-    return filtered
 
-
-def _get_normalized_records(start_date: str = None, end_date: str = None) -> List[dict]:
-    """Fetch raw records from Google Sheets and pass through §2 Normalization Layer."""
+def _get_normalized_records(start_date: str = None, end_date: str = None,
+                            student_keys: Optional[set] = None, class_code: Optional[str] = None) -> List[dict]:
+    """
+    Fetch raw records from Google Sheets and pass through §2 Normalization Layer.
+    student_keys (student code / name values) and class_code narrow the rows through the
+    event index before normalization, same as filtering the normalized logs afterwards.
+    """
+    import numpy as np
+    from app.services.sheets import fetch_all_records, fetch_student_status, normalize_date_string
+    from app.services.event_store import normalize_logs
+    from app.services.event_index import get_event_index
     raw_records = fetch_all_records()
-    raw_filtered = _filter_by_date(raw_records, start_date, end_date)
+    index = get_event_index(raw_records)
+    rows = None
+    if start_date and end_date:
+        rows = index.rows_in_date_range(normalize_date_string(start_date), normalize_date_string(end_date))
+    if student_keys is not None:
+        by_student = index.rows_for_keys(student_keys)
+        rows = by_student if rows is None else np.intersect1d(rows, by_student, assume_unique=True)
+    if class_code:
+        from app.api.deps import get_student_class_code
+        by_class = index.rows_for_class(class_code, get_student_class_code)
+        rows = by_class if rows is None else np.intersect1d(rows, by_class, assume_unique=True)
+    raw_filtered = raw_records if rows is None else index.records_at(raw_records, rows)
 
     status_records = fetch_student_status()
     tier_info_map = {}
@@ -63,7 +61,7 @@ def _get_normalized_records(start_date: str = None, end_date: str = None) -> Lis
         if name:
             tier_info_map[name] = meta
 
-    return [normalize_behavior_log(r, tier_info_map) for r in raw_filtered]
+    return normalize_logs(raw_filtered, tier_info_map)
 
 
 # ============================================================
@@ -79,6 +77,7 @@ async def get_data_quality(
     §2 데이터 정규화 레이어 품질 진단:
     정규화 실패 건수, 필드별 오염률, 평균 기록 지연일 JSON 반환
     """
+    from app.services.normalize import calculate_data_quality_report
     normalized_logs = _get_normalized_records(start_date, end_date)
     report = calculate_data_quality_report(normalized_logs)
     return report
@@ -92,23 +91,26 @@ async def get_peer_contagion(
     start_date: str = None,
     end_date: str = None,
     with_ai: bool = False,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """
     §4 학급 또래 행동 전염 분석:
     특기사항 텍스트 기반 상호작용 네트워크 및 AI 임상 분석 보고서 반환 (교사 학급 스코프 격리)
     """
+    from app.services.sheets import fetch_student_status
+    from app.services.contagion import analyze_peer_contagion
+    from app.services.ai_insight import generate_peer_contagion_analysis
+    from app.services.llm_cache import regenerating
     role = str(current_user.get("role", "")).lower()
-    normalized_logs = _get_normalized_records(start_date, end_date)
+    user_class = None
+    if role not in ["admin", "superadmin"]:
+        user_class = normalize_class_identifier(current_user.get("class_id") or current_user.get("id"))
+    normalized_logs = _get_normalized_records(start_date, end_date, class_code=user_class)
     status_records = fetch_student_status()
 
     if role not in ["admin", "superadmin"]:
-        user_class = normalize_class_identifier(current_user.get("class_id") or current_user.get("id"))
         from app.api.deps import get_student_class_code
-        normalized_logs = [
-            l for l in normalized_logs
-            if get_student_class_code(str(l.get("student_code", "")).strip()) == user_class
-        ]
         status_records = [
             s for s in status_records
             if get_student_class_code(str(s.get("학생코드") or s.get("Code") or s.get("학번") or "").strip()) == user_class
@@ -118,7 +120,8 @@ async def get_peer_contagion(
 
     ai_analysis = ""
     if with_ai and contagion_data["edges"]:
-        ai_analysis = generate_peer_contagion_analysis(contagion_data)
+        with regenerating(regenerate):
+            ai_analysis = generate_peer_contagion_analysis(contagion_data)
 
     return {
         "network": contagion_data,
@@ -164,9 +167,14 @@ class MeetingMinutesRequest(BaseModel):
 @router.post("/ai-comprehensive-analysis")
 async def ai_comprehensive_analysis(
     req: ComprehensiveAnalysisRequest,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """① 🤖 메인 대시보드 BCBA 종합 분석 (교사 학급 스코프 격리)"""
+    from app.services.analysis import get_analytics_data
+    from app.services.normalize import calculate_data_quality_report
+    from app.services.ai_insight import generate_bcba_comprehensive_analysis
+    from app.services.llm_cache import regenerating
     role = str(current_user.get("role", "")).lower()
     user_class = None
     if role not in ["admin", "superadmin"]:
@@ -177,39 +185,43 @@ async def ai_comprehensive_analysis(
     trends = analytics_data.get("trends", [])
     risk_list = analytics_data.get("risk_list", [])
 
-    normalized_logs = _get_normalized_records(req.start_date, req.end_date)
-    if user_class:
-        from app.api.deps import get_student_class_code
-        normalized_logs = [
-            l for l in normalized_logs
-            if get_student_class_code(str(l.get("student_code", "")).strip()) == user_class
-        ]
+    normalized_logs = _get_normalized_records(req.start_date, req.end_date, class_code=user_class)
     quality_report = calculate_data_quality_report(normalized_logs)
 
-    result = generate_bcba_comprehensive_analysis(
-        summary, trends, risk_list, quality_report=quality_report
-    )
+    with regenerating(regenerate):
+        result = generate_bcba_comprehensive_analysis(
+            summary, trends, risk_list, quality_report=quality_report
+        )
     return {"analysis": result}
 
 
+@router.post("/ai-comprehensive-analysis/stream")
+async def ai_comprehensive_analysis_stream(
+    req: ComprehensiveAnalysisRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """① 스트리밍(SSE) 버전: 보고서를 생성되는 대로 전송"""
+    from app.api.sse import stream_ai_endpoint
+    return await stream_ai_endpoint(ai_comprehensive_analysis, "analysis", req=req, regenerate=regenerate, current_user=current_user)
+
+
 @router.post("/ai-section-analysis")
 async def ai_section_analysis(
     req: SectionAnalysisRequest,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """② 🤖 5대 심층 영역별(시간/장소/유형/강도/기능) AI 분석 (교사 학급 스코프 격리)"""
+    from app.services.normalize import calculate_data_quality_report
+    from app.services.ai_insight import generate_bcba_section_analysis
+    from app.services.llm_cache import regenerating
     role = str(current_user.get("role", "")).lower()
     user_class = None
     if role not in ["admin", "superadmin"]:
         user_class = normalize_class_identifier(current_user.get("class_id") or current_user.get("id"))
 
-    normalized_logs = _get_normalized_records(req.start_date, req.end_date)
-    if user_class:
-        from app.api.deps import get_student_class_code
-        normalized_logs = [
-            l for l in normalized_logs
-            if get_student_class_code(str(l.get("student_code", "")).strip()) == user_class
-        ]
+    normalized_logs = _get_normalized_records(req.start_date, req.end_date, class_code=user_class)
     quality_report = calculate_data_quality_report(normalized_logs)
 
     if isinstance(req.data_context, dict):
@@ -219,23 +231,38 @@ async def ai_section_analysis(
         chart_data = req.data_context
         top_items = req.data_context if isinstance(req.data_context, list) else []
 
-    result = generate_bcba_section_analysis(
-        req.section_name,
-        chart_data=chart_data,
-        top_items=top_items,
-        raw_summary=req.data_context,
-        quality_report=quality_report
-    )
+    with regenerating(regenerate):
+        result = generate_bcba_section_analysis(
+            req.section_name,
+            chart_data=chart_data,
+            top_items=top_items,
+            raw_summary=req.data_context,
+            quality_report=quality_report
+        )
     return {"analysis": result}
 
 
+@router.post("/ai-section-analysis/stream")
+async def ai_section_analysis_stream(
+    req: SectionAnalysisRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """② 스트리밍(SSE) 버전: 보고서를 생성되는 대로 전송"""
+    from app.api.sse import stream_ai_endpoint
+    return await stream_ai_endpoint(ai_section_analysis, "analysis", req=req, regenerate=regenerate, current_user=current_user)
+
+
 @router.post("/ai-cico-analysis")
 async def ai_cico_analysis(
     req: CICOAnalysisRequest,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """③ 🤖 CICO AI 성과 분석 및 Tier 조정 의사결정 (교사 학급 스코프 격리)"""
-    from app.services.sheets import get_cico_report_data
+    from app.services.ai_insight import generate_bcba_cico_analysis
+    from app.services.llm_cache import regenerating
+    from app.services.sheets import get_cico_report_data, fetch_student_status
     role = str(current_user.get("role", "")).lower()
     user_class = None
     if role not in ["admin", "superadmin"]:
@@ -256,13 +283,7 @@ async def ai_cico_analysis(
             if get_student_class_code(str(s.get("code") or s.get("student_code") or s.get("학생코드") or "").strip()) == user_class
         ]
 
-    normalized_logs = _get_normalized_records()
-    if user_class:
-        from app.api.deps import get_student_class_code
-        normalized_logs = [
-            l for l in normalized_logs
-            if get_student_class_code(str(l.get("student_code", "")).strip()) == user_class
-        ]
+    normalized_logs = _get_normalized_records(class_code=user_class)
 
     status_records = fetch_student_status()
     if user_class:
@@ -272,21 +293,37 @@ async def ai_cico_analysis(
             if get_student_class_code(str(s.get("학생코드") or s.get("Code") or s.get("학번") or "").strip()) == user_class
         ]
 
-    result = generate_bcba_cico_analysis(
-        students_data=students,
-        behavior_logs=normalized_logs[:100],
-        tier_info=status_records,
-        selected_month=req.month
-    )
+    with regenerating(regenerate):
+        result = generate_bcba_cico_analysis(
+            students_data=students,
+            behavior_logs=normalized_logs[:100],
+            tier_info=status_records,
+            selected_month=req.month
+        )
     return {"analysis": result}
 
 
+@router.post("/ai-cico-analysis/stream")
+async def ai_cico_analysis_stream(
+    req: CICOAnalysisRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """③ 스트리밍(SSE) 버전: 보고서를 생성되는 대로 전송"""
+    from app.api.sse import stream_ai_endpoint
+    return await stream_ai_endpoint(ai_cico_analysis, "analysis", req=req, regenerate=regenerate, current_user=current_user)
+
+
 @router.post("/ai-meeting-minutes")
 async def ai_meeting_minutes(
     req: MeetingMinutesRequest,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """④ 🤖 SST 행동중재협의회 공문서 규격 AI 회의록 자동 생성 (교사 학급 스코프 격리)"""
+    from app.services.analysis import get_analytics_data
+    from app.services.ai_insight import generate_bcba_meeting_minutes
+    from app.services.llm_cache import regenerating
     role = str(current_user.get("role", "")).lower()
     user_class = None
     if role not in ["admin", "superadmin"]:
@@ -303,20 +340,47 @@ async def ai_meeting_minutes(
         "total_incidents": analytics.get("summary", {}).get("total_incidents", 0)
     }
 
-    result = generate_bcba_meeting_minutes(
-        meeting_data=meeting_data,
-        risk_students=risk_list[:5],
-        recent_trends=analytics.get("trends", [])
-    )
+    with regenerating(regenerate):
+        result = generate_bcba_meeting_minutes(
+            meeting_data=meeting_data,
+            risk_students=risk_list[:5],
+            recent_trends=analytics.get("trends", [])
+        )
     return {"analysis": result}
 
 
+@router.post("/ai-meeting-minutes/stream")
+async def ai_meeting_minutes_stream(
+    req: MeetingMinutesRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """④ 스트리밍(SSE) 버전: 보고서를 생성되는 대로 전송"""
+    from app.api.sse import stream_ai_endpoint
+    return await stream_ai_endpoint(ai_meeting_minutes, "analysis", req=req, regenerate=regenerate, current_user=current_user)
+
+
+@router.post("/ai-meeting-minutes/jobs", status_code=202)
+async def ai_meeting_minutes_job(
+    req: MeetingMinutesRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """④ 백그라운드 작업 버전: job id를 즉시 반환하고 GET /api/v1/ai-jobs/{job_id}로 결과 조회"""
+    from app.api.endpoints.ai_jobs import submit_ai_job
+    return await submit_ai_job(ai_meeting_minutes, "meeting-minutes", "analysis", req=req, regenerate=regenerate, current_user=current_user)
+
+
 @router.post("/ai-tier3-analysis")
 async def ai_tier3_analysis(
     req: Tier3AnalysisRequest,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """⑤ 🤖 Tier 3 심층 위기관리 AI 컨설팅 (교사 학급 스코프 격리)"""
+    from app.services.sheets import get_tier3_report_data
+    from app.services.ai_insight import generate_bcba_tier3_analysis
+    from app.services.llm_cache import regenerating
     role = str(current_user.get("role", "")).lower()
     user_class = None
     if role not in ["admin", "superadmin"]:
@@ -326,35 +390,52 @@ async def ai_tier3_analysis(
     if "error" in t3_data:
         return {"analysis": f"데이터 로드 실패: {t3_data['error']}"}
 
-    normalized_logs = _get_normalized_records(req.start_date, req.end_date)
-    if user_class:
-        from app.api.deps import get_student_class_code
-        normalized_logs = [
-            l for l in normalized_logs
-            if get_student_class_code(str(l.get("student_code", "")).strip()) == user_class
-        ]
-
     t3_students = t3_data.get("students", [])
     t3_codes = {str(s.get("code", "")).strip() for s in t3_students}
 
-    t3_logs = [
-        l for l in normalized_logs
-        if l.get("student_code") in t3_codes or l.get("student_name") in t3_codes
-    ]
+    t3_logs = _get_normalized_records(req.start_date, req.end_date, student_keys=t3_codes, class_code=user_class)
 
-    result = generate_bcba_tier3_analysis(
-        tier3_students=t3_students,
-        behavior_logs=t3_logs
-    )
+    with regenerating(regenerate):
+        result = generate_bcba_tier3_analysis(
+            tier3_students=t3_students,
+            behavior_logs=t3_logs
+        )
     return {"analysis": result}
 
 
+@router.post("/ai-tier3-analysis/stream")
+async def ai_tier3_analysis_stream(
+    req: Tier3AnalysisRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """⑤ 스트리밍(SSE) 버전: 보고서를 생성되는 대로 전송"""
+    from app.api.sse import stream_ai_endpoint
+    return await stream_ai_endpoint(ai_tier3_analysis, "analysis", req=req, regenerate=regenerate, current_user=current_user)
+
+
+@router.post("/ai-tier3-analysis/jobs", status_code=202)
+async def ai_tier3_analysis_job(
+    req: Tier3AnalysisRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """⑤ 백그라운드 작업 버전: job id를 즉시 반환하고 GET /api/v1/ai-jobs/{job_id}로 결과 조회"""
+    from app.api.endpoints.ai_jobs import submit_ai_job
+    return await submit_ai_job(ai_tier3_analysis, "tier3-analysis", "analysis", req=req, regenerate=regenerate, current_user=current_user)
+
+
 @router.post("/ai-student-analysis")
 async def ai_student_analysis(
     req: StudentAnalysisRequest,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """⑥ 🤖 개별 학생 A-B-C 기능평가 기반 AI 종합 진단 (학생 Scope 검증)"""
+    from app.services.sheets import get_beable_code_mapping, fetch_student_status
+    from app.services.event_index import get_beable_code
+    from app.services.ai_insight import generate_bcba_student_analysis
+    from app.services.llm_cache import regenerating
     beable_mapping = get_beable_code_mapping()
     target_code = str(req.student_code or "").strip()
 
@@ -369,11 +450,7 @@ async def ai_student_analysis(
     if target_code:
         check_student_scope(target_code, current_user)
 
-    beable_code = ""
-    for bc, info in beable_mapping.items():
-        if str(info.get('student_code', '')).strip() == target_code:
-            beable_code = bc
-            break
+    beable_code = get_beable_code(target_code)
 
     codes_to_match = {target_code}
     if beable_code:
@@ -381,11 +458,7 @@ async def ai_student_analysis(
     if req.student_name:
         codes_to_match.add(str(req.student_name).strip())
 
-    normalized_logs = _get_normalized_records(req.start_date, req.end_date)
-    student_logs = [
-        l for l in normalized_logs
-        if l.get("student_code") in codes_to_match or l.get("student_name") in codes_to_match
-    ]
+    student_logs = _get_normalized_records(req.start_date, req.end_date, student_keys=codes_to_match)
 
     status_records = fetch_student_status()
     student_info = {}
@@ -403,23 +476,38 @@ async def ai_student_analysis(
 
     all_notes = [{"date": l.get("date"), "content": l.get("notes")} for l in student_logs if l.get("notes")]
 
-    result = generate_bcba_student_analysis(
-        student_info=student_info,
-        student_logs=student_logs,
-        all_notes=all_notes
-    )
+    with regenerating(regenerate):
+        result = generate_bcba_student_analysis(
+            student_info=student_info,
+            student_logs=student_logs,
+            all_notes=all_notes
+        )
     return {"analysis": result}
 
 
+@router.post("/ai-student-analysis/stream")
+async def ai_student_analysis_stream(
+    req: StudentAnalysisRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """⑥ 스트리밍(SSE) 버전: 보고서를 생성되는 대로 전송"""
+    from app.api.sse import stream_ai_endpoint
+    return await stream_ai_endpoint(ai_student_analysis, "analysis", req=req, regenerate=regenerate, current_user=current_user)
+
+
 @router.get("/debug-sheets")
 async def debug_sheets(current_admin: Dict[str, Any] = Depends(require_admin)):
     """Debug endpoint to inspect sheets connectivity (Admin only)."""
     from app.core.config import settings
-    from app.services.sheets import get_sheets_client, safe_get_all_records
+    from app.services.sheets import get_sheets_client, get_spreadsheet, safe_get_all_records
+    from app.adapters.sheets.client import get_cache_stats
     client = get_sheets_client()
     if not client:
         return {"error": "Failed to connect to Google Spreadsheet"}
-    spreadsheet = client.open_by_url(settings.SHEET_URL)
+    spreadsheet = get_spreadsheet()
+    # Debug view should reflect the live sheet list, not the cached index
+    spreadsheet.invalidate()
     worksheets_info = []
     for ws in spreadsheet.worksheets():
         try:
@@ -435,7 +523,32 @@ async def debug_sheets(current_admin: Dict[str, Any] = Depends(require_admin)):
                 "title": ws.title,
                 "error": str(e)
             })
-    return {"sheets": worksheets_info}
+    from app.adapters.sheets.write_queue import sheet_write_queue
+    from app.adapters.sheets.governor import sheets_governor
+    return {"sheets": worksheets_info, "cache": get_cache_stats(), "write_queue": sheet_write_queue.stats(),
+            "governor": sheets_governor.stats()}
+
+
+@router.get("/write-queue")
+async def get_write_queue_stats(current_admin: Dict[str, Any] = Depends(require_admin)):
+    """Pending sheet writes and flush/retry counters (Admin only)."""
+    from app.adapters.sheets.write_queue import sheet_write_queue
+    return sheet_write_queue.stats()
+
+
+@router.get("/sheets-governor")
+async def get_sheets_governor_stats(current_admin: Dict[str, Any] = Depends(require_admin)):
+    """Sheets API read/write budgets plus call, throttle and retry counters (Admin only)."""
+    from app.adapters.sheets.governor import sheets_governor
+    return sheets_governor.stats()
+
+
+@router.post("/write-queue/flush")
+def flush_write_queue(current_admin: Dict[str, Any] = Depends(require_admin)):
+    """Send every pending sheet write now (Admin only). Runs in the threadpool; flushing blocks."""
+    from app.adapters.sheets.write_queue import sheet_write_queue
+    result = sheet_write_queue.flush()
+    return {**sheet_write_queue.stats(), "flush_errors": result["errors"]}
 
 @router.get("/dashboard")
 async def get_dashboard_summary(
@@ -444,11 +557,17 @@ async def get_dashboard_summary(
     class_id: str = None,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
+    from app.services.analysis import get_analytics_data
     role = str(current_user.get("role", "")).lower()
     if role not in ["admin", "superadmin"]:
         user_class = normalize_class_identifier(current_user.get("class_id") or current_user.get("id"))
         class_id = user_class
-    return get_analytics_data(start_date, end_date, class_id)
+    # Log_Main and TierStatus are read in one batchGet without blocking the event loop;
+    # the aggregation itself then runs on warm caches in a worker thread
+    from app.services.sheets import aprefetch_log_and_tier_status, afetch_student_status
+    await aprefetch_log_and_tier_status()
+    await afetch_student_status()
+    return await asyncio.to_thread(get_analytics_data, start_date, end_date, class_id)
 
 @router.get("/meeting")
 async def get_meeting_analysis(
@@ -477,6 +596,7 @@ async def get_tier3_report(
     class_id: str = None,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
+    from app.services.sheets import get_tier3_report_data
     import traceback
     try:
         role = str(current_user.get("role", "")).lower()
@@ -537,6 +657,13 @@ async def debug_ai_keys(current_admin: Dict[str, Any] = Depends(require_admin)):
     else:
         results["local_llm"] = {"status": "ℹ️ LOCAL_LLM_URL 미설정 (클라우드 모드)"}
 
+    from app.services.llm_providers import local_llm_registry
+    results["local_llm_registry"] = local_llm_registry.stats()
+    from app.services.llm_cache import llm_result_cache
+    results["llm_result_cache"] = llm_result_cache.stats()
+    from app.services.llm_hedge import hedge_stats
+    results["llm_hedge"] = hedge_stats.as_dict()
+
     if gemini_key:
         try:
             url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent?key={gemini_key}"
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, HTTPException, Response, Depends, status
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
-from app.services.sheets import get_user_by_id, update_user_password, update_user_password_cas, get_all_users
 from app.core.security import (
     verify_password_compat, create_access_token, set_session_cookie,
     delete_session_cookie, hash_password
@@ -20,6 +19,7 @@ class PasswordUpdateRequest(BaseModel):
 
 @router.post("/login")
 async def login(request: LoginRequest, response: Response):
+    from app.services.sheets import get_user_by_id, update_user_password_cas
     user = get_user_by_id(request.user_id) if request.user_id else None
 
     stored_pw = str(user.get("Password", "")) if user else ""
@@ -73,6 +73,7 @@ async def login(request: LoginRequest, response: Response):
 @router.get("/me")
 async def get_current_user_profile(current_user: Dict[str, Any] = Depends(require_authenticated_user)):
     """Returns the authenticated user's profile resolved from backend store using validated session."""
+    from app.services.sheets import get_user_by_id
     user_id = current_user.get("sub", "")
     user = get_user_by_id(user_id) if user_id else None
     name = user.get("Name", "") if user else ""
@@ -96,12 +97,14 @@ from app.api.deps import require_authenticated_user, require_admin
 @router.get("/users")
 async def list_users(current_admin: Dict[str, Any] = Depends(require_admin)):
     """Admin only: Get all users (without passwords)"""
+    from app.services.sheets import get_all_users
     users = get_all_users()
     return users
 
 @router.put("/users/{user_id}/password")
 async def change_password(user_id: str, request: PasswordUpdateRequest, current_admin: Dict[str, Any] = Depends(require_admin)):
     """Admin only: Update password for a user"""
+    from app.services.sheets import update_user_password
     result = update_user_password(user_id, request.new_password)
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
@@ -1,6 +1,6 @@
+import asyncio
 from fastapi import APIRouter, HTTPException, Query, Body, Depends
 from typing import Optional, List, Dict, Any
-from app.services.sheets import fetch_all_records, get_sheets_client, safe_get_all_records
 from app.core.config import settings
 from app.api.deps import require_authenticated_user, require_admin, check_student_scope
 import uuid
@@ -17,12 +17,17 @@ async def submit_behavior_log(
     Submit a new behavior log from Vercel Frontend.
     Handles 'Intensity' branching and auto-forwards to Google Sheets with student scope validation.
     """
+    import gspread
+    from app.adapters.sheets.async_client import get_async_sheets_client
+    from app.adapters.sheets.tier_status import TierStatusAdapter
     student_identifier = str(payload.get("학생코드") or payload.get("학생명") or "").strip()
     if student_identifier:
+        # Roster read without blocking the loop; the scope check then runs on the warm cache
+        await TierStatusAdapter.afetch_raw_records()
         check_student_scope(student_identifier, current_user)
 
     from app.services.sheets import get_main_worksheet, clear_cache
-    log_main_ws = get_main_worksheet()
+    log_main_ws = await asyncio.to_thread(get_main_worksheet)
     if not log_main_ws:
         raise HTTPException(status_code=500, detail="Cannot access Google Sheets behavior worksheet")
     
@@ -72,8 +77,13 @@ async def submit_behavior_log(
         for h in headers:
             row_data.append(str(payload.get(h, "")))
             
-        log_main_ws.append_row(row_data, table_range='A1')
-        clear_cache("records")
+        aclient = get_async_sheets_client()
+        if aclient is not None:
+            # Same request as append_row(table_range='A1'), sent over the pooled async client
+            await aclient.values_append(gspread.utils.absolute_range_name(log_main_ws.title, "A1"), [row_data])
+        else:
+            await asyncio.to_thread(log_main_ws.append_row, row_data, table_range='A1')
+        clear_cache("records:append")
             
         return {"success": True, "message": "Log submitted", "log_id": log_id, "status": status}
     except Exception as e:
@@ -87,6 +97,7 @@ async def approve_behavior_log(
     """
     Approve a pending behavior log (Admin only).
     """
+    from app.services.sheets import get_sheets_client, get_spreadsheet
     log_id = payload.get("log_id")
     admin_id = current_admin.get("id") or current_admin.get("name") or "Admin"
     
@@ -98,7 +109,7 @@ async def approve_behavior_log(
         raise HTTPException(status_code=500, detail="Cannot access Google Sheets")
         
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         log_main_ws = sheet.worksheet("Log_Main")
         
         all_vals = log_main_ws.get_all_values()
@@ -141,6 +152,7 @@ async def revise_behavior_log(
     """
     Request revision for a pending behavior log (Admin only).
     """
+    from app.services.sheets import get_sheets_client, get_spreadsheet
     log_id = payload.get("log_id")
     admin_id = current_admin.get("id") or current_admin.get("name") or "Admin"
     memo = payload.get("memo", "")
@@ -153,7 +165,7 @@ async def revise_behavior_log(
         raise HTTPException(status_code=500, detail="Cannot access Google Sheets")
         
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         log_main_ws = sheet.worksheet("Log_Main")
         
         all_vals = log_main_ws.get_all_values()
@@ -196,6 +208,7 @@ async def get_student_timeline(
     """
     Fetch merged timeline of behaviors for a student with scope check.
     """
+    from app.services.sheets import fetch_all_records
     check_student_scope(student_id, current_user)
     records = fetch_all_records(force_refresh=False)
     student_logs = []
@@ -211,6 +224,7 @@ async def get_pending_logs(current_admin: Dict[str, Any] = Depends(require_admin
     """
     Fetch all pending logs requiring admin approval (Admin only).
     """
+    from app.services.sheets import fetch_all_records
     records = fetch_all_records(force_refresh=False)
     pending_logs = [r for r in records if r.get("Status") == "Pending"]
         
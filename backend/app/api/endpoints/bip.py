@@ -1,13 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
-from app.services.normalize import normalize_behavior_log
-from app.services.ai_insight import (
-    generate_bip_hypothesis,
-    generate_bip_strategies,
-    generate_full_bip,
-    generate_data_based_decision_recommendation
-)
 from app.api.deps import require_authenticated_user, check_student_scope
 
 router = APIRouter()
@@ -34,25 +27,17 @@ class BIPData(BaseModel):
     CrisisEBP: Optional[str] = ""
 
 def _resolve_beable_code(student_code: str) -> str:
-    from app.services.sheets import get_beable_code_mapping
-    mapping = get_beable_code_mapping()
-    for bc, info in mapping.items():
-        if str(info.get('student_code', '')).strip() == student_code.strip():
-            return bc
-    return student_code
+    from app.services.event_index import get_beable_code
+    return get_beable_code(student_code.strip()) or student_code
 
 def _filter_student_logs(records: list, student_code: str, beable_code: str = "") -> list:
+    from app.services.event_index import get_event_index
     codes = {student_code.strip()}
     if beable_code:
         codes.add(beable_code.strip())
-    
-    filtered = []
-    for r in records:
-        sc = str(r.get("student_code", r.get("학생코드", r.get("코드번호", "")))).strip()
-        name = str(r.get("student_name", r.get("학생명", ""))).strip()
-        if sc in codes or name in codes:
-            filtered.append(r)
-    return filtered
+
+    index = get_event_index(records)
+    return index.records_at(records, index.rows_for_keys(codes))
 
 
 @router.get("/students/{student_code}/bip")
@@ -94,9 +79,13 @@ async def save_student_bip(
 @router.post("/students/{student_code}/ai-hypothesis")
 async def ai_bip_hypothesis(
     student_code: str,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """⑦ 🤖 AI 기능적 가설 생성 (BIP Step 4)"""
+    from app.services.event_store import normalize_logs
+    from app.services.ai_insight import generate_bip_hypothesis
+    from app.services.llm_cache import regenerating
     check_student_scope(student_code, current_user)
     from app.services.sheets import fetch_all_records, fetch_student_status
     
@@ -116,7 +105,7 @@ async def ai_bip_hypothesis(
             }
             break
             
-    norm_logs = [normalize_behavior_log(r, {student_code: student_info}) for r in raw_logs]
+    norm_logs = normalize_logs(raw_logs, {student_code: student_info})
     
     target_behaviors = list(dict.fromkeys([l["behavior_type"] for l in norm_logs]))
     tb_str = ", ".join(target_behaviors) if target_behaviors else "수업 방해 및 과제 불응"
@@ -130,17 +119,29 @@ async def ai_bip_hypothesis(
     notes_list = [l["notes"] for l in norm_logs if l.get("notes")]
     notes_summary = " / ".join(notes_list[:5])
     
-    result = generate_bip_hypothesis(
-        student_info=student_info,
-        target_behavior=tb_str,
-        antecedent_data=ant_str,
-        function_data=func_str,
-        notes_summary=notes_summary,
-        sample_size=len(norm_logs)
-    )
+    with regenerating(regenerate):
+        result = generate_bip_hypothesis(
+            student_info=student_info,
+            target_behavior=tb_str,
+            antecedent_data=ant_str,
+            function_data=func_str,
+            notes_summary=notes_summary,
+            sample_size=len(norm_logs)
+        )
     return {"hypothesis": result}
 
 
+@router.post("/students/{student_code}/ai-hypothesis/stream")
+async def ai_bip_hypothesis_stream(
+    student_code: str,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """⑦ 스트리밍(SSE) 버전: 보고서를 생성되는 대로 전송"""
+    from app.api.sse import stream_ai_endpoint
+    return await stream_ai_endpoint(ai_bip_hypothesis, "hypothesis", student_code=student_code, regenerate=regenerate, current_user=current_user)
+
+
 class AIStrategiesRequest(BaseModel):
     target_behavior: str = ""
     hypothesis: str = ""
@@ -150,9 +151,12 @@ class AIStrategiesRequest(BaseModel):
 async def ai_bip_strategies(
     student_code: str,
     req: AIStrategiesRequest,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """⑧ 🤖 AI 3단계 중재 전략 제안 (BIP Step 6)"""
+    from app.services.ai_insight import generate_bip_strategies
+    from app.services.llm_cache import regenerating
     check_student_scope(student_code, current_user)
     from app.services.sheets import fetch_student_status
     
@@ -168,15 +172,28 @@ async def ai_bip_strategies(
             }
             break
             
-    result = generate_bip_strategies(
-        student_info=student_info,
-        target_behavior=req.target_behavior or "표적행동",
-        hypothesis_data=req.hypothesis or "가설 데이터",
-        function_data=req.goals or "추정 기능"
-    )
+    with regenerating(regenerate):
+        result = generate_bip_strategies(
+            student_info=student_info,
+            target_behavior=req.target_behavior or "표적행동",
+            hypothesis_data=req.hypothesis or "가설 데이터",
+            function_data=req.goals or "추정 기능"
+        )
     return {"strategies": result}
 
 
+@router.post("/students/{student_code}/ai-strategies/stream")
+async def ai_bip_strategies_stream(
+    student_code: str,
+    req: AIStrategiesRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """⑧ 스트리밍(SSE) 버전: 보고서를 생성되는 대로 전송"""
+    from app.api.sse import stream_ai_endpoint
+    return await stream_ai_endpoint(ai_bip_strategies, "strategies", student_code=student_code, req=req, regenerate=regenerate, current_user=current_user)
+
+
 class AIBIPFullRequest(BaseModel):
     start_date: Optional[str] = None
     end_date: Optional[str] = None
@@ -188,9 +205,13 @@ class AIBIPFullRequest(BaseModel):
 async def ai_bip_full(
     student_code: str,
     req: AIBIPFullRequest,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """⑨ 🤖 AI BIP 전체 계획서 제안 (BIP Step 12)"""
+    from app.services.event_store import normalize_logs
+    from app.services.ai_insight import generate_full_bip
+    from app.services.llm_cache import regenerating
     check_student_scope(student_code, current_user)
     from app.services.sheets import fetch_all_records, fetch_student_status, normalize_date_string
     
@@ -215,7 +236,7 @@ async def ai_bip_full(
             }
             break
             
-    norm_logs = [normalize_behavior_log(r, {student_code: student_info}) for r in raw_logs]
+    norm_logs = normalize_logs(raw_logs, {student_code: student_info})
     
     if not norm_logs:
         return {"analysis": "INSUFFICIENT_DATA: 행동 관찰 기록이 부족하여 기능적 가설 및 BIP를 자동 생성할 수 없습니다. 직접 관찰 기록을 먼저 수집해 주세요."}
@@ -227,18 +248,43 @@ async def ai_bip_full(
     func_list = list(dict.fromkeys([','.join(l['function_labels']) for l in norm_logs if l['function_labels']]))
     hypothesis_data = f"관찰된 추정 기능: {', '.join(func_list)}" if func_list else "기능 미상 (추가 FBA 직접 관찰 필요)"
         
-    result = generate_full_bip(
-        student_info=student_info,
-        target_behavior=target_behavior,
-        hypothesis_data=hypothesis_data,
-        strategies_data=f"건강/복약 관찰: {req.medication_status}, 선호강화제: {req.reinforcer_info}, 기타: {req.other_considerations}",
-        school_crisis_protocol="경은학교 위기관리 4단계 프로토콜 (전조-고조-위기-회복 및 최소제한원칙 준수)",
-        behavior_logs=norm_logs
-    )
+    with regenerating(regenerate):
+        result = generate_full_bip(
+            student_info=student_info,
+            target_behavior=target_behavior,
+            hypothesis_data=hypothesis_data,
+            strategies_data=f"건강/복약 관찰: {req.medication_status}, 선호강화제: {req.reinforcer_info}, 기타: {req.other_considerations}",
+            school_crisis_protocol="경은학교 위기관리 4단계 프로토콜 (전조-고조-위기-회복 및 최소제한원칙 준수)",
+            behavior_logs=norm_logs
+        )
 
     return {"analysis": result}
 
 
+@router.post("/students/{student_code}/ai-bip-full/stream")
+async def ai_bip_full_stream(
+    student_code: str,
+    req: AIBIPFullRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """⑨ 스트리밍(SSE) 버전: 보고서를 생성되는 대로 전송"""
+    from app.api.sse import stream_ai_endpoint
+    return await stream_ai_endpoint(ai_bip_full, "analysis", student_code=student_code, req=req, regenerate=regenerate, current_user=current_user)
+
+
+@router.post("/students/{student_code}/ai-bip-full/jobs", status_code=202)
+async def ai_bip_full_job(
+    student_code: str,
+    req: AIBIPFullRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """⑨ 백그라운드 작업 버전: job id를 즉시 반환하고 GET /api/v1/ai-jobs/{job_id}로 결과 조회"""
+    from app.api.endpoints.ai_jobs import submit_ai_job
+    return await submit_ai_job(ai_bip_full, "bip-full", "analysis", student_code=student_code, req=req, regenerate=regenerate, current_user=current_user)
+
+
 class AIDecisionRecommendationRequest(BaseModel):
     start_date: Optional[str] = None
     end_date: Optional[str] = None
@@ -247,9 +293,13 @@ class AIDecisionRecommendationRequest(BaseModel):
 async def ai_decision_recommendation(
     student_code: str,
     req: AIDecisionRecommendationRequest,
+    regenerate: bool = False,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """⑩ 🤖 데이터기반 의사결정(DBDM) 제안 — 기간 데이터 + 현재 BIP + EBP 실행충실도 + 팀 협의 기록 종합"""
+    from app.services.event_store import normalize_logs
+    from app.services.ai_insight import generate_data_based_decision_recommendation
+    from app.services.llm_cache import regenerating
     check_student_scope(student_code, current_user)
     from app.services.sheets import fetch_all_records, fetch_student_status, fetch_meeting_notes, get_bip, normalize_date_string
 
@@ -274,7 +324,7 @@ async def ai_decision_recommendation(
             }
             break
 
-    norm_logs = [normalize_behavior_log(r, {student_code: student_info}) for r in raw_logs]
+    norm_logs = normalize_logs(raw_logs, {student_code: student_info})
     tb_list = list(dict.fromkeys([l["behavior_type"] for l in norm_logs]))
     avg_int = round(sum(l['intensity'] for l in norm_logs)/len(norm_logs), 1) if norm_logs else 0
     period_data = (
@@ -295,11 +345,24 @@ async def ai_decision_recommendation(
     notes = fetch_meeting_notes("fba_bip_team", student_code)
     team_notes_str = "\n".join(f"[{n.get('date','')}] {n.get('content','')}" for n in notes)
 
-    result = generate_data_based_decision_recommendation(
-        student_info=student_info,
-        period_data=period_data,
-        current_bip=current_bip_str,
-        ebp_selections=ebp_str,
-        team_notes=team_notes_str
-    )
+    with regenerating(regenerate):
+        result = generate_data_based_decision_recommendation(
+            student_info=student_info,
+            period_data=period_data,
+            current_bip=current_bip_str,
+            ebp_selections=ebp_str,
+            team_notes=team_notes_str
+        )
     return {"analysis": result}
+
+
+@router.post("/students/{student_code}/ai-decision-recommendation/stream")
+async def ai_decision_recommendation_stream(
+    student_code: str,
+    req: AIDecisionRecommendationRequest,
+    regenerate: bool = False,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """⑩ 스트리밍(SSE) 버전: 보고서를 생성되는 대로 전송"""
+    from app.api.sse import stream_ai_endpoint
+    return await stream_ai_endpoint(ai_decision_recommendation, "analysis", student_code=student_code, req=req, regenerate=regenerate, current_user=current_user)
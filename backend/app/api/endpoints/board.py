@@ -1,7 +1,6 @@
 from fastapi import APIRouter, HTTPException, Body, Depends
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-from app.services.sheets import fetch_board_posts, add_board_post, delete_board_post, update_board_post
 from app.api.deps import require_authenticated_user
 
 router = APIRouter()
@@ -25,6 +24,7 @@ class PostResponse(BaseModel):
 
 @router.get("/", response_model=List[dict])
 async def get_posts(current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.sheets import fetch_board_posts
     posts = fetch_board_posts()
     return posts
 
@@ -33,6 +33,7 @@ async def create_post(
     post: PostCreate,
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
+    from app.services.sheets import add_board_post
     author = post.author or current_user.get("name") or current_user.get("id")
     result = add_board_post(post.title, post.content, author)
     if "error" in result:
@@ -45,6 +46,7 @@ async def delete_post(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Delete a board post with verified server session ownership check"""
+    from app.services.sheets import fetch_board_posts, delete_board_post
     posts = fetch_board_posts()
     post = next((p for p in posts if p.get("id") == post_id), None)
     
@@ -72,6 +74,7 @@ async def update_existing_post(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Update a board post with verified server session ownership check"""
+    from app.services.sheets import fetch_board_posts, update_board_post
     posts = fetch_board_posts()
     post = next((p for p in posts if p.get("id") == post_id), None)
     
@@ -1,16 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
-from app.services.sheets import (
-    get_monthly_cico_data,
-    update_monthly_cico_cells,
-    update_student_cico_settings,
-    toggle_tier2_status,
-    get_holidays_from_config,
-    get_business_days,
-    get_cico_report_data,
-    create_monthly_cico_sheet
-)
 from app.api.deps import require_authenticated_user, require_admin, check_student_scope, normalize_class_identifier, get_student_class_code
 
 router = APIRouter()
@@ -22,6 +12,7 @@ class GenerateSheetRequest(BaseModel):
 @router.post("/generate")
 async def generate_cico_sheet(req: GenerateSheetRequest, current_admin: Dict[str, Any] = Depends(require_admin)):
     """Generate a monthly CICO sheet with dropdowns for students marked as Tier2(CICO) - Admin only."""
+    from app.services.sheets import create_monthly_cico_sheet
     if req.month < 1 or req.month > 12:
         raise HTTPException(status_code=400, detail="Month must be 1-12")
 
@@ -38,6 +29,7 @@ async def get_cico_business_days(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Get business days (weekdays excluding holidays) for a given month."""
+    from app.services.sheets import get_holidays_from_config, get_business_days
     if month < 1 or month > 12:
         raise HTTPException(status_code=400, detail="Month must be 1-12")
     holidays = get_holidays_from_config()
@@ -51,6 +43,7 @@ async def get_cico_report(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Get T2 CICO report data for decision making."""
+    from app.services.sheets import get_cico_report_data
     if month < 1 or month > 12:
         raise HTTPException(status_code=400, detail="Month must be 1-12")
     data = get_cico_report_data(month)
@@ -89,6 +82,7 @@ async def get_cico_monthly(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Get Tier2 student data for a monthly sheet (scoped by teacher class or admin)."""
+    from app.services.sheets import get_monthly_cico_data
     if month < 1 or month > 12:
         raise HTTPException(status_code=400, detail="Month must be 1-12")
 
@@ -128,6 +122,7 @@ async def update_cico_cells(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Batch update daily cell values in a monthly sheet (scoped by student/class authorization)."""
+    from app.services.sheets import get_monthly_cico_data, update_monthly_cico_cells
     if req.month < 1 or req.month > 12:
         raise HTTPException(status_code=400, detail="Month must be 1-12")
 
@@ -169,6 +164,7 @@ async def update_settings(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Update CICO settings for a student (scoped to assigned class)."""
+    from app.services.sheets import update_student_cico_settings
     check_student_scope(req.student_code, current_user)
     result = update_student_cico_settings(req.month, req.student_code, req.settings, req.row_index)
     if "error" in result:
@@ -188,6 +184,7 @@ async def tier2_toggle(
     current_admin: Dict[str, Any] = Depends(require_admin)
 ):
     """Toggle Tier2 status for a student in a monthly sheet (Admin only)."""
+    from app.services.sheets import toggle_tier2_status
     if req.status not in ("O", "X"):
         raise HTTPException(status_code=400, detail="Status must be 'O' or 'X'")
 
@@ -125,6 +125,35 @@ async def award(
     return result
 
 
+class BulkAwardTokenRequest(BaseModel):
+    category: str
+    delta: int = 1
+    student_codes: Optional[List[str]] = None  # None = every student of the class
+
+
+@router.post("/{class_id}/tokens/award-bulk")
+async def award_bulk(
+    class_id: str,
+    req: BulkAwardTokenRequest,
+    current_user: Dict[str, Any] = Depends(require_authenticated_user)
+):
+    """학급 단위 일괄 지급: 학생 수와 관계없이 TokenBoard 1회 + TokenLog 1회 쓰기"""
+    clean = _check_class_scope(class_id, current_user)
+    from app.services.token_ledger import award_tokens
+    codes = req.student_codes
+    if codes is None:
+        from app.services.sheets import fetch_student_status
+        codes = [
+            str(s.get("학생코드", "")).strip() for s in fetch_student_status()
+            if str(s.get("학생코드", "")).strip() and normalize_class_identifier(s.get("학급", "")) == clean
+        ]
+    author = current_user.get("name") or current_user.get("id") or ""
+    result = award_tokens(clean, [{"student_code": c, "category": req.category, "delta": req.delta} for c in codes], author)
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    return {"class_id": clean, "results": result["results"]}
+
+
 @router.get("/{class_id}/tokens/log")
 async def get_tokens_log(
     class_id: str,
@@ -3,7 +3,6 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from app.services.sheets import add_meeting_note, fetch_meeting_notes, update_meeting_note, delete_meeting_note
 from app.api.deps import require_authenticated_user, check_student_scope, normalize_class_identifier, get_student_class_code
 
 router = APIRouter()
@@ -38,6 +37,7 @@ async def save_meeting_note(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Save a meeting note with student scope check if student_code is present"""
+    from app.services.sheets import add_meeting_note
     if request.student_code:
         check_student_scope(request.student_code, current_user)
 
@@ -66,6 +66,7 @@ async def get_meeting_notes(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Get meeting notes, optionally filtered by type and student_code with class isolation"""
+    from app.services.sheets import fetch_meeting_notes
     if student_code:
         check_student_scope(student_code, current_user)
     notes = fetch_meeting_notes(meeting_type, student_code)
@@ -86,6 +87,7 @@ async def get_meeting_notes(
 @router.get("/latest")
 async def get_latest_notes(current_user: Dict[str, Any] = Depends(require_authenticated_user)):
     """Get the latest note for each meeting type (scoped by teacher class or school-wide for admin)"""
+    from app.services.sheets import fetch_meeting_notes
     all_notes = fetch_meeting_notes()
     role = str(current_user.get("role", "")).lower()
 
@@ -111,6 +113,7 @@ async def update_note(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Update a meeting note with verified server session ownership and class scope check"""
+    from app.services.sheets import fetch_meeting_notes, update_meeting_note
     all_notes = fetch_meeting_notes()
     note = next((n for n in all_notes if str(n.get("id")) == str(note_id) or str(n.get("uuid")) == str(note_id) or str(n.get("created_at")) == str(note_id)), None)
 
@@ -143,6 +146,7 @@ async def delete_note(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Delete a meeting note with verified server session ownership and class scope check"""
+    from app.services.sheets import fetch_meeting_notes, delete_meeting_note
     all_notes = fetch_meeting_notes()
     note = next((n for n in all_notes if str(n.get("id")) == str(note_id) or str(n.get("uuid")) == str(note_id) or str(n.get("created_at")) == str(note_id)), None)
 
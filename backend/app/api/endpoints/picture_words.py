@@ -1,15 +1,6 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
-from app.services.picture_words import (
-    fetch_all_students, fetch_students_by_class,
-    add_student, delete_student,
-    fetch_student_vocab, update_student_vocab, batch_update_student_vocab,
-    fetch_lessons, update_lesson,
-    fetch_minutes, add_minute_entry, update_minute_entry, delete_minute_entry,
-    fetch_class_overview, fetch_certification_status,
-    init_picture_word_system, get_evaluation_sentences
-)
 from app.api.deps import require_authenticated_user, require_admin, normalize_class_identifier
 
 router = APIRouter()
@@ -28,6 +19,7 @@ def _check_class_permission(class_id: str, current_user: Dict[str, Any]):
 # ─────────────────────────────────────────────────────────────
 @router.post("/init")
 def init_system(current_admin: Dict[str, Any] = Depends(require_admin)):
+    from app.services.picture_words import init_picture_word_system
     return init_picture_word_system()
 
 # ─────────────────────────────────────────────────────────────
@@ -35,6 +27,7 @@ def init_system(current_admin: Dict[str, Any] = Depends(require_admin)):
 # ─────────────────────────────────────────────────────────────
 @router.get("/students")
 def get_all_students(current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import fetch_all_students
     students = fetch_all_students()
     role = str(current_user.get("role", "")).lower()
     if role not in ["admin", "superadmin"]:
@@ -44,6 +37,7 @@ def get_all_students(current_user: Dict[str, Any] = Depends(require_authenticate
 
 @router.get("/students/by-class/{class_id}")
 def get_students_by_class(class_id: str, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import fetch_students_by_class
     _check_class_permission(class_id, current_user)
     return fetch_students_by_class(class_id)
 
@@ -55,11 +49,13 @@ class AddStudentRequest(BaseModel):
 
 @router.post("/students")
 def create_student(req: AddStudentRequest, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import add_student
     _check_class_permission(req.class_id, current_user)
     return add_student(req.class_id, req.class_name, req.student_num, req.student_name)
 
 @router.delete("/students/{class_id}/{student_name}")
 def remove_student(class_id: str, student_name: str, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import delete_student
     _check_class_permission(class_id, current_user)
     result = delete_student(class_id, student_name)
     if "error" in result:
@@ -71,6 +67,7 @@ def remove_student(class_id: str, student_name: str, current_user: Dict[str, Any
 # ─────────────────────────────────────────────────────────────
 @router.get("/vocab/{class_id}/{student_name}")
 def get_vocab(class_id: str, student_name: str, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import fetch_student_vocab
     _check_class_permission(class_id, current_user)
     return fetch_student_vocab(class_id, student_name)
 
@@ -79,6 +76,7 @@ class VocabBatchUpdateRequest(BaseModel):
 
 @router.patch("/vocab/batch/{class_id}/{student_name}")
 def patch_vocab_batch(class_id: str, student_name: str, req: VocabBatchUpdateRequest, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import batch_update_student_vocab
     _check_class_permission(class_id, current_user)
     result = batch_update_student_vocab(class_id, student_name, req.payload)
     if "error" in result:
@@ -90,6 +88,7 @@ class VocabUpdateRequest(BaseModel):
 
 @router.patch("/vocab/{class_id}/{student_name}/{vocab_id}")
 def patch_vocab(class_id: str, student_name: str, vocab_id: int, req: VocabUpdateRequest, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import update_student_vocab
     _check_class_permission(class_id, current_user)
     result = update_student_vocab(class_id, student_name, vocab_id, req.updates)
     if "error" in result:
@@ -101,6 +100,7 @@ def patch_vocab(class_id: str, student_name: str, vocab_id: int, req: VocabUpdat
 # ─────────────────────────────────────────────────────────────
 @router.get("/lessons")
 def get_lessons(current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import fetch_lessons
     return fetch_lessons()
 
 class LessonUpdateRequest(BaseModel):
@@ -108,6 +108,7 @@ class LessonUpdateRequest(BaseModel):
 
 @router.patch("/lessons/{lesson_num}")
 def patch_lesson(lesson_num: int, req: LessonUpdateRequest, current_admin: Dict[str, Any] = Depends(require_admin)):
+    from app.services.picture_words import update_lesson
     result = update_lesson(lesson_num, req.updates)
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
@@ -118,6 +119,7 @@ def patch_lesson(lesson_num: int, req: LessonUpdateRequest, current_admin: Dict[
 # ─────────────────────────────────────────────────────────────
 @router.get("/minutes")
 def get_minutes(class_id: Optional[str] = Query(None), current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import fetch_minutes
     if class_id:
         _check_class_permission(class_id, current_user)
     return fetch_minutes(class_id)
@@ -132,6 +134,7 @@ class MinuteRequest(BaseModel):
 
 @router.post("/minutes")
 def post_minute(req: MinuteRequest, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import add_minute_entry
     if req.class_id:
         _check_class_permission(req.class_id, current_user)
     result = add_minute_entry(req.date, req.kind, req.source, req.content, req.class_id, req.class_name)
@@ -146,6 +149,7 @@ class MinuteUpdateRequest(BaseModel):
 
 @router.patch("/minutes")
 def patch_minute(req: MinuteUpdateRequest, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import fetch_minutes, update_minute_entry
     try:
         all_min = fetch_minutes()
         target = next((m for m in all_min if m.get("source_type") == req.source_type and int(m.get("row_index", -1)) == req.row_index), None)
@@ -173,6 +177,7 @@ def patch_minute(req: MinuteUpdateRequest, current_user: Dict[str, Any] = Depend
 
 @router.delete("/minutes/{source_type}/{row_index}")
 def remove_minute(source_type: str, row_index: int, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import fetch_minutes, delete_minute_entry
     try:
         all_min = fetch_minutes()
         target = next((m for m in all_min if m.get("source_type") == source_type and int(m.get("row_index", -1)) == row_index), None)
@@ -203,6 +208,7 @@ def remove_minute(source_type: str, row_index: int, current_user: Dict[str, Any]
 # ─────────────────────────────────────────────────────────────
 @router.get("/overview")
 def get_overview(class_id: Optional[str] = Query(None), current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import fetch_class_overview
     if class_id:
         _check_class_permission(class_id, current_user)
     return fetch_class_overview(class_id)
@@ -212,6 +218,7 @@ def get_overview(class_id: Optional[str] = Query(None), current_user: Dict[str,
 # ─────────────────────────────────────────────────────────────
 @router.get("/certification/{class_id}/{student_name}")
 def get_certification(class_id: str, student_name: str, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import fetch_certification_status
     _check_class_permission(class_id, current_user)
     return fetch_certification_status(class_id, student_name)
 
@@ -220,4 +227,5 @@ def get_certification(class_id: str, student_name: str, current_user: Dict[str,
 # ─────────────────────────────────────────────────────────────
 @router.get("/evaluation-sentences")
 def get_sentences(current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.picture_words import get_evaluation_sentences
     return get_evaluation_sentences()
@@ -1,5 +1,4 @@
 from fastapi import APIRouter, HTTPException, Depends
-from app.services.sheets import fetch_all_records, fetch_student_codes, update_student_codes
 from typing import List, Dict, Any
 from app.api.deps import require_authenticated_user, require_admin, get_student_class_code, normalize_class_identifier
 
@@ -49,6 +48,7 @@ async def get_roster(current_user: Dict[str, Any] = Depends(require_authenticate
 
 @router.get("/codes")
 async def get_codes(current_user: Dict[str, Any] = Depends(require_authenticated_user)):
+    from app.services.sheets import fetch_student_codes
     mapping = fetch_student_codes()
     role = str(current_user.get("role", "")).lower()
     if role not in ["admin", "superadmin"]:
@@ -65,6 +65,7 @@ async def save_codes(
     codes: list[dict[str, str]],
     current_admin: Dict[str, Any] = Depends(require_admin)
 ):
+    from app.services.sheets import update_student_codes
     result = update_student_codes(codes)
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
@@ -1,5 +1,4 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
-from app.services.analysis import get_student_analytics
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
 from app.api.deps import require_authenticated_user, require_admin, check_student_scope
@@ -25,6 +24,7 @@ async def get_student_detail(
     end_date: Optional[str] = Query(None, description="End date (YYYY-MM-DD)"),
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
+    from app.services.analysis import get_student_analytics
     check_student_scope(student_name, current_user)
     data = get_student_analytics(student_name, start_date=start_date, end_date=end_date)
     if "error" in data:
@@ -1,9 +1,4 @@
 from fastapi import APIRouter, HTTPException, Request, Depends
-from app.services.sheets import (
-    fetch_student_status, update_student_tier, fetch_cico_daily, add_cico_daily,
-    update_student_enrollment, update_student_beable_code, get_enrolled_student_count, get_beable_code_mapping,
-    reset_tier_status_sheet, update_student_tier_unified
-)
 from pydantic import BaseModel
 from typing import Optional, Union, Dict, Any
 from app.api.deps import require_authenticated_user, require_admin, check_student_scope, normalize_class_identifier
@@ -49,6 +44,7 @@ class BeAbleCodeUpdateRequest(BaseModel):
 @router.get("/status")
 async def get_all_status(current_user: Dict[str, Any] = Depends(require_authenticated_user)):
     """Get students' tier status scoped by user role and class"""
+    from app.services.sheets import fetch_student_status, get_enrolled_student_count
     status = fetch_student_status()
     role = str(current_user.get("role", "")).lower()
 
@@ -72,6 +68,7 @@ async def get_all_status(current_user: Dict[str, Any] = Depends(require_authenti
 @router.put("/status")
 async def update_tier(request: TierUpdateRequest, current_admin: Dict[str, Any] = Depends(require_admin)):
     """Update a student's tier status (5 separate O/X columns - Admin only)"""
+    from app.services.sheets import update_student_tier
     tier_values = {}
     if request.tier1 is not None:
         tier_values['Tier1'] = request.tier1
@@ -92,6 +89,7 @@ async def update_tier(request: TierUpdateRequest, current_admin: Dict[str, Any]
 @router.put("/status/unified")
 async def update_tier_unified(request: Request, current_admin: Dict[str, Any] = Depends(require_admin)):
     """Unified update: tier + enrollment + beable in single API call (Admin only)"""
+    from app.services.sheets import update_student_tier_unified
     try:
         body = await request.json()
 
@@ -130,6 +128,7 @@ async def update_tier_unified(request: Request, current_admin: Dict[str, Any] =
 @router.put("/enrollment")
 async def update_enrollment(request: EnrollmentUpdateRequest, current_admin: Dict[str, Any] = Depends(require_admin)):
     """Update a student's enrollment status (O/X - Admin only)"""
+    from app.services.sheets import update_student_enrollment
     if request.enrolled not in ["O", "X"]:
         raise HTTPException(status_code=400, detail="Enrolled must be O or X")
     result = update_student_enrollment(str(request.code), request.enrolled)
@@ -140,6 +139,7 @@ async def update_enrollment(request: EnrollmentUpdateRequest, current_admin: Dic
 @router.put("/beable")
 async def update_beable(request: BeAbleCodeUpdateRequest, current_admin: Dict[str, Any] = Depends(require_admin)):
     """Update a student's BeAble code for data linking (Admin only)"""
+    from app.services.sheets import update_student_beable_code
     result = update_student_beable_code(str(request.code), request.beable_code)
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
@@ -148,12 +148,14 @@ async def update_beable(request: BeAbleCodeUpdateRequest, current_admin: Dict[st
 @router.get("/beable-mapping")
 async def get_beable_mapping(current_user: Dict[str, Any] = Depends(require_authenticated_user)):
     """Get BeAble code to student code mapping for data analysis"""
+    from app.services.sheets import get_beable_code_mapping
     mapping = get_beable_code_mapping()
     return mapping
 
 @router.post("/reset-sheet")
 async def reset_sheet(current_admin: Dict[str, Any] = Depends(require_admin)):
     """Reset TierStatus sheet with all 210 students (Admin only & DEV only)"""
+    from app.services.sheets import reset_tier_status_sheet
     from app.core.config import settings
     if settings.ENVIRONMENT.lower() != "development":
         raise HTTPException(
@@ -187,6 +189,7 @@ async def get_cico_records(
     current_user: Dict[str, Any] = Depends(require_authenticated_user)
 ):
     """Get CICO daily records with student scope enforcement"""
+    from app.services.sheets import fetch_cico_daily
     if student_code:
         check_student_scope(str(student_code), current_user)
 
@@ -204,6 +207,7 @@ async def get_cico_records(
 @router.post("/cico")
 async def add_cico_record(data: CICODailyInput, current_user: Dict[str, Any] = Depends(require_authenticated_user)):
     """Add a new CICO daily record with write scope verification"""
+    from app.services.sheets import add_cico_daily
     check_student_scope(str(data.student_code), current_user)
 
     rate = data.achievement_rate
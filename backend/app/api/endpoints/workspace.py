@@ -1,5 +1,6 @@
 # backend/app/api/endpoints/workspace.py
 
+import asyncio
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import Optional, List, Dict, Any
 from datetime import date, timedelta
@@ -9,10 +10,6 @@ from app.domain.models import (
     DecisionSignal, DataQualityCheck, FunctionHypothesis, FunctionCode,
     DataSufficiency, SignalSeverity, HypothesisStatus
 )
-from app.adapters.sheets.tier_status import TierStatusAdapter
-from app.adapters.sheets.log_main import LogMainAdapter
-from app.adapters.sheets.cico import CicoMonthAdapter
-from app.services.sheets import get_bip
 from app.services.ebp.matching import generate_ebp_recommendation_bundle
 from app.services.decision.signals import evaluate_decision_signals
 from app.api.deps import require_authenticated_user, check_student_scope, normalize_class_identifier
@@ -27,9 +24,16 @@ async def get_today_decision_center(current_user: Dict[str, Any] = Depends(requi
     - Review Due Signals (CICO stalled / Frequency spikes / Active missing data)
     - Tier counts & High-risk highlights
     """
+    from app.adapters.sheets.tier_status import TierStatusAdapter
+    from app.adapters.sheets.log_main import LogMainAdapter
+    from app.services.sheets import aprefetch_log_and_tier_status
     today = today_kst()
-    students = TierStatusAdapter.fetch_students()
-    all_events = LogMainAdapter.fetch_events()
+    # Both sheets come back in one batchGet over the async client; the views below build on the warm caches
+    await aprefetch_log_and_tier_status()
+    students, all_events = await asyncio.gather(
+        TierStatusAdapter.afetch_students(),
+        LogMainAdapter.afetch_events(),
+    )
 
     role = str(current_user.get("role", "")).lower()
     if role not in ["admin", "superadmin"]:
@@ -105,20 +109,31 @@ async def get_student_workspace(
     - Active BIP
     - Decision Signals & Data Quality check
     """
+    from app.adapters.sheets.tier_status import TierStatusAdapter
+    from app.adapters.sheets.log_main import LogMainAdapter
+    from app.adapters.sheets.cico import CicoMonthAdapter
+    from app.services.sheets import get_bip
+    # Roster read without blocking the loop; the scope check then runs on the warm cache
+    await TierStatusAdapter.afetch_raw_records()
     check_student_scope(student_code, current_user)
     today = today_kst()
-    students = TierStatusAdapter.fetch_students()
+
+    # TierStatus, Log_Main and the CICO months (3~7월) are independent reads: run them concurrently
+    cico_months = [3, 4, 5, 6, 7]
+    students, all_events, *month_obs = await asyncio.gather(
+        TierStatusAdapter.afetch_students(),
+        LogMainAdapter.afetch_events(),
+        *[CicoMonthAdapter.afetch_observations(m) for m in cico_months],
+    )
     profile = next((s for s in students if s.student_code == student_code), None)
     if not profile:
         raise HTTPException(status_code=404, detail=f"Student '{student_code}' not found in TierStatus roster.")
 
-    all_events = LogMainAdapter.fetch_events()
     s_events = [e for e in all_events if e.student_code == student_code]
 
     # CICO Observations from active months (3~7월)
     cico_obs: List[CicoObservation] = []
-    for m in [3, 4, 5, 6, 7]:
-        m_obs = CicoMonthAdapter.fetch_observations(m)
+    for m_obs in month_obs:
         s_m_obs = [o for o in m_obs if o.student_code == student_code]
         cico_obs.extend(s_m_obs)
 
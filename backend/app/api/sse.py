@@ -0,0 +1,30 @@
+# backend/app/api/sse.py
+
+from typing import Any, Awaitable, Callable, Dict
+from fastapi.responses import StreamingResponse
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # keep proxies from buffering the stream
+}
+
+
+async def stream_ai_endpoint(handler: Callable[..., Awaitable[Dict[str, Any]]], result_key: str,
+                             **kwargs) -> StreamingResponse:
+    """
+    Streaming (SSE) variant of an AI endpoint.
+    Runs the regular handler with the LLM call captured, so scope checks, data loading and
+    the prompt are exactly the same, then streams the model output for that prompt.
+    A handler that answers without the model (load error, insufficient data) is sent as-is.
+    """
+    from app.services.llm_stream import capturing_prompts, stream_llm_events, stream_text_events
+
+    with capturing_prompts() as prompts:
+        result = await handler(**kwargs)
+    if prompts:
+        system_prompt, user_prompt, max_tokens = prompts[-1]
+        events = stream_llm_events(system_prompt, user_prompt, max_tokens,
+                                   regenerate=bool(kwargs.get("regenerate")))
+    else:
+        events = stream_text_events(str((result or {}).get(result_key) or ""))
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -14,6 +15,50 @@ class Settings(BaseSettings):
     AUTH_SECRET: str = os.getenv("AUTH_SECRET", "")
     AUTH_TOKEN_TTL_MINUTES: int = int(os.getenv("AUTH_TOKEN_TTL_MINUTES", "480"))
     AUTH_COOKIE_NAME: str = "pbst_session"
+    # Seconds a verified session token is reused without re-decoding / re-reading Users (0 disables)
+    AUTH_SESSION_CACHE_TTL: float = float(os.getenv("AUTH_SESSION_CACHE_TTL", "5"))
+    # Stale-while-revalidate overrides, e.g. "sheet:log-main=600,sheet:cico=0" (0 disables)
+    CACHE_STALE_TTLS: str = os.getenv("CACHE_STALE_TTLS", "")
+    # On-disk snapshots of sheet data so a cold instance can answer before the first download
+    CACHE_DIR: str = os.getenv("CACHE_DIR", os.path.join(tempfile.gettempdir(), "pbst_cache"))
+    CACHE_SNAPSHOTS_ENABLED: bool = os.getenv("CACHE_SNAPSHOTS_ENABLED", "true").lower() in ("1", "true", "yes")
+    CACHE_SNAPSHOT_MAX_AGE: int = int(os.getenv("CACHE_SNAPSHOT_MAX_AGE", "21600"))  # 6h
+    # Write-behind queue for sheet mutations. Off on Vercel: a frozen function never runs the flush timer.
+    WRITE_QUEUE_ENABLED: bool = os.getenv("WRITE_QUEUE_ENABLED", "false" if os.getenv("VERCEL") else "true").lower() in ("1", "true", "yes")
+    WRITE_QUEUE_DEBOUNCE_SECONDS: float = float(os.getenv("WRITE_QUEUE_DEBOUNCE_SECONDS", "0.3"))
+    WRITE_QUEUE_MAX_DELAY_SECONDS: float = float(os.getenv("WRITE_QUEUE_MAX_DELAY_SECONDS", "2"))
+    WRITE_QUEUE_MAX_RETRIES: int = int(os.getenv("WRITE_QUEUE_MAX_RETRIES", "5"))
+    # Sheets API governor: per-minute budgets (Google's default per-user quotas), the share of
+    # each budget kept for interactive requests, and retries on 429/5xx
+    SHEETS_GOVERNOR_ENABLED: bool = os.getenv("SHEETS_GOVERNOR_ENABLED", "true").lower() in ("1", "true", "yes")
+    SHEETS_READS_PER_MINUTE: float = float(os.getenv("SHEETS_READS_PER_MINUTE", "60"))
+    SHEETS_WRITES_PER_MINUTE: float = float(os.getenv("SHEETS_WRITES_PER_MINUTE", "60"))
+    SHEETS_BACKGROUND_RESERVE: float = float(os.getenv("SHEETS_BACKGROUND_RESERVE", "0.2"))
+    SHEETS_MAX_RETRIES: int = int(os.getenv("SHEETS_MAX_RETRIES", "5"))
+    # Local LLM discovery: how long a probed endpoint (or "none up") is trusted, probe timeout,
+    # and the circuit breaker (consecutive failures before skipping the endpoint, for how long)
+    LOCAL_LLM_DISCOVERY_TTL: float = float(os.getenv("LOCAL_LLM_DISCOVERY_TTL", "300"))
+    LOCAL_LLM_NEGATIVE_TTL: float = float(os.getenv("LOCAL_LLM_NEGATIVE_TTL", "60"))
+    LOCAL_LLM_PROBE_TIMEOUT: float = float(os.getenv("LOCAL_LLM_PROBE_TIMEOUT", "2"))
+    LOCAL_LLM_BREAKER_THRESHOLD: int = int(os.getenv("LOCAL_LLM_BREAKER_THRESHOLD", "3"))
+    LOCAL_LLM_BREAKER_COOLDOWN: float = float(os.getenv("LOCAL_LLM_BREAKER_COOLDOWN", "120"))
+    # AI result cache keyed by a hash of (prompts, model, max_tokens); kept in memory and in CACHE_DIR
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    LLM_CACHE_TTL: float = float(os.getenv("LLM_CACHE_TTL", "604800"))  # 7d
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "256"))
+    LLM_CACHE_PERSIST: bool = os.getenv("LLM_CACHE_PERSIST", "true").lower() in ("1", "true", "yes")
+    # Background AI report jobs: worker threads running the LLM chain, and how long results stay pollable.
+    # Needs a long-lived host: jobs run on in-process threads and their state lives in CACHE_DIR of that
+    # one instance. Off on Vercel (frozen between requests, per-instance /tmp): the /jobs routes answer 501.
+    AI_JOBS_ENABLED: bool = os.getenv("AI_JOBS_ENABLED", "false" if os.getenv("VERCEL") else "true").lower() in ("1", "true", "yes")
+    AI_JOB_WORKERS: int = int(os.getenv("AI_JOB_WORKERS", "2"))
+    AI_JOB_RETENTION: float = float(os.getenv("AI_JOB_RETENTION", "86400"))
+    AI_JOB_DEADLINE: float = float(os.getenv("AI_JOB_DEADLINE", "900"))
+    # Hedged LLM chain: seconds before the next provider is started alongside a silent one, how many
+    # may run at once, and the total budget of one call (inside Vercel's 60s maxDuration there)
+    LLM_HEDGE_DELAY: float = float(os.getenv("LLM_HEDGE_DELAY", "15"))
+    LLM_HEDGE_MAX_PARALLEL: int = int(os.getenv("LLM_HEDGE_MAX_PARALLEL", "2"))
+    LLM_DEADLINE_SECONDS: float = float(os.getenv("LLM_DEADLINE_SECONDS", "50" if os.getenv("VERCEL") else "180"))
     
     class Config:
         env_file = ".env"
@@ -5,20 +5,26 @@ import hashlib
 from typing import Optional, Dict, Any
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from argon2 import PasswordHasher, Type
-from argon2.exceptions import VerifyMismatchError, InvalidHash
 import jwt
 from fastapi import Response, HTTPException, status
 from app.core.config import settings
 
-# Argon2id Hasher instance
-_hasher = PasswordHasher(
-    time_cost=2,
-    memory_cost=65536,  # 64 MB
-    parallelism=1,
-    hash_len=32,
-    type=Type.ID
-)
+# Argon2id Hasher instance (created on first use: only login / password changes need argon2)
+_hasher = None
+
+
+def _get_hasher():
+    global _hasher
+    if _hasher is None:
+        from argon2 import PasswordHasher, Type
+        _hasher = PasswordHasher(
+            time_cost=2,
+            memory_cost=65536,  # 64 MB
+            parallelism=1,
+            hash_len=32,
+            type=Type.ID
+        )
+    return _hasher
 
 @dataclass
 class PasswordVerificationResult:
@@ -31,7 +37,7 @@ def hash_password(plain_password: str) -> str:
     """Hashes a plain password using Argon2id."""
     if not plain_password:
         raise ValueError("Password cannot be empty")
-    return _hasher.hash(plain_password)
+    return _get_hasher().hash(plain_password)
 
 
 def verify_password_compat(plain_password: str, stored_password: str) -> PasswordVerificationResult:
@@ -44,9 +50,11 @@ def verify_password_compat(plain_password: str, stored_password: str) -> Passwor
 
     # 1. Argon2id check
     if stored_password.startswith("$argon2"):
+        from argon2.exceptions import VerifyMismatchError, InvalidHash
+        hasher = _get_hasher()
         try:
-            _hasher.verify(stored_password, plain_password)
-            needs_rehash = _hasher.check_needs_rehash(stored_password)
+            hasher.verify(stored_password, plain_password)
+            needs_rehash = hasher.check_needs_rehash(stored_password)
             return PasswordVerificationResult(verified=True, needs_rehash=needs_rehash, legacy_type=None)
         except (VerifyMismatchError, InvalidHash):
             return PasswordVerificationResult(verified=False, needs_rehash=False)
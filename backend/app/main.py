@@ -87,6 +87,7 @@ from app.api.endpoints import behavior
 from app.api.endpoints import ebp
 from app.api.endpoints import workspace
 from app.api.endpoints import class_rules
+from app.api.endpoints import ai_jobs
 
 app.include_router(bip.router, prefix="/api/v1/bip", tags=["bip"])
 app.include_router(picture_words.router, prefix="/api/v1/picture-words", tags=["picture-words"])
@@ -94,6 +95,18 @@ app.include_router(behavior.router, prefix="/api/v1/behavior-log", tags=["behavi
 app.include_router(ebp.router, prefix="/api/v1/ebp", tags=["ebp"])
 app.include_router(workspace.router, prefix="/api/v1/workspace", tags=["workspace"])
 app.include_router(class_rules.router, prefix="/api/v1/class-rules", tags=["class-rules"])
+app.include_router(ai_jobs.router, prefix="/api/v1/ai-jobs", tags=["ai-jobs"])
+
+@app.on_event("shutdown")
+def flush_sheet_writes():
+    # Queued sheet writes must not be lost when the server stops
+    from app.adapters.sheets.write_queue import sheet_write_queue
+    sheet_write_queue.flush()
+
+@app.on_event("shutdown")
+async def close_async_sheets():
+    from app.adapters.sheets.async_client import close_async_sheets_client
+    await close_async_sheets_client()
 
 @app.get("/")
 async def root():
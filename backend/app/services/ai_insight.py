@@ -1,6 +1,7 @@
 import os
 import json
 import re
+import time
 import requests
 from dotenv import load_dotenv
 from typing import Dict, List, Optional, Any
@@ -58,255 +59,354 @@ def _clean_llm_output(text: str) -> str:
     text = re.sub(r'<think>[\s\S]*?</think>', '', text, flags=re.IGNORECASE).strip()
     return text
 
+LOCAL_NO_THINK_DIRECTIVE = "\n\n[최우선 지침: 생각/추론 과정(Thinking/Reasoning)을 일체 출력하지 말고, 즉시 <1. 핵심 요약>부터 시작하는 한국어 최종 보고서 본문만을 출력하라.]"
+
+def _local_openai_payload(system_prompt: str, user_prompt: str, max_tokens: int, model: str) -> dict:
+    """Request body for an OpenAI-compatible local /chat/completions (LM Studio, Tunnel, Ollama v1)."""
+    return {
+        "model": model,
+        "messages": [
+            {
+                "role": "system", 
+                "content": "/no_think\n" + system_prompt + LOCAL_NO_THINK_DIRECTIVE
+            },
+            {"role": "user", "content": user_prompt}
+        ],
+        "temperature": 0.4,
+        "max_tokens": min(max_tokens, 4096),
+        "reasoning_effort": "none",
+        "chat_template_kwargs": {"enable_thinking": False},
+        "extra_body": {"thinking": False}
+    }
+
+def _ollama_payload(system_prompt: str, user_prompt: str, max_tokens: int, model: str) -> dict:
+    """Request body for Ollama's native /api/chat."""
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        "stream": False,
+        "options": {
+            "temperature": 0.6,
+            "num_predict": max_tokens
+        }
+    }
+
 def _call_local_llm(system_prompt: str, user_prompt: str, max_tokens: int = 4096) -> Optional[str]:
-    """Call Local LLM endpoint (LM Studio on :1234 or Cloudflare Tunnel or Ollama) with Gemma 4 E4B."""
-    raw_url = os.getenv("LOCAL_LLM_URL", "").strip()
-    configured_model = os.getenv("LOCAL_LLM_MODEL", "").strip()
-    
-    # URL 후보 목록 구성 (반드시 /v1 경로로 정규화)
-    v1_urls = []
-    if raw_url:
-        clean = raw_url.rstrip("/")
-        if not clean.endswith("/v1"):
-            clean = f"{clean}/v1"
-        v1_urls.append(clean)
-            
-    # 로컬 기본 URL 추가
-    v1_urls.extend([
-        "http://localhost:1234/v1",
-        "http://127.0.0.1:1234/v1",
-        "http://localhost:11434/v1",
-        "http://127.0.0.1:11434/v1"
-    ])
-    
-    # 중복 제거
-    seen = set()
-    unique_urls = []
-    for u in v1_urls:
-        if u not in seen:
-            seen.add(u)
-            unique_urls.append(u)
-            
-    # 1. OpenAI-compatible /v1/chat/completions 호출 (LM Studio / Cloudflare Tunnel / Ollama v1)
-    for endpoint in unique_urls:
-        try:
-            model_to_use = configured_model or "google/gemma-4-e4b"
-            try:
-                m_resp = requests.get(f"{endpoint}/models", timeout=3)
-                if m_resp.status_code == 200:
-                    m_data = m_resp.json().get("data", [])
-                    if m_data and isinstance(m_data, list):
-                        model_to_use = m_data[0].get("id", model_to_use)
-            except Exception:
-                pass
-
-            payload = {
-                "model": model_to_use,
-                "messages": [
-                    {
-                        "role": "system", 
-                        "content": "/no_think\n" + system_prompt + "\n\n[최우선 지침: 생각/추론 과정(Thinking/Reasoning)을 일체 출력하지 말고, 즉시 <1. 핵심 요약>부터 시작하는 한국어 최종 보고서 본문만을 출력하라.]"
-                    },
-                    {"role": "user", "content": user_prompt}
-                ],
-                "temperature": 0.4,
-                "max_tokens": min(max_tokens, 4096),
-                "reasoning_effort": "none",
-                "chat_template_kwargs": {"enable_thinking": False},
-                "extra_body": {"thinking": False}
-            }
-            # (connect_timeout, read_timeout): 죽은 터널/미가동 로컬 서버는 연결 단계에서 몇 초 안에 실패해야
-            # Vercel의 60초 함수 제한 안에서 Gemini/Groq 폴백까지 도달할 수 있다. 실제로 연결된 뒤의
-            # 생성 시간(20 tokens/s 기준)은 기존과 동일하게 175초까지 여유있게 기다린다.
-            resp = requests.post(f"{endpoint}/chat/completions", json=payload, timeout=(5, 175))
-            if resp.status_code == 200:
-                data = resp.json()
-                choices = data.get("choices", [])
-                if choices:
-                    msg_obj = choices[0].get("message", {})
-                    content = msg_obj.get("content", "").strip()
-                    # content가 비어있고 reasoning_content에 내용이 있는 경우 대비
-                    if not content and msg_obj.get("reasoning_content"):
-                        content = msg_obj.get("reasoning_content", "").strip()
-                        
-                    actual_model = data.get("model", model_to_use)
-                    cleaned = _clean_llm_output(content)
-                    if cleaned and len(cleaned) > 100:
-                        location_tag = "Cloudflare Tunnel" if "trycloudflare" in endpoint else "Local"
-                        return cleaned + f"\n\n---\n> 🖥️ **로컬 AI 모델**: {actual_model} ({location_tag})"
-        except Exception:
-            continue
-            
-    # 2. Ollama 네이티브 API (:11434/api/chat)
-    ollama_candidates = ["http://localhost:11434", "http://127.0.0.1:11434"]
-    for o_url in ollama_candidates:
-        try:
-            payload = {
-                "model": configured_model or "gemma-4-e4b",
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                "stream": False,
-                "options": {
-                    "temperature": 0.6,
-                    "num_predict": max_tokens
-                }
-            }
-            resp = requests.post(f"{o_url}/api/chat", json=payload, timeout=(5, 175))
-            if resp.status_code == 200:
-                res_data = resp.json()
-                msg = res_data.get("message", {}).get("content", "").strip()
-                cleaned = _clean_llm_output(msg)
+    """
+    Call the Local LLM (LM Studio on :1234, Cloudflare Tunnel or Ollama) with Gemma 4 E4B.
+    The endpoint and model id come from local_llm_registry, which probes the candidate URLs
+    once and caches the healthy one; each call is a single request (or none when no local
+    server is up / its circuit breaker is open).
+    """
+    from app.services.llm_providers import local_llm_registry
+
+    provider = local_llm_registry.resolve()
+    if provider is None:
+        return None
+    return _local_llm_request(provider, system_prompt, user_prompt, max_tokens, 175)
+
+def _local_llm_request(provider, system_prompt: str, user_prompt: str, max_tokens: int,
+                       read_timeout: float) -> Optional[str]:
+    """One request to a resolved local provider; None unless it returns a usable report (>100 chars)."""
+    from app.services.llm_providers import OPENAI, local_llm_registry
+
+    # (connect_timeout, read_timeout): 점검을 통과한 엔드포인트라도 그 사이 터널이 죽었으면 연결 단계에서
+    # 몇 초 안에 실패해야 Vercel의 60초 함수 제한 안에서 Gemini/Groq 폴백까지 도달할 수 있다. 실제로 연결된
+    # 뒤의 생성 시간(20 tokens/s 기준)은 최대 175초(또는 남은 전체 예산)까지 기다린다.
+    timeout = (min(5, read_timeout), read_timeout)
+    try:
+        if provider.kind == OPENAI:
+            # 1. OpenAI-compatible /v1/chat/completions 호출 (LM Studio / Cloudflare Tunnel / Ollama v1)
+            payload = _local_openai_payload(system_prompt, user_prompt, max_tokens, provider.model)
+            resp = requests.post(f"{provider.base_url}/chat/completions", json=payload, timeout=timeout)
+            if resp.status_code != 200:
+                local_llm_registry.record_failure(provider, f"HTTP {resp.status_code}")
+                return None
+            local_llm_registry.record_success(provider)
+            data = resp.json()
+            choices = data.get("choices", [])
+            if choices:
+                msg_obj = choices[0].get("message", {})
+                content = msg_obj.get("content", "").strip()
+                # content가 비어있고 reasoning_content에 내용이 있는 경우 대비
+                if not content and msg_obj.get("reasoning_content"):
+                    content = msg_obj.get("reasoning_content", "").strip()
+
+                actual_model = data.get("model", provider.model)
+                cleaned = _clean_llm_output(content)
                 if cleaned and len(cleaned) > 100:
-                    return cleaned + f"\n\n---\n> 🖥️ **로컬 모델**: {configured_model or 'gemma-4-e4b'} (Ollama)"
-        except Exception:
-            continue
-            
+                    return cleaned + f"\n\n---\n> 🖥️ **로컬 AI 모델**: {actual_model} ({provider.location_tag})"
+            return None
+
+        # 2. Ollama 네이티브 API (:11434/api/chat)
+        payload = _ollama_payload(system_prompt, user_prompt, max_tokens, provider.model)
+        resp = requests.post(f"{provider.base_url}/api/chat", json=payload, timeout=timeout)
+        if resp.status_code != 200:
+            local_llm_registry.record_failure(provider, f"HTTP {resp.status_code}")
+            return None
+        local_llm_registry.record_success(provider)
+        msg = resp.json().get("message", {}).get("content", "").strip()
+        cleaned = _clean_llm_output(msg)
+        if cleaned and len(cleaned) > 100:
+            return cleaned + f"\n\n---\n> 🖥️ **로컬 모델**: {provider.model} (Ollama)"
+    except Exception as e:
+        local_llm_registry.record_failure(provider, str(e))
     return None
 
 def _call_ollama(system_prompt: str, user_prompt: str, max_tokens: int = 4096) -> Optional[str]:
     """Alias for _call_local_llm for backward compatibility."""
     return _call_local_llm(system_prompt, user_prompt, max_tokens)
 
-def _call_gemini(system_prompt: str, user_prompt: str, max_tokens: int = 4096) -> str:
-    """Fallback Gemini & Cloud API call wrapper - with thinkingBudget fix and robust fallbacks."""
-    gemini_key = (
+GEMINI_MODELS = [
+    "gemini-2.5-flash",
+    "gemini-1.5-flash",
+    "gemini-2.5-flash-lite",
+]
+
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+GROQ_MODELS = ["openai/gpt-oss-120b", "openai/gpt-oss-20b"]
+GROQ_MAX_CHARS = 18000
+
+def _gemini_request_bodies(system_prompt: str, user_prompt: str) -> List[dict]:
+    # Gemini 2.5 Flash의 Thinking 버짓 문제를 해결하기 위한 요청 생성
+    # thinkingBudget: 0 으로 설정하여 추론 토큰 소진 없이 100% 한국어 임상 분석 본문 출력에 집중
+    return [
+        # Config 1: thinkingBudget: 0 (Gemini 2.5 Flash용 초고속/전체 토큰 출력)
+        {
+            "systemInstruction": {"parts": [{"text": system_prompt}]},
+            "contents": [{"role": "user", "parts": [{"text": user_prompt}]}],
+            "generationConfig": {
+                "temperature": 0.6,
+                "maxOutputTokens": 8192,
+                "thinkingConfig": {"thinkingBudget": 0}
+            }
+        },
+        # Config 2: 기본 generationConfig (Gemini 1.5 등 thinkingConfig 미지원 모델용)
+        {
+            "systemInstruction": {"parts": [{"text": system_prompt}]},
+            "contents": [{"role": "user", "parts": [{"text": user_prompt}]}],
+            "generationConfig": {
+                "temperature": 0.6,
+                "maxOutputTokens": 8192
+            }
+        }
+    ]
+
+def _groq_payload(system_prompt: str, user_prompt: str, max_tokens: int, model: str) -> dict:
+    """Groq chat body; prompts are truncated to stay inside the free-tier request size."""
+    groq_system = system_prompt[:3000] if len(system_prompt) > 3000 else system_prompt
+    groq_user = user_prompt[:GROQ_MAX_CHARS] if len(user_prompt) > GROQ_MAX_CHARS else user_prompt
+    return {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": groq_system},
+            {"role": "user", "content": groq_user}
+        ],
+        "max_tokens": min(max_tokens, 4096),
+        "temperature": 0.6
+    }
+
+def _gemini_key() -> str:
+    return (
         os.getenv("GEMINI_API_KEY", "").strip()
         or os.getenv("GEMINI_API_KEY_0817", "").strip()
         or os.getenv("GOOGLE_AI_API_KEY", "").strip()
     )
-    groq_key = os.getenv("GROQ_API_KEY", "").strip()
 
-    if not (gemini_key or groq_key):
-        return "⚠️ AI 응답 생성에 실패했습니다. Vercel 환경변수 GEMINI_API_KEY 또는 GROQ_API_KEY를 설정해주세요."
+def _gemini_attempt(g_model: str, gemini_key: str, system_prompt: str, user_prompt: str, timeout: float,
+                    cancel=None):
+    """
+    One Gemini model, both request configs in turn (Gemini 2.5 Flash thinking fix, then plain).
+    Stops before the next request once the hedge has settled (cancel set).
+    """
+    from app.services.llm_hedge import AttemptResult
+
+    g_url = f"https://generativelanguage.googleapis.com/v1beta/models/{g_model}:generateContent?key={gemini_key}"
+    started = time.monotonic()
+    best = AttemptResult()
+    for req_body in _gemini_request_bodies(system_prompt, user_prompt):
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            break
+        if cancel is not None and cancel.is_set():
+            best.cancelled = True
+            break
+        try:
+            resp = requests.post(g_url, json=req_body, timeout=min(55, remaining))
+            if resp.status_code == 200:
+                resp_json = resp.json()
+                candidates = resp_json.get("candidates", [])
+                if candidates:
+                    text = "".join(p.get("text", "") for p in candidates[0].get("content", {}).get("parts", [])).strip()
+                    finish_reason = candidates[0].get("finishReason", "UNKNOWN")
+                    usage = resp_json.get("usageMetadata", {})
+                    out_tokens = usage.get("candidatesTokenCount", 0)
+                    in_tokens = usage.get("promptTokenCount", 0)
+
+                    if not text:
+                        continue
+
+                    diag = f"| 종료: {finish_reason} | 입력: {in_tokens}토큰, 출력: {out_tokens}토큰"
+                    model_tag = f"\n\n---\n> ☁️ **AI 모델**: {g_model} (Google Gemini) {diag}"
+                    cleaned = _clean_llm_output(text)
+
+                    # 정상 완료 (STOP) 이거나 충분한 분량 (1200자 이상)이면 즉시 채택
+                    if finish_reason == "STOP" or len(cleaned) >= 1200:
+                        return AttemptResult(cleaned, model_tag, complete=True)
+
+                    # 너무 짧게 잘린 경우 후보로 보관하고 다음 시도
+                    if len(cleaned) > len(best.text):
+                        best = AttemptResult(cleaned, model_tag)
+
+            elif resp.status_code == 429:
+                best.error = f"{g_model} 429 한도 초과"
+                best.rate_limited = True
+                break
+            else:
+                best.error = f"{g_model} HTTP {resp.status_code}"
+        except Exception as e:
+            best.error = f"{g_model} 예외: {str(e)[:100]}"
+            continue
+    return best
 
-    last_error = ""
-    best_response = ""
-    best_model_tag = ""
+def _groq_attempt(g_model: str, groq_key: str, system_prompt: str, user_prompt: str, max_tokens: int, timeout: float):
+    """Groq fallback; its answer wins only if longer than any truncated Gemini answer."""
+    from app.services.llm_hedge import AttemptResult
 
-    # 1. Gemini API - v1beta ONLY
-    if gemini_key:
-        gemini_models = [
-            "gemini-2.5-flash",
-            "gemini-1.5-flash",
-            "gemini-2.5-flash-lite",
-        ]
-        for g_model in gemini_models:
-            g_url = f"https://generativelanguage.googleapis.com/v1beta/models/{g_model}:generateContent?key={gemini_key}"
-            
-            # Gemini 2.5 Flash의 Thinking 버짓 문제를 해결하기 위한 요청 생성
-            # thinkingBudget: 0 으로 설정하여 추론 토큰 소진 없이 100% 한국어 임상 분석 본문 출력에 집중
-            req_configs = [
-                # Config 1: thinkingBudget: 0 (Gemini 2.5 Flash용 초고속/전체 토큰 출력)
-                {
-                    "systemInstruction": {"parts": [{"text": system_prompt}]},
-                    "contents": [{"role": "user", "parts": [{"text": user_prompt}]}],
-                    "generationConfig": {
-                        "temperature": 0.6,
-                        "maxOutputTokens": 8192,
-                        "thinkingConfig": {"thinkingBudget": 0}
-                    }
-                },
-                # Config 2: 기본 generationConfig (Gemini 1.5 등 thinkingConfig 미지원 모델용)
-                {
-                    "systemInstruction": {"parts": [{"text": system_prompt}]},
-                    "contents": [{"role": "user", "parts": [{"text": user_prompt}]}],
-                    "generationConfig": {
-                        "temperature": 0.6,
-                        "maxOutputTokens": 8192
-                    }
-                }
-            ]
-            
-            for req_body in req_configs:
-                try:
-                    resp = requests.post(g_url, json=req_body, timeout=55)
-                    if resp.status_code == 200:
-                        resp_json = resp.json()
-                        candidates = resp_json.get("candidates", [])
-                        if candidates:
-                            text = "".join(p.get("text", "") for p in candidates[0].get("content", {}).get("parts", [])).strip()
-                            finish_reason = candidates[0].get("finishReason", "UNKNOWN")
-                            usage = resp_json.get("usageMetadata", {})
-                            out_tokens = usage.get("candidatesTokenCount", 0)
-                            in_tokens = usage.get("promptTokenCount", 0)
-                            
-                            if not text:
-                                continue
-                            
-                            diag = f"| 종료: {finish_reason} | 입력: {in_tokens}토큰, 출력: {out_tokens}토큰"
-                            model_tag = f"\n\n---\n> ☁️ **AI 모델**: {g_model} (Google Gemini) {diag}"
-                            cleaned = _clean_llm_output(text)
-                            
-                            # 정상 완료 (STOP) 이거나 충분한 분량 (1200자 이상)이면 즉시 반환
-                            if finish_reason == "STOP" or len(cleaned) >= 1200:
-                                return cleaned + model_tag
-                            
-                            # 너무 짧게 잘린 경우 저장 후 다음 시도
-                            if len(cleaned) > len(best_response):
-                                best_response = cleaned
-                                best_model_tag = model_tag
-                                
-                    elif resp.status_code == 429:
-                        last_error = f"{g_model} 429 한도 초과"
-                        break
-                    else:
-                        last_error = f"{g_model} HTTP {resp.status_code}"
-                except Exception as e:
-                    last_error = f"{g_model} 예외: {str(e)[:100]}"
-                    continue
-
-    # 2. Groq Fallback (Gemini 실패 또는 잘림 시)
-    if groq_key:
-        GROQ_MAX_CHARS = 18000
-        groq_system = system_prompt[:3000] if len(system_prompt) > 3000 else system_prompt
-        groq_user = user_prompt[:GROQ_MAX_CHARS] if len(user_prompt) > GROQ_MAX_CHARS else user_prompt
+    try:
+        resp = requests.post(
+            GROQ_CHAT_URL,
+            headers={"Authorization": f"Bearer {groq_key}", "Content-Type": "application/json"},
+            json=_groq_payload(system_prompt, user_prompt, max_tokens, g_model),
+            timeout=min(45, timeout)
+        )
+        if resp.status_code == 200:
+            content = resp.json().get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+            if content:
+                cleaned = _clean_llm_output(content)
+                groq_tag = f"\n\n---\n> ☁️ **AI 모델**: {g_model} (Groq)"
+                return AttemptResult(cleaned, groq_tag, complete=True, longer_wins=True)
+        elif resp.status_code == 429:
+            return AttemptResult(error=f"Groq {g_model} HTTP 429", rate_limited=True)
+        return AttemptResult(error=f"Groq {g_model} HTTP {resp.status_code}")
+    except Exception as e:
+        return AttemptResult(error=f"Groq {g_model}: {str(e)}")
 
-        for g_model in ["openai/gpt-oss-120b", "openai/gpt-oss-20b"]:
-            try:
-                resp = requests.post(
-                    "https://api.groq.com/openai/v1/chat/completions",
-                    headers={"Authorization": f"Bearer {groq_key}", "Content-Type": "application/json"},
-                    json={
-                        "model": g_model,
-                        "messages": [
-                            {"role": "system", "content": groq_system},
-                            {"role": "user", "content": groq_user}
-                        ],
-                        "max_tokens": min(max_tokens, 4096),
-                        "temperature": 0.6
-                    },
-                    timeout=45
-                )
-                if resp.status_code == 200:
-                    content = resp.json().get("choices", [{}])[0].get("message", {}).get("content", "").strip()
-                    if content:
-                        cleaned = _clean_llm_output(content)
-                        groq_tag = f"\n\n---\n> ☁️ **AI 모델**: {g_model} (Groq)"
-                        if len(cleaned) > len(best_response):
-                            return cleaned + groq_tag
-                elif resp.status_code == 429:
-                    if not best_response:
-                        return "⏳ AI 분석 요청이 너무 많아 잠시 대기 중입니다. 1분 후 다시 [Refresh]를 눌러주세요. (Groq 무료 한도 초과)"
-                    break
-                last_error = f"Groq {g_model} HTTP {resp.status_code}"
-            except Exception as e:
-                last_error = f"Groq {g_model}: {str(e)}"
-                continue
+def _cloud_attempts(system_prompt: str, user_prompt: str, max_tokens: int) -> list:
+    """Gemini models, then Groq models, in fallback order."""
+    from app.services.llm_hedge import Attempt
 
+    attempts = []
+    gemini_key = _gemini_key()
+    groq_key = os.getenv("GROQ_API_KEY", "").strip()
+    if gemini_key:
+        for g_model in GEMINI_MODELS:
+            attempts.append(Attempt(
+                g_model,
+                lambda t, c, m=g_model: _gemini_attempt(m, gemini_key, system_prompt, user_prompt, t, c),
+                timeout=110, group=g_model))
+    if groq_key:
+        for g_model in GROQ_MODELS:
+            attempts.append(Attempt(
+                f"groq:{g_model}",
+                lambda t, c, m=g_model: _groq_attempt(m, groq_key, system_prompt, user_prompt, max_tokens, t),
+                timeout=45, group="groq"))
+    return attempts
+
+def _local_attempt(system_prompt: str, user_prompt: str, max_tokens: int):
+    from app.services.llm_hedge import Attempt, AttemptResult
+    from app.services.llm_providers import local_llm_registry
+
+    provider = local_llm_registry.resolve()
+    if provider is None:
+        return None
+
+    def run(timeout: float, cancel):
+        result = _local_llm_request(provider, system_prompt, user_prompt, max_tokens, timeout)
+        if result:
+            return AttemptResult(result, complete=True)
+        return AttemptResult(error=f"local {provider.model}: 응답 없음")
+
+    return Attempt("local", run, timeout=175)
+
+def _dispatch(attempts: list) -> str:
+    """Hedged run over the attempts; the answer, or the same notices the sequential chain gave."""
+    from app.core.config import settings
+    from app.services.llm_hedge import run_hedged
+
+    outcome = run_hedged(attempts, hedge_delay=settings.LLM_HEDGE_DELAY,
+                         max_parallel=settings.LLM_HEDGE_MAX_PARALLEL)
+    if outcome.winner:
+        return outcome.winner.text + outcome.winner.tag
     # 최장 응답 반환
-    if best_response:
-        return best_response + best_model_tag
-
+    if outcome.best:
+        return outcome.best.text + outcome.best.tag
+    if "groq" in outcome.rate_limited:
+        return "⏳ AI 분석 요청이 너무 많아 잠시 대기 중입니다. 1분 후 다시 [Refresh]를 눌러주세요. (Groq 무료 한도 초과)"
+    last_error = "전체 응답 제한시간 초과" if outcome.timed_out else (outcome.errors[-1] if outcome.errors else "")
     return f"⚠️ 모든 AI 모델 호출에 실패했습니다. (마지막 오류: {last_error})"
 
+def _call_gemini(system_prompt: str, user_prompt: str, max_tokens: int = 4096) -> str:
+    """Fallback Gemini & Cloud API call wrapper - with thinkingBudget fix and robust fallbacks (hedged)."""
+    attempts = _cloud_attempts(system_prompt, user_prompt, max_tokens)
+    if not attempts:
+        return "⚠️ AI 응답 생성에 실패했습니다. Vercel 환경변수 GEMINI_API_KEY 또는 GROQ_API_KEY를 설정해주세요."
+    return _dispatch(attempts)
+
+def _call_llm_uncached(system_prompt: str, user_prompt: str, max_tokens: int = 8192) -> str:
+    """
+    Local model first, then Gemini and Groq, as one hedged chain (llm_hedge.run_hedged):
+    a slow provider gets company after LLM_HEDGE_DELAY seconds instead of blocking the
+    fallbacks until its timeout, and the whole call ends by the request deadline.
+    """
+    no_keys = "⚠️ AI 응답 생성에 실패했습니다. Vercel 환경변수 GEMINI_API_KEY 또는 GROQ_API_KEY를 설정해주세요."
+    local = _local_attempt(system_prompt, user_prompt, max_tokens)
+    cloud = _cloud_attempts(system_prompt, user_prompt, max_tokens)
+    if not local and not cloud:
+        return no_keys
+    result = _dispatch(([local] if local else []) + cloud)
+    if not cloud and result.startswith("⚠️"):
+        return no_keys
+    return result
+
+def _llm_model_id() -> str:
+    """Model the dispatcher tries first (discovered local model, else the primary Gemini model)."""
+    from app.services.llm_providers import local_llm_registry
+    provider = local_llm_registry.peek()
+    if provider is not None:
+        return f"local:{provider.model}"
+    return f"cloud:{GEMINI_MODELS[0]}"
+
+def _is_cacheable_result(result: str) -> bool:
+    # 실패·한도 초과 안내문(⚠️/⏳)은 캐시하지 않는다
+    return bool(result) and not result.lstrip().startswith(("⚠️", "⏳"))
+
 def _call_llm(system_prompt: str, user_prompt: str, max_tokens: int = 8192) -> str:
-    """Primary LLM dispatcher: tries Local Ollama/LM Studio first, falls back to Gemini API."""
-    ollama_result = _call_ollama(system_prompt, user_prompt, max_tokens)
-    if ollama_result:
-        return ollama_result
-    return _call_gemini(system_prompt, user_prompt, max_tokens)
+    """
+    Primary LLM dispatcher: tries Local Ollama/LM Studio first, falls back to Gemini API.
+    Results are cached by a hash of (system prompt, user prompt, model, max_tokens), so a
+    byte-identical evidence payload is answered from llm_result_cache; run under
+    llm_cache.regenerating() to force a fresh generation.
+    Under llm_stream.capturing_prompts() the prompt is only recorded (for the SSE endpoints).
+    """
+    from app.services.llm_stream import capture_prompt
+    if capture_prompt(system_prompt, user_prompt, max_tokens):
+        return ""
+
+    from app.core.config import settings
+    if not settings.LLM_CACHE_ENABLED:
+        return _call_llm_uncached(system_prompt, user_prompt, max_tokens)
+
+    from app.services.llm_cache import llm_cache_key, llm_result_cache
+    key = llm_cache_key(system_prompt, user_prompt, _llm_model_id(), max_tokens)
+    return llm_result_cache.get_or_generate(
+        key,
+        lambda: _call_llm_uncached(system_prompt, user_prompt, max_tokens),
+        cache_if=_is_cacheable_result,
+    )
 
 
 # ==============================================================================
@@ -519,7 +619,7 @@ def generate_bcba_section_analysis(
         full_logs: list = []
         if codes:
             from app.services.sheets import fetch_all_records, fetch_student_status
-            from app.services.normalize import normalize_behavior_log
+            from app.services.event_store import normalize_logs
 
             status_records = fetch_student_status()
             tier_info_map = {}
@@ -527,10 +627,11 @@ def generate_bcba_section_analysis(
                 code = str(s.get("학생코드", "")).strip()
                 if code:
                     tier_info_map[code] = {"class": s.get("학급", ""), "tier": s.get("Tier", 1)}
-            for r in fetch_all_records():
-                rc = str(r.get("학생코드", r.get("코드번호", ""))).strip()
-                if rc in codes:
-                    full_logs.append(normalize_behavior_log(r, tier_info_map))
+            candidate_rows = [
+                r for r in fetch_all_records()
+                if str(r.get("학생코드", r.get("코드번호", ""))).strip() in codes
+            ]
+            full_logs = normalize_logs(candidate_rows, tier_info_map)
         logs_str = json.dumps(full_logs[-150:], ensure_ascii=False, indent=2)
 
         prompt = f"""[분석 영역: {target_tier} 상향 검토 대상자 선정 근거 분석]
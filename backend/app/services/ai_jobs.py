@@ -0,0 +1,291 @@
+# backend/app/services/ai_jobs.py
+# 장시간 AI 보고서 작업 큐:
+# BIP 전문·Tier 3 컨설팅·SST 회의록은 로컬 모델에서 수 분이 걸려 요청 하나(Vercel 60초) 안에 끝나지 않는다.
+# 요청은 프롬프트만 만들어 작업으로 제출하고 job id를 즉시 돌려받는다. 워커 풀이 _call_llm 체인을 실행하고,
+# 상태와 결과는 SQLite에 남아 폴링·재시작 후에도 조회된다. 같은 프롬프트의 작업이 진행 중이면 그 작업을 공유한다.
+# 워커 스레드와 SQLite 파일이 한 프로세스에 묶여 있으므로 상시 실행 서버가 필요하다 (AI_JOBS_ENABLED).
+# Vercel처럼 요청 사이에 멈추는 서버리스 환경에서는 /jobs 라우트가 501을 돌려주고 /stream 변형을 쓴다.
+
+import os
+import time
+import uuid
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+
+AI_JOBS_DB_NAME = "ai_jobs.sqlite3"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+INTERRUPTED = "interrupted"  # the process that ran it stopped before it finished
+
+_COLUMNS = ("id", "kind", "owner", "status", "cache_key", "result", "error",
+            "created_at", "started_at", "finished_at")
+
+
+def job_owners(job: Dict[str, Any]) -> List[str]:
+    """Users who submitted the job (identical submissions share one job)."""
+    return [o for o in str(job.get("owner") or "").split(",") if o]
+
+
+class AIJobStore:
+    """
+    SQLite table of AI jobs in CACHE_DIR. Every failure is logged and treated as
+    "not found"; the store never breaks a request.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.path = os.path.join(cache_dir, AI_JOBS_DB_NAME)
+        self._lock = threading.Lock()
+        self._ready = False
+        self._disabled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._disabled:
+            return None
+        try:
+            if not self._ready:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=2, check_same_thread=False)
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS ai_jobs ("
+                    " id TEXT PRIMARY KEY,"
+                    " kind TEXT NOT NULL,"
+                    " owner TEXT NOT NULL,"
+                    " status TEXT NOT NULL,"
+                    " cache_key TEXT,"
+                    " result TEXT,"
+                    " error TEXT,"
+                    " created_at REAL NOT NULL,"
+                    " started_at REAL,"
+                    " finished_at REAL)"
+                )
+                conn.commit()
+                try:
+                    # Reports quote student names and behavior notes
+                    os.chmod(self.path, 0o600)
+                except OSError:
+                    pass
+                self._ready = True
+            return conn
+        except Exception as e:
+            print(f"AI job store unavailable at {self.path}: {e}")
+            self._disabled = True
+            return None
+
+    def save(self, job: Dict[str, Any]):
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO ai_jobs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                    tuple(job.get(c) for c in _COLUMNS),
+                )
+                conn.commit()
+            except Exception as e:
+                print(f"AI job save failed for {job.get('id')}: {e}")
+            finally:
+                conn.close()
+
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM ai_jobs WHERE id = ?", (job_id,)).fetchone()
+                return dict(zip(_COLUMNS, row)) if row else None
+            except Exception as e:
+                print(f"AI job load failed for {job_id}: {e}")
+                return None
+            finally:
+                conn.close()
+
+    def prune(self, older_than: float):
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM ai_jobs WHERE created_at < ?", (older_than,))
+                conn.commit()
+            except Exception as e:
+                print(f"AI job prune failed: {e}")
+            finally:
+                conn.close()
+
+
+class AIJobQueue:
+    """
+    Worker pool for long AI reports.
+
+    - submit() takes a prompt that was already built in the request and returns a job at
+      once; a worker runs _call_llm on it (so the result also lands in the LLM result cache).
+    - A prompt that is already queued or running is not submitted twice: the caller gets
+      the existing job. A prompt whose result is cached completes immediately.
+    - Jobs are kept in memory and written to the store on every state change, so results
+      can be polled for `retention` seconds, also from a restarted process. A job left
+      queued/running by a process that stopped is reported as interrupted.
+    """
+
+    def __init__(self, workers: int = 2, retention: float = 86400, store: Optional[AIJobStore] = None):
+        self.workers = max(1, workers)
+        self.retention = retention
+        self.store = store
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, str] = {}  # cache key -> job id
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pruned = False
+
+        self.submitted = 0
+        self.deduplicated = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="ai-job")
+        return self._executor
+
+    def _persist(self, job: Dict[str, Any]):
+        if self.store is not None:
+            self.store.save(job)
+
+    def _new_job(self, kind: str, owner: str, cache_key: Optional[str], status: str) -> Dict[str, Any]:
+        return {
+            "id": uuid.uuid4().hex, "kind": kind, "owner": owner, "status": status, "cache_key": cache_key,
+            "result": None, "error": None, "created_at": time.time(), "started_at": None, "finished_at": None,
+        }
+
+    def complete(self, kind: str, owner: str, result: str) -> Dict[str, Any]:
+        """A job that is done on arrival (the endpoint answered without calling the model)."""
+        job = self._new_job(kind, owner, None, DONE)
+        job["result"] = result
+        job["finished_at"] = job["created_at"]
+        with self._lock:
+            self._jobs[job["id"]] = job
+        self._persist(dict(job))
+        return dict(job)
+
+    def submit(self, kind: str, owner: str, system_prompt: str, user_prompt: str,
+               max_tokens: int, regenerate: bool = False) -> Dict[str, Any]:
+        from app.services.ai_insight import _llm_model_id
+        from app.services.llm_cache import llm_cache_key, llm_result_cache
+
+        if self.store is not None and not self._pruned:
+            self._pruned = True
+            self.store.prune(time.time() - self.retention)
+
+        cache_key = llm_cache_key(system_prompt, user_prompt, _llm_model_id(), max_tokens)
+        if not regenerate and settings.LLM_CACHE_ENABLED:
+            cached = llm_result_cache.peek(cache_key)
+            if cached is not None:
+                return self.complete(kind, owner, cached)
+
+        with self._lock:
+            expired = [jid for jid, j in self._jobs.items()
+                       if j["finished_at"] and time.time() - j["created_at"] >= self.retention]
+            for jid in expired:
+                del self._jobs[jid]
+            job_id = self._inflight.get(cache_key)
+            if job_id is not None:
+                self.deduplicated += 1
+                job = self._jobs[job_id]
+                # The same prompt means the caller passed the same scope checks: share the job
+                is_new = False
+                if owner not in job_owners(job):
+                    job["owner"] = ",".join(job_owners(job) + [owner])
+            else:
+                job = self._new_job(kind, owner, cache_key, QUEUED)
+                self._jobs[job["id"]] = job
+                self._inflight[cache_key] = job["id"]
+                self.submitted += 1
+                is_new = True
+            snapshot = dict(job)
+        self._persist(snapshot)
+        if is_new:
+            self._pool().submit(self._run, job["id"], system_prompt, user_prompt, max_tokens, regenerate)
+        return snapshot
+
+    def _run(self, job_id: str, system_prompt: str, user_prompt: str, max_tokens: int, regenerate: bool):
+        from app.services.ai_insight import _call_llm, _is_cacheable_result
+        from app.services.llm_cache import regenerating
+        from app.services.llm_hedge import llm_deadline
+
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = RUNNING
+            job["started_at"] = time.time()
+            snapshot = dict(job)
+        self._persist(snapshot)
+        try:
+            # Not bound by the request budget: jobs exist for reports that outlast it
+            with regenerating(regenerate), llm_deadline(settings.AI_JOB_DEADLINE):
+                result = _call_llm(system_prompt, user_prompt, max_tokens)
+            ok = _is_cacheable_result(result)
+            error = None if ok else result
+        except Exception as e:
+            print(f"[AIJobs] job {job_id} failed: {e}")
+            result, ok, error = None, False, str(e)[:300]
+        with self._lock:
+            job["status"] = DONE if ok else FAILED
+            job["result"] = result
+            job["error"] = error
+            job["finished_at"] = time.time()
+            self._inflight.pop(job["cache_key"], None)
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+            snapshot = dict(job)
+        self._persist(snapshot)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return dict(job)
+        job = self.store.load(job_id) if self.store is not None else None
+        if job is None or time.time() - job["created_at"] >= self.retention:
+            return None
+        if job["status"] in (QUEUED, RUNNING):
+            job["status"] = INTERRUPTED
+            job["error"] = "작업을 실행하던 서버가 재시작되어 중단되었습니다. 다시 요청해 주세요."
+        return job
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda j: j["created_at"], reverse=True)[:limit]
+            return [{k: v for k, v in j.items() if k not in ("result", "cache_key")} for j in jobs]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            by_status: Dict[str, int] = {}
+            for job in self._jobs.values():
+                by_status[job["status"]] = by_status.get(job["status"], 0) + 1
+            return {
+                "workers": self.workers,
+                "persistent": self.store is not None and not self.store._disabled,
+                "jobs": by_status,
+                "inflight": len(self._inflight),
+                "submitted": self.submitted,
+                "deduplicated": self.deduplicated,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+
+ai_job_queue = AIJobQueue(
+    workers=settings.AI_JOB_WORKERS,
+    retention=settings.AI_JOB_RETENTION,
+    store=AIJobStore(settings.CACHE_DIR),
+)
@@ -1,6 +1,9 @@
-from app.services.sheets import fetch_all_records, fetch_student_codes, get_beable_code_mapping, fetch_student_status, get_enrolled_student_count
+from app.services.sheets import fetch_all_records, fetch_student_codes, get_beable_code_mapping, fetch_student_status, get_enrolled_student_count, prefetch_log_and_tier_status
 from app.schemas import BehaviorRecord
+from app.services.event_table import get_event_table
+from app.services.event_index import get_event_index
 import pandas as pd
+import numpy as np
 import re
 from typing import List, Dict
 from app.services.ai_insight import generate_ai_insight, generate_meeting_agent_report
@@ -42,9 +45,17 @@ def normalize_function(raw: str) -> str:
 def aggregate_functions(series) -> list:
     """pandas Series(기능 컬럼)를 6개 카테고리로 집계, 0인 항목 제외 후 정렬."""
     counts = {cat: 0 for cat in _FUNCTION_CATEGORIES}
-    for val in series:
+    # 고유값마다 한 번만 정규화
+    for val, n in pd.Series(series).value_counts(dropna=False).items():
         cat = normalize_function(val)
-        counts[cat] = counts.get(cat, 0) + 1
+        counts[cat] = counts.get(cat, 0) + int(n)
+    return function_stats_from_counts(counts)
+
+def function_stats_from_counts(category_counts: dict) -> list:
+    """{카테고리: 건수} → 차트용 목록 (0인 항목 제외, 내림차순, '기타'는 마지막)."""
+    counts = {cat: 0 for cat in _FUNCTION_CATEGORIES}
+    for cat, n in category_counts.items():
+        counts[cat] = counts.get(cat, 0) + int(n)
     # 0인 카테고리 제외, 정렬(내림차순), '기타'는 마지막
     result = []
     for cat in _FUNCTION_CATEGORIES[:-1]:  # 기타 제외
@@ -67,6 +78,17 @@ def extract_numeric(val, default=0):
         return float(match.group(1))
     return default
 
+def extract_numeric_series(series, default=0):
+    """Vectorized extract_numeric(): first run of digits as float, default when missing."""
+    digits = series.map(str).str.extract(r'(\d+)', expand=False)
+    return digits.map(float, na_action='ignore').fillna(default).astype(float)
+
+def month_labels(date_series):
+    """date_series.dt.strftime('%Y-%m'), formatting each distinct date only once (NaT stays missing)."""
+    distinct = date_series.dropna().unique()
+    labels = dict(zip(distinct, pd.DatetimeIndex(distinct).strftime('%Y-%m')))
+    return date_series.map(labels)
+
 def robust_parse_dates(date_series):
     import pandas as pd
     cleaned = date_series.astype(str).replace(r'[^\d]+', '-', regex=True).str.strip('-')
@@ -91,6 +113,8 @@ def sort_time_slots(slots):
     return sorted(slots, key=lambda x: parse_time(x['name']))
 
 def get_analytics_data(start_date: str = None, end_date: str = None, class_id: str = None):
+    # Log_Main and TierStatus come back in one batchGet when both are cold
+    prefetch_log_and_tier_status()
     raw_data = fetch_all_records()
     
     empty_res = {
@@ -104,7 +128,9 @@ def get_analytics_data(start_date: str = None, end_date: str = None, class_id: s
     if not raw_data:
         return empty_res
 
-    df = pd.DataFrame(raw_data)
+    # Pre-aggregated counts, rebuilt only when Log_Main ingestion yields a new record set
+    from app.services.analytics_cube import get_analytics_cube, with_student_columns
+    cube = get_analytics_cube(raw_data)
     
     # 2. Get BeAble code mapping & TierStatus for O(1) Indexed Lookups
     all_status = fetch_student_status() or []
@@ -140,74 +166,73 @@ def get_analytics_data(start_date: str = None, end_date: str = None, class_id: s
         if sn and sn not in name_map:
             name_map[sn] = {'student_code': sc or sn, 'student_name': sn}
 
-    # 3. Filter & Map Data in O(N) instead of O(N * M)
-    resolved_records = []
-    records_list = df.to_dict('records')
-    for row in records_list:
-        s_code = str(row.get('학생코드', '')).strip()
-        s_name = str(row.get('학생명', '')).strip()
-        
-        info = code_map.get(s_code) or name_map.get(s_name)
-        if info:
-            row['student_code'] = info['student_code']
-            row['student_name_labeled'] = info.get('student_name', info['student_code'])
-        else:
-            raw_name = s_name or s_code or "Unknown"
-            row['student_code'] = raw_name
-            row['student_name_labeled'] = raw_name
-            
-        resolved_records.append(row)
-    
-    if not resolved_records:
-        return empty_res
-
-    df = pd.DataFrame(resolved_records)
+    # 3. Resolve codes once per distinct (code, name) pair of the pre-aggregated cube
+    cells = with_student_columns(cube.cells, code_map, name_map)
+    alerts = with_student_columns(cube.alerts, code_map, name_map) if cube.alerts is not None else None
     # Ensure columns exist for downstream logic
-    if '학생코드' not in df.columns:
-        df['학생코드'] = df['student_code']
-    
-    # Ensure numeric columns are actually numeric using regex extraction
-    if '강도' in df.columns:
-        df['강도'] = df['강도'].apply(lambda x: extract_numeric(x, 0))
-    if '발생횟수' in df.columns:
-        df['발생횟수'] = df['발생횟수'].apply(lambda x: extract_numeric(x, 1))
-    else:
-        df['발생횟수'] = 1
+    if '학생코드' not in cube.columns:
+        cells['학생코드'] = cells['student_code']
+        if alerts is not None:
+            alerts['학생코드'] = alerts['student_code']
 
     # --- Date Filtering ---
-    if '행동발생날짜' in df.columns:
-        df['date_obj'] = robust_parse_dates(df['행동발생날짜'])
-        
-        if start_date:
-            df = df[df['date_obj'] >= pd.to_datetime(start_date)]
+    has_dates = '행동발생날짜' in cube.columns
+    if has_dates and start_date:
+        start_ts = pd.to_datetime(start_date)
+        cells = cells[cells['date_obj'] >= start_ts]
+        if alerts is not None:
+            alerts = alerts[alerts['date_obj'] >= start_ts]
     # --- Class Filtering ---
-    if class_id and not df.empty:
+    if class_id and not cells.empty:
         try:
-            from app.api.deps import normalize_class_identifier, get_student_class_code
+            from app.api.deps import normalize_class_identifier
+            from app.services.roster_index import get_roster_index
             target_canonical = normalize_class_identifier(class_id)
+            roster = get_roster_index()
             def _matches_class(sc):
                 sc_str = str(sc).strip()
                 if sc_str.startswith(str(class_id)):
                     return True
-                resolved = get_student_class_code(sc_str)
-                return resolved == target_canonical
-            df = df[df['student_code'].apply(_matches_class)]
+                entry = roster.get(sc_str)
+                return entry is not None and entry.class_code == target_canonical
+            # Resolve each distinct code once instead of once per log row
+            matches = {sc: _matches_class(sc) for sc in cells['student_code'].unique()}
+            cells = cells[cells['student_code'].map(matches).astype(bool)]
+            if alerts is not None:
+                alerts = alerts[alerts['student_code'].map(lambda sc: matches.get(sc, _matches_class(sc))).astype(bool)]
         except Exception:
-            df = df[df['student_code'].str.startswith(str(class_id), na=False)]
-    
+            cells = cells[cells['student_code'].astype(str).str.startswith(str(class_id), na=False)]
+            if alerts is not None:
+                alerts = alerts[alerts['student_code'].astype(str).str.startswith(str(class_id), na=False)]
+
+    def _counts_by(keys):
+        """Row count per key(s), summed over cube cells (same index/order as groupby().size())."""
+        return cells.groupby(keys)['count'].sum()
+
+    def _mean_by(keys, col):
+        weighted = (cells[col] * cells['count']).groupby([cells[k] for k in keys]).sum()
+        return weighted / _counts_by(keys)
+
+    if has_dates:
+        dates = cells['date_obj']
+        cells = cells.assign(
+            weekday=dates.dt.dayofweek,
+            month_label=month_labels(dates),
+        )
+
     # --- Tier 1: Big 5 Analysis ---
-    if not df.empty:
+    if not cells.empty:
         # Daily trend: count form submissions per date (not frequency sum)
-        date_counts = df.groupby('행동발생날짜').size().sort_index().to_dict()
+        date_counts = {k: int(v) for k, v in _counts_by('행동발생날짜').sort_index().items()}
         
         # Weekly Trend: count submissions per week
         weekly_counts = {}
-        if 'date_obj' in df.columns:
-            df['week'] = df['date_obj'].dt.isocalendar().week.fillna(-1).astype(int)
-            df['year'] = df['date_obj'].dt.year.fillna(-1).astype(int)
+        if has_dates:
+            cells['week'] = cells['date_obj'].dt.isocalendar().week.fillna(-1).astype(int)
+            cells['year'] = cells['date_obj'].dt.year.fillna(-1).astype(int)
             # Filter valid dates for weekly
-            valid_df = df[df['year'] > 0]
-            w_grouped = valid_df.groupby(['year', 'week']).size()  # count rows
+            valid = cells[cells['year'] > 0]
+            w_grouped = valid.groupby(['year', 'week'])['count'].sum()  # count rows
             for (y, w), count in w_grouped.items():
                 label = f"{y}-W{w:02d}"
                 weekly_counts[label] = int(count)
@@ -217,20 +242,20 @@ def get_analytics_data(start_date: str = None, end_date: str = None, class_id: s
 
     # 3. Location Stats (Big 5) - count submissions per location
     location_stats = []
-    if '장소' in df.columns:
-        loc_counts = df.groupby('장소').size().sort_values(ascending=False).head(10)
+    if '장소' in cube.columns:
+        loc_counts = _counts_by('장소').sort_values(ascending=False).head(10)
         location_stats = [{"name": k, "value": int(v)} for k, v in loc_counts.items()]
 
     # 4. Time Stats (Big 5) - count submissions per time slot
     time_stats = []
-    if '시간대' in df.columns:
-        t_counts = df.groupby('시간대').size()
+    if '시간대' in cube.columns:
+        t_counts = _counts_by('시간대')
         time_stats = sort_time_slots([{"name": k, "value": int(v)} for k, v in t_counts.items()])
 
     # 5. Behavior Type Stats (Big 5) - count submissions per behavior type
     behavior_stats = []
-    if '행동유형' in df.columns:
-        b_counts = df.groupby('행동유형').size().sort_values(ascending=False).head(5)
+    if '행동유형' in cube.columns:
+        b_counts = _counts_by('행동유형').sort_values(ascending=False).head(5)
         behavior_stats = [{"name": k, "value": int(v)} for k, v in b_counts.items()]
 
     # --- Tier 2: Screening & Hot Spots ---
@@ -238,92 +263,83 @@ def get_analytics_data(start_date: str = None, end_date: str = None, class_id: s
     # 6. At Risk Students (Frequency >= 3 OR Intensity >= 5) - Use 학생코드
     at_risk_list = []
     
-    if '학생코드' in df.columns:
-        # Group by Student Code (4-digit), sum 발생횟수 for accurate PBIS incident count
-        student_groups = df.groupby('학생코드')
-        for student_code, group in student_groups:
-            freq_count = len(group)  # PBIS: number of submissions (report frequency)
-            max_intensity = group['강도'].max()
-            
-            tier = "Tier 1"
-            if freq_count >= 6 or (pd.notna(max_intensity) and max_intensity >= 5):
-                tier = "Tier 3"
-            elif freq_count >= 3:
-                tier = "Tier 2"
-            
-            # 이미 해당 단계 이상으로 배정된 학생은 "상향 검토 대상자"에서 제외한다
-            # (Tier2 후보는 Tier2 이상 배정자 제외, Tier3 후보는 Tier3 이상 배정자 제외)
-            assigned_tier = assigned_tier_cache.get(str(student_code), 'Tier 1')
-            tier_rank = {"Tier 1": 0, "Tier 2": 1, "Tier 3": 2, "Tier 3+": 3}
-            already_assigned = tier_rank.get(assigned_tier, 0) >= tier_rank.get(tier, 0)
-
-            if tier != "Tier 1" and not already_assigned:
-                student_name_label = group['student_name_labeled'].iloc[0] if 'student_name_labeled' in group.columns else str(student_code)
-                at_risk_list.append({
-                    "name": student_name_label,
-                    "student_code": str(student_code),
-                    "count": freq_count,
-                    "max_intensity": int(max_intensity) if pd.notna(max_intensity) else 0,
-                    "tier": tier,
-                    "class": tier_status_cache.get(str(student_code), '-')
-                })
+    if not cells.empty:
+        # Group by Student Code (4-digit); PBIS count = number of submissions (report frequency)
+        student_groups = cells.sort_values('first_row', kind='stable').groupby('학생코드')
+        students = pd.DataFrame({
+            "count": student_groups['count'].sum(),
+            "max_intensity": student_groups['강도'].max(),
+            # Label of the student's earliest log row
+            "name": student_groups['student_name_labeled'].first(),
+        })
+        students["code"] = students.index.map(str)
+        students["tier"] = np.select(
+            [(students["count"] >= 6) | (students["max_intensity"] >= 5), students["count"] >= 3],
+            ["Tier 3", "Tier 2"],
+            default="Tier 1",
+        )
+
+        # 이미 해당 단계 이상으로 배정된 학생은 "상향 검토 대상자"에서 제외한다
+        # (Tier2 후보는 Tier2 이상 배정자 제외, Tier3 후보는 Tier3 이상 배정자 제외)
+        tier_rank = {"Tier 1": 0, "Tier 2": 1, "Tier 3": 2, "Tier 3+": 3}
+        assigned_rank = students["code"].map(lambda c: tier_rank.get(assigned_tier_cache.get(c, 'Tier 1'), 0))
+        candidates = students[(students["tier"] != "Tier 1") & (assigned_rank < students["tier"].map(tier_rank))]
+
+        at_risk_list = [
+            {
+                "name": row["name"],
+                "student_code": row["code"],
+                "count": int(row["count"]),
+                "max_intensity": int(row["max_intensity"]) if pd.notna(row["max_intensity"]) else 0,
+                "tier": row["tier"],
+                "class": tier_status_cache.get(row["code"], '-')
+            }
+            for row in candidates.to_dict('records')
+        ]
     
     # Sort risk list by Tier (desc) then Count (desc)
     at_risk_list.sort(key=lambda x: (x['tier'], x['count']), reverse=True)
 
     # 7. Function Analysis (Why?) - 6개 표준 카테고리로 정규화
     function_stats = []
-    if '기능' in df.columns:
-        function_stats = aggregate_functions(df['기능'])
+    if '기능' in cube.columns:
+        function_stats = function_stats_from_counts(_counts_by('기능').to_dict()) if not cells.empty else []
 
     # 8. Heatmap (Location x Time) - Hotspot Analysis using row count
     heatmap_data = []
-    if '장소' in df.columns and '시간대' in df.columns:
-        ct = df.groupby(['장소', '시간대']).size().unstack(fill_value=0)
-        for loc in ct.index:
-            for time in ct.columns:
-                val = ct.loc[loc, time]
-                if val > 0:
-                    heatmap_data.append({
-                        "y": loc,
-                        "x": time,
-                        "value": int(val)
-                    })
+    if '장소' in cube.columns and '시간대' in cube.columns and not cells.empty:
+        ct = _counts_by(['장소', '시간대']).unstack(fill_value=0)
+        # Row-major (location, time) order, same as walking the crosstab cell by cell
+        cells_2d = ct.stack()
+        cells_2d = cells_2d[cells_2d > 0]
+        heatmap_data = [
+            {"y": loc, "x": time, "value": int(val)}
+            for (loc, time), val in cells_2d.items()
+        ]
 
     # --- Tier 3: Safety Alerts (Intensity >= 5) ---
     safety_alerts = []
-    if '강도' in df.columns:
-        high_intensity_df = df[df['강도'] >= 5]
-        # Sort by date desc
-        if '행동발생날짜' in high_intensity_df.columns:
-            # high_intensity_df.sort_values(by='행동발생날짜', ascending=False, inplace=True)
-            pass
-        
-        for _, row in high_intensity_df.iterrows():
-            raw_int_val = row.get('강도', 5)
-            try:
-                alert_int = int(raw_int_val) if pd.notna(raw_int_val) else 5
-            except Exception:
-                alert_int = 5
-            safety_alerts.append({
-                "date": row.get('행동발생날짜', '-'),
-                "student": row.get('학생코드', row.get('학생명', '-')),  # Use 4-digit student code
-                "location": row.get('장소', '-'),
-                "type": row.get('행동유형', '-'),
-                "intensity": alert_int
-            })
-
-
+    if alerts is not None:
+        def _alert_column(col, fallback='-'):
+            if col in cube.columns:
+                return alerts[col].astype(object)
+            return pd.Series(fallback, index=alerts.index, dtype=object)
+
+        safety_alerts = pd.DataFrame({
+            "date": _alert_column('행동발생날짜'),
+            "student": alerts['학생코드'].astype(object),  # Use 4-digit student code
+            "location": _alert_column('장소'),
+            "type": _alert_column('행동유형'),
+            "intensity": alerts['강도'].astype(int).astype(object),
+        }).to_dict('records')
 
-
-    
     # Summary Stats — use ROW COUNT (= number of form submissions, not frequency sum)
-    total_incidents = len(df)
+    total_incidents = int(cells['count'].sum())
 
     # 개별학생교육지원 건수 (구 명칭: 분리지도) - 물리적 제지/개별학생교육지원이 발생한 기록 수
     individual_support_count = 0
-    if '물리적제지여부' in df.columns:
-        individual_support_count = int(df['물리적제지여부'].astype(str).str.startswith('O', na=False).sum())
+    if '물리적제지여부' in cube.columns:
+        individual_support_count = int(cells.loc[cells['물리적제지'], 'count'].sum())
 
     # Calculate daily average
     daily_avg = 0.0
@@ -336,40 +352,40 @@ def get_analytics_data(start_date: str = None, end_date: str = None, class_id: s
                 daily_avg = round(total_incidents / days, 1)
         except Exception:
             pass
-    elif not df.empty and 'date_obj' in df.columns:
+    elif not cells.empty and has_dates:
         # Fallback to unique dates if range not provided
-        days = df['date_obj'].nunique()
+        days = cells['date_obj'].nunique()
         if days > 0:
             daily_avg = round(total_incidents / days, 1)
 
     # Unweighted average intensity (mean across all submission rows)
-    avg_intensity = float(df['강도'].mean()) if not df.empty and '강도' in df.columns else 0.0
+    avg_intensity = 0.0
+    if total_incidents and '강도' in cube.columns:
+        avg_intensity = float((cells['강도'] * cells['count']).sum() / total_incidents)
     avg_intensity = round(avg_intensity, 2)
         
     risk_student_count = len(at_risk_list)
     # 9. Weekday Analysis - count submissions per weekday
     weekday_stats = []
     weekday_names = ['월', '화', '수', '목', '금', '토', '일']
-    if 'date_obj' in df.columns:
-        df['weekday'] = df['date_obj'].dt.dayofweek
-        wd_counts = df.groupby('weekday').size().sort_index()  # row count
+    if has_dates:
+        wd_counts = _counts_by('weekday').sort_index()  # row count
         for wd, cnt in wd_counts.items():
              name = weekday_names[int(wd)] if int(wd) < 7 else str(wd)
              weekday_stats.append({"name": name, "value": int(cnt)})
 
     # 10. Intensity Distribution (Replacing Antecedent)
     intensity_dist = []
-    if '강도' in df.columns:
-        i_counts = df.groupby('강도').size().sort_index()
+    if '강도' in cube.columns:
+        i_counts = _counts_by('강도').sort_index()
         intensity_dist = [{"name": f"강도 {int(k)}", "value": int(v)} for k, v in i_counts.items()]
 
     # 11. Monthly Intensity Trend (Replacing Consequence)
     intensity_trend = []
-    if 'date_obj' in df.columns and '강도' in df.columns:
-        df['month_label'] = df['date_obj'].dt.strftime('%Y-%m')
+    if has_dates and '강도' in cube.columns:
         # Average intensity per month
-        m_intensity = df.groupby('month_label')['강도'].mean().reset_index()
-        intensity_trend = [{"month": row['month_label'], "value": round(float(row['강도']), 2)} for _, row in m_intensity.iterrows()]
+        m_intensity = _mean_by(['month_label'], '강도')
+        intensity_trend = [{"month": month, "value": round(float(val), 2)} for month, val in m_intensity.items()]
 
 
     # Generate AI Insight with enriched tier data
@@ -416,10 +432,9 @@ def get_analytics_data(start_date: str = None, end_date: str = None, class_id: s
 
     # Monthly trend — row count per month (for monthly bar chart)
     monthly_trend = []
-    if 'date_obj' in df.columns:
-        df['month_label'] = df['date_obj'].dt.strftime('%Y-%m')
-        m_counts = df.groupby('month_label').size().reset_index(name='count')
-        monthly_trend = [{"month": row['month_label'], "count": int(row['count'])} for _, row in m_counts.iterrows()]
+    if has_dates:
+        m_counts = cells.groupby('month_label')['count'].sum()
+        monthly_trend = [{"month": month, "count": int(cnt)} for month, cnt in m_counts.items()]
 
     # Build tier_distribution for donut chart
     tier_distribution = []
@@ -490,31 +505,32 @@ def get_student_analytics(student_name: str, start_date: str = None, end_date: s
     if not raw_data:
         return empty_result
     
-    df = pd.DataFrame(raw_data)
-    if '학생명' not in df.columns:
+    index = get_event_index(raw_data)
+    table = index.table
+    if '학생명' not in table.columns:
         return empty_result
     
     student_df = pd.DataFrame()  # Ensures it's always initialized
     resolved_name = student_name
     resolved_code = "-"
 
-    # Strategy 1: Try exact match on '학생코드'
-    if '학생코드' in df.columns:
-        match_code = df[df['학생코드'].astype(str).str.strip() == str(student_name).strip()].copy()
+    # Strategy 1: Try exact match on '학생코드' (hash index)
+    if '학생코드' in table.columns:
+        match_code = table.frame(rows=index.rows_for_code(student_name))
         if not match_code.empty:
             student_df = match_code
             resolved_code = str(student_name).strip()
             resolved_name = student_df['학생명'].iloc[0] if ('학생명' in student_df.columns and pd.notna(student_df['학생명'].iloc[0])) else student_name
     
-    # Strategy 2: Direct search by 학생명
+    # Strategy 2: Direct search by 학생명 (exact, unstripped value)
     if student_df is None or student_df.empty:
-        student_df = df[df['학생명'] == student_name].copy()
+        student_df = table.frame(rows=index.rows_matching('학생명', lambda names: names == student_name))
         resolved_name = student_name
         resolved_code = student_df['학생코드'].iloc[0] if not student_df.empty and '학생코드' in student_df.columns else "-"
         
-    # Strategy 3: Try partial match on 학생명
+    # Strategy 3: Try partial match on 학생명 (checked once per distinct name)
     if student_df.empty:
-        student_df = df[df['학생명'].str.contains(student_name, na=False)].copy()
+        student_df = table.frame(rows=index.rows_matching('학생명', lambda names: names.str.contains(student_name, na=False)))
         if not student_df.empty:
             resolved_name = student_df['학생명'].iloc[0]
             resolved_code = student_df['학생코드'].iloc[0] if '학생코드' in student_df.columns else "-"
@@ -759,7 +775,7 @@ def analyze_meeting_data(target_date: str = None):
             "summary": {"emergency_count": 0, "tier2_candidate_count": 0}
         }
 
-    df = pd.DataFrame(raw_data)
+    df = get_event_table(raw_data).frame()
     
     # Preprocessing
     if '행동발생날짜' in df.columns:
@@ -0,0 +1,175 @@
+# backend/app/services/analytics_cube.py
+
+import threading
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from app.services.analysis import extract_numeric_series, robust_parse_dates, normalize_function
+from app.services.event_table import EventTable, get_event_table
+
+# Raw Log_Main columns that become cube dimensions, in key order
+CUBE_TEXT_DIMENSIONS = ['행동발생날짜', '학생코드', '학생명', '장소', '시간대', '행동유형']
+ALERT_COLUMNS = ['행동발생날짜', '학생코드', '학생명', '장소', '행동유형', '강도']
+ALERT_INTENSITY = 5
+
+
+class AnalyticsCube:
+    """
+    Behavior-log counts pre-aggregated by (date, student code, student name, location,
+    time slot, behavior type, intensity, function category, restraint flag).
+
+    Built once per Log_Main record set from its EventTable; dashboard queries filter and sum cells instead
+    of rebuilding a DataFrame from every row. Each cell also keeps the position of its
+    first row so "first record of a student" stays answerable. Student code resolution
+    and class membership depend on TierStatus, so they are applied at query time over
+    the (few) distinct code/name pairs rather than baked into the key.
+
+    High-intensity rows are kept verbatim (in log order) for the safety alert list.
+    """
+
+    def __init__(self, table: EventTable):
+        self.columns = set(table.columns)
+        self.row_count = len(table)
+
+        # Group on the table's integer codes; per-row derived dimensions are computed once
+        # per distinct value and broadcast through the codes.
+        dims: Dict[str, np.ndarray] = {}
+        decoders: Dict[str, np.ndarray] = {}
+        for col in CUBE_TEXT_DIMENSIONS:
+            if col in self.columns:
+                dims[col] = _codes(table, col)
+                decoders[col] = _categories(table, col)
+        if '강도' in self.columns:
+            intensity = extract_numeric_series(pd.Series(_categories(table, '강도'), dtype=object), 0)
+            dims['강도'] = intensity.values.take(_codes(table, '강도'))
+        if '기능' in self.columns:
+            functions = _categories(table, '기능')
+            dims['기능'] = np.array([normalize_function(val) for val in functions], dtype=object).take(_codes(table, '기능'))
+        if '물리적제지여부' in self.columns:
+            restraint = pd.Series(_categories(table, '물리적제지여부'), dtype=object).astype(str).str.startswith('O', na=False)
+            dims['물리적제지'] = restraint.values.take(_codes(table, '물리적제지여부'))
+
+        frame = pd.DataFrame(dims)
+        frame['_row'] = np.arange(len(table))
+        self.dimensions = list(dims)
+        if self.dimensions and len(frame):
+            self.cells = (
+                frame.groupby(self.dimensions, dropna=False, sort=False)['_row']
+                .agg(['size', 'min'])
+                .rename(columns={'size': 'count', 'min': 'first_row'})
+                .reset_index()
+            )
+            for col, values in decoders.items():
+                self.cells[col] = pd.Series(values.take(self.cells[col].values), index=self.cells.index, dtype=object)
+        else:
+            self.cells = pd.DataFrame({
+                'count': [len(frame)] if len(frame) else [],
+                'first_row': [0] if len(frame) else [],
+            })
+
+        self.alerts = None
+        if '강도' in frame.columns:
+            hot_rows = np.flatnonzero(frame['강도'].values >= ALERT_INTENSITY)
+            self.alerts = pd.DataFrame({
+                col: (frame['강도'].values[hot_rows] if col == '강도'
+                      else pd.Series(table.column(col, hot_rows), dtype=object))
+                for col in ALERT_COLUMNS if col in self.columns
+            }).reset_index(drop=True)
+
+        # Lookup keys for student resolution, stringified once per cell
+        for table in (self.cells, self.alerts):
+            if table is not None:
+                table['_code_key'] = _text(table, '학생코드')
+                table['_name_key'] = _text(table, '학생명')
+
+        # Parse each distinct date once. Cells keep first-appearance order, so
+        # to_datetime infers the format from the same first value as a row scan would.
+        if '행동발생날짜' in self.cells.columns:
+            self.cells['date_obj'] = robust_parse_dates(self.cells['행동발생날짜'])
+            if self.alerts is not None:
+                parsed = dict(zip(self.cells['행동발생날짜'], self.cells['date_obj']))
+                self.alerts['date_obj'] = self.alerts['행동발생날짜'].map(parsed)
+
+
+def _codes(table: EventTable, col: str) -> np.ndarray:
+    if table.is_categorical(col):
+        return table.codes(col)
+    codes, _ = pd.factorize(table.column(col), use_na_sentinel=False)
+    return codes
+
+
+def _categories(table: EventTable, col: str) -> np.ndarray:
+    if table.is_categorical(col):
+        return table.categories(col)
+    _, uniques = pd.factorize(table.column(col), use_na_sentinel=False)
+    return np.asarray(uniques, dtype=object)
+
+
+def resolve_student_columns(s_codes: pd.Series, s_names: pd.Series,
+                            code_map: Dict[str, dict], name_map: Dict[str, dict]):
+    """
+    Vectorized code resolution: BeAble/TierStatus code first, then name, else the raw
+    name (or code, or 'Unknown'). Returns (student_code, student_name_labeled) arrays.
+    """
+    code_lookup = pd.DataFrame(
+        [(k, v['student_code'], v.get('student_name', v['student_code'])) for k, v in code_map.items()],
+        columns=['key', 'student_code', 'student_name_labeled'], dtype=object
+    ).set_index('key')
+    name_lookup = pd.DataFrame(
+        [(k, v['student_code'], v.get('student_name', v['student_code'])) for k, v in name_map.items()],
+        columns=['key', 'student_code', 'student_name_labeled'], dtype=object
+    ).set_index('key')
+
+    by_code = code_lookup.reindex(s_codes.values)
+    by_name = name_lookup.reindex(s_names.values)
+    hit_code = s_codes.isin(code_lookup.index).values
+    hit_name = s_names.isin(name_lookup.index).values
+    # Unresolved rows keep their raw name/code as both code and label
+    raw_names = s_names.where(s_names != '', s_codes).where(lambda x: x != '', 'Unknown').values
+    return tuple(
+        np.where(hit_code, by_code[col].values, np.where(hit_name, by_name[col].values, raw_names))
+        for col in ('student_code', 'student_name_labeled')
+    )
+
+
+def _text(frame: pd.DataFrame, col: str) -> pd.Series:
+    if col not in frame.columns:
+        return pd.Series('', index=frame.index, dtype=object)
+    return frame[col].map(str).str.strip()
+
+
+def with_student_columns(frame: pd.DataFrame, code_map: Dict[str, dict], name_map: Dict[str, dict]) -> pd.DataFrame:
+    """Adds student_code / student_name_labeled, resolving each distinct (code, name) pair once."""
+    frame = frame.copy()
+    if frame.empty:
+        frame['student_code'] = pd.Series(dtype=object)
+        frame['student_name_labeled'] = pd.Series(dtype=object)
+        return frame
+    if '_code_key' in frame.columns:
+        keys = pd.DataFrame({'code': frame['_code_key'], 'name': frame['_name_key']})
+    else:
+        keys = pd.DataFrame({'code': _text(frame, '학생코드'), 'name': _text(frame, '학생명')})
+    distinct = keys.drop_duplicates()
+    codes, labels = resolve_student_columns(distinct['code'], distinct['name'], code_map, name_map)
+    resolved = pd.DataFrame({'student_code': codes, 'student_name_labeled': labels}, index=pd.MultiIndex.from_frame(distinct))
+    resolved = resolved.reindex(pd.MultiIndex.from_frame(keys))
+    frame['student_code'] = pd.Series(resolved['student_code'].values, index=frame.index, dtype=object)
+    frame['student_name_labeled'] = pd.Series(resolved['student_name_labeled'].values, index=frame.index, dtype=object)
+    return frame
+
+
+_cube_lock = threading.Lock()
+_cube_source: Optional[list] = None
+_cube: Optional[AnalyticsCube] = None
+
+
+def get_analytics_cube(records: List[Dict[str, Any]]) -> AnalyticsCube:
+    """Cube for this exact record list; rebuilt only when Log_Main ingestion yields a new list."""
+    global _cube_source, _cube
+    with _cube_lock:
+        if records is _cube_source and _cube is not None:
+            return _cube
+    cube = AnalyticsCube(get_event_table(records))
+    with _cube_lock:
+        _cube_source, _cube = records, cube
+    return cube
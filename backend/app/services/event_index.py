@@ -0,0 +1,151 @@
+# backend/app/services/event_index.py
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+from app.services.event_table import EventTable, get_event_table
+
+EMPTY_ROWS = np.empty(0, dtype=np.intp)
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+
+class EventIndex:
+    """
+    Secondary indexes over an EventTable, built once per Log_Main record list.
+
+    - dates: every row's normalize_date_string() key, sorted, so a date range is two
+      binary searches plus the k matching rows
+    - by_code / by_name: stripped 학생코드 / 학생명 -> row positions
+
+    Every lookup returns row positions in ascending (log) order, so results come back in
+    the same order a full scan would produce. BeAble codes (get_beable_code) and classes
+    (rows_for_class) resolve to student codes through TierStatus first.
+    """
+
+    def __init__(self, table: EventTable):
+        from app.services.sheets import normalize_date_string
+
+        self.table = table
+        self._rows_by_category: Dict[str, List[np.ndarray]] = {}
+
+        self.by_code = self._key_index('학생코드')
+        self.by_name = self._key_index('학생명')
+
+        if '행동발생날짜' in table.columns:
+            categories = table.categories('행동발생날짜')
+            keys = np.array([normalize_date_string(v) for v in categories], dtype=object)
+            date_keys = keys.take(table.codes('행동발생날짜'))
+        else:
+            date_keys = np.full(len(table), "", dtype=object)
+        self._date_order = np.argsort(date_keys, kind='stable')
+        self._sorted_dates = date_keys[self._date_order]
+        # Undated rows ('' keys) sort first and never match a range
+        self._first_dated = int(np.searchsorted(self._sorted_dates, "", side='right'))
+
+    def _category_rows(self, col: str) -> List[np.ndarray]:
+        """Row positions (ascending) for each category of a categorical column."""
+        if col not in self._rows_by_category:
+            codes = self.table.codes(col)
+            order = np.argsort(codes, kind='stable')
+            bounds = np.cumsum(np.bincount(codes, minlength=len(self.table.categories(col))))[:-1]
+            self._rows_by_category[col] = np.split(order, bounds)
+        return self._rows_by_category[col]
+
+    def _key_index(self, col: str) -> Dict[str, np.ndarray]:
+        if col not in self.table.columns or not self.table.is_categorical(col):
+            return {}
+        grouped: Dict[str, List[np.ndarray]] = {}
+        for value, rows in zip(self.table.categories(col), self._category_rows(col)):
+            if not _is_missing(value):
+                grouped.setdefault(str(value).strip(), []).append(rows)
+        return {k: (v[0] if len(v) == 1 else np.sort(np.concatenate(v))) for k, v in grouped.items()}
+
+    def rows_in_date_range(self, start: str, end: str) -> np.ndarray:
+        """Rows whose normalized date key d satisfies start <= d <= end (keys are YYYY-MM-DD)."""
+        lo = max(int(np.searchsorted(self._sorted_dates, start, side='left')), self._first_dated)
+        hi = np.searchsorted(self._sorted_dates, end, side='right')
+        if lo >= hi:
+            return EMPTY_ROWS
+        return np.sort(self._date_order[lo:hi])
+
+    def rows_for_code(self, code: str) -> np.ndarray:
+        return self.by_code.get(str(code).strip(), EMPTY_ROWS)
+
+    def rows_for_keys(self, keys: Iterable[str]) -> np.ndarray:
+        """Rows whose stripped 학생코드 or 학생명 is one of keys."""
+        parts = []
+        for key in keys:
+            for index in (self.by_code, self.by_name):
+                rows = index.get(key)
+                if rows is not None:
+                    parts.append(rows)
+        if not parts:
+            return EMPTY_ROWS
+        return parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+
+    def rows_for_class(self, class_code: str, class_of: Callable[[str], Optional[str]]) -> np.ndarray:
+        """Rows whose student code belongs to class_code according to class_of(code)."""
+        parts = [rows for code, rows in self.by_code.items() if class_of(code) == class_code]
+        if not parts:
+            return EMPTY_ROWS
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def rows_matching(self, col: str, mask: Callable[[pd.Series], Any]) -> np.ndarray:
+        """
+        Rows whose raw value satisfies a vectorized predicate, evaluated once per distinct
+        value of the column, e.g. lambda s: s.str.contains(name, na=False).
+        """
+        if col not in self.table.columns or not self.table.is_categorical(col):
+            return EMPTY_ROWS
+        hits = np.asarray(mask(pd.Series(self.table.categories(col), dtype=object)), dtype=bool)
+        parts = [rows for rows, hit in zip(self._category_rows(col), hits) if hit]
+        if not parts:
+            return EMPTY_ROWS
+        return parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+
+    def records_at(self, records: List[Dict[str, Any]], rows: np.ndarray) -> List[Dict[str, Any]]:
+        return [records[i] for i in rows]
+
+
+_index_lock = threading.Lock()
+_index_source: Optional[list] = None
+_index: Optional[EventIndex] = None
+
+
+def get_event_index(records: List[Dict[str, Any]]) -> EventIndex:
+    """Index for this exact record list; rebuilt only when Log_Main ingestion yields a new list."""
+    global _index_source, _index
+    with _index_lock:
+        if records is _index_source and _index is not None:
+            return _index
+    index = EventIndex(get_event_table(records))
+    with _index_lock:
+        _index_source, _index = records, index
+    return index
+
+
+_beable_lock = threading.Lock()
+_beable_source: Optional[list] = None
+_beable_by_code: Dict[str, str] = {}
+
+
+def get_beable_code(student_code: str) -> str:
+    """
+    BeAble code of an enrolled student ("" if none), i.e. the first get_beable_code_mapping()
+    key whose student_code equals student_code. The reverse map is rebuilt when TierStatus reloads.
+    """
+    global _beable_source, _beable_by_code
+    from app.services.sheets import fetch_student_status, get_beable_code_mapping
+
+    status = fetch_student_status()
+    with _beable_lock:
+        if status is not _beable_source:
+            by_code: Dict[str, str] = {}
+            for key, info in get_beable_code_mapping().items():
+                by_code.setdefault(str(info.get('student_code', '')).strip(), key)
+            _beable_by_code, _beable_source = by_code, status
+        return _beable_by_code.get(str(student_code or ""), "")
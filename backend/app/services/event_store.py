@@ -0,0 +1,101 @@
+# backend/app/services/event_store.py
+
+"""
+Single Log_Main event store. The worksheets are downloaded once by the incremental
+ingest in sheets.py; every consumer reads one of three views over that data:
+
+- fetch_all_records()   legacy Korean-keyed dicts (dashboard, CICO, reports)
+- normalize_logs(rows)  §2 normalized logs (analytics AI endpoints, BIP, AI insight)
+- fetch_log_events()    BehaviorEvent models (v2 workspace; LogMainAdapter.fetch_events)
+
+Each row is normalized once: the row-only part is memoized by its source fields and
+the TierStatus-dependent part (class, course level, tier, slot labels) is a cheap
+per-call step; BehaviorEvents are built once per ingested row and kept in the ingest state.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+from app.adapters.sheets.client import get_cached
+from app.adapters.sheets.log_main import LogMainAdapter, LOG_MAIN_TITLES
+from app.domain.models import BehaviorEvent
+from app.services.normalize import extract_log_fields, normalize_log_fields, apply_student_meta
+from app.services.sheets import fetch_all_records, CACHE_KEY_LOG_INGEST, LOG_FULL_RESYNC_SECONDS
+
+# Distinct Log_Main rows whose tier-independent normalization is kept in memory
+MAX_NORMALIZED_ROWS = 50000
+
+
+class NormalizedLogCache:
+    """Memo of normalize_log_fields() keyed by the source field tuple of a row."""
+
+    def __init__(self, max_entries: int = MAX_NORMALIZED_ROWS):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._bases: Dict[tuple, dict] = {}
+
+    def normalize(self, rows: List[Dict[str, Any]], tier_info_map: dict = None) -> List[dict]:
+        """Same output as [normalize_behavior_log(r, tier_info_map) for r in rows]."""
+        bases = self._bases
+        normalized = []
+        for row in rows:
+            fields = extract_log_fields(row)
+            base = bases.get(fields)
+            if base is None:
+                base = normalize_log_fields(fields)
+                with self._lock:
+                    if len(self._bases) >= self.max_entries:
+                        # Rows edited or removed in the sheet leave orphans behind; start over
+                        self._bases = {}
+                    self._bases[fields] = base
+                    bases = self._bases
+            normalized.append(apply_student_meta(base, tier_info_map))
+        return normalized
+
+    def flush(self):
+        with self._lock:
+            self._bases = {}
+
+
+normalized_log_cache = NormalizedLogCache()
+_events_lock = threading.Lock()
+
+
+def normalize_logs(rows: List[Dict[str, Any]], tier_info_map: dict = None) -> List[dict]:
+    return normalized_log_cache.normalize(rows, tier_info_map)
+
+
+def _current_ingest_state() -> Optional[dict]:
+    fetch_all_records()
+    state = get_cached(CACHE_KEY_LOG_INGEST, ttl=LOG_FULL_RESYNC_SECONDS)
+    if state is None:
+        # Records came from a snapshot (or the ingest state was evicted): sync once
+        fetch_all_records(force_refresh=True)
+        state = get_cached(CACHE_KEY_LOG_INGEST, ttl=LOG_FULL_RESYNC_SECONDS)
+    return state
+
+
+def fetch_log_events() -> Optional[List[BehaviorEvent]]:
+    """
+    BehaviorEvents for the primary Log_Main worksheet, built from the shared ingest
+    (no separate download). Rows ingested since the last call are normalized here, once.
+    """
+    state = _current_ingest_state()
+    if not state:
+        return None
+
+    title = next((t for t in LOG_MAIN_TITLES if t in state["sheets"]), None)
+    if title is None:
+        print("CRITICAL_DATA_CONTRACT_ERROR: Log_Main worksheet not found.")
+        return None
+
+    ws_state = state["sheets"][title]
+    with _events_lock:
+        pending = ws_state["pending_events"]
+        count = len(pending)
+        for row_idx, row in pending[:count]:
+            event = LogMainAdapter._normalize_row(row, row_idx=row_idx)
+            if event:
+                ws_state["events"].append(event)
+        # Raw rows are only needed until their event exists; keep any appended meanwhile
+        del pending[:count]
+        return list(ws_state["events"])
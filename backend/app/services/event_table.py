@@ -0,0 +1,155 @@
+# backend/app/services/event_table.py
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+from app.services.sheets import LOG_CATEGORICAL_COLUMNS
+
+# Low-cardinality Log_Main columns stored as int32 codes into a per-column category array
+CATEGORICAL_COLUMNS = LOG_CATEGORICAL_COLUMNS
+CRISIS_COLUMN = 'crisis_details'
+
+
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    # Assigned element-wise so tuples/lists in a cell are never broadcast into extra dimensions
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+class EventTable:
+    """
+    Struct-of-arrays form of the Log_Main record list (one array per column).
+
+    Categorical columns (student, date, location, time slot, behavior type, intensity,
+    function, ...) keep one int32 code per row plus the distinct values in first-appearance
+    order; free-text columns are plain object arrays. The 26 crisis fields, filled in on
+    only a handful of rows, live in a side table keyed by row position.
+
+    The table holds no copies of the cell strings: text arrays reference the record's own
+    values, and the categories are the interned strings the records share (see
+    LOG_CATEGORICAL_COLUMNS in sheets.py). It sits next to the record list, which the
+    dict consumers still read, at the cost of one code or pointer per cell.
+
+    frame() decodes the table into a DataFrame identical to pd.DataFrame(records) once;
+    every request gets a copy-on-write view of it instead of building its own. Built once
+    per record list; treat as read-only.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        self.row_count = len(records)
+
+        # Column order of pd.DataFrame(records): keys in order of first appearance
+        seen: Dict[str, None] = {}
+        for r in records:
+            for k in r:
+                if k not in seen:
+                    seen[k] = None
+        self.columns = list(seen)
+
+        self._codes: Dict[str, np.ndarray] = {}
+        self._categories: Dict[str, np.ndarray] = {}
+        self._values: Dict[str, np.ndarray] = {}
+        self._base: Optional[pd.DataFrame] = None
+        self._base_lock = threading.Lock()
+        for col in self.columns:
+            if col == CRISIS_COLUMN:
+                continue
+            values = _object_array([r.get(col, np.nan) for r in records])
+            if col in CATEGORICAL_COLUMNS:
+                codes, uniques = pd.factorize(values, use_na_sentinel=False)
+                self._codes[col] = codes.astype(np.int32)
+                self._categories[col] = _object_array(list(uniques))
+            else:
+                self._values[col] = values
+
+        # Crisis side table: positions of rows that carry details + one array per field
+        crisis_rows = [i for i, r in enumerate(records) if isinstance(r.get(CRISIS_COLUMN), dict)]
+        self.crisis_rows = np.asarray(crisis_rows, dtype=np.int32)
+        self.crisis: Dict[str, np.ndarray] = {}
+        for i in crisis_rows:
+            for k in records[i][CRISIS_COLUMN]:
+                if k not in self.crisis:
+                    self.crisis[k] = _object_array([records[j][CRISIS_COLUMN].get(k, "") for j in crisis_rows])
+
+    def __len__(self) -> int:
+        return self.row_count
+
+    def is_categorical(self, col: str) -> bool:
+        return col in self._codes
+
+    def codes(self, col: str) -> np.ndarray:
+        """Per-row int32 codes into categories(col)."""
+        return self._codes[col]
+
+    def categories(self, col: str) -> np.ndarray:
+        return self._categories[col]
+
+    def column(self, col: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Decoded values (object array), optionally only for the given row positions."""
+        if col == CRISIS_COLUMN:
+            return self._crisis_column(rows)
+        if col in self._codes:
+            codes = self._codes[col] if rows is None else self._codes[col][rows]
+            return self._categories[col].take(codes)
+        values = self._values[col]
+        return values if rows is None else values[rows]
+
+    def _crisis_column(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        targets = np.arange(self.row_count) if rows is None else np.asarray(rows)
+        out = _object_array([np.nan] * len(targets))
+        if len(self.crisis_rows) and len(targets):
+            pos = np.searchsorted(self.crisis_rows, targets)
+            found = self.crisis_rows[np.minimum(pos, len(self.crisis_rows) - 1)] == targets
+            fields = list(self.crisis)
+            for i in np.flatnonzero(found):
+                out[i] = {k: self.crisis[k][pos[i]] for k in fields}
+        return out
+
+    def _base_frame(self) -> pd.DataFrame:
+        # Decoded once per table (text columns handed to pandas as-is, categorical ones with
+        # one vectorized take per column). infer_objects() gives all-number columns the
+        # numeric dtype pd.DataFrame(records) infers for them.
+        with self._base_lock:
+            if self._base is None:
+                self._base = pd.DataFrame({c: self.column(c) for c in self.columns},
+                                          columns=self.columns).infer_objects()
+            return self._base
+
+    def frame(self, columns: Optional[List[str]] = None, rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        DataFrame over the table (all columns by default), as pd.DataFrame(records) builds it.
+        The result shares its data with the table's decoded frame; pandas copy-on-write copies
+        a column only when the caller modifies it. With rows, only those positions are taken
+        and they become the index, as with pd.DataFrame(records).iloc[rows].
+        """
+        base = self._base_frame()
+        if rows is not None:
+            base = base.iloc[np.asarray(rows, dtype=np.intp)]
+        if columns is None:
+            return base.copy(deep=False)
+        return base[[c for c in columns if c in self.columns]]
+
+    def crisis_details(self, row: int) -> Optional[Dict[str, Any]]:
+        pos = np.searchsorted(self.crisis_rows, row)
+        if pos < len(self.crisis_rows) and self.crisis_rows[pos] == row:
+            return {k: v[pos] for k, v in self.crisis.items()}
+        return None
+
+
+_table_lock = threading.Lock()
+_table_source: Optional[list] = None
+_table: Optional[EventTable] = None
+
+
+def get_event_table(records: List[Dict[str, Any]]) -> EventTable:
+    """Table for this exact record list; rebuilt only when Log_Main ingestion yields a new list."""
+    global _table_source, _table
+    with _table_lock:
+        if records is _table_source and _table is not None:
+            return _table
+    table = EventTable(records)
+    with _table_lock:
+        _table_source, _table = records, table
+    return table
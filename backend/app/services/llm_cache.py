@@ -0,0 +1,282 @@
+# backend/app/services/llm_cache.py
+# AI 분석 결과 캐시:
+# 같은 근거 데이터로 같은 AI 버튼을 누르면(협의회에서 여러 교사가 같은 학생 리포트를 여는 경우) 프롬프트가
+# 바이트 단위로 같으므로, (시스템 프롬프트, 사용자 프롬프트, 모델, max_tokens)의 해시를 키로 결과를 재사용한다.
+# 메모리 LRU + SQLite 영구 저장(콜드 스타트에서도 적중), TTL, "다시 생성" 플래그를 지원한다.
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+
+LLM_CACHE_DB_NAME = "llm_results.sqlite3"
+
+# True while the current request asked to regenerate: lookups are skipped and the fresh
+# result replaces the cached one.
+_regenerate: ContextVar[bool] = ContextVar("llm_cache_regenerate", default=False)
+
+
+@contextmanager
+def regenerating(enabled: bool = True):
+    """Bypass cached AI results for the enclosed calls (the endpoints' `regenerate` flag)."""
+    token = _regenerate.set(bool(enabled))
+    try:
+        yield
+    finally:
+        _regenerate.reset(token)
+
+
+def llm_cache_key(system_prompt: str, user_prompt: str, model: str, max_tokens: int) -> str:
+    raw = json.dumps([system_prompt, user_prompt, model, int(max_tokens)], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResultStore:
+    """
+    SQLite table of AI results by content hash, next to the sheet snapshots in CACHE_DIR.
+    Every failure is logged and treated as a miss; the store never breaks a request.
+    """
+
+    def __init__(self, cache_dir: str):
+        self.path = os.path.join(cache_dir, LLM_CACHE_DB_NAME)
+        self._lock = threading.Lock()
+        self._ready = False
+        self._disabled = False
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._disabled:
+            return None
+        try:
+            if not self._ready:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=2, check_same_thread=False)
+            if not self._ready:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_results ("
+                    " key TEXT PRIMARY KEY,"
+                    " payload BLOB NOT NULL,"
+                    " created_at REAL NOT NULL)"
+                )
+                conn.commit()
+                try:
+                    # Results quote student names and behavior notes
+                    os.chmod(self.path, 0o600)
+                except OSError:
+                    pass
+                self._ready = True
+            return conn
+        except Exception as e:
+            print(f"LLM result store unavailable at {self.path}: {e}")
+            self._disabled = True
+            return None
+
+    def load(self, key: str) -> Optional[Tuple[str, float]]:
+        """Returns (result, created_at) or None."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute("SELECT payload, created_at FROM llm_results WHERE key = ?", (key,)).fetchone()
+                if not row:
+                    return None
+                return zlib.decompress(row[0]).decode("utf-8"), float(row[1])
+            except Exception as e:
+                print(f"LLM result load failed for {key[:12]}: {e}")
+                return None
+            finally:
+                conn.close()
+
+    def save(self, key: str, result: str, created_at: float):
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_results (key, payload, created_at) VALUES (?, ?, ?)",
+                    (key, zlib.compress(result.encode("utf-8"), 1), created_at),
+                )
+                conn.commit()
+            except Exception as e:
+                print(f"LLM result save failed for {key[:12]}: {e}")
+            finally:
+                conn.close()
+
+    def prune(self, older_than: float):
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute("DELETE FROM llm_results WHERE created_at < ?", (older_than,))
+                conn.commit()
+            except Exception as e:
+                print(f"LLM result prune failed: {e}")
+            finally:
+                conn.close()
+
+    def clear(self):
+        self.prune(float("inf"))
+
+
+class LLMResultCache:
+    """
+    Content-addressed cache in front of _call_llm.
+
+    - Memory LRU (max_entries) backed by an optional LLMResultStore; a result is served
+      until it is `ttl` seconds old.
+    - Single-flight: identical prompts arriving together (several teachers opening the
+      same report) wait for the one LLM call and share its result instead of each
+      starting their own.
+    - Only results accepted by cache_if are stored, so error messages are never replayed.
+    """
+
+    def __init__(self, ttl: float = 604800, max_entries: int = 256, store: Optional[LLMResultStore] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.store = store
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._pruned = False
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.regenerated = 0
+        self.shared = 0
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[1] >= self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _set_memory(self, key: str, result: str, created_at: float):
+        with self._lock:
+            self._entries[key] = (result, created_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_stored(self, key: str) -> Optional[str]:
+        if self.store is None:
+            return None
+        if not self._pruned:
+            self._pruned = True
+            self.store.prune(time.time() - self.ttl)
+        loaded = self.store.load(key)
+        if loaded is None or time.time() - loaded[1] >= self.ttl:
+            return None
+        self._set_memory(key, loaded[0], loaded[1])
+        return loaded[0]
+
+    def peek(self, key: str) -> Optional[str]:
+        """Cached result for key (memory, then the store) or None; never generates."""
+        result = self._get_memory(key)
+        if result is not None:
+            with self._lock:
+                self.hits += 1
+            return result
+        result = self._get_stored(key)
+        if result is not None:
+            with self._lock:
+                self.disk_hits += 1
+        return result
+
+    def put(self, key: str, result: str):
+        """Store a result produced elsewhere (e.g. a completed streamed report)."""
+        created_at = time.time()
+        self._set_memory(key, result, created_at)
+        if self.store is not None:
+            self.store.save(key, result, created_at)
+
+    def get_or_generate(self, key: str, generate: Callable[[], str],
+                        cache_if: Callable[[str], bool] = bool) -> str:
+        regenerate = _regenerate.get()
+        if regenerate:
+            with self._lock:
+                self.regenerated += 1
+        else:
+            result = self._get_memory(key)
+            if result is not None:
+                with self._lock:
+                    self.hits += 1
+                return result
+
+        while True:
+            with self._lock:
+                flight = self._inflight.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._inflight[key] = {"event": threading.Event()}
+            if leader:
+                break
+            flight["event"].wait()
+            if "result" in flight:
+                with self._lock:
+                    self.shared += 1
+                return flight["result"]
+            # The other call raised: try again, possibly as leader
+
+        try:
+            if not regenerate:
+                result = self._get_stored(key)
+                if result is not None:
+                    with self._lock:
+                        self.disk_hits += 1
+                    flight["result"] = result
+                    return result
+            with self._lock:
+                self.misses += 1
+            result = generate()
+            if result and cache_if(result):
+                self.put(key, result)
+            flight["result"] = result
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight["event"].set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ttl": self.ttl,
+                "persistent": self.store is not None and not self.store._disabled,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "shared": self.shared,
+                "regenerated": self.regenerated,
+                "inflight": len(self._inflight),
+            }
+
+
+llm_result_cache = LLMResultCache(
+    ttl=settings.LLM_CACHE_TTL,
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    store=LLMResultStore(settings.CACHE_DIR) if settings.LLM_CACHE_PERSIST else None,
+)
@@ -0,0 +1,210 @@
+# backend/app/services/llm_hedge.py
+# LLM 공급자 헤지(hedged) 호출:
+# 로컬 → Gemini → Groq를 하나씩 순서대로 기다리면 최악의 경우 모든 타임아웃의 합만큼 걸린다.
+# 여기서는 1순위 공급자를 먼저 보내고, hedge_delay 안에 응답이 없으면 다음 순위를 함께 띄운다(동시에 최대
+# max_parallel개). 실패한 시도는 즉시 다음 순위로 넘기고, 먼저 도착한 "합격" 응답을 쓰며 나머지에는 취소
+# 신호(threading.Event)를 보낸다. 진행 중인 HTTP 요청은 끊을 수 없지만, 다음 요청은 보내지 않는다.
+# 전체 체인은 요청 예산에서 나온 전역 마감 시간(deadline)을 넘지 않는다.
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Dict, List, Optional, Set
+from app.core.config import settings
+
+# Absolute time.monotonic() by which the current LLM call must be answered (None: from settings)
+_deadline: ContextVar[Optional[float]] = ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def llm_deadline(seconds: float):
+    """Give the enclosed LLM calls `seconds` in total (e.g. longer for background jobs)."""
+    token = _deadline.set(time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> float:
+    deadline = _deadline.get()
+    return deadline if deadline is not None else time.monotonic() + settings.LLM_DEADLINE_SECONDS
+
+
+class AttemptResult:
+    """
+    Outcome of one provider attempt.
+    complete: the response passes that provider's acceptance rule and may win outright.
+    Otherwise a non-empty text is a fallback candidate (the longest one is used if nothing
+    completes). longer_wins: complete only if longer than the best fallback seen so far.
+    """
+
+    def __init__(self, text: str = "", tag: str = "", complete: bool = False, longer_wins: bool = False,
+                 error: str = "", rate_limited: bool = False, cancelled: bool = False):
+        self.text = text
+        self.tag = tag
+        self.complete = complete
+        self.longer_wins = longer_wins
+        self.error = error
+        self.rate_limited = rate_limited
+        # Stopped early because the cancel flag was set (skipped its remaining requests)
+        self.cancelled = cancelled
+
+
+class Attempt:
+    """One provider call: fn(timeout_seconds, cancel) -> AttemptResult. An attempt is not started
+    once cancel is set; fn that sends several requests checks it before each further one and
+    returns AttemptResult(cancelled=True). A rate-limited attempt drops the not-yet-started
+    attempts of its group."""
+
+    def __init__(self, name: str, fn: Callable[[float, threading.Event], AttemptResult], timeout: float,
+                 group: Optional[str] = None):
+        self.name = name
+        self.fn = fn
+        self.timeout = timeout
+        self.group = group
+
+
+class HedgeOutcome:
+    def __init__(self):
+        self.winner: Optional[AttemptResult] = None
+        self.winner_name = ""
+        self.best: Optional[AttemptResult] = None
+        self.best_name = ""
+        self.errors: List[str] = []
+        self.rate_limited: Set[str] = set()
+        self.timed_out = False
+
+
+class HedgeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.hedged = 0
+        self.launched = 0
+        self.abandoned = 0
+        self.cancelled = 0
+        self.deadline_hits = 0
+        self.wins: Dict[str, int] = {}
+
+    def record(self, launched: int, hedged: int, abandoned: int, outcome: HedgeOutcome):
+        with self._lock:
+            self.calls += 1
+            self.launched += launched
+            self.hedged += hedged
+            self.abandoned += abandoned
+            self.deadline_hits += 1 if outcome.timed_out else 0
+            name = outcome.winner_name or outcome.best_name
+            if name:
+                self.wins[name] = self.wins.get(name, 0) + 1
+
+    def record_cancelled(self):
+        with self._lock:
+            self.cancelled += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": self.calls, "launched": self.launched, "hedged": self.hedged,
+                    "abandoned": self.abandoned, "cancelled": self.cancelled, "deadline_hits": self.deadline_hits, "wins": dict(self.wins)}
+
+
+hedge_stats = HedgeStats()
+
+
+def run_hedged(attempts: List[Attempt], hedge_delay: float, max_parallel: int = 2,
+               deadline: Optional[float] = None) -> HedgeOutcome:
+    """
+    Run attempts in priority order with hedging:
+    - the next attempt starts when a running one fails or is not acceptable, or when
+      hedge_delay passes without any answer (at most max_parallel in flight);
+    - the first complete answer wins; the attempts still in flight are abandoned (counted
+      in hedge_stats.abandoned) and their shared cancel event is set;
+    - nothing waits past the deadline; each attempt's timeout is capped by what is left.
+    Blocking HTTP calls cannot be interrupted, so an abandoned attempt finishes the request
+    it is in, but it sends no further one (e.g. Gemini's second request config); attempts
+    that stop early this way are counted in hedge_stats.cancelled.
+    """
+    deadline = deadline if deadline is not None else current_deadline()
+    outcome = HedgeOutcome()
+    results: "queue.Queue" = queue.Queue()
+    cancel = threading.Event()
+    pending = list(attempts)
+    running = 0
+    launched = 0
+    hedged = 0
+    last_launch = 0.0
+    max_parallel = max(1, max_parallel)
+
+    def launch(hedge: bool = False):
+        nonlocal running, launched, hedged, last_launch
+        while pending:
+            attempt = pending.pop(0)
+            if attempt.group and attempt.group in outcome.rate_limited:
+                continue
+            timeout = min(attempt.timeout, deadline - time.monotonic())
+            if timeout <= 0:
+                pending.clear()
+                return
+
+            def work(a=attempt, t=timeout):
+                try:
+                    if cancel.is_set():
+                        # Settled between launch and this thread starting (e.g. the next Groq model)
+                        result = AttemptResult(error=f"{a.name}: 취소됨", cancelled=True)
+                    else:
+                        result = a.fn(t, cancel)
+                except Exception as e:
+                    result = AttemptResult(error=f"{a.name} 예외: {str(e)[:100]}")
+                if result.cancelled:
+                    hedge_stats.record_cancelled()
+                results.put((a, result))
+
+            # Workers keep the caller's context (regenerate flag, Sheets priority)
+            ctx = copy_context()
+            threading.Thread(target=ctx.run, args=(work,), daemon=True, name=f"llm-{attempt.name}").start()
+            running += 1
+            launched += 1
+            hedged += 1 if hedge else 0
+            last_launch = time.monotonic()
+            return
+
+    def has_pending() -> bool:
+        return any(not (a.group and a.group in outcome.rate_limited) for a in pending)
+
+    launch()
+    while running:
+        now = time.monotonic()
+        if now >= deadline:
+            outcome.timed_out = True
+            break
+        wait = deadline - now
+        can_hedge = has_pending() and running < max_parallel
+        if can_hedge:
+            wait = min(wait, max(0.0, last_launch + hedge_delay - now))
+        try:
+            attempt, result = results.get(timeout=wait)
+        except queue.Empty:
+            if can_hedge and time.monotonic() >= last_launch + hedge_delay:
+                launch(hedge=True)
+            continue
+
+        running -= 1
+        if result.rate_limited and attempt.group:
+            outcome.rate_limited.add(attempt.group)
+        if result.error:
+            outcome.errors.append(result.error)
+        if result.text:
+            best_len = len(outcome.best.text) if outcome.best else 0
+            if result.complete and (not result.longer_wins or len(result.text) > best_len):
+                outcome.winner, outcome.winner_name = result, attempt.name
+                break
+            if len(result.text) > best_len:
+                outcome.best, outcome.best_name = result, attempt.name
+        if running < max_parallel and has_pending():
+            launch()
+
+    cancel.set()
+    hedge_stats.record(launched, hedged, running, outcome)
+    return outcome
@@ -0,0 +1,291 @@
+# backend/app/services/llm_providers.py
+# 로컬 LLM 엔드포인트 레지스트리:
+# 후보 URL(LOCAL_LLM_URL, LM Studio :1234, Ollama :11434)을 한 번에 병렬로 점검해 살아있는 엔드포인트와
+# 모델 id를 TTL 동안 기억한다. AI 호출은 기억된 엔드포인트로 요청 한 번만 보내고, 실패는 서킷 브레이커에
+# 기록해 연속 실패 시 일정 시간 로컬 호출을 건너뛴다. TTL 만료·실패 후 재점검은 백그라운드 스레드에서 한다.
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import requests
+from app.core.config import settings
+
+OPENAI = "openai"   # OpenAI 호환 /v1 (LM Studio, Cloudflare Tunnel, Ollama v1)
+OLLAMA = "ollama"   # Ollama 네이티브 /api/chat
+
+DEFAULT_OPENAI_MODEL = "google/gemma-4-e4b"
+DEFAULT_OLLAMA_MODEL = "gemma-4-e4b"
+
+
+def local_llm_candidates() -> List[Tuple[str, str]]:
+    """(kind, base_url) in the order _call_local_llm used to try them, /v1 URLs normalized and deduped."""
+    raw_url = os.getenv("LOCAL_LLM_URL", "").strip()
+    v1_urls = []
+    if raw_url:
+        clean = raw_url.rstrip("/")
+        if not clean.endswith("/v1"):
+            clean = f"{clean}/v1"
+        v1_urls.append(clean)
+    v1_urls.extend([
+        "http://localhost:1234/v1",
+        "http://127.0.0.1:1234/v1",
+        "http://localhost:11434/v1",
+        "http://127.0.0.1:11434/v1",
+    ])
+    candidates = []
+    for u in v1_urls:
+        if (OPENAI, u) not in candidates:
+            candidates.append((OPENAI, u))
+    candidates.extend([(OLLAMA, "http://localhost:11434"), (OLLAMA, "http://127.0.0.1:11434")])
+    return candidates
+
+
+class LocalProvider:
+    """A probed, healthy local endpoint and the model id to send to it."""
+
+    def __init__(self, kind: str, base_url: str, model: str):
+        self.kind = kind
+        self.base_url = base_url
+        self.model = model
+        self.probed_at = time.time()
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.kind, self.base_url)
+
+    @property
+    def location_tag(self) -> str:
+        return "Cloudflare Tunnel" if "trycloudflare" in self.base_url else "Local"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "url": self.base_url, "model": self.model,
+                "age_seconds": round(time.time() - self.probed_at, 1)}
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker for one endpoint. After `threshold` failures in a row it
+    opens for `cooldown` seconds; then a single trial call is let through (half-open) and
+    its outcome closes or re-opens it.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.last_error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        if self.failures < self.threshold:
+            return "closed"
+        if time.time() - self.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def success(self):
+        self.failures = 0
+        self.trial_in_flight = False
+        self.last_error = None
+
+    def failure(self, error: str):
+        self.failures += 1
+        self.trial_in_flight = False
+        self.last_error = error[:200]
+        if self.failures >= self.threshold:
+            self.opened_at = time.time()
+
+
+class LocalLLMRegistry:
+    """
+    Process-wide discovery cache for the local LLM.
+
+    - resolve() returns the cached healthy provider (or None when no local server is up)
+      without any network call; only the very first call, or a changed LOCAL_LLM_URL /
+      LOCAL_LLM_MODEL, probes synchronously — all candidates in parallel with short timeouts.
+    - A healthy result is kept for `ttl` seconds, "nothing is up" for `negative_ttl`;
+      after that the stale answer is still served while a background thread re-probes.
+    - record_failure() feeds a per-endpoint circuit breaker and triggers a background
+      re-probe so another candidate can take over; open endpoints are skipped by probes.
+    """
+
+    def __init__(self, ttl: float = 300, negative_ttl: float = 60, probe_timeout: float = 2.0,
+                 failure_threshold: int = 3, cooldown: float = 120):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.probe_timeout = probe_timeout
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._active: Optional[LocalProvider] = None
+        self._probed_at = 0.0
+        self._signature: Optional[Tuple] = None
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        self.probes = 0
+        self.background_probes = 0
+        self.calls = 0
+        self.skipped = 0
+        self.failures = 0
+
+    # ── probing ──────────────────────────────────────────────
+    def _breaker(self, key: Tuple[str, str]) -> CircuitBreaker:
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(self.failure_threshold, self.cooldown)
+        return breaker
+
+    def _probe_one(self, kind: str, base_url: str, configured_model: str) -> Optional[LocalProvider]:
+        timeout = (self.probe_timeout, self.probe_timeout)
+        try:
+            if kind == OPENAI:
+                resp = requests.get(f"{base_url}/models", timeout=timeout)
+                if resp.status_code != 200:
+                    return None
+                model = configured_model or DEFAULT_OPENAI_MODEL
+                try:
+                    data = resp.json().get("data", [])
+                    if data and isinstance(data, list):
+                        model = data[0].get("id", model)
+                except Exception:
+                    pass
+                return LocalProvider(kind, base_url, model)
+            resp = requests.get(f"{base_url}/api/tags", timeout=timeout)
+            if resp.status_code != 200:
+                return None
+            return LocalProvider(kind, base_url, configured_model or DEFAULT_OLLAMA_MODEL)
+        except Exception:
+            return None
+
+    def probe(self) -> Optional[LocalProvider]:
+        """Probe every candidate at once; the first healthy one in priority order wins."""
+        signature = (os.getenv("LOCAL_LLM_URL", "").strip(), os.getenv("LOCAL_LLM_MODEL", "").strip())
+        with self._lock:
+            candidates = [c for c in local_llm_candidates() if self._breaker(c).state != "open"]
+        found: Optional[LocalProvider] = None
+        if candidates:
+            with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+                futures = [pool.submit(self._probe_one, kind, url, signature[1]) for kind, url in candidates]
+                for future in futures:
+                    provider = future.result()
+                    if provider is not None:
+                        found = provider
+                        break
+        with self._lock:
+            self.probes += 1
+            self._active = found
+            self._probed_at = time.time()
+            self._signature = signature
+        if found:
+            print(f"[LocalLLM] {found.kind} endpoint {found.base_url} ({found.model})")
+        return found
+
+    def _reprobe_in_background(self):
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self.background_probes += 1
+            self._refresh_thread = threading.Thread(target=self._background_probe, daemon=True,
+                                                    name="local-llm-probe")
+            self._refresh_thread.start()
+
+    def _background_probe(self):
+        try:
+            with self._probe_lock:
+                self.probe()
+        except Exception as e:
+            print(f"[LocalLLM] background probe failed: {e}")
+
+    # ── lookup ───────────────────────────────────────────────
+    def _discover(self):
+        signature = (os.getenv("LOCAL_LLM_URL", "").strip(), os.getenv("LOCAL_LLM_MODEL", "").strip())
+        if self._signature != signature:
+            # Single-flight: concurrent first callers share one probe
+            with self._probe_lock:
+                if self._signature != signature:
+                    self.probe()
+        else:
+            age = time.time() - self._probed_at
+            if age >= (self.ttl if self._active else self.negative_ttl):
+                self._reprobe_in_background()
+
+    def peek(self) -> Optional[LocalProvider]:
+        """The provider the next call would use (None: cloud), without counting it as a call."""
+        self._discover()
+        with self._lock:
+            provider = self._active
+            if provider is None or self._breaker(provider.key).state == "open":
+                return None
+            return provider
+
+    def resolve(self) -> Optional[LocalProvider]:
+        """The provider to send this call to, or None to go straight to the cloud fallback."""
+        self._discover()
+        with self._lock:
+            provider = self._active
+            if provider is None or not self._breaker(provider.key).allow():
+                self.skipped += 1
+                return None
+            self.calls += 1
+            return provider
+
+    def record_success(self, provider: LocalProvider):
+        with self._lock:
+            self._breaker(provider.key).success()
+
+    def record_failure(self, provider: LocalProvider, error: str):
+        with self._lock:
+            self.failures += 1
+            self._breaker(provider.key).failure(error)
+        self._reprobe_in_background()
+
+    def invalidate(self):
+        """Forget the discovered endpoint and breaker state; the next call probes again."""
+        with self._lock:
+            self._active = None
+            self._probed_at = 0.0
+            self._signature = None
+            self._breakers.clear()
+
+    # ── metrics ──────────────────────────────────────────────
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "active": self._active.as_dict() if self._active else None,
+                "probed_seconds_ago": round(time.time() - self._probed_at, 1) if self._probed_at else None,
+                "ttl": self.ttl,
+                "negative_ttl": self.negative_ttl,
+                "breakers": {
+                    url: {"kind": kind, "state": b.state, "failures": b.failures, "last_error": b.last_error}
+                    for (kind, url), b in self._breakers.items() if b.failures or b.last_error
+                },
+                "probes": self.probes,
+                "background_probes": self.background_probes,
+                "calls": self.calls,
+                "skipped": self.skipped,
+                "failures": self.failures,
+            }
+
+
+local_llm_registry = LocalLLMRegistry(
+    ttl=settings.LOCAL_LLM_DISCOVERY_TTL,
+    negative_ttl=settings.LOCAL_LLM_NEGATIVE_TTL,
+    probe_timeout=settings.LOCAL_LLM_PROBE_TIMEOUT,
+    failure_threshold=settings.LOCAL_LLM_BREAKER_THRESHOLD,
+    cooldown=settings.LOCAL_LLM_BREAKER_COOLDOWN,
+)
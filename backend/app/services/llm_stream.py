@@ -0,0 +1,312 @@
+# backend/app/services/llm_stream.py
+# AI 보고서 스트리밍(SSE):
+# 로컬 Gemma(~20 tok/s)로 긴 보고서를 만들면 응답 하나를 다 기다리다 Vercel 60초 제한에 걸린다.
+# 여기서는 _call_llm과 같은 순서(로컬 → Gemini → Groq)로 각 공급자의 스트리밍 API를 열어 토큰이 오는 대로
+# Server-Sent Events로 흘려보낸다. 첫 토큰이 나오기 전에 실패한 공급자는 조용히 다음으로 넘어가고,
+# 끝까지 받은 보고서는 llm_result_cache에 저장되어 일반(비스트리밍) 엔드포인트와 캐시를 공유한다.
+
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import requests
+
+# While set, _call_llm records its prompts here and returns "" instead of calling a model:
+# a streaming endpoint runs the regular endpoint under capturing_prompts() to build the
+# exact same prompt, then streams it.
+_captured: ContextVar[Optional[List[Tuple[str, str, int]]]] = ContextVar("llm_captured_prompts", default=None)
+
+
+@contextmanager
+def capturing_prompts():
+    prompts: List[Tuple[str, str, int]] = []
+    token = _captured.set(prompts)
+    try:
+        yield prompts
+    finally:
+        _captured.reset(token)
+
+
+def capture_prompt(system_prompt: str, user_prompt: str, max_tokens: int) -> bool:
+    """Record the prompt if a capture is active (then the caller must not call the model)."""
+    prompts = _captured.get()
+    if prompts is None:
+        return False
+    prompts.append((system_prompt, user_prompt, max_tokens))
+    return True
+
+
+def sse_event(data: Dict[str, Any], event: Optional[str] = None) -> str:
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+class ThinkFilter:
+    """Drops <think>...</think> blocks from a token stream, also when a tag is split across chunks."""
+
+    OPEN, CLOSE = "<think>", "</think>"
+
+    def __init__(self):
+        self.buf = ""
+        self.inside = False
+
+    @staticmethod
+    def _partial_tag(text: str, tag: str) -> int:
+        lower = text.lower()
+        for k in range(min(len(tag) - 1, len(text)), 0, -1):
+            if lower.endswith(tag[:k]):
+                return k
+        return 0
+
+    def feed(self, text: str) -> str:
+        self.buf += text
+        out = []
+        while self.buf:
+            lower = self.buf.lower()
+            if self.inside:
+                end = lower.find(self.CLOSE)
+                if end < 0:
+                    keep = self._partial_tag(self.buf, self.CLOSE)
+                    self.buf = self.buf[len(self.buf) - keep:] if keep else ""
+                    break
+                self.buf = self.buf[end + len(self.CLOSE):]
+                self.inside = False
+            else:
+                start = lower.find(self.OPEN)
+                if start < 0:
+                    keep = self._partial_tag(self.buf, self.OPEN)
+                    out.append(self.buf[:len(self.buf) - keep])
+                    self.buf = self.buf[len(self.buf) - keep:]
+                    break
+                out.append(self.buf[:start])
+                self.buf = self.buf[start + len(self.OPEN):]
+                self.inside = True
+        return "".join(out)
+
+    def flush(self) -> str:
+        rest, self.buf = ("" if self.inside else self.buf), ""
+        return rest
+
+
+def _data_lines(resp) -> Iterator[str]:
+    """Payloads of `data:` lines of an SSE response (decoded as UTF-8 regardless of headers)."""
+    for raw in resp.iter_lines():
+        if not raw:
+            continue
+        line = raw.decode("utf-8", "replace") if isinstance(raw, bytes) else raw
+        if line.startswith("data:"):
+            yield line[5:].strip()
+
+
+# ── sources ──────────────────────────────────────────────────
+# Each source is a generator of text chunks. One that fails before yielding anything is
+# skipped in favour of the next; `state` receives the model tag appended to the report.
+
+def _local_source(system_prompt: str, user_prompt: str, max_tokens: int, state: Dict[str, Any]) -> Iterator[str]:
+    from app.services.ai_insight import _local_openai_payload, _ollama_payload
+    from app.services.llm_providers import OPENAI, local_llm_registry
+
+    provider = local_llm_registry.resolve()
+    if provider is None:
+        return
+    if provider.kind == OPENAI:
+        url = f"{provider.base_url}/chat/completions"
+        payload = _local_openai_payload(system_prompt, user_prompt, max_tokens, provider.model)
+    else:
+        url = f"{provider.base_url}/api/chat"
+        payload = _ollama_payload(system_prompt, user_prompt, max_tokens, provider.model)
+    payload["stream"] = True
+    try:
+        # read timeout applies between chunks, not to the whole report
+        resp = requests.post(url, json=payload, stream=True, timeout=(5, 60))
+    except Exception as e:
+        local_llm_registry.record_failure(provider, str(e))
+        return
+    with resp:
+        if resp.status_code != 200:
+            local_llm_registry.record_failure(provider, f"HTTP {resp.status_code}")
+            return
+        local_llm_registry.record_success(provider)
+        if provider.kind == OPENAI:
+            state["tag"] = f"\n\n---\n> 🖥️ **로컬 AI 모델**: {provider.model} ({provider.location_tag})"
+            for data in _data_lines(resp):
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                if chunk.get("model"):
+                    state["tag"] = f"\n\n---\n> 🖥️ **로컬 AI 모델**: {chunk['model']} ({provider.location_tag})"
+                choices = chunk.get("choices") or [{}]
+                text = (choices[0].get("delta") or {}).get("content")
+                if text:
+                    yield text
+        else:
+            state["tag"] = f"\n\n---\n> 🖥️ **로컬 모델**: {provider.model} (Ollama)"
+            for raw in resp.iter_lines():
+                if not raw:
+                    continue
+                chunk = json.loads(raw)
+                text = (chunk.get("message") or {}).get("content")
+                if text:
+                    yield text
+                if chunk.get("done"):
+                    break
+
+
+def _gemini_source(model: str, system_prompt: str, user_prompt: str, max_tokens: int,
+                   state: Dict[str, Any]) -> Iterator[str]:
+    from app.services.ai_insight import _gemini_request_bodies
+
+    gemini_key = state["gemini_key"]
+    url = (f"https://generativelanguage.googleapis.com/v1beta/models/{model}:streamGenerateContent"
+           f"?alt=sse&key={gemini_key}")
+    for body in _gemini_request_bodies(system_prompt, user_prompt):
+        try:
+            resp = requests.post(url, json=body, stream=True, timeout=(10, 55))
+        except Exception as e:
+            state["last_error"] = f"{model} 예외: {str(e)[:100]}"
+            continue
+        with resp:
+            if resp.status_code != 200:
+                state["last_error"] = f"{model} HTTP {resp.status_code}"
+                if resp.status_code == 429:
+                    return
+                continue
+            finish_reason, in_tokens, out_tokens = "UNKNOWN", 0, 0
+            for data in _data_lines(resp):
+                chunk = json.loads(data)
+                candidates = chunk.get("candidates") or [{}]
+                finish_reason = candidates[0].get("finishReason", finish_reason)
+                usage = chunk.get("usageMetadata") or {}
+                in_tokens = usage.get("promptTokenCount", in_tokens)
+                out_tokens = usage.get("candidatesTokenCount", out_tokens)
+                text = "".join(p.get("text", "") for p in (candidates[0].get("content") or {}).get("parts", []))
+                if text:
+                    yield text
+            diag = f"| 종료: {finish_reason} | 입력: {in_tokens}토큰, 출력: {out_tokens}토큰"
+            state["tag"] = f"\n\n---\n> ☁️ **AI 모델**: {model} (Google Gemini) {diag}"
+            return
+
+
+def _groq_source(model: str, system_prompt: str, user_prompt: str, max_tokens: int,
+                 state: Dict[str, Any]) -> Iterator[str]:
+    from app.services.ai_insight import GROQ_CHAT_URL, _groq_payload
+
+    payload = _groq_payload(system_prompt, user_prompt, max_tokens, model)
+    payload["stream"] = True
+    try:
+        resp = requests.post(
+            GROQ_CHAT_URL,
+            headers={"Authorization": f"Bearer {state['groq_key']}", "Content-Type": "application/json"},
+            json=payload, stream=True, timeout=(10, 45)
+        )
+    except Exception as e:
+        state["last_error"] = f"Groq {model}: {str(e)[:100]}"
+        return
+    with resp:
+        if resp.status_code != 200:
+            state["last_error"] = f"Groq {model} HTTP {resp.status_code}"
+            return
+        state["tag"] = f"\n\n---\n> ☁️ **AI 모델**: {model} (Groq)"
+        for data in _data_lines(resp):
+            if data == "[DONE]":
+                break
+            choices = json.loads(data).get("choices") or [{}]
+            text = (choices[0].get("delta") or {}).get("content")
+            if text:
+                yield text
+
+
+def _sources(system_prompt: str, user_prompt: str, max_tokens: int, state: Dict[str, Any]):
+    import os
+    from app.services.ai_insight import GEMINI_MODELS, GROQ_MODELS, _gemini_key
+
+    yield "local", _local_source(system_prompt, user_prompt, max_tokens, state)
+    gemini_key = _gemini_key()
+    groq_key = os.getenv("GROQ_API_KEY", "").strip()
+    if gemini_key:
+        state["gemini_key"] = gemini_key
+        for model in GEMINI_MODELS:
+            yield model, _gemini_source(model, system_prompt, user_prompt, max_tokens, state)
+    if groq_key:
+        state["groq_key"] = groq_key
+        for model in GROQ_MODELS:
+            yield f"groq:{model}", _groq_source(model, system_prompt, user_prompt, max_tokens, state)
+
+
+# ── SSE ──────────────────────────────────────────────────────
+
+def stream_text_events(text: str, cached: bool = False) -> Iterator[str]:
+    """A complete result (cache hit, or an endpoint that answered without the model) as one event."""
+    yield sse_event({"cached": cached}, "meta")
+    yield sse_event({"delta": text or ""})
+    yield sse_event({"finish": "complete", "cached": cached}, "done")
+
+
+def stream_llm_events(system_prompt: str, user_prompt: str, max_tokens: int = 8192,
+                      regenerate: bool = False) -> Iterator[str]:
+    """
+    SSE events for one report:
+      event: meta   {"source", "cached"}       once the first provider starts producing text
+      data:         {"delta": "..."}           report text as it arrives
+      event: done   {"finish", "elapsed_ms"}   after the model tag; the full text is cached
+      event: error  {"message"}                no provider could start, or one broke mid-report
+    """
+    from app.core.config import settings
+    from app.services.ai_insight import _is_cacheable_result, _llm_model_id
+
+    key = None
+    if settings.LLM_CACHE_ENABLED:
+        from app.services.llm_cache import llm_cache_key, llm_result_cache
+        key = llm_cache_key(system_prompt, user_prompt, _llm_model_id(), max_tokens)
+        if not regenerate:
+            cached = llm_result_cache.peek(key)
+            if cached is not None:
+                yield from stream_text_events(cached, cached=True)
+                return
+
+    started = time.time()
+    state: Dict[str, Any] = {"last_error": ""}
+    for name, chunks in _sources(system_prompt, user_prompt, max_tokens, state):
+        think = ThinkFilter()
+        parts: List[str] = []
+        state["tag"] = ""
+        try:
+            for chunk in chunks:
+                text = think.feed(chunk)
+                if not parts:
+                    text = text.lstrip()
+                    if not text:
+                        continue
+                    yield sse_event({"source": name, "cached": False}, "meta")
+                parts.append(text)
+                yield sse_event({"delta": text})
+        except Exception as e:
+            state["last_error"] = f"{name}: {str(e)[:100]}"
+            if parts:
+                yield sse_event({"message": f"⚠️ 스트리밍이 중단되었습니다. ({state['last_error']})"}, "error")
+                return
+            continue
+        finally:
+            chunks.close()
+        if not parts:
+            continue
+
+        tail = think.flush()
+        if tail:
+            parts.append(tail)
+            yield sse_event({"delta": tail})
+        tag = state.get("tag", "")
+        if tag:
+            yield sse_event({"delta": tag})
+        report = "".join(parts).rstrip() + tag
+        if key is not None and _is_cacheable_result(report):
+            llm_result_cache.put(key, report)
+        yield sse_event({"finish": "complete", "source": name,
+                         "elapsed_ms": int((time.time() - started) * 1000)}, "done")
+        return
+
+    message = (f"⚠️ 모든 AI 모델 호출에 실패했습니다. (마지막 오류: {state['last_error']})"
+               if state.get("gemini_key") or state.get("groq_key")
+               else "⚠️ AI 응답 생성에 실패했습니다. Vercel 환경변수 GEMINI_API_KEY 또는 GROQ_API_KEY를 설정해주세요.")
+    yield sse_event({"message": message}, "error")
@@ -400,46 +400,77 @@ def extract_clinical_signals(text: str, restraint_val: str = "") -> Dict[str, An
 # 8. 개별 레코드 종합 정규화 함수
 # ==============================================================================
 
-def normalize_behavior_log(raw_row: dict, tier_info_map: dict = None) -> dict:
+def extract_log_fields(raw_row: dict) -> Tuple[str, ...]:
     """
-    원자료 1건을 분석용 정규 객체로 변환하고 raw_* 원본 필드를 완벽히 보존합니다.
+    정규화에 쓰이는 원자료 필드 13종을 추출합니다. 같은 튜플이면 정규화 결과도 같으므로 캐시 키로 사용됩니다.
     """
-    tier_info_map = tier_info_map or {}
-    
-    name = str(raw_row.get("student_name", raw_row.get("학생명", ""))).strip()
-    code = str(raw_row.get("student_code", raw_row.get("학생코드", ""))).strip()
-    date_val = str(raw_row.get("date", raw_row.get("발생날짜", raw_row.get("행동발생날짜", "")))).strip()
-    time_val = str(raw_row.get("time_slot", raw_row.get("시간대", ""))).strip()
-    loc_val = str(raw_row.get("location", raw_row.get("행동 발생 장소", raw_row.get("장소", "")))).strip()
-    type_val = str(raw_row.get("behavior_type", raw_row.get("행동유형(핵심행동으로택1)", raw_row.get("행동유형", "")))).strip()
-    int_val = str(raw_row.get("intensity", raw_row.get("강도(1~5)", raw_row.get("강도(1~5점 척도)", "1")))).strip()
-    func_val = str(raw_row.get("function", raw_row.get("추정기능(이번 행동을 통해 파악된 기능)", raw_row.get("추정기능", "")))).strip()
-    restr_val = str(raw_row.get("restraint_report", raw_row.get("물리적제지, 3/4호분리지도,본인/타인상해 발생 여부", raw_row.get("물리적제지", "X")))).strip()
-    freq_val = str(raw_row.get("frequency", raw_row.get("발생횟수(한 에피소드 당 1회로 입력 권장)", raw_row.get("발생횟수", "1")))).strip()
-    notes_val = str(raw_row.get("notes", raw_row.get("특기사항(기타)", raw_row.get("특기사항", "")))).strip()
-    ts_val = str(raw_row.get("timestamp", raw_row.get("타임스탬프", ""))).strip()
-    teacher_val = str(raw_row.get("teacher_name", raw_row.get("입력교사명", ""))).strip()
-    
-    student_meta = tier_info_map.get(code, tier_info_map.get(name, {}))
-    class_name = student_meta.get("class", student_meta.get("학급", ""))
-    course_level = resolve_course_level(code, class_name)
-    tier = student_meta.get("tier", student_meta.get("Tier", 1))
-    
-    slot_numbers = parse_time_slots(time_val)
-    slot_labels = [resolve_slot_label(s, course_level) for s in slot_numbers]
-    
+    return (
+        str(raw_row.get("student_name", raw_row.get("학생명", ""))).strip(),
+        str(raw_row.get("student_code", raw_row.get("학생코드", ""))).strip(),
+        str(raw_row.get("date", raw_row.get("발생날짜", raw_row.get("행동발생날짜", "")))).strip(),
+        str(raw_row.get("time_slot", raw_row.get("시간대", ""))).strip(),
+        str(raw_row.get("location", raw_row.get("행동 발생 장소", raw_row.get("장소", "")))).strip(),
+        str(raw_row.get("behavior_type", raw_row.get("행동유형(핵심행동으로택1)", raw_row.get("행동유형", "")))).strip(),
+        str(raw_row.get("intensity", raw_row.get("강도(1~5)", raw_row.get("강도(1~5점 척도)", "1")))).strip(),
+        str(raw_row.get("function", raw_row.get("추정기능(이번 행동을 통해 파악된 기능)", raw_row.get("추정기능", "")))).strip(),
+        str(raw_row.get("restraint_report", raw_row.get("물리적제지, 3/4호분리지도,본인/타인상해 발생 여부", raw_row.get("물리적제지", "X")))).strip(),
+        str(raw_row.get("frequency", raw_row.get("발생횟수(한 에피소드 당 1회로 입력 권장)", raw_row.get("발생횟수", "1")))).strip(),
+        str(raw_row.get("notes", raw_row.get("특기사항(기타)", raw_row.get("특기사항", "")))).strip(),
+        str(raw_row.get("timestamp", raw_row.get("타임스탬프", ""))).strip(),
+        str(raw_row.get("teacher_name", raw_row.get("입력교사명", ""))).strip(),
+    )
+
+
+def normalize_log_fields(fields: Tuple[str, ...]) -> dict:
+    """
+    학생 메타(학급·Tier)와 무관한 정규화 단계. 결과는 apply_student_meta()가 읽기 전용으로 사용합니다.
+    """
+    (name, code, date_val, time_val, loc_val, type_val, int_val,
+     func_val, restr_val, freq_val, notes_val, ts_val, teacher_val) = fields
+
     loc_norm = normalize_location(loc_val)
     func_norm = normalize_function(func_val)
     occ_norm = parse_occurrence(freq_val)
-    beh_norm = normalize_behavior_type(type_val)
-    lag_days = compute_entry_lag(ts_val, date_val)
     signals = extract_clinical_signals(notes_val, restr_val)
-    
+
     try:
         intensity_num = int(re.search(r'\d+', int_val).group(1)) if re.search(r'\d+', int_val) else 1
     except Exception:
         intensity_num = 1
-        
+
+    return {
+        "fields": fields,
+        "time_slots": parse_time_slots(time_val),
+        "loc_norm": loc_norm,
+        "func_norm": func_norm,
+        "occurrence_count": occ_norm["count"] if occ_norm["count"] is not None else 1,
+        "behavior_type": normalize_behavior_type(type_val),
+        "entry_lag_days": compute_entry_lag(ts_val, date_val),
+        "signals": signals,
+        "intensity": intensity_num,
+    }
+
+
+def apply_student_meta(base: dict, tier_info_map: dict = None) -> dict:
+    """
+    normalize_log_fields() 결과에 학급·과정·Tier·구간명을 붙여 최종 정규 객체를 만듭니다.
+    """
+    tier_info_map = tier_info_map or {}
+    (name, code, date_val, time_val, loc_val, type_val, int_val,
+     func_val, restr_val, freq_val, notes_val, ts_val, teacher_val) = base["fields"]
+
+    student_meta = tier_info_map.get(code, tier_info_map.get(name, {}))
+    class_name = student_meta.get("class", student_meta.get("학급", ""))
+    course_level = resolve_course_level(code, class_name)
+    tier = student_meta.get("tier", student_meta.get("Tier", 1))
+
+    slot_numbers = base["time_slots"]
+    slot_labels = [resolve_slot_label(s, course_level) for s in slot_numbers]
+    loc_norm = base["loc_norm"]
+    func_norm = base["func_norm"]
+    signals = base["signals"]
+
+    # 리스트 필드는 복사해서 반환 (base는 여러 호출이 공유)
     return {
         # 정규화된 필드
         "student_name": name,
@@ -448,28 +479,28 @@ def normalize_behavior_log(raw_row: dict, tier_info_map: dict = None) -> dict:
         "course_level": course_level,
         "tier": tier,
         "date": date_val,
-        "time_slots": slot_numbers,
+        "time_slots": list(slot_numbers),
         "time_slot_labels": slot_labels,
         "primary_slot": slot_numbers[0] if slot_numbers else None,
         "location": loc_norm["code"],
-        "locations": loc_norm["codes"],
-        "behavior_type": beh_norm,
-        "intensity": intensity_num,
-        "function_codes": func_norm["codes"],
-        "function_labels": func_norm["labels"],
+        "locations": list(loc_norm["codes"]),
+        "behavior_type": base["behavior_type"],
+        "intensity": base["intensity"],
+        "function_codes": list(func_norm["codes"]),
+        "function_labels": list(func_norm["labels"]),
         "function_confidence": func_norm["confidence"],
         "is_go_home": func_norm["is_go_home"],
-        "occurrence_count": occ_norm["count"] if occ_norm["count"] is not None else 1,
+        "occurrence_count": base["occurrence_count"],
         "restraint": "O" if signals["is_restrained"] else "X",
         "is_restrained": signals["is_restrained"],
         "notes": notes_val,
         "teacher_name": teacher_val,
-        "entry_lag_days": lag_days,
+        "entry_lag_days": base["entry_lag_days"],
         "has_staff_injury": signals["has_staff_injury"],
-        "setting_events": signals["setting_events"],
+        "setting_events": list(signals["setting_events"]),
         "used_sensory_room": signals["used_sensory_room"],
         "sensory_room_success": signals["sensory_room_success"],
-        
+
         # 원본 필드 보존 (raw_*)
         "raw_time_slot": time_val,
         "raw_location": loc_val,
@@ -481,6 +512,14 @@ def normalize_behavior_log(raw_row: dict, tier_info_map: dict = None) -> dict:
     }
 
 
+def normalize_behavior_log(raw_row: dict, tier_info_map: dict = None) -> dict:
+    """
+    원자료 1건을 분석용 정규 객체로 변환하고 raw_* 원본 필드를 완벽히 보존합니다.
+    Log_Main 행을 반복 정규화할 때는 event_store.normalize_logs()를 사용하세요 (행별 결과 캐시).
+    """
+    return apply_student_meta(normalize_log_fields(extract_log_fields(raw_row)), tier_info_map)
+
+
 # ==============================================================================
 # 9. 데이터 품질 보고서 (Data Quality Report)
 # ==============================================================================
@@ -1,9 +1,11 @@
 from typing import Optional
 import gspread
 from app.services.sheets import (
-    get_sheets_client, settings, fetch_student_status,
+    get_sheets_client, get_spreadsheet, settings, fetch_student_status,
     fetch_evaluation_sentences
 )
+from app.adapters.sheets.client import get_or_load, invalidate_cache
+from app.adapters.sheets.write_queue import sheet_write_queue
 from app.core.picture_word_data import DOMAINS, VBS, VOCAB_DATA, LESSON_DATA
 import time
 import threading
@@ -38,7 +40,7 @@ def get_pw_spreadsheet():
     if not client or not settings.SHEET_URL:
         return None
     try:
-        return client.open_by_url(settings.SHEET_URL)
+        return get_spreadsheet()
     except Exception as e:
         print(f"[PW] 시트 접근 오류: {e}")
         return None
@@ -54,15 +56,12 @@ def get_or_create_worksheet(ss, title: str, rows=200, cols=20):
 # 1. Roster (학생 명부) 관리 기반 - TierStatus 연동으로 변경
 # ─────────────────────────────────────────────────────────────
 
-_pw_cache = {"vocab": {}}
 PW_CACHE_TTL = 60
+PW_CACHE_KEY_VOCAB = "pw:vocab:GLOBAL"
 
 def clear_pw_cache(class_id: Optional[str] = None):
-    global _pw_cache
-    if class_id:
-        _pw_cache["vocab"][class_id] = {"data": [], "timestamp": 0}
-    else:
-        _pw_cache["vocab"] = {}
+    # 어휘 데이터는 전 학급 통합 시트 1개로 캐시되므로 학급 단위 요청도 전체 무효화
+    invalidate_cache("pw:vocab")
 
 def get_global_vocab_ws(ss):
     """글로벌 통합 어휘 데이터 시트 (PW_어휘데이터) 확보 및 초기화"""
@@ -76,22 +75,17 @@ def get_global_vocab_ws(ss):
         return ws
 
 def fetch_global_vocab_records():
-    global _pw_cache
-    now = time.time()
-    
-    cache_entry = _pw_cache["vocab"].get("GLOBAL")
-    if cache_entry and cache_entry["data"] and (now - cache_entry["timestamp"] < PW_CACHE_TTL):
-        return cache_entry["data"]
-        
+    # 동시 요청이 캐시 만료 시점에 몰려도 시트 읽기는 1회만 수행 (single-flight)
+    return get_or_load(PW_CACHE_KEY_VOCAB, _load_global_vocab_records, ttl=PW_CACHE_TTL, cache_if=bool)
+
+def _load_global_vocab_records():
     ss = get_pw_spreadsheet()
     if not ss:
         return []
     ws = get_global_vocab_ws(ss)
     
     try:
-        records = get_all_records_with_row_index(ws)
-        _pw_cache["vocab"]["GLOBAL"] = {"data": records, "timestamp": now}
-        return records
+        return get_all_records_with_row_index(ws)
     except Exception as e:
         print(f"[PW] Error fetching global vocab: {e}")
         return []
@@ -211,10 +205,12 @@ def update_student_vocab(class_id: str, student_name: str, vocab_id: int, update
         records = fetch_global_vocab_records()
     
     target_row = None
+    target_record = None
     # 검색
     for r in records:
         if str(r.get('학급ID', '')) == str(class_id) and str(r.get('학생이름', '')) == str(student_name) and int(r.get('번호', 0)) == int(vocab_id):
             target_row = r.get('_row_index')
+            target_record = r
             break
             
     if not target_row:
@@ -227,30 +223,40 @@ def update_student_vocab(class_id: str, student_name: str, vocab_id: int, update
         '협의내용': 14, '협의날짜': 15
     }
     
+    cells = []
     for key, val in updates.items():
         if key in col_map:
             if isinstance(val, bool):
                 val_str = 'TRUE' if val else 'FALSE'
             else:
                 val_str = str(val)
-            ws.update_cell(target_row, col_map[key], val_str)
-
-    # 합계 자동 계산 기능 (7~12 열)
-    row_data = ws.row_values(target_row) # 0-based 리스트 반환
-    total = 0
-    # 열 범위: D~I 가 아니고 G~L 이므로 cols index = 6~11
-    for col in range(6, 12):
-        if col < len(row_data) and str(row_data[col]).upper() == 'TRUE':
-            total += 1
-            
-    ws.update_cell(target_row, 13, total) # 13: 합계 열
+            # 캐시된 레코드에 바로 반영 (합계 계산 및 쓰기 반영 전 조회용)
+            target_record[key] = val_str
+            cells.append({"range": f"{chr(64 + col_map[key])}{target_row}", "values": [[val_str]]})
+
+    # 합계 자동 계산 기능 (7~12 열) - 시트 재조회 없이 캐시된 행 기준
+    total = sum(1 for b_key in VB_COLS if str(target_record.get(b_key, '')).upper() == 'TRUE')
+    target_record['합계'] = str(total)
+    cells.append({"range": f"M{target_row}", "values": [[total]]})  # 13: 합계 열
+
+    # 셀 단위 update_cell 대신 쓰기 큐로 1회 batch_update (update_cell과 같은 USER_ENTERED)
+    # 큐 비활성(즉시 전송) 시 실패는 여기서 failed에 담긴다 - 캐시에 먼저 반영한 값은 무효화로 되돌림
+    failed = []
+
+    def write_failed(e):
+        failed.append(e)
+        clear_pw_cache()
+
+    sheet_write_queue.update(ws, cells, value_input_option="USER_ENTERED",
+                             on_flushed=clear_pw_cache, on_failed=write_failed)
+    if failed:
+        return {"error": f"시트 저장 실패: {failed[0]}"}
 
     # [NEW RULE] 어휘 업데이트 후 인증제 배지 개수 계산 및 TierStatus 연동
     from app.services.sheets import update_tierstatus_certification
     cert_status = fetch_certification_status(class_id, student_name)
     update_tierstatus_certification(student_name, cert_status["total_badges"])
 
-    clear_pw_cache()
     return {"message": "업데이트 완료", "total_badges": cert_status["total_badges"]}
 
 def batch_update_student_vocab(class_id: str, student_name: str, payload: list[dict]) -> dict:
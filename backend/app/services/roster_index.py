@@ -0,0 +1,64 @@
+# backend/app/services/roster_index.py
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from app.adapters.sheets.tier_status import TierStatusAdapter
+
+# The index is memoized on the raw TierStatus row list it was built from, not stored in the
+# sheet cache: it follows every reload or invalidation of the raw rows (which are never
+# served stale) at once. Scope checks in api/deps rely on it.
+_index_lock = threading.Lock()
+_index_source: Optional[list] = None
+_index: Dict[str, "RosterEntry"] = {}
+
+
+@dataclass(frozen=True)
+class RosterEntry:
+    student_code: str
+    class_code: str  # canonical, e.g. '초1-1'
+    name: str
+    beable_code: Optional[str]
+    tiers: List[str]
+    enrolled: bool
+
+
+def _build_roster_index(raw_records: List[Dict[str, Any]]) -> Dict[str, RosterEntry]:
+    from app.api.deps import normalize_class_identifier
+
+    index: Dict[str, RosterEntry] = {}
+    for row in raw_records:
+        student = TierStatusAdapter._normalize_student(row)
+        if not student:
+            continue
+        code = student.student_code.strip()
+        # First row wins, same as the linear scan it replaces
+        if code and code not in index:
+            index[code] = RosterEntry(
+                student_code=code,
+                class_code=normalize_class_identifier(student.class_name),
+                name=student.display_name,
+                beable_code=student.beable_code,
+                tiers=[t.value for t in student.tier.active_tiers],
+                enrolled=student.enrolled,
+            )
+    return index
+
+
+def get_roster_index() -> Dict[str, RosterEntry]:
+    """student_code -> RosterEntry for every TierStatus row. Treat as read-only."""
+    global _index_source, _index
+    raw_records = TierStatusAdapter.fetch_raw_records()
+    with _index_lock:
+        if raw_records is _index_source:
+            return _index
+    index = _build_roster_index(raw_records)
+    with _index_lock:
+        _index_source, _index = raw_records, index
+    return index
+
+
+def get_roster_entry(student_code: str) -> Optional[RosterEntry]:
+    if not student_code:
+        return None
+    return get_roster_index().get(str(student_code).strip())
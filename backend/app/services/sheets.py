@@ -1,29 +1,48 @@
 import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from app.core.config import settings
 import os
 import json
-import pandas as pd
 import re
 import datetime
 import time
+import asyncio
+import itertools
+import sys
 from typing import Optional, List, Dict, Any, Union
-from app.adapters.sheets.client import get_cached, set_cached, invalidate_cache
+from app.adapters.sheets.client import get_sheets_client, get_spreadsheet, get_cached, set_cached, invalidate_cache, get_or_load, aget_or_load, is_cached
+from app.adapters.sheets.async_client import get_async_sheets_client, is_missing_sheet_error, padded_values
+from app.adapters.sheets.batch_loader import RangeLoad, batch_load, abatch_load
+from app.adapters.sheets.tier_status import TierStatusAdapter, CACHE_KEY_TIER_STATUS_RAW
+from app.adapters.sheets.log_main import LOG_MAIN_TITLES
+from app.adapters.sheets.write_queue import sheet_write_queue
 from app.core.time import now_kst
 
-# Simple in-memory cache
-_cache = {
-    "records": {"data": [], "timestamp": 0},
-    "users": {"data": [], "timestamp": 0},
-    "board": {"data": [], "timestamp": 0},
-    "evaluation_sentences": {"data": [], "timestamp": 0},
-    "tierstatus": {"data": [], "timestamp": 0},
-    "daily_cico": {"data": [], "timestamp": 0},
-    "meeting_notes": {"data": [], "timestamp": 0},
-    "holidays": {"data": [], "timestamp": 0}
-}
 CACHE_TTL = 60  # Increased to 60 seconds to mitigate API limits in Vercel containers
 
+# Shared sheet cache keys (see app/adapters/sheets/cache.py)
+CACHE_KEY_RECORDS = "sheet:log-main:records"
+CACHE_KEY_LOG_INGEST = "sheet:log-main:ingest"
+LOG_FULL_RESYNC_SECONDS = 600
+CACHE_KEY_USERS = "sheet:users"
+CACHE_KEY_BOARD = "sheet:board"
+CACHE_KEY_EVALUATION_SENTENCES = "sheet:evaluation-sentences"
+CACHE_KEY_TIER_STATUS_RECORDS = "sheet:tier-status:records"
+CACHE_KEY_CICO_DAILY = "sheet:cico:daily"
+
+# Legacy clear_cache() slot names -> cache key prefix(es) to invalidate
+CACHE_SLOT_PREFIXES = {
+    "records": "sheet:log-main",
+    # Rows appended to Log_Main: keep the incremental ingest state, drop assembled views
+    "records:append": (CACHE_KEY_RECORDS, "sheet:log-main:events"),
+    "users": CACHE_KEY_USERS,
+    "tierstatus": "sheet:tier-status",
+    "board": CACHE_KEY_BOARD,
+    "evaluation_sentences": CACHE_KEY_EVALUATION_SENTENCES,
+    "meeting_notes": "sheet:meeting_notes",
+    "daily_cico": "sheet:cico",
+    "holidays": "config:holidays",
+}
+
 def safe_get_all_records(ws) -> List[Dict[str, Any]]:
     """
     Safely fetch all records from a worksheet.
@@ -49,64 +68,21 @@ def safe_get_all_records(ws) -> List[Dict[str, Any]]:
 def safe_get_all_values(ws) -> List[List[Any]]:
     """
     Safely fetch all values from a worksheet.
+    Transient errors (429/5xx) are retried with backoff by the Sheets governor.
     """
     try:
-        # Retry logic for transient errors
-        retries = 3
-        for i in range(retries):
-            try:
-                return ws.get_all_values()
-            except Exception as e:
-                if i == retries - 1: raise e
-                time.sleep(1)
-        return [] # Fallback
+        return ws.get_all_values()
     except Exception as e:
         print(f"safe_get_all_values failed: {e}")
         return []
 
-_sheets_client = None
-
-def get_sheets_client():
-    """
-    Authenticates with Google Sheets API and returns the client.
-    Prioritizes 'GOOGLE_SERVICE_ACCOUNT_JSON' env var (for Production/Render).
-    Fallbacks to 'service_account.json' file (for Local Dev).
-    Note: Token logic handles refresh automatically.
-    """
-    global _sheets_client
-    if _sheets_client is not None:
-        return _sheets_client
-
-    scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-
-    # 1. Try Environment Variable (Production)
-    env_creds = os.environ.get('GOOGLE_SERVICE_ACCOUNT_JSON')
-    if env_creds:
-        try:
-            creds_dict = json.loads(env_creds)
-            creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-            _sheets_client = gspread.authorize(creds)
-            return _sheets_client
-        except Exception as e:
-            print(f"Error loading credentials from env: {e}")
-            return None
-
-    # 2. Try Local File (Development)
-    if os.path.exists(settings.GOOGLE_CREDENTIALS_FILE):
-        creds = ServiceAccountCredentials.from_json_keyfile_name(settings.GOOGLE_CREDENTIALS_FILE, scope)
-        _sheets_client = gspread.authorize(creds)
-        return _sheets_client
-
-    print(f"Warning: Credentials not found (Env var or {settings.GOOGLE_CREDENTIALS_FILE})")
-    return None
-
 def get_main_worksheet():
     client = get_sheets_client()
     if not client or not settings.SHEET_URL:
         return None
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         primary_names = ["Log_Main", "BehaviorLogs1", "BehaviorLogs", "설문지 응답 시트1", "설문지 응답 1", "Form Responses 1", "시트1"]
         existing_ws = {ws.title: ws for ws in sheet.worksheets()}
 
@@ -122,60 +98,30 @@ def get_main_worksheet():
 
 def fetch_evaluation_sentences():
     """Fetch all records from '평가문장' worksheet with caching."""
-    global _cache
-    now = time.time()
-    cached = _cache.get("evaluation_sentences")
-    if cached and cached.get("data") and (now - float(cached.get("timestamp", 0)) < 3600):
-        return cached["data"]
+    cached = get_cached(CACHE_KEY_EVALUATION_SENTENCES, ttl=3600)
+    if cached:
+        return cached
     client = get_sheets_client()
     if not client:
         return []
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         ws = sheet.worksheet(settings.DAILY_LOG_SHEET)
         records = safe_get_all_records(ws)
-        _cache["evaluation_sentences"] = {"data": records, "timestamp": float(now)}
+        set_cached(CACHE_KEY_EVALUATION_SENTENCES, records, ttl=3600)
         return records
     except Exception as e:
         print(f"Error fetching evaluation sentences: {e}")
         return []
 
 def clear_cache(key: Optional[str] = None):
-    global _cache
+    """Invalidate a cache slot by legacy name ("records", "users", ...) or key prefix; all if key is None."""
     try:
         if key:
-            if key in _cache:
-                _cache[key] = {"data": [], "timestamp": 0.0}
-            else:
-                _cache[key] = {"data": [], "timestamp": 0.0}
-
-            # Propagate targeted invalidations to adapter generic cache
-            if key == "records":
-                invalidate_cache("records")
-                invalidate_cache("sheet:log-main")
-            elif key == "users":
-                invalidate_cache("users")
-                invalidate_cache("sheet:users")
-            elif key == "tierstatus":
-                invalidate_cache("tierstatus")
-                invalidate_cache("sheet:tier-status")
-            elif key == "board":
-                invalidate_cache("board")
-                invalidate_cache("sheet:board")
-            elif key == "meeting_notes":
-                invalidate_cache("meeting:notes")
-                invalidate_cache("sheet:meeting_notes")
-            elif key == "daily_cico":
-                invalidate_cache("sheet:cico")
-            elif key == "holidays":
-                invalidate_cache("config:holidays")
-            elif key.startswith("bip"):
-                invalidate_cache(key)
-            else:
-                invalidate_cache(key)
+            prefixes = CACHE_SLOT_PREFIXES.get(key, key)
+            for prefix in ((prefixes,) if isinstance(prefixes, str) else prefixes):
+                invalidate_cache(prefix)
         else:
-            for k in _cache:
-                _cache[k] = {"data": [], "timestamp": 0.0}
             invalidate_cache()
     except Exception as e:
         print(f"clear_cache error: {e}")
@@ -197,148 +143,465 @@ def normalize_date_string(date_str: str) -> str:
     return date_str
 
 def fetch_all_records(force_refresh: bool = False):
-    global _cache
-    now = time.time()
+    # Single-flight: concurrent cold-cache callers share one Log_Main read
+    return get_or_load(CACHE_KEY_RECORDS, _load_all_records, ttl=CACHE_TTL, force=force_refresh, cache_if=bool,
+                       persist=True)
 
-    cached_ts = _cache["records"].get("timestamp", 0.0)
-    if not force_refresh and _cache["records"]["data"] and isinstance(cached_ts, (int, float)) and (now - cached_ts < CACHE_TTL):
-        return _cache["records"]["data"]
+LOG_BEHAVIOR_SAMPLE_COLUMNS = [
+    "학생명", "행동유형(핵심행동으로택1)", "(주요)행동유형", "행동유형",
+    "행동발생날짜", "행동발생 날짜", "타임스탬프", "Timestamp", "장소", "행동 발생 장소"
+]
 
+LOG_CRISIS_HEADERS = [
+    "발생 시 지도교사",
+    "1차_개별학생교육지원_시간", "1차_개별학생교육지원_장소", "1차_개별학생교육지원_교사",
+    "2차_개별학생교육지원_시간", "2차_개별학생교육지원_장소", "2차_개별학생교육지원_교사",
+    "A_배경_선행사건", "B_나타난_위기행동", "C_후속결과",
+    "1차_경위", "2차_경위", "1차_관찰기록", "2차_관찰기록",
+    "부상자_치료_시간", "부상자_치료_내용",
+    "관리자_보고_시간", "관리자_보고_내용",
+    "학부모_알림_시간", "학부모_알림_내용",
+    "학생_상담_시간", "학생_상담_내용",
+    "학부모_상담_시간", "학부모_상담_내용",
+    "긴급회의_시간", "긴급회의_내용"
+]
+
+def _load_all_records():
+    """
+    Sync the behavior log worksheets into the ingest state and assemble the mapped rows.
+    After the first full read, each sync only downloads rows appended since the last one.
+    """
     client = get_sheets_client()
     if not client or not settings.SHEET_URL:
         return []
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
-        all_worksheets = sheet.worksheets()
-
-        exclude_titles = {
-            "Users", "TierStatus", "CICODaily", "PW_기록", "PW_수업가이드", "PW_협의록",
-            "StudentCodes", "평가문장", "Board", "MeetingNotes", "대시보드", "Dashboard"
-        }
+        sheet = get_spreadsheet()
+        target_worksheets = _log_target_worksheets(sheet.worksheets())
 
-        candidate_names = ["Log_Main", "BehaviorLogs1", "BehaviorLogs", "설문지 응답 시트1", "설문지 응답 1", "Form Responses 1", "시트1"]
+        state, previous = _current_log_ingest()
+        synced = {}
+        for ws in target_worksheets:
+            try:
+                synced[ws.title] = _sync_log_worksheet(ws, previous.get(ws.title))
+            except Exception as ws_err:
+                print(f"Error reading records from worksheet '{ws.title}': {ws_err}")
 
-        ws_by_title = {ws.title: ws for ws in all_worksheets}
-        target_worksheets = []
+        return _assemble_log_records(_store_log_ingest(state, synced))
+    except Exception as e:
+        print(f"Error fetching records: {e}")
+        return []
 
-        for name in candidate_names:
-            if name in ws_by_title and ws_by_title[name] not in target_worksheets:
-                target_worksheets.append(ws_by_title[name])
 
-        if not target_worksheets:
-            for ws in all_worksheets:
-                if ws.title not in exclude_titles:
-                    target_worksheets.append(ws)
+async def afetch_all_records(force_refresh: bool = False):
+    """
+    fetch_all_records() for async endpoints. The worksheets are read concurrently over the
+    async client; the row mapping runs in worker threads so the event loop stays free.
+    """
+    return await aget_or_load(CACHE_KEY_RECORDS, _load_all_records, ttl=CACHE_TTL, force=force_refresh,
+                              cache_if=bool, persist=True, aloader=_aload_all_records)
 
-        seen_keys = set()
-        beable_map_cache = None
-        mapped_values = []
 
-        for ws in target_worksheets:
-            try:
-                ws_records = safe_get_all_records(ws)
-                if not ws_records:
-                    continue
+async def _aload_all_records():
+    client = get_async_sheets_client()
+    if client is None or not settings.SHEET_URL:
+        return await asyncio.to_thread(_load_all_records)
 
-                # Check if worksheet looks like behavior log records
-                sample = ws_records[0] if ws_records else {}
-                has_behavior_columns = any(
-                    k in sample for k in [
-                        "학생명", "행동유형(핵심행동으로택1)", "(주요)행동유형", "행동유형",
-                        "행동발생날짜", "행동발생 날짜", "타임스탬프", "Timestamp", "장소", "행동 발생 장소"
-                    ]
-                )
-                if not has_behavior_columns and len(ws_records) > 0:
-                    continue
+    try:
+        # Worksheet index is cached by the session; only a cold index costs a metadata call
+        all_worksheets = await asyncio.to_thread(lambda: get_spreadsheet().worksheets())
+        target_worksheets = _log_target_worksheets(all_worksheets)
+
+        state, previous = _current_log_ingest()
+        results = await asyncio.gather(
+            *[_async_sync_log_worksheet(client, ws, previous.get(ws.title)) for ws in target_worksheets],
+            return_exceptions=True,
+        )
+        synced = {}
+        for ws, result in zip(target_worksheets, results):
+            if isinstance(result, Exception):
+                print(f"Error reading records from worksheet '{ws.title}': {result}")
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                synced[ws.title] = result
 
-                for idx, row in enumerate(ws_records):
-                    name = str(row.get("학생명", row.get("이름", row.get("학생", "")))).strip()
-                    code = str(row.get("학생코드", row.get("코드번호", row.get("코드", "")))).strip()
-                    date_val = str(row.get("발생날짜", row.get("행동발생날짜", row.get("행동발생 날짜", row.get("날짜", ""))))).strip()
-                    time_val = str(row.get("시간대", row.get("시간대 (복수)", row.get("시간대(복수)", "")))).strip()
-                    behavior_type = str(row.get("행동유형", row.get("행동유형(핵심행동으로택1)", row.get("(주요)행동유형", row.get("주요행동유형", ""))))).strip()
-                    ts_val = str(row.get("타임스탬프", row.get("Timestamp", row.get("입력일", "")))).strip()
-                    log_id = str(row.get("Log_ID", "")).strip()
-
-                    # Deduplicate across multiple worksheets
-                    if log_id:
-                        dedup_key = f"log_id:{log_id}"
-                    elif name and (date_val or ts_val):
-                        dedup_key = f"{name}_{date_val}_{time_val}_{behavior_type}_{ts_val}"
-                    else:
-                        dedup_key = f"row_{ws.title}_{idx}"
+        return await asyncio.to_thread(_assemble_log_records, _store_log_ingest(state, synced))
+    except Exception as e:
+        print(f"Error fetching records: {e}")
+        return []
 
-                    if dedup_key in seen_keys:
-                        continue
-                    seen_keys.add(dedup_key)
-
-                    # Auto-populate student code if missing
-                    if not code and name:
-                        if beable_map_cache is None:
-                            beable_map_cache = get_beable_code_mapping()
-                        clean_name = name.replace(" ", "")
-                        for k, v in (beable_map_cache or {}).items():
-                            if isinstance(v, dict) and str(v.get('student_name', '')).strip().replace(" ", "") == clean_name:
-                                code = v.get('student_code', k)
-                                break
-
-                    mapped_row = {
-                        "행동발생날짜": normalize_date_string(date_val),
-                        "시간대": time_val,
-                        "장소": str(row.get("행동 발생 장소", row.get("행동발생장소", row.get("장소", "")))).strip(),
-                        "강도": str(row.get("강도(1~5)", row.get("강도(1~5점 척도)", row.get("강도", "")))).strip(),
-                        "행동유형": behavior_type,
-                        "기능": str(row.get("추정기능(이번 행동을 통해 파악된 기능)", row.get("기능(이번 행동을 통해 파악된 기능)", row.get("기능", row.get("추정기능", ""))))).strip(),
-                        "결과": str(row.get("결과", row.get("C_후속결과", ""))).strip(),
-                        "학생명": name,
-                        "학생코드": code,
-                        "코드번호": str(row.get("코드번호", code)).strip(),
-                        "입력교사명": str(row.get("입력교사명", row.get("교사명", row.get("입력자", "")))).strip(),
-                        "타임스탬프": ts_val,
-                        "특기사항": str(row.get("특기사항(기타)", row.get("특기사항", row.get("비고", row.get("기타", ""))))).strip(),
-                        "물리적제지여부": str(row.get("물리적제지, 3/4호분리지도,본인/타인상해 발생 여부", row.get("물리적제지여부", row.get("분리지도 여부", row.get("물리적제지", ""))))).strip(),
-                        "발생횟수": row.get("발생횟수(한 에피소드 당 1회로 입력 권장)", row.get("발생횟수", row.get("발생빈도", 1))),
-                        "Log_ID": log_id,
-                        "Status": str(row.get("Status", "Approved")),
-                        "Source": str(row.get("Source", "Google Forms")),
-                        "Approval_Meta": str(row.get("Approval_Meta", ""))
-                    }
-
-                    crisis_headers = [
-                        "발생 시 지도교사",
-                        "1차_개별학생교육지원_시간", "1차_개별학생교육지원_장소", "1차_개별학생교육지원_교사",
-                        "2차_개별학생교육지원_시간", "2차_개별학생교육지원_장소", "2차_개별학생교육지원_교사",
-                        "A_배경_선행사건", "B_나타난_위기행동", "C_후속결과",
-                        "1차_경위", "2차_경위", "1차_관찰기록", "2차_관찰기록",
-                        "부상자_치료_시간", "부상자_치료_내용",
-                        "관리자_보고_시간", "관리자_보고_내용",
-                        "학부모_알림_시간", "학부모_알림_내용",
-                        "학생_상담_시간", "학생_상담_내용",
-                        "학부모_상담_시간", "학부모_상담_내용",
-                        "긴급회의_시간", "긴급회의_내용"
-                    ]
 
-                    crisis_details = {}
-                    has_crisis = False
-                    for ch in crisis_headers:
-                        val = str(row.get(ch, "")).strip()
-                        crisis_details[ch] = val
-                        if val:
-                            has_crisis = True
+def _log_records_range_load() -> Optional[RangeLoad]:
+    """
+    The Log_Main records entry as part of a multi-sheet batch read: whole worksheets on
+    the first sync, only header + appended rows (_log_append_ranges) afterwards.
+    None when the spreadsheet is not reachable (the regular loader then reports it).
+    """
+    if not get_sheets_client() or not settings.SHEET_URL:
+        return None
+    try:
+        target_worksheets = _log_target_worksheets(get_spreadsheet().worksheets())
+    except Exception as e:
+        print(f"Error fetching records: {e}")
+        return None
 
-                    if has_crisis:
-                        mapped_row["crisis_details"] = crisis_details
+    state, previous = _current_log_ingest()
+    plan, ranges = [], []
+    for ws in target_worksheets:
+        ws_state = previous.get(ws.title)
+        append_ranges = _log_append_ranges(ws_state) if ws_state else None
+        if append_ranges:
+            plan.append((ws, ws_state, len(ranges)))
+            ranges.extend((ws.title, r) for r in append_ranges)
+        else:
+            plan.append((ws, None, len(ranges)))
+            ranges.append((ws.title, None))
 
-                    mapped_values.append(mapped_row)
+    def build(value_ranges):
+        synced = {}
+        for ws, ws_state, at in plan:
+            try:
+                if ws_state:
+                    try:
+                        if _apply_new_log_rows(ws, ws_state, value_ranges[at].get("values", []),
+                                               value_ranges[at + 1].get("values", [])):
+                            synced[ws.title] = ws_state
+                            continue
+                    except Exception as e:
+                        print(f"Incremental sync failed for '{ws.title}', reloading: {e}")
+                    synced[ws.title] = _full_load_log_worksheet(ws, ws.get_all_values())
+                else:
+                    synced[ws.title] = _full_load_log_worksheet(ws, padded_values(value_ranges[at]))
             except Exception as ws_err:
                 print(f"Error reading records from worksheet '{ws.title}': {ws_err}")
+        return _assemble_log_records(_store_log_ingest(state, synced))
+
+    return RangeLoad(CACHE_KEY_RECORDS, ranges, build, loader=_load_all_records, aloader=_aload_all_records,
+                     ttl=CACHE_TTL, cache_if=bool, persist=True)
+
+
+def _log_and_tier_status_loads() -> List[RangeLoad]:
+    loads = [TierStatusAdapter.raw_records_range_load()]
+    log_load = _log_records_range_load()
+    if log_load is not None:
+        loads.append(log_load)
+    return loads
+
+
+def prefetch_log_and_tier_status():
+    """
+    Warm Log_Main records and TierStatus rows together: whatever is not cached yet comes
+    back from one values.batchGet instead of one read per sheet.
+    """
+    if is_cached(CACHE_KEY_RECORDS, CACHE_TTL) and is_cached(CACHE_KEY_TIER_STATUS_RAW):
+        return
+    batch_load(_log_and_tier_status_loads())
+
+
+async def aprefetch_log_and_tier_status():
+    """prefetch_log_and_tier_status() for async endpoints (one batchGet over the async client)."""
+    if is_cached(CACHE_KEY_RECORDS, CACHE_TTL) and is_cached(CACHE_KEY_TIER_STATUS_RAW):
+        return
+    # Planning reads the worksheet index and the ingest state: keep it off the event loop
+    await abatch_load(await asyncio.to_thread(_log_and_tier_status_loads))
+
+
+def _log_target_worksheets(all_worksheets) -> list:
+    exclude_titles = {
+        "Users", "TierStatus", "CICODaily", "PW_기록", "PW_수업가이드", "PW_협의록",
+        "StudentCodes", "평가문장", "Board", "MeetingNotes", "대시보드", "Dashboard"
+    }
+
+    candidate_names = ["Log_Main", "BehaviorLogs1", "BehaviorLogs", "설문지 응답 시트1", "설문지 응답 1", "Form Responses 1", "시트1"]
+
+    ws_by_title = {ws.title: ws for ws in all_worksheets}
+    target_worksheets = []
+
+    for name in candidate_names:
+        if name in ws_by_title and ws_by_title[name] not in target_worksheets:
+            target_worksheets.append(ws_by_title[name])
+
+    if not target_worksheets:
+        for ws in all_worksheets:
+            if ws.title not in exclude_titles:
+                target_worksheets.append(ws)
+    return target_worksheets
+
+
+_log_generations = itertools.count(1)
 
-        _cache["records"] = {"data": mapped_values, "timestamp": now}
-        return mapped_values
-    except Exception as e:
-        print(f"Error fetching records: {e}")
-        return []
+
+def _current_log_ingest():
+    # The ingest state expires every LOG_FULL_RESYNC_SECONDS, forcing a full re-read
+    # so in-place edits made directly in the sheet are eventually picked up.
+    state = get_cached(CACHE_KEY_LOG_INGEST, ttl=LOG_FULL_RESYNC_SECONDS)
+    return state, (state["sheets"] if state else {})
+
+
+def _store_log_ingest(state: Optional[dict], synced: dict) -> dict:
+    if state is None:
+        state = {"sheets": synced, "order": list(synced)}
+        set_cached(CACHE_KEY_LOG_INGEST, state, ttl=LOG_FULL_RESYNC_SECONDS)
+    else:
+        # Update in place so the entry keeps its original timestamp (resync clock)
+        state["sheets"] = synced
+        state["order"] = list(synced)
+    return state
+
+
+def _sync_log_worksheet(ws, ws_state: Optional[dict]) -> dict:
+    """Bring one worksheet's ingest state up to date: append new rows, or fully reload."""
+    if ws_state:
+        try:
+            if _append_new_log_rows(ws, ws_state):
+                return ws_state
+        except Exception as e:
+            print(f"Incremental sync failed for '{ws.title}', reloading: {e}")
+    return _full_load_log_worksheet(ws, ws.get_all_values())
+
+
+async def _async_sync_log_worksheet(client, ws, ws_state: Optional[dict]) -> dict:
+    """_sync_log_worksheet() with the reads made over the async client."""
+    if ws_state:
+        try:
+            ranges = _log_append_ranges(ws_state)
+            if ranges:
+                header_range, rows_range = await client.values_batch_get(
+                    [gspread.utils.absolute_range_name(ws.title, r) for r in ranges])
+                # Row mapping is CPU work; keep it off the event loop
+                if await asyncio.to_thread(_apply_new_log_rows, ws, ws_state,
+                                           header_range.get("values", []), rows_range.get("values", [])):
+                    return ws_state
+        except Exception as e:
+            print(f"Incremental sync failed for '{ws.title}', reloading: {e}")
+    all_vals = await client.get_all_values(ws.title)
+    return await asyncio.to_thread(_full_load_log_worksheet, ws, all_vals)
+
+
+def _full_load_log_worksheet(ws, all_vals: list) -> dict:
+    keys = list(all_vals[0]) if all_vals else []
+    ws_state = {
+        "header": _trim_log_row(keys),
+        "keys": keys,
+        # get_all_records() rejects duplicate headers; safe_get_all_records then falls
+        # back to raw strings, so mirror that choice for every row of this sheet
+        "numericise": len(set(keys)) == len(keys),
+        "row_count": 0,
+        "last_row": None,
+        "is_behavior": None,
+        "entries": [],
+        # BehaviorEvent view (app/services/event_store.py): raw rows wait in
+        # pending_events until the view is first read, then become events
+        "pending_events": [],
+        "events": [],
+        # Bumped whenever rows are ingested; assembly reuses its result while nothing changed
+        "generation": next(_log_generations),
+    }
+    _ingest_log_rows(ws, ws_state, all_vals[1:] if len(all_vals) > 1 else [])
+    return ws_state
+
+
+def _log_append_ranges(ws_state: dict) -> Optional[List[str]]:
+    """Header row plus everything from the last ingested row onwards (None: full reload needed)."""
+    width = len(ws_state["keys"])
+    if not width:
+        return None
+    row_count = ws_state["row_count"]
+    start_row = row_count + 1 if row_count else 2  # re-read the last known row as an anchor
+    end_col = re.sub(r"\d", "", gspread.utils.rowcol_to_a1(1, width))
+    return ["1:1", f"A{start_row}:{end_col}"]
+
+
+def _append_new_log_rows(ws, ws_state: dict) -> bool:
+    """
+    Fetch the header row plus everything from the last ingested row onwards in one call.
+    Returns False when a full reload is required (header changed, rows removed or the
+    last known row was edited).
+    """
+    ranges = _log_append_ranges(ws_state)
+    if not ranges:
+        return False
+    header_range, rows_range = ws.batch_get(ranges)
+    return _apply_new_log_rows(ws, ws_state, header_range, rows_range)
+
+
+def _apply_new_log_rows(ws, ws_state: dict, header_range: list, rows_range: list) -> bool:
+    width = len(ws_state["keys"])
+    row_count = ws_state["row_count"]
+
+    header_now = list(header_range[0]) if header_range else []
+    if _trim_log_row(header_now) != ws_state["header"]:
+        return False
+
+    rows = [list(r) for r in rows_range]
+    if row_count:
+        if not rows or _trim_log_row(rows[0], width) != ws_state["last_row"]:
+            return False
+        rows = rows[1:]
+
+    if rows:
+        _ingest_log_rows(ws, ws_state, [r + [""] * (width - len(r)) for r in rows])
+    return True
+
+
+def _trim_log_row(row: list, width: Optional[int] = None) -> list:
+    trimmed = list(row[:width]) if width is not None else list(row)
+    while trimmed and trimmed[-1] == "":
+        trimmed.pop()
+    return trimmed
+
+
+def _ingest_log_rows(ws, ws_state: dict, rows: list):
+    keys = ws_state["keys"]
+    if ws_state["numericise"]:
+        records = [dict(zip(keys, gspread.utils.numericise_all(row))) for row in rows]
+    else:
+        records = []
+        for row in rows:
+            record = {}
+            for ci, h in enumerate(keys):
+                if ci < len(row) and h:
+                    record[h] = row[ci]
+            records.append(record)
+
+    # Check if worksheet looks like behavior log records (decided by its first record)
+    is_behavior = ws_state["is_behavior"]
+    if is_behavior is None and records:
+        is_behavior = any(k in records[0] for k in LOG_BEHAVIOR_SAMPLE_COLUMNS)
+
+    # Map every row before touching the shared state: if one row raises, the caller
+    # reloads from scratch and no half-ingested batch is left in entries/pending_events
+    base_idx = ws_state["row_count"]
+    new_pending = [(base_idx + i + 2, row) for i, row in enumerate(records)] if ws.title in LOG_MAIN_TITLES else []
+    new_entries = [_map_log_row(row, ws.title, base_idx + i) for i, row in enumerate(records)] if is_behavior else []
+
+    ws_state["is_behavior"] = is_behavior
+    ws_state["pending_events"].extend(new_pending)
+    ws_state["entries"].extend(new_entries)
+    ws_state["row_count"] = base_idx + len(rows)
+    if rows:
+        ws_state["last_row"] = _trim_log_row(rows[-1], len(keys))
+        ws_state["generation"] = next(_log_generations)
+
+
+# Canonical Log_Main columns with few distinct values (students, dates, places, behavior types, ...).
+# Their cell strings are interned, so every record (and EventTable's categories) shares one
+# object per distinct value instead of holding its own copy of each cell.
+LOG_CATEGORICAL_COLUMNS = [
+    '행동발생날짜', '학생코드', '학생명', '코드번호', '장소', '시간대', '행동유형', '강도', '기능',
+    '물리적제지여부', '결과', '입력교사명', 'Status', 'Source',
+]
+
+
+def _map_log_row(row: dict, ws_title: str, idx: int) -> tuple:
+    """
+    Map one raw behavior log record to the canonical Korean-keyed row.
+    Returns (dedup_key, mapped_row, name_needing_code_or_None, fill_코드번호).
+    Student codes are resolved at assembly time so TierStatus changes apply without re-reading.
+    """
+    name = str(row.get("학생명", row.get("이름", row.get("학생", "")))).strip()
+    code = str(row.get("학생코드", row.get("코드번호", row.get("코드", "")))).strip()
+    date_val = str(row.get("발생날짜", row.get("행동발생날짜", row.get("행동발생 날짜", row.get("날짜", ""))))).strip()
+    time_val = str(row.get("시간대", row.get("시간대 (복수)", row.get("시간대(복수)", "")))).strip()
+    behavior_type = str(row.get("행동유형", row.get("행동유형(핵심행동으로택1)", row.get("(주요)행동유형", row.get("주요행동유형", ""))))).strip()
+    ts_val = str(row.get("타임스탬프", row.get("Timestamp", row.get("입력일", "")))).strip()
+    log_id = str(row.get("Log_ID", "")).strip()
+
+    # Deduplicate across multiple worksheets
+    if log_id:
+        dedup_key = f"log_id:{log_id}"
+    elif name and (date_val or ts_val):
+        dedup_key = f"{name}_{date_val}_{time_val}_{behavior_type}_{ts_val}"
+    else:
+        dedup_key = f"row_{ws_title}_{idx}"
+
+    mapped_row = {
+        "행동발생날짜": normalize_date_string(date_val),
+        "시간대": time_val,
+        "장소": str(row.get("행동 발생 장소", row.get("행동발생장소", row.get("장소", "")))).strip(),
+        "강도": str(row.get("강도(1~5)", row.get("강도(1~5점 척도)", row.get("강도", "")))).strip(),
+        "행동유형": behavior_type,
+        "기능": str(row.get("추정기능(이번 행동을 통해 파악된 기능)", row.get("기능(이번 행동을 통해 파악된 기능)", row.get("기능", row.get("추정기능", ""))))).strip(),
+        "결과": str(row.get("결과", row.get("C_후속결과", ""))).strip(),
+        "학생명": name,
+        "학생코드": code,
+        "코드번호": str(row.get("코드번호", code)).strip(),
+        "입력교사명": str(row.get("입력교사명", row.get("교사명", row.get("입력자", "")))).strip(),
+        "타임스탬프": ts_val,
+        "특기사항": str(row.get("특기사항(기타)", row.get("특기사항", row.get("비고", row.get("기타", ""))))).strip(),
+        "물리적제지여부": str(row.get("물리적제지, 3/4호분리지도,본인/타인상해 발생 여부", row.get("물리적제지여부", row.get("분리지도 여부", row.get("물리적제지", ""))))).strip(),
+        "발생횟수": row.get("발생횟수(한 에피소드 당 1회로 입력 권장)", row.get("발생횟수", row.get("발생빈도", 1))),
+        "Log_ID": log_id,
+        "Status": str(row.get("Status", "Approved")),
+        "Source": str(row.get("Source", "Google Forms")),
+        "Approval_Meta": str(row.get("Approval_Meta", ""))
+    }
+    for col in LOG_CATEGORICAL_COLUMNS:
+        mapped_row[col] = sys.intern(mapped_row[col])
+
+    crisis_details = {}
+    has_crisis = False
+    for ch in LOG_CRISIS_HEADERS:
+        val = str(row.get(ch, "")).strip()
+        crisis_details[ch] = val
+        if val:
+            has_crisis = True
+
+    if has_crisis:
+        mapped_row["crisis_details"] = crisis_details
+
+    # Auto-populate student code if missing (resolved in _assemble_log_records)
+    fill_name = name.replace(" ", "") if (not code and name) else None
+    return dedup_key, mapped_row, fill_name, "코드번호" not in row
+
+
+def _log_name_to_code() -> dict:
+    name_to_code = {}
+    for k, v in (get_beable_code_mapping() or {}).items():
+        if isinstance(v, dict):
+            clean = str(v.get('student_name', '')).strip().replace(" ", "")
+            name_to_code.setdefault(clean, v.get('student_code', k))
+    return name_to_code
+
+
+def _assemble_log_records(state: dict) -> list:
+    """
+    Dedup across worksheets in priority order and fill missing student codes.
+    A sync that ingested nothing new gets the previous list object back, so everything
+    memoized on the record list (EventTable, EventIndex, analytics cube) is kept.
+    """
+    signature = tuple((title, state["sheets"][title].get("generation")) for title in state["order"])
+    memo = state.get("assembled")
+    if memo is not None and memo[0] == signature and (memo[1] is None or memo[1] == _log_name_to_code()):
+        return memo[2]
+
+    seen_keys = set()
+    name_to_code = None
+    mapped_values = []
+
+    for title in state["order"]:
+        ws_state = state["sheets"][title]
+        for dedup_key, mapped, fill_name, fill_codebeon in ws_state["entries"]:
+            if dedup_key in seen_keys:
+                continue
+            seen_keys.add(dedup_key)
+
+            # Rows that need no code fill share the ingest's dict (records are read-only)
+            row = mapped
+            if fill_name:
+                if name_to_code is None:
+                    name_to_code = _log_name_to_code()
+                code = name_to_code.get(fill_name)
+                if code:
+                    row = dict(mapped)
+                    row["학생코드"] = code
+                    if fill_codebeon:
+                        row["코드번호"] = sys.intern(str(code).strip())
+            mapped_values.append(row)
+
+    state["assembled"] = (signature, name_to_code, mapped_values)
+    return mapped_values
 
 
 def get_student_codes_worksheet():
@@ -347,7 +610,7 @@ def get_student_codes_worksheet():
         return None
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         # Try to open "StudentCodes" tab, create if not exists
         try:
             return sheet.worksheet("StudentCodes")
@@ -416,7 +679,7 @@ def get_users_worksheet():
         return None
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             return sheet.worksheet("Users")
         except gspread.WorksheetNotFound:
@@ -442,22 +705,33 @@ def get_users_worksheet():
         return None
 
 def fetch_all_users():
-    global _cache
-    now = time.time()
+    return get_or_load(CACHE_KEY_USERS, _load_all_users, ttl=CACHE_TTL, cache_if=bool, persist=True)
+
+async def afetch_all_users():
+    """fetch_all_users() for async code paths (auth dependency); a miss is read over the async client."""
+    return await aget_or_load(CACHE_KEY_USERS, _load_all_users, ttl=CACHE_TTL, cache_if=bool, persist=True,
+                              aloader=_aload_all_users)
 
-    # Check cache
-    cached_users = _cache.get("users")
-    if cached_users and cached_users.get("data") and (now - float(cached_users.get("timestamp", 0)) < CACHE_TTL):
-        return cached_users["data"]
+async def _aload_all_users():
+    client = get_async_sheets_client()
+    if client is None:
+        return await asyncio.to_thread(_load_all_users)
+    try:
+        return await client.get_all_records("Users")
+    except Exception as e:
+        if is_missing_sheet_error(e):
+            # get_users_worksheet() creates the sheet with its header row
+            return await asyncio.to_thread(_load_all_users)
+        print(f"Error fetching users: {e}")
+        return []
 
+def _load_all_users():
     ws = get_users_worksheet()
     if not ws:
         return []
 
     try:
-        records = safe_get_all_records(ws)
-        _cache["users"] = {"data": records, "timestamp": float(now)}
-        return records
+        return safe_get_all_records(ws)
     except Exception as e:
         print(f"Error fetching users: {e}")
         return []
@@ -473,7 +747,7 @@ def create_user(user_data: dict):
         return {"error": "Sheet not accessible"}
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             ws = sheet.worksheet("Users")
         except gspread.WorksheetNotFound:
@@ -521,7 +795,7 @@ def delete_user(user_id: str):
         return {"error": "Sheet not accessible"}
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         ws = sheet.worksheet("Users")
 
         cell = ws.find(user_id, in_column=1) # Assuming ID is in Column 1
@@ -540,11 +814,9 @@ def delete_user(user_id: str):
         return {"error": str(e)}
 
 def get_user_by_id(user_id: str):
-    users = fetch_all_users()
-    for r in users:
-        if str(r.get('ID')) == str(user_id):
-            return r
-    return None
+    # Indexed lookup; the index is rebuilt only when the Users cache changes
+    from app.services.user_directory import user_directory
+    return user_directory.get(user_id)
 
 def update_user_password(user_id: str, new_password: str):
     """
@@ -663,6 +935,7 @@ def update_tierstatus_certification(student_code_or_name: str, cert_count: int):
             if str(r.get('학생코드')) == str(student_code_or_name) or str(r.get('학생이름')) == str(student_code_or_name):
                 row_num = idx + 2 # +2 for header and 0-indexing of enumerate
                 ws.update_cell(row_num, 7, cert_count)
+                clear_cache("tierstatus")
                 return {"message": f"Updated certification count to {cert_count} for {student_code_or_name}"}
         return {"error": "Student not found in TierStatus"}
     except Exception as e:
@@ -821,7 +1094,7 @@ def reset_users_sheet():
         return {"error": "Cannot access Google Sheets"}
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
 
         # Delete old if exists
         try:
@@ -862,7 +1135,7 @@ def get_student_status_worksheet():
         return None
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             return sheet.worksheet("TierStatus")
         except gspread.WorksheetNotFound:
@@ -890,7 +1163,7 @@ def reset_tier_status_sheet():
         return {"error": "Cannot access Google Sheets"}
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
 
         # Try to delete existing TierStatus sheet
         try:
@@ -912,6 +1185,7 @@ def reset_tier_status_sheet():
 
         # Batch update all rows at once
         ws.update(all_data, 'A1')
+        clear_cache("tierstatus")
 
         return {"message": f"TierStatus sheet reset with {len(STUDENT_CODES)} students", "count": len(STUDENT_CODES)}
     except Exception as e:
@@ -921,28 +1195,37 @@ def reset_tier_status_sheet():
 
 def fetch_student_status():
     """Fetch all student tier status records with caching and fallback for duplicate headers"""
-    now = time.time()
-    if "tierstatus" not in _cache:
-        _cache["tierstatus"] = {"data": [], "timestamp": 0}
+    return get_or_load(CACHE_KEY_TIER_STATUS_RECORDS, _load_student_status, ttl=CACHE_TTL, cache_if=bool,
+                       persist=True)
 
-    if _cache["tierstatus"]["data"] and now - _cache["tierstatus"]["timestamp"] < CACHE_TTL:
-        return _cache["tierstatus"]["data"]
+async def afetch_student_status():
+    """fetch_student_status() for async endpoints: the TierStatus read happens on the event loop."""
+    return await aget_or_load(CACHE_KEY_TIER_STATUS_RECORDS, _load_student_status, ttl=CACHE_TTL, cache_if=bool,
+                              persist=True, aloader=_aload_student_status)
 
-    ws = get_student_status_worksheet()
-    if not ws:
-        return []
+async def _aload_student_status():
+    await TierStatusAdapter.afetch_raw_records()
+    return await asyncio.to_thread(_load_student_status)
 
+def _load_student_status():
     try:
-        records = safe_get_all_records(ws)
+        # Raw rows are shared with TierStatusAdapter.fetch_students (one sheet read for both)
+        raw_records = TierStatusAdapter.fetch_raw_records()
+        if not raw_records:
+            ws = get_student_status_worksheet()
+            if not ws:
+                return []
+            raw_records = TierStatusAdapter.fetch_raw_records(force_refresh=True, ws=ws)
 
-        # Add row_index for updates
-        for idx, record in enumerate(records):
+        records = []
+        for idx, raw in enumerate(raw_records):
+            record = dict(raw)
             record['row_index'] = idx + 2  # +2 for header and 1-indexing
             # Ensure student code is string
             if '학생코드' in record:
                 record['학생코드'] = str(record['학생코드'])
+            records.append(record)
 
-        _cache["tierstatus"] = {"data": records, "timestamp": now}
         return records
     except Exception as e:
         print(f"Error fetching status: {e}")
@@ -1086,6 +1369,7 @@ def update_student_tier_unified(code: str, tier_values: dict, enrolled: str = No
                 # Execute batch update
                 if batch_updates:
                     ws.batch_update(batch_updates)
+                    clear_cache("tierstatus")
 
                 return {"message": f"Student {code} updated successfully", "code": code}
 
@@ -1107,6 +1391,7 @@ def update_student_enrollment(code: str, enrolled: str):
             if str(r.get('학생코드')) == str(code):
                 row_num = idx + 2
                 ws.update_cell(row_num, 5, enrolled)  # Column 5: 재학여부
+                clear_cache("tierstatus")
                 return {"message": f"Enrollment updated to {enrolled}"}
         return {"error": f"Student code {code} not found"}
     except Exception as e:
@@ -1125,6 +1410,7 @@ def update_student_beable_code(code: str, beable_code: str):
             if str(r.get('학생코드')) == str(code):
                 row_num = idx + 2
                 ws.update_cell(row_num, 6, beable_code)  # Column 6: BeAble코드
+                clear_cache("tierstatus")
                 return {"message": f"BeAble code updated to {beable_code}"}
         return {"error": f"Student code {code} not found"}
     except Exception as e:
@@ -1192,7 +1478,7 @@ def get_cico_daily_worksheet():
         return None
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             return sheet.worksheet("CICODaily")
         except gspread.WorksheetNotFound:
@@ -1205,22 +1491,17 @@ def get_cico_daily_worksheet():
         return None
 
 def fetch_cico_daily(student_code: str = None, start_date: str = None, end_date: str = None):
-    global _cache
-    now = time.time()
-
-    if "daily_cico" not in _cache:
-        _cache["daily_cico"] = {"data": [], "timestamp": 0}
-
-    if _cache["daily_cico"]["data"] and now - _cache["daily_cico"]["timestamp"] < CACHE_TTL:
-        records = _cache["daily_cico"]["data"]
-    else:
+    # Queued rows must be in the sheet before it is read (their on_flushed clears the cache)
+    sheet_write_queue.flush("CICODaily")
+    records = get_cached(CACHE_KEY_CICO_DAILY, ttl=CACHE_TTL)
+    if not records:
         ws = get_cico_daily_worksheet()
         if not ws:
             return []
 
         try:
             records = safe_get_all_records(ws)
-            _cache["daily_cico"] = {"data": records, "timestamp": now}
+            set_cached(CACHE_KEY_CICO_DAILY, records, ttl=CACHE_TTL)
         except Exception as e:
             print(f"Error fetching CICO daily: {e}")
             return []
@@ -1253,7 +1534,12 @@ def add_cico_daily(data: dict):
             data.get('memo', ''),
             data.get('entered_by', '')
         ]
-        ws.append_row(row)
+        # Queued: the row and the monthly-sheet cells below go out in the next batch.
+        # With the queue disabled the write happens here and a failure lands in `failed`.
+        failed = []
+        sheet_write_queue.append_row(ws, row, on_flushed=lambda: clear_cache("daily_cico"), on_failed=failed.append)
+        if failed:
+            return {"error": f"CICODaily write failed: {failed[0]}"}
         # Trigger recalculation
         try:
             sync_result = sync_daily_entry_to_monthly(
@@ -1270,8 +1556,6 @@ def add_cico_daily(data: dict):
             else:
                 print("Error syncing CICO daily to monthly (continuing)")
 
-        clear_cache("daily_cico")
-
         return {"message": "CICO daily record added"}
     except Exception as e:
         if settings.ENVIRONMENT.lower() != "production":
@@ -1335,7 +1619,7 @@ def update_user_role(user_id: str, new_role: str, new_class: str = "", name: str
         return {"error": "Sheet not available"}
 
     try:
-        sh = client.open_by_url(settings.SHEET_URL)
+        sh = get_spreadsheet()
         ws = sh.worksheet("Users")
 
         cell = ws.find(user_id, in_column=1) # Assume ID is col 1
@@ -1399,7 +1683,7 @@ def get_meeting_notes_worksheet():
         return None
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             return sheet.worksheet("MeetingNotes")
         except gspread.WorksheetNotFound:
@@ -1413,6 +1697,8 @@ def get_meeting_notes_worksheet():
         return None
 
 def fetch_meeting_notes(meeting_type: str = None, student_code: str = None):
+    # Queued notes must be in the sheet before it is read (their on_flushed clears the cache)
+    sheet_write_queue.flush("MeetingNotes")
     raw_cache_key = "sheet:meeting_notes:raw"
     records = get_cached(raw_cache_key, ttl=120)
 
@@ -1423,7 +1709,7 @@ def fetch_meeting_notes(meeting_type: str = None, student_code: str = None):
         try:
             records = safe_get_all_records(ws)
             if records is not None:
-                set_cached(raw_cache_key, records)
+                set_cached(raw_cache_key, records, ttl=120)
         except Exception as e:
             print(f"Error fetching meeting notes: {e}")
             return []
@@ -1496,11 +1782,16 @@ def add_meeting_note(data: dict):
         ]
         if settings.ENVIRONMENT.lower() != "production":
             print(f"DEBUG: Appending meeting note: {row}")
+        # Cache is invalidated once the row is in the sheet, so the next read sees it
+        failed = []
+        sheet_write_queue.append_row(ws, row, on_flushed=lambda: clear_cache("meeting_notes"), on_failed=failed.append)
+        if failed:
+            print(f"Error adding meeting note: {failed[0]}")
+            return {"error": str(failed[0])}
+        if settings.ENVIRONMENT.lower() != "production":
             print("DEBUG: Meeting note added successfully")
         else:
             print("Meeting note added successfully")
-        ws.append_row(row)
-        clear_cache("meeting_notes") # Invalidate cache
         return {"message": "Meeting note added", "created_at": created_at, "uuid": note_uuid}
     except Exception as e:
         if settings.ENVIRONMENT.lower() != "production":
@@ -1516,6 +1807,7 @@ def update_meeting_note(note_id: str, content: str):
         return {"error": "Sheet not accessible"}
 
     try:
+        sheet_write_queue.flush("MeetingNotes")  # a note still in the queue has no row yet
         records = safe_get_all_records(ws)
         row_idx = -1
 
@@ -1549,6 +1841,7 @@ def delete_meeting_note(note_id: str):
         return {"error": "Sheet not accessible"}
 
     try:
+        sheet_write_queue.flush("MeetingNotes")  # a note still in the queue has no row yet
         records = safe_get_all_records(ws)
         row_idx = -1
 
@@ -1617,7 +1910,7 @@ def get_holidays_from_config():
     if not settings.SHEET_URL:
         return []
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
 
         # Try '날짜 관리' sheet first
         config_ws = None
@@ -1654,7 +1947,7 @@ def get_holidays_from_config():
             if val and not val.startswith("※"):
                 holidays.append(val)
         if holidays:
-            set_cached("config:holidays", holidays)
+            set_cached("config:holidays", holidays, ttl=3600)
         return holidays
     except Exception as e:
         print(f"Error getting holidays: {e}")
@@ -1827,7 +2120,7 @@ def create_monthly_cico_sheet(year: int, month: int):
 
     if not client: return {"error": "Sheet not available"}
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         month_name = f"{month}월"
 
         # Check if exists
@@ -1985,15 +2278,10 @@ def get_worksheet_fuzzy(sheet, name):
     return None
 
 
-def get_cico_raw_sheet_values(month: int) -> List[List[Any]]:
-    """
-    Fetch raw values from a monthly CICO sheet with cache-aware behavior.
-    Cache key: sheet:cico:raw:{year}:{month:02d}
-    TTL: 60s for current/future month, 3600s for completed past months (KST).
-    """
+def _cico_raw_cache_entry(month: int):
+    """(cache key, ttl) of a monthly CICO sheet's raw values."""
     kst_now = now_kst()
-    target_year = kst_now.year
-    cache_key = f"sheet:cico:raw:{target_year}:{month:02d}"
+    cache_key = f"sheet:cico:raw:{kst_now.year}:{month:02d}"
 
     if month == kst_now.month:
         ttl = 60
@@ -2001,30 +2289,64 @@ def get_cico_raw_sheet_values(month: int) -> List[List[Any]]:
         ttl = 3600
     else:
         ttl = 60
+    return cache_key, ttl
 
-    cached = get_cached(cache_key, ttl=ttl)
-    if cached is not None:
-        return cached
 
+def _load_cico_raw_values(month: int) -> List[List[Any]]:
     client = get_sheets_client()
     if not client or not settings.SHEET_URL:
         return []
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         month_name = f"{month}월"
         ws = get_worksheet_fuzzy(sheet, month_name)
         if not ws:
             return []
-        all_values = safe_get_all_values(ws)
-        if all_values:
-            set_cached(cache_key, all_values)
-        return all_values
+        return safe_get_all_values(ws)
     except Exception as e:
         print(f"Error fetching raw CICO values for {month}월: {e}")
         return []
 
 
+def get_cico_raw_sheet_values(month: int) -> List[List[Any]]:
+    """
+    Fetch raw values from a monthly CICO sheet with cache-aware behavior.
+    Cache key: sheet:cico:raw:{year}:{month:02d}
+    TTL: 60s for current/future month, 3600s for completed past months (KST).
+    """
+    cache_key, ttl = _cico_raw_cache_entry(month)
+    return get_or_load(cache_key, lambda: _load_cico_raw_values(month), ttl=ttl, cache_if=bool)
+
+
+def get_cico_raw_sheet_values_bulk(months: List[int], force_refresh: bool = False) -> Dict[int, List[List[Any]]]:
+    """
+    get_cico_raw_sheet_values() for several months at once: every month not cached yet
+    (all of them with force_refresh) is read in the same values.batchGet call.
+    """
+    client = get_sheets_client()
+    if not client or not settings.SHEET_URL:
+        return {m: [] for m in months}
+
+    try:
+        sheet = get_spreadsheet()
+    except Exception as e:
+        print(f"Error fetching raw CICO values: {e}")
+        return {m: [] for m in months}
+
+    loads, keys = [], {}
+    for month in months:
+        cache_key, ttl = _cico_raw_cache_entry(month)
+        ws = get_worksheet_fuzzy(sheet, f"{month}월")
+        ranges = [(ws.title, None)] if ws else []
+        loads.append(RangeLoad(cache_key, ranges, lambda vrs: padded_values(vrs[0]) if vrs else [],
+                               loader=lambda m=month: _load_cico_raw_values(m), ttl=ttl, cache_if=bool))
+        keys[month] = cache_key
+
+    values = batch_load(loads, force=force_refresh)
+    return {m: values.get(keys[m]) or [] for m in months}
+
+
 def get_monthly_cico_data(month: int):
     """
     Get all student data from a monthly sheet for the CICO grid view.
@@ -2043,10 +2365,19 @@ def get_monthly_cico_data(month: int):
     else:
         ttl = 60
 
-    cached = get_cached(cache_key, ttl=ttl)
-    if cached is not None:
-        return cached
+    # Stale-while-revalidate (sheet:cico policy): past the TTL the previous grid is
+    # served while one background reload runs
+    return get_or_load(
+        cache_key,
+        lambda: _load_monthly_cico_data(month),
+        ttl=ttl,
+        depends_on=[f"sheet:cico:raw:{target_year}:{month:02d}"],
+        cache_if=lambda r: isinstance(r, dict) and "error" not in r,
+        persist=True,
+    )
+
 
+def _load_monthly_cico_data(month: int):
     col_map = {}
     month_name = f"{month}월"
     all_values = get_cico_raw_sheet_values(month)
@@ -2055,7 +2386,7 @@ def get_monthly_cico_data(month: int):
         if not client or not settings.SHEET_URL:
             return {"error": "Sheet not accessible"}
         try:
-            sheet = client.open_by_url(settings.SHEET_URL)
+            sheet = get_spreadsheet()
             ws = get_worksheet_fuzzy(sheet, month_name)
             if not ws:
                 return {"error": f"'{month_name}' 시트가 없습니다."}
@@ -2220,7 +2551,6 @@ def get_monthly_cico_data(month: int):
             "weekly_trend": weekly_summary,
             "col_map": {k: v for k, v in col_map.items()}
         }
-        set_cached(cache_key, result)
         return result
 
     except Exception as e:
@@ -2228,254 +2558,274 @@ def get_monthly_cico_data(month: int):
         return {"error": str(e)}
 
 
-def update_monthly_cico_cells(month: int, updates: list, student_code_override: str = None):
+def _cico_cache_ttl(month: int) -> int:
+    """60s for the current/future month, 3600s for completed past months (KST)."""
+    return 3600 if month < now_kst().month else 60
+
+
+class _CicoSheetLayout:
     """
-    Batch update cells in a monthly sheet.
-    updates = [{"row": 5, "col": 12, "value": "O"}, ...]
-    col can be a column index (1-based) or a header name.
+    Row/column resolution for one monthly CICO grid (header lookups, session numbers,
+    student code -> row), built once per cached raw grid instead of per update.
     """
-    client = get_sheets_client()
-    if not client or not settings.SHEET_URL:
-        return {"error": "Sheet not accessible"}
 
-    if not client: return {"error": "Sheet not accessible"}
-    try:
-        sheet = client.open_by_url(settings.SHEET_URL)
-        month_name = f"{month}월"
+    RATE_SYNONYMS = {
+        "수행/발생률": ["수행/발생률", "수행률", "발생률", "Rate"],
+        "목표 달성 여부": ["목표 달성 여부", "달성여부", "Achieved"],
+    }
 
-        try:
-            ws = get_worksheet_fuzzy(sheet, month_name)
-            if not ws:
-                return {"error": f"'{month_name}' 시트가 없습니다."}
-        except Exception:
-            return {"error": f"'{month_name}' 시트를 찾는 중 오류 발생"}
+    def __init__(self, all_values: List[List[Any]]):
+        headers = list(all_values[0]) if all_values else []
+        self.headers = headers
 
-        headers = ws.row_values(1)
-        all_values = safe_get_all_values(ws)
+        self.header_pos: Dict[str, int] = {}
+        self.session_pos: Dict[int, int] = {}
+        for idx, h in enumerate(headers):
+            self.header_pos.setdefault(h, idx)
+            h_match = re.search(r'^(\d+)', str(h))
+            if h_match:
+                self.session_pos.setdefault(int(h_match.group(1)), idx)
 
-        # Determine student_code column index for override lookup
-        # Check for v3 column "학생명(코드)" or explicit "학생코드"
-        code_col_idx = -1
+        # Student code column: v3 "학생명(코드)" or explicit "학생코드"
+        self.code_col_idx = -1
         for idx, h in enumerate(headers):
             h_str = str(h).strip()
             if "학생코드" in h_str or "Code" in h_str or "(코드)" in h_str:
-                code_col_idx = idx # 0-based
+                self.code_col_idx = idx
                 break
 
-        # Build batch update
-        cells_to_update = []
-        rows_to_recalc = set()
+        # First row whose code cell matches directly or inside "Name(Code)"
+        self.code_rows: Dict[str, int] = {}
+        if self.code_col_idx != -1:
+            for r_idx, r_val in enumerate(all_values[1:], start=2):
+                if len(r_val) > self.code_col_idx:
+                    cell_val = str(r_val[self.code_col_idx]).strip()
+                    self.code_rows.setdefault(cell_val, r_idx)
+                    match = re.search(r'\((.*?)\)', cell_val)
+                    if match:
+                        self.code_rows.setdefault(match.group(1).strip(), r_idx)
 
-        import re
+        def find_col_regex(pattern):
+            for idx, h in enumerate(headers):
+                if re.search(pattern, str(h)):
+                    return idx
+            return -1
+
+        self.rate_idx = find_col_regex(r'수행.*률|발생.*률|Rate')
+        self.achieved_idx = find_col_regex(r'달성.*여부|성공.*여부')
+        self.goal_idx = find_col_regex(r'달성.*기준|목표.*기준')
+        self.type_idx = find_col_regex(r'행동.*유형')
+        self.day_cols = [
+            idx for idx, h in enumerate(headers)
+            if re.search(r'^(\d{1,2})[-/.](\d{1,2})$|^(\d{1,2})(일)?$', str(h).strip())
+        ]
+
+    def resolve_col(self, col: Any) -> int:
+        """1-based column for an index or header name (exact, rate synonyms, then session number); -1 if unknown."""
+        if not isinstance(col, str):
+            return col
+        if col in self.header_pos:
+            return self.header_pos[col] + 1
+        if col in self.RATE_SYNONYMS:
+            idx = find_col_fuzzy(self.headers, self.RATE_SYNONYMS[col])
+            if idx != -1:
+                return idx + 1
+        match = re.search(r'^(\d+)', str(col))
+        if match and int(match.group(1)) in self.session_pos:
+            return self.session_pos[int(match.group(1))] + 1
+        return -1
+
+    def recalculate(self, row_data: list):
+        """(수행/발생률 text or None, 달성 여부 'O'/'X' or None) for one row."""
+        type_idx, goal_idx = self.type_idx, self.goal_idx
+        target_type = row_data[type_idx] if (type_idx != -1 and len(row_data) > type_idx) else "증가 목표행동"
+        goal_criteria = row_data[goal_idx] if (goal_idx != -1 and len(row_data) > goal_idx) else "80% 이상"
+
+        total_days = 0
+        success_days = 0
+        for dc in self.day_cols:
+            if dc < len(row_data):
+                val = str(row_data[dc]).strip()
+                if val in ["O", "X"]:
+                    total_days += 1
+                    if "감소" in str(target_type):
+                        if val == "X": success_days += 1
+                    else:
+                        # Default to Increase
+                        if val == "O": success_days += 1
 
+        rate_val = (success_days / total_days) * 100 if total_days > 0 else 0
+        final_rate_str = f"{int(rate_val)}%" if total_days > 0 else None
+
+        is_achieved = "X"
+        try:
+            match = re.search(r'\d+', str(goal_criteria))
+            criteria_num = int(match.group()) if match else 80
+            if "이하" in str(goal_criteria):
+                if rate_val <= criteria_num: is_achieved = "O"
+            else: # 이상
+                if rate_val >= criteria_num: is_achieved = "O"
+        except Exception:
+            pass
+
+        if total_days == 0: is_achieved = None
+        return final_rate_str, is_achieved
+
+
+_cico_layouts: Dict[str, tuple] = {}
+
+
+def _get_cico_layout(raw_key: str, all_values: List[List[Any]]) -> _CicoSheetLayout:
+    cached = _cico_layouts.get(raw_key)
+    if cached and cached[0] is all_values:
+        return cached[1]
+    layout = _CicoSheetLayout(all_values)
+    _cico_layouts[raw_key] = (all_values, layout)
+    return layout
+
+
+def _sheet_cell_text(value: Any) -> str:
+    # How a RAW-written value reads back through get_all_values()
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+
+def update_monthly_cico_cells(month: int, updates: list, student_code_override: str = None):
+    """
+    Batch update cells in a monthly sheet.
+    updates = [{"row": 5, "col": 12, "value": "O"}, ...]
+    col can be a column index (1-based) or a header name.
+
+    Rows and columns are resolved against the cached grid (get_cico_raw_sheet_values).
+    Writes are diffed against the cached cell values, so no-op edits are dropped. All
+    changed cells, including the recalculated 수행/발생률 and 목표 달성 여부, are queued as
+    one batch_update on the sheet write queue. A patched copy of the cached grid replaces
+    it right away (the grid view is rebuilt on its next read), and it is dropped once the
+    write has reached the sheet.
+    """
+    client = get_sheets_client()
+    if not client or not settings.SHEET_URL:
+        return {"error": "Sheet not accessible"}
+
+    month_name = f"{month}월"
+    cur_year = now_kst().year
+    raw_key = f"sheet:cico:raw:{cur_year}:{month:02d}"
+    grid_key = f"sheet:cico:{cur_year}:{month:02d}"
+
+    try:
+        all_values = get_cico_raw_sheet_values(month)
+        if not all_values:
+            try:
+                if not get_worksheet_fuzzy(get_spreadsheet(), month_name):
+                    return {"error": f"'{month_name}' 시트가 없습니다."}
+            except Exception:
+                return {"error": f"'{month_name}' 시트를 찾는 중 오류 발생"}
+            return {"error": "Empty sheet"}
+
+        layout = _get_cico_layout(raw_key, all_values)
+
+        # (row, col) -> value; a later write to the same cell wins, as in one batch_update
+        writes: Dict[tuple, Any] = {}
         for u in updates:
             row = u.get("row")
             col = u.get("col")
             value = u.get("value", "")
 
             # If row is None, try to find by student_code_override
-            if row is None and student_code_override and code_col_idx != -1:
-                found_row = -1
-                for r_idx, r_val in enumerate(all_values):
-                    if r_idx == 0: continue
-
-                    if len(r_val) > code_col_idx:
-                        cell_val = str(r_val[code_col_idx]).strip()
-                        # Direct match or extract from "Name(Code)"
-                        if cell_val == str(student_code_override).strip():
-                            found_row = r_idx + 1
-                            break
-
-                        # Check inside parentheses
-                        match = re.search(r'\((.*?)\)', cell_val)
-                        if match and match.group(1).strip() == str(student_code_override).strip():
-                            found_row = r_idx + 1
-                            break
-
-                if found_row != -1:
-                    row = found_row
+            if row is None and student_code_override and layout.code_col_idx != -1:
+                row = layout.code_rows.get(str(student_code_override).strip(), row)
 
             if not row:
                 if settings.ENVIRONMENT.lower() != "production":
                     print("DEBUG: Row not specified and could not be resolved.")
                 continue
 
-            # If col is a string (header name), convert to column index
-            if isinstance(col, str):
-                col_idx = -1
-                # 1. Exact or Fuzzy match
-                # Use synonyms similar to get_monthly_cico_data
-                synonym_candidates = {
-                    "수행/발생률": ["수행/발생률", "수행률", "발생률", "Rate"],
-                    "목표 달성 여부": ["목표 달성 여부", "달성여부", "Achieved"],
-                }
-
-                if col in headers:
-                    col_idx = headers.index(col) + 1
-                else:
-                    # Check synonyms
-                    for formal_key, cands in synonym_candidates.items():
-                        if col == formal_key:
-                            col_to_find = cands
-                            idx = find_col_fuzzy(headers, col_to_find)
-                            if idx != -1:
-                                col_idx = idx + 1
-                                break
-
-                if col_idx == -1:
-                    # 2. Flexible match for Sessions (1회차, 1일, 1...)
-                    import re
-                    match = re.search(r'^(\d+)', str(col))
-                    if match:
-                        num = int(match.group(1))
-                        for idx, h in enumerate(headers):
-                            h_match = re.search(r'^(\d+)', str(h))
-                            if h_match and int(h_match.group(1)) == num:
-                                col_idx = idx + 1
-                                break
-
-                if col_idx != -1:
-                    col = col_idx
-                else:
-                    if settings.ENVIRONMENT.lower() != "production":
-                        print(f"DEBUG: Column '{col}' not found in headers")
-                    continue  # Skip unknown columns
-
-            if row and col:
-                cells_to_update.append({
-                    "range": f"{_col_letter(col)}{row}",
-                    "values": [[value]]
-                })
-                rows_to_recalc.add(row)
-
-        # Recalculate Logic
-        try:
-            # Identify columns using Regex loose matching
-            def find_col_regex(pattern):
-                import re
-                for idx, h in enumerate(headers):
-                    if re.search(pattern, str(h)):
-                        return idx
-                return -1
-
-            rate_idx = find_col_regex(r'수행.*률|발생.*률|Rate')
-            achieved_idx = find_col_regex(r'달성.*여부|성공.*여부')
-            goal_idx = find_col_regex(r'달성.*기준|목표.*기준')
-            type_idx = find_col_regex(r'행동.*유형')
-
-            if rate_idx == -1:
-                if settings.ENVIRONMENT.lower() != "production":
-                    print("DEBUG: '수행/발생률' column missing, skipping calculation")
-
-            day_cols = []
-            import re
-            for idx, h in enumerate(headers):
-                match = re.search(r'^(\d{1,2})[-/.](\d{1,2})$|^(\d{1,2})(일)?$', str(h).strip())
-                if match:
-                   day_cols.append(idx)
-
-            if rate_idx != -1:
+            col_idx = layout.resolve_col(col)
+            if col_idx == -1:
                 if settings.ENVIRONMENT.lower() != "production":
-                    print(f"DEBUG: Recalculating {len(rows_to_recalc)} rows...")
-                for r_idx in rows_to_recalc:
-                    # 0-based index for python list
-                    row_data_idx = r_idx - 1
-                    if row_data_idx < len(all_values):
-                        row_data = list(all_values[row_data_idx])
-                    else:
-                        if settings.ENVIRONMENT.lower() != "production":
-                            print(f"DEBUG: Row {r_idx} out of bounds")
-                        continue
+                    print(f"DEBUG: Column '{col}' not found in headers")
+                continue  # Skip unknown columns
 
-                    # Apply pending updates to memory for accurate calculation
-                    for u in updates:
-                        # Logic to find if this update applies to current row
-                        # 'u' has 'row' (1-based)
-                        if u.get("row") == r_idx:
-                            c = u.get("col")
-                            # Resolve column index again
-                            c_idx = -1
-                            if isinstance(c, int): c_idx = c - 1
-                            elif isinstance(c, str):
-                                if c in headers: c_idx = headers.index(c)
-                                elif f"{c}일" in headers: c_idx = headers.index(f"{c}일")
-
-                            if c_idx != -1 and 0 <= c_idx < len(row_data):
-                                row_data[c_idx] = u.get("value", "")
-
-                    # Calculate Rate
-                    target_type = row_data[type_idx] if (type_idx != -1 and len(row_data) > type_idx) else "증가 목표행동"
-                    goal_criteria = row_data[goal_idx] if (goal_idx != -1 and len(row_data) > goal_idx) else "80% 이상"
-
-                    total_days = 0
-                    success_days = 0
-
-                    for dc in day_cols:
-                        if dc < len(row_data):
-                            val = str(row_data[dc]).strip()
-                            if val in ["O", "X"]:
-                                total_days += 1
-                                if "감소" in str(target_type):
-                                    if val == "X": success_days += 1
-                                else:
-                                    # Default to Increase
-                                    if val == "O": success_days += 1
-
-                    rate_val = 0
-                    if total_days > 0:
-                        rate_val = (success_days / total_days) * 100
-
-                    final_rate_str = f"{int(rate_val)}%" if total_days > 0 else None
-
-                    # Achievement
-                    is_achieved = "X"
-                    try:
-                        # Extract number from criteria
-                        import re
-                        match = re.search(r'\d+', str(goal_criteria))
-                        criteria_num = int(match.group()) if match else 80
-
-                        if "이하" in str(goal_criteria):
-                            if rate_val <= criteria_num: is_achieved = "O"
-                        else: # 이상
-                            if rate_val >= criteria_num: is_achieved = "O"
-                    except:
-                        pass
-
-                    if total_days == 0: is_achieved = None
-
-                    cells_to_update.append({
-                        "range": f"{_col_letter(rate_idx + 1)}{r_idx}",
-                        "values": [[final_rate_str]]
-                    })
-                    if achieved_idx != -1:
-                        cells_to_update.append({
-                            "range": f"{_col_letter(achieved_idx + 1)}{r_idx}",
-                            "values": [[is_achieved]]
-                        })
-                    if settings.ENVIRONMENT.lower() != "production":
-                        print(f"DEBUG: Row {r_idx} Calculated - Rate: {final_rate_str}, Achieved: {is_achieved}")
+            if row and col_idx:
+                writes[(row, col_idx)] = value
 
-        except Exception as e:
+        # Recalculate rate / achievement for every touched row with the pending writes applied
+        if layout.rate_idx == -1:
             if settings.ENVIRONMENT.lower() != "production":
-                print(f"DEBUG: Error in recalculation loop: {e}")
-            pass # Continue to update whatever we have
-
-        # Batch update using gspread
-        if cells_to_update:
-            ws.batch_update([{
-                "range": c["range"],
-                "values": c["values"]
-            } for c in cells_to_update])
+                print("DEBUG: '수행/발생률' column missing, skipping calculation")
+        else:
+            for r_idx in sorted({r for r, _ in writes}):
+                if r_idx - 1 >= len(all_values):
+                    continue
+                row_data = list(all_values[r_idx - 1])
+                for (w_row, w_col), w_value in list(writes.items()):
+                    if w_row == r_idx and 0 <= w_col - 1 < len(row_data):
+                        row_data[w_col - 1] = w_value
+                rate_str, is_achieved = layout.recalculate(row_data)
+                writes[(r_idx, layout.rate_idx + 1)] = rate_str
+                if layout.achieved_idx != -1:
+                    writes[(r_idx, layout.achieved_idx + 1)] = is_achieved
+
+        # Drop no-op writes. None is skipped by the Sheets API anyway.
+        def current(r, c):
+            row_vals = all_values[r - 1] if r - 1 < len(all_values) else []
+            return row_vals[c - 1] if c - 1 < len(row_vals) else ""
+
+        changed = [
+            (r, c, v) for (r, c), v in writes.items()
+            if v is not None and str(current(r, c)) != _sheet_cell_text(v)
+        ]
+        if not changed:
+            return {"message": "0 cells updated", "unchanged": len(writes)}
 
-        # Invalidate CICO cache for this month
-        cur_year = now_kst().year
-        invalidate_cache(f"sheet:cico:{cur_year}:{month:02d}")
-        invalidate_cache(f"sheet:cico:raw:{cur_year}:{month:02d}")
-        invalidate_cache(f"sheet:cico:{month}")
-        clear_cache("daily_cico")
+        ws = get_worksheet_fuzzy(get_spreadsheet(), month_name)
+        if not ws:
+            return {"error": f"'{month_name}' 시트가 없습니다."}
 
-        return {"message": f"{len(cells_to_update)} cells updated"}
+        def drop_month_views():
+            # Views derived from this month's grid
+            invalidate_cache(f"sheet:cico:report:{cur_year}:{month:02d}")
+            invalidate_cache(f"sheet:cico:{month}")
+
+        def drop_month_grid(_error=None):
+            invalidate_cache(raw_key)
+            drop_month_views()
+
+        if get_cached(raw_key, ttl=_cico_cache_ttl(month)) is all_values:
+            # Copy-on-write: other requests may be iterating the cached grid right now
+            patched = [list(r) for r in all_values]
+            width = len(patched[0]) if patched else 0
+            for r, c, v in changed:
+                while len(patched) < r:
+                    patched.append([""] * width)
+                row_vals = patched[r - 1]
+                if len(row_vals) < c:
+                    row_vals.extend([""] * (c - len(row_vals)))
+                row_vals[c - 1] = _sheet_cell_text(v)
+            set_cached(raw_key, patched, ttl=_cico_cache_ttl(month))
+        # The month grid is rebuilt from the patched values by the next read, not in this request
+        invalidate_cache(grid_key)
+        drop_month_views()
+        # The grid is invalidated again once the write lands: the patched grid may have been
+        # reloaded from the sheet before the queued write reached it (debounce, governor
+        # waits, retries), and later edits are diffed against whatever is cached. A write
+        # that is finally dropped rolls the optimistic patch back the same way.
+        failed = []
+
+        def write_failed(e):
+            failed.append(e)
+            drop_month_grid()
+
+        sheet_write_queue.update(
+            ws, [{"range": f"{_col_letter(c)}{r}", "values": [[v]]} for r, c, v in changed],
+            on_flushed=drop_month_grid,
+            on_failed=write_failed,
+        )
+        if failed:
+            return {"error": f"'{month_name}' 시트 저장 실패: {failed[0]}"}
+
+        return {"message": f"{len(changed)} cells updated", "unchanged": len(writes) - len(changed)}
 
     except Exception as e:
         print(f"Error updating monthly CICO cells: {e}")
@@ -2494,7 +2844,7 @@ def update_student_cico_settings(month: int, student_code: str, settings_data: d
 
     if not client: return {"error": "Sheet not accessible"}
     try:
-        sh = client.open_by_url(settings.SHEET_URL)
+        sh = get_spreadsheet()
         month_name = f"{month}월"
 
         try:
@@ -2564,7 +2914,7 @@ def toggle_tier2_status(month: int, student_code: str, status: str):
     if not client or not settings.SHEET_URL:
         return {"error": "Sheet not accessible"}
     try:
-        sh = client.open_by_url(settings.SHEET_URL)
+        sh = get_spreadsheet()
         month_name = f"{month}월"
 
         try:
@@ -2614,7 +2964,7 @@ def get_student_dashboard_analysis(student_code: str):
     client = get_sheets_client()
     if not client: return {"error": "Sheet not accessible"}
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         # Try to open "Tier2_대시보드"
         try:
             ws = sheet.worksheet("Tier2_대시보드")
@@ -2710,7 +3060,7 @@ def get_cico_report_data(month: int):
         if not client or not settings.SHEET_URL:
             return {"error": "Sheet not accessible"}
         try:
-            sheet = client.open_by_url(settings.SHEET_URL)
+            sheet = get_spreadsheet()
             ws = get_worksheet_fuzzy(sheet, month_name)
             if not ws:
                 return {"error": f"'{month_name}' 시트가 없습니다."}
@@ -3103,7 +3453,7 @@ def get_cico_report_data(month: int):
                 "weekly_trend": overall_weekly_trend,
             }
         }
-        set_cached(report_cache_key, result)
+        set_cached(report_cache_key, result, ttl=report_ttl)
         return result
 
     except Exception as e:
@@ -3116,6 +3466,9 @@ def get_tier3_report_data(start_date: str = None, end_date: str = None, class_id
     Get Tier3 report data for decision making.
     Returns Tier3 student list with crisis behavior stats.
     """
+    import pandas as pd
+    from app.services.event_table import get_event_table
+
     # 1. Get Tier3 students from TierStatus
     records = fetch_student_status()
     if not records:
@@ -3182,7 +3535,7 @@ def get_tier3_report_data(start_date: str = None, end_date: str = None, class_id
             "summary": {"total_students": len(set(s["code"] for s in tier3_students)), "total_incidents": 0, "avg_intensity": 0},
         }
 
-    df = pd.DataFrame(raw_data)
+    df = get_event_table(raw_data).frame()
 
     def robust_parse_dates(date_series):
         import pandas as pd
@@ -3420,7 +3773,7 @@ def initialize_dashboard_if_missing():
         return {"error": "Sheet not accessible"}
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
 
         try:
             ws = sheet.worksheet("Tier2_대시보드")
@@ -3477,10 +3830,12 @@ def refresh_dashboard_data(sheet, dashboard_ws):
     months = ["3월", "4월", "5월", "6월", "7월", "8월", "9월", "10월", "11월", "12월"]
     student_history = {} # {code: [rate, rate, ...]}
 
+    # All ten month sheets in one values.batchGet (fresh: the dashboard is being rebuilt)
+    month_rows = get_cico_raw_sheet_values_bulk([int(m.replace("월", "")) for m in months], force_refresh=True)
+
     for i, m_name in enumerate(months):
         try:
-            m_ws = sheet.worksheet(m_name)
-            m_rows = safe_get_all_values(m_ws)
+            m_rows = month_rows.get(int(m_name.replace("월", ""))) or []
             if len(m_rows) < 2: continue
 
             headers = m_rows[0]
@@ -3509,8 +3864,12 @@ def refresh_dashboard_data(sheet, dashboard_ws):
 
     # 3. Get Current Month Data & Merge
     try:
-        t_ws = sheet.worksheet(target_month_str)
-        t_rows = safe_get_all_values(t_ws)
+        if target_month_str in months:
+            t_rows = month_rows.get(int(target_month_str.replace("월", ""))) or []
+            if not t_rows:
+                raise gspread.WorksheetNotFound(target_month_str)
+        else:
+            t_rows = safe_get_all_values(sheet.worksheet(target_month_str))
 
         output_rows = []
         if len(t_rows) > 1:
@@ -3559,7 +3918,7 @@ def initialize_monthly_sheets():
     client = get_sheets_client()
     if not client: return {"error": "Sheet not accessible"}
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
 
         # 1. Get Roster from TierStatus
         try:
@@ -3643,7 +4002,7 @@ def get_board_worksheet():
         return None
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             return sheet.worksheet("Board")
         except gspread.WorksheetNotFound:
@@ -3656,11 +4015,9 @@ def get_board_worksheet():
         return None
 
 def fetch_board_posts():
-    global _cache
-    now = time.time()
-
-    if _cache["board"]["data"] and (now - _cache["board"]["timestamp"] < CACHE_TTL):
-        return _cache["board"]["data"]
+    cached = get_cached(CACHE_KEY_BOARD, ttl=CACHE_TTL)
+    if cached:
+        return cached
 
     ws = get_board_worksheet()
     if not ws:
@@ -3699,7 +4056,7 @@ def fetch_board_posts():
             return val if val else ""
 
         valid_records.sort(key=parse_date, reverse=True)
-        _cache["board"] = {"data": valid_records, "timestamp": now}
+        set_cached(CACHE_KEY_BOARD, valid_records, ttl=CACHE_TTL)
         return valid_records
     except Exception as e:
         print(f"Error fetching board posts: {e}")
@@ -3787,7 +4144,7 @@ def ensure_bip_sheet():
     client = get_sheets_client()
     if not client: return None
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             ws = sheet.worksheet("BIP")
             existing_headers = ws.row_values(1)
@@ -3826,7 +4183,7 @@ def get_bip(student_code: str):
         records = safe_get_all_records(ws)
         for r in records:
             if str(r.get("StudentCode")).strip() == clean_code:
-                set_cached(cache_key, r)
+                set_cached(cache_key, r, ttl=300)
                 return r
         return None
     except Exception as e:
@@ -3875,7 +4232,7 @@ def add_holiday(date_str, name):
         return {"error": "Sheet not accessible"}
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             config_ws = sheet.worksheet("날짜 관리")
         except gspread.WorksheetNotFound:
@@ -3891,7 +4248,6 @@ def add_holiday(date_str, name):
         # Append
         config_ws.append_row([date_str, name, "수동 추가됨"])
         clear_cache("holidays") # Clear holidays cache only
-        invalidate_cache("config:holidays")  # get_holidays_from_config's actual cache key
         return {"message": f"Holiday {name} ({date_str}) added"}
     except Exception as e:
         print(f"Error adding holiday: {e}")
@@ -3904,7 +4260,7 @@ def delete_holiday(date_str):
         return {"error": "Sheet not accessible"}
 
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         config_ws = sheet.worksheet("날짜 관리")
 
         dates = config_ws.col_values(1)
@@ -3912,7 +4268,6 @@ def delete_holiday(date_str):
             if d == date_str:
                 config_ws.delete_rows(i + 1)  # 1-indexed
                 clear_cache("holidays") # Clear holidays cache only
-                invalidate_cache("config:holidays")  # get_holidays_from_config's actual cache key
                 return {"message": f"Holiday {date_str} deleted"}
 
         return {"error": "Holiday not found"}
@@ -3929,7 +4284,7 @@ def ensure_class_rules_sheet():
     client = get_sheets_client()
     if not client: return None
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             ws = sheet.worksheet("ClassRules")
         except gspread.WorksheetNotFound:
@@ -3975,7 +4330,7 @@ def ensure_token_board_sheet():
     client = get_sheets_client()
     if not client: return None
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             ws = sheet.worksheet("TokenBoard")
         except gspread.WorksheetNotFound:
@@ -3987,12 +4342,9 @@ def ensure_token_board_sheet():
         return None
 
 def get_token_board(class_id: str) -> list:
-    ws = ensure_token_board_sheet()
-    if not ws: return []
-    clean = str(class_id).strip()
+    from app.services.token_ledger import get_token_board as ledger_board
     try:
-        records = safe_get_all_records(ws)
-        return [r for r in records if str(r.get("ClassID", "")).strip() == clean]
+        return ledger_board(class_id)
     except Exception as e:
         print(f"Error getting token board: {e}")
         return []
@@ -4001,40 +4353,15 @@ def award_token(student_code: str, class_id: str, category: str, delta: int, aut
     """
     Adds `delta` tokens to a student's board (토큰 1개 = 100원).
     Every 10 tokens (=1000원) auto-converts into ExchangedCount and TokenCount wraps around.
+    Single-student form of token_ledger.award_tokens().
     """
-    ws = ensure_token_board_sheet()
-    if not ws: return {"error": "Sheet access failed"}
-    clean_code = str(student_code).strip()
-    clean_class = str(class_id).strip()
-    try:
-        records = safe_get_all_records(ws)
-        row_idx = None
-        cur_count, cur_exchanged = 0, 0
-        for i, r in enumerate(records):
-            if str(r.get("StudentCode", "")).strip() == clean_code:
-                row_idx = i + 2
-                cur_count = int(r.get("TokenCount", 0) or 0)
-                cur_exchanged = int(r.get("ExchangedCount", 0) or 0)
-                break
-
-        cur_count = max(0, cur_count + delta)
-        exchanged_now = cur_count // 10
-        cur_exchanged += exchanged_now
-        cur_count = cur_count % 10
-        now = now_kst().strftime("%Y-%m-%d %H:%M")
-        row = [clean_code, clean_class, cur_count, cur_exchanged, now]
-
-        if row_idx:
-            ws.delete_rows(row_idx)
-            ws.insert_row(row, index=row_idx)
-        else:
-            ws.append_row(row)
-
-        log_token_award(clean_code, clean_class, category, delta, author)
-        return {"student_code": clean_code, "token_count": cur_count, "exchanged_count": cur_exchanged, "exchanged_now": exchanged_now}
-    except Exception as e:
-        print(f"Error awarding token: {e}")
-        return {"error": str(e)}
+    from app.services.token_ledger import award_tokens
+    result = award_tokens(class_id, [{"student_code": student_code, "category": category, "delta": delta}], author)
+    if "error" in result:
+        return result
+    if not result["results"]:
+        return {"error": "student_code is required"}
+    return result["results"][0]
 
 
 def ensure_token_log_sheet():
@@ -4042,7 +4369,7 @@ def ensure_token_log_sheet():
     client = get_sheets_client()
     if not client: return None
     try:
-        sheet = client.open_by_url(settings.SHEET_URL)
+        sheet = get_spreadsheet()
         try:
             ws = sheet.worksheet("TokenLog")
         except gspread.WorksheetNotFound:
@@ -4058,21 +4385,16 @@ def log_token_award(student_code: str, class_id: str, category: str, delta: int,
     if not ws: return
     try:
         now = now_kst()
-        ws.append_row([now.strftime("%Y-%m-%d"), str(student_code).strip(), str(class_id).strip(), category, delta, author, now.strftime("%Y-%m-%d %H:%M:%S")])
+        failed = []
+        sheet_write_queue.append_row(ws, [now.strftime("%Y-%m-%d"), str(student_code).strip(), str(class_id).strip(), category, delta, author, now.strftime("%Y-%m-%d %H:%M:%S")],
+                                     on_failed=failed.append)
+        if failed:
+            print(f"Error logging token award: {failed[0]}")
+            return {"error": str(failed[0])}
     except Exception as e:
         print(f"Error logging token award: {e}")
+        return {"error": str(e)}
 
 def get_token_log(class_id: str = None, student_code: str = None, limit: int = 50) -> list:
-    ws = ensure_token_log_sheet()
-    if not ws: return []
-    try:
-        records = safe_get_all_records(ws)
-        if class_id:
-            records = [r for r in records if str(r.get("ClassID", "")).strip() == str(class_id).strip()]
-        if student_code:
-            records = [r for r in records if str(r.get("StudentCode", "")).strip() == str(student_code).strip()]
-        return records[-limit:][::-1]
-    except Exception as e:
-        print(f"Error getting token log: {e}")
-        return []
-
+    from app.services.token_ledger import get_token_log as ledger_log
+    return ledger_log(class_id=class_id, student_code=student_code, limit=limit)
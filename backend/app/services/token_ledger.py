@@ -0,0 +1,196 @@
+# backend/app/services/token_ledger.py
+
+"""
+Token ledger: the TokenBoard tally (one row per student) and the TokenLog history.
+
+Only the student code -> sheet row index is cached. An award reads the students' current
+rows fresh in one batch_get, checks that each row still holds that student (otherwise the
+index is re-read from the code column), and rewrites only the counter rows as range
+updates. New students are appended, never written to a guessed row. Counter writes go out
+before award_tokens() returns; the TokenLog rows go through the sheet write queue. Any
+number of awards in one call (a whole class) costs one batch_get and one batch_update on
+TokenBoard plus one append_rows on TokenLog.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+from app.adapters.sheets.client import get_or_load, invalidate_cache, safe_get_all_records, set_cached
+from app.adapters.sheets.write_queue import sheet_write_queue
+from app.core.time import now_kst
+
+TOKEN_BOARD_SHEET = "TokenBoard"
+TOKEN_LOG_SHEET = "TokenLog"
+TOKEN_BOARD_HEADERS = ["StudentCode", "ClassID", "TokenCount", "ExchangedCount", "UpdatedAt"]
+CACHE_KEY_TOKEN_BOARD_INDEX = "sheet:token-board-index"
+TOKEN_BOARD_INDEX_TTL = 300  # Rows are verified on every award, so a stale index costs a re-read, not a wrong row
+TOKENS_PER_EXCHANGE = 10  # 토큰 10개 = 1000원
+
+_ledger_lock = threading.Lock()
+
+
+class TokenBoardIndex:
+    """Student code -> TokenBoard sheet row, built from the code column (header first)."""
+
+    def __init__(self, codes: List[Any]):
+        self.row_of: Dict[str, int] = {}
+        for i, value in enumerate(codes[1:], start=2):
+            code = str(value).strip()
+            # First row wins, same as the record scan it replaces
+            if code:
+                self.row_of.setdefault(code, i)
+
+
+class TokenBoardChanged(Exception):
+    """The rows moved under us twice in a row (e.g. rows deleted in the sheet meanwhile)."""
+
+
+def _cell(row: List[Any], idx: int) -> Any:
+    return row[idx] if idx < len(row) else ""
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(float(value or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _load_index(ws) -> TokenBoardIndex:
+    # Never index the sheet while our own counter rows are still queued
+    sheet_write_queue.flush(TOKEN_BOARD_SHEET)
+    return TokenBoardIndex(ws.col_values(1))
+
+
+def get_board_index(ws, force: bool = False) -> TokenBoardIndex:
+    return get_or_load(CACHE_KEY_TOKEN_BOARD_INDEX, lambda: _load_index(ws), ttl=TOKEN_BOARD_INDEX_TTL, force=force)
+
+
+def _drop_index(_error=None):
+    invalidate_cache(CACHE_KEY_TOKEN_BOARD_INDEX)
+
+
+def _read_rows(ws, codes: List[str]) -> Dict[str, tuple]:
+    """
+    Current (row index, values) of every code already on the board, read from the sheet.
+    The cached index only says where to look: a row that no longer holds its code, or a
+    code the index does not know, triggers one re-read of the code column.
+    """
+    index = get_board_index(ws)
+    for attempt in range(2):
+        known = [c for c in codes if c in index.row_of]
+        ranges = [f"A{index.row_of[c]}:E{index.row_of[c]}" for c in known]
+        fetched = ws.batch_get(ranges) if ranges else []
+        current: Dict[str, tuple] = {}
+        moved = False
+        for code, values in zip(known, fetched):
+            row = list(values[0]) if values else []
+            if str(_cell(row, 0)).strip() == code:
+                current[code] = (index.row_of[code], row)
+            else:
+                moved = True
+        if not moved and (attempt or len(known) == len(codes)):
+            return current
+        index = get_board_index(ws, force=True)
+        if not moved and not any(c in index.row_of for c in codes if c not in current):
+            # Unknown codes are really new: nothing else to read
+            return current
+    raise TokenBoardChanged("TokenBoard rows changed during the award; please try again")
+
+
+def get_token_board(class_id: str) -> list:
+    from app.services.sheets import ensure_token_board_sheet
+    # Queued counter rows must be in the sheet before it is read
+    sheet_write_queue.flush(TOKEN_BOARD_SHEET)
+    ws = ensure_token_board_sheet()
+    if not ws:
+        return []
+    clean = str(class_id).strip()
+    records = safe_get_all_records(ws)
+    return [r for r in records if str(r.get("ClassID", "")).strip() == clean]
+
+
+def award_tokens(class_id: str, awards: List[Dict[str, Any]], author: str = "") -> dict:
+    """
+    Applies awards = [{"student_code": ..., "category": ..., "delta": 1}, ...] in order.
+    Every 10 tokens (=1000원) auto-convert into ExchangedCount and TokenCount wraps around.
+    Returns {"results": [per-award result, same shape as award_token()]}.
+    """
+    from app.services.sheets import ensure_token_board_sheet, ensure_token_log_sheet
+
+    board_ws = ensure_token_board_sheet()
+    if not board_ws:
+        return {"error": "Sheet access failed"}
+    log_ws = ensure_token_log_sheet()
+    clean_class = str(class_id).strip()
+
+    try:
+        with _ledger_lock:
+            codes = list(dict.fromkeys(str(a.get("student_code", "")).strip() for a in awards))
+            codes = [c for c in codes if c]
+            # Our own queued counter writes must land before the rows are read back
+            sheet_write_queue.flush(TOKEN_BOARD_SHEET)
+            current = _read_rows(board_ws, codes)
+
+            now = now_kst()
+            stamp = now.strftime("%Y-%m-%d %H:%M")
+            results, log_rows = [], []
+            updated: Dict[str, List[Any]] = {}
+            appended: Dict[str, List[Any]] = {}
+            for award in awards:
+                code = str(award.get("student_code", "")).strip()
+                if not code:
+                    continue
+                delta = int(award.get("delta", 1))
+                row = updated.get(code) or appended.get(code) or current.get(code, (0, []))[1]
+                cur_count, cur_exchanged = _to_int(_cell(row, 2)), _to_int(_cell(row, 3))
+
+                cur_count = max(0, cur_count + delta)
+                exchanged_now = cur_count // TOKENS_PER_EXCHANGE
+                cur_exchanged += exchanged_now
+                cur_count = cur_count % TOKENS_PER_EXCHANGE
+                row = [code, clean_class, cur_count, cur_exchanged, stamp]
+                (updated if code in current else appended)[code] = row
+
+                log_rows.append([now.strftime("%Y-%m-%d"), code, clean_class, award.get("category", ""), delta,
+                                 author, now.strftime("%Y-%m-%d %H:%M:%S")])
+                results.append({"student_code": code, "token_count": cur_count,
+                                "exchanged_count": cur_exchanged, "exchanged_now": exchanged_now})
+
+            failed: List[Exception] = []
+            updates = [{"range": f"A{current[c][0]}:E{current[c][0]}", "values": [row]} for c, row in updated.items()]
+            sheet_write_queue.update(board_ws, updates, on_failed=failed.append)
+            if appended:
+                # The sheet decides where appended rows land: re-index once they are written
+                sheet_write_queue.append_rows(board_ws, list(appended.values()), on_flushed=_drop_index,
+                                              on_failed=failed.append)
+            # Counters are read-modify-write: send them now instead of after the debounce
+            sheet_write_queue.flush(TOKEN_BOARD_SHEET)
+            if failed:
+                _drop_index()
+                return {"error": f"TokenBoard write failed: {failed[0]}"}
+            if log_ws:
+                sheet_write_queue.append_rows(log_ws, log_rows)
+        return {"results": results}
+    except Exception as e:
+        print(f"Error awarding tokens: {e}")
+        _drop_index()
+        return {"error": str(e)}
+
+
+def get_token_log(class_id: str = None, student_code: str = None, limit: int = 50) -> list:
+    from app.services.sheets import ensure_token_log_sheet, safe_get_all_records
+
+    # Queued award rows must be in the sheet before it is read
+    sheet_write_queue.flush(TOKEN_LOG_SHEET)
+    ws = ensure_token_log_sheet()
+    if not ws: return []
+    try:
+        records = safe_get_all_records(ws)
+        if class_id:
+            records = [r for r in records if str(r.get("ClassID", "")).strip() == str(class_id).strip()]
+        if student_code:
+            records = [r for r in records if str(r.get("StudentCode", "")).strip() == str(student_code).strip()]
+        return records[-limit:][::-1]
+    except Exception as e:
+        print(f"Error getting token log: {e}")
+        return []
@@ -0,0 +1,100 @@
+# backend/app/services/user_directory.py
+
+import time
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.adapters.sheets.client import peek_cached
+from app.services.sheets import fetch_all_users, CACHE_KEY_USERS
+
+MAX_CACHED_SESSIONS = 2048
+
+
+class UserDirectory:
+    """
+    ID -> user row index over the cached Users sheet.
+
+    The index is rebuilt only when fetch_all_users() hands back a different list,
+    i.e. after the Users cache was reloaded or invalidated (clear_cache("users")).
+
+    Also keeps a short-lived session cache: a verified token maps to the user
+    context built for it, so repeated requests skip both the JWT decode and the
+    Users lookup. Entries live for AUTH_SESSION_CACHE_TTL seconds (never past the
+    token's exp) and only while the Users data they were built from is current.
+    """
+
+    def __init__(self, session_ttl: float = 5.0):
+        self.session_ttl = session_ttl
+        self._lock = threading.Lock()
+        self._source: Optional[list] = None
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._sessions: Dict[str, tuple] = {}
+
+    def _index(self) -> Dict[str, Dict[str, Any]]:
+        users = fetch_all_users()
+        with self._lock:
+            if users is not self._source:
+                by_id: Dict[str, Dict[str, Any]] = {}
+                for r in users:
+                    # Same as the old linear scan: first row with a given ID wins
+                    by_id.setdefault(str(r.get("ID")), r)
+                self._by_id = by_id
+                self._source = users
+                self._sessions.clear()
+            return self._by_id
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        if user_id is None:
+            return None
+        return self._index().get(str(user_id))
+
+    @staticmethod
+    def _session_key(token: str) -> str:
+        # The raw token (sub + iat + signature) is the key; a bare sub+iat pair could be forged
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def cached_session(self, token: str) -> Optional[Dict[str, Any]]:
+        """Returns the user context cached for this token, or None."""
+        if not token or self.session_ttl <= 0:
+            return None
+        key = self._session_key(token)
+        with self._lock:
+            item = self._sessions.get(key)
+            if item is None:
+                return None
+            context, expires_at, source = item
+            if time.time() >= expires_at or source is not self._source:
+                self._sessions.pop(key, None)
+                return None
+        # Users cache was reloaded or invalidated since this session was resolved
+        # (peek: a per-request identity check, not a cache read for the hit/miss stats)
+        if peek_cached(CACHE_KEY_USERS) is not source:
+            return None
+        return dict(context)
+
+    def remember_session(self, token: str, payload: Dict[str, Any], context: Dict[str, Any]):
+        if not token or self.session_ttl <= 0:
+            return
+        now = time.time()
+        expires_at = now + self.session_ttl
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        with self._lock:
+            if self._source is None:
+                return
+            if len(self._sessions) >= MAX_CACHED_SESSIONS:
+                self._sessions = {k: v for k, v in self._sessions.items() if v[1] > now}
+                if len(self._sessions) >= MAX_CACHED_SESSIONS:
+                    self._sessions.clear()
+            self._sessions[self._session_key(token)] = (dict(context), expires_at, self._source)
+
+    def flush(self):
+        with self._lock:
+            self._source = None
+            self._by_id = {}
+            self._sessions.clear()
+
+
+user_directory = UserDirectory(session_ttl=settings.AUTH_SESSION_CACHE_TTL)
@@ -0,0 +1,124 @@
+import sys
+import os
+import time
+import threading
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+os.environ.setdefault("LLM_CACHE_ENABLED", "true")
+
+from app.services import ai_insight
+from app.services.ai_jobs import AIJobQueue, AIJobStore, DONE, FAILED, INTERRUPTED, QUEUED, RUNNING, job_owners
+
+# AI 작업 큐 테스트:
+# 가짜 LLM 호출(완료 시점을 테스트가 제어)로 같은 프롬프트 작업 공유(dedup), 캐시된 결과 즉시 완료,
+# 실패 안내문·예외 처리, 그리고 재시작한 프로세스에서 완료 작업 조회와 중단된 작업의 interrupted 상태를 확인한다.
+
+ai_insight._llm_model_id = lambda: "local:test-model"
+
+llm_calls = []
+gates = {}
+
+
+def fake_uncached(system_prompt, user_prompt, max_tokens=8192):
+    llm_calls.append(user_prompt)
+    gate = gates.get(user_prompt)
+    if gate is not None:
+        gate.wait(5)
+    if user_prompt.startswith("예외"):
+        raise RuntimeError("provider crashed")
+    if user_prompt.startswith("실패"):
+        return "⚠️ 모든 AI 모델 호출에 실패했습니다."
+    return f"보고서: {user_prompt}"
+
+
+ai_insight._call_llm_uncached = fake_uncached
+
+
+def wait_done(queue, job_id, seconds=5.0):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job and job["status"] in (DONE, FAILED):
+            return job
+        time.sleep(0.01)
+    return queue.get(job_id)
+
+
+store_dir = tempfile.mkdtemp(prefix="pbst_jobs_")
+queue = AIJobQueue(workers=2, retention=3600, store=AIJobStore(store_dir))
+
+print("=" * 60)
+print("🧪 AI 작업 큐 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 제출 즉시 job 반환 (워커가 백그라운드에서 실행)
+gates["학생 2101 BIP"] = threading.Event()
+first = queue.submit("bip", "teacher-a", "시스템", "학생 2101 BIP", 1000)
+check("1. 즉시 반환", first["status"] in (QUEUED, RUNNING) and first["result"] is None)
+
+# 2. 같은 프롬프트가 진행 중이면 새 작업 없이 같은 job 공유, 요청자 목록에 추가, LLM 호출 1회로 완료
+second = queue.submit("bip", "teacher-b", "시스템", "학생 2101 BIP", 1000)
+third = queue.submit("bip", "teacher-a", "시스템", "학생 2101 BIP", 1000)
+gates["학생 2101 BIP"].set()
+done = wait_done(queue, first["id"])
+check("2. 진행 중 작업 공유", second["id"] == third["id"] == first["id"]
+      and job_owners(done) == ["teacher-a", "teacher-b"] and queue.stats()["deduplicated"] == 2
+      and llm_calls.count("학생 2101 BIP") == 1 and done["status"] == DONE
+      and done["result"] == "보고서: 학생 2101 BIP" and queue.stats()["inflight"] == 0)
+
+# 3. 결과가 캐시된 프롬프트는 워커 없이 즉시 완료된 작업
+cached = queue.submit("bip", "teacher-c", "시스템", "학생 2101 BIP", 1000)
+check("3. 캐시 적중 즉시 완료", cached["status"] == DONE and cached["id"] != first["id"]
+      and cached["result"] == "보고서: 학생 2101 BIP" and llm_calls.count("학생 2101 BIP") == 1)
+
+# 4. regenerate: 캐시를 건너뛰고 새 작업으로 다시 생성
+regen = wait_done(queue, queue.submit("bip", "teacher-a", "시스템", "학생 2101 BIP", 1000, regenerate=True)["id"])
+check("4. 다시 생성", regen["status"] == DONE and llm_calls.count("학생 2101 BIP") == 2)
+
+# 5. 실패 안내문(⚠️)과 예외는 FAILED, 오류 내용 보존, 다음 제출은 새 작업
+failed = wait_done(queue, queue.submit("tier3", "teacher-a", "시스템", "실패 프롬프트", 1000)["id"])
+crashed = wait_done(queue, queue.submit("tier3", "teacher-a", "시스템", "예외 프롬프트", 1000)["id"])
+retry = queue.submit("tier3", "teacher-a", "시스템", "실패 프롬프트", 1000)
+check("5. 실패·예외 처리", failed["status"] == FAILED and failed["error"].startswith("⚠️")
+      and crashed["status"] == FAILED and "provider crashed" in crashed["error"]
+      and retry["id"] != failed["id"] and queue.stats()["failed"] >= 2)
+wait_done(queue, retry["id"])
+
+# 6. 재시작: 새 프로세스(새 큐, 같은 저장소)에서 완료된 작업 조회
+restarted = AIJobQueue(workers=1, retention=3600, store=AIJobStore(store_dir))
+reloaded = restarted.get(first["id"])
+check("6. 재시작 후 완료 작업 조회", reloaded is not None and reloaded["status"] == DONE
+      and reloaded["result"] == "보고서: 학생 2101 BIP" and job_owners(reloaded) == ["teacher-a", "teacher-b"])
+
+# 7. 이전 프로세스가 실행 중에 멈춘 작업은 interrupted로 보고
+gates["긴 SST 회의록"] = threading.Event()
+stuck = queue.submit("sst", "teacher-a", "시스템", "긴 SST 회의록", 1000)
+deadline = time.monotonic() + 5
+while queue.get(stuck["id"])["status"] != RUNNING and time.monotonic() < deadline:
+    time.sleep(0.01)
+seen_after_restart = restarted.get(stuck["id"])
+gates["긴 SST 회의록"].set()
+wait_done(queue, stuck["id"])
+check("7. 중단된 작업 interrupted", seen_after_restart["status"] == INTERRUPTED
+      and "재시작" in seen_after_restart["error"] and restarted.get("없는-job") is None)
+
+# 8. 보존 기간이 지난 작업은 조회되지 않음
+expired = AIJobQueue(workers=1, retention=0, store=AIJobStore(store_dir))
+check("8. 보존 기간 만료", expired.get(first["id"]) is None)
+
+print("=" * 60)
+print("🎉 모든 AI 작업 큐 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
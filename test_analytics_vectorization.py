@@ -0,0 +1,571 @@
+import sys
+import os
+import json
+import time
+import random
+import re
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+
+import pandas as pd
+from app.services import analysis
+from app.services.analysis import extract_numeric, robust_parse_dates, sort_time_slots, normalize_function
+from app.services.analysis import _FUNCTION_CATEGORIES
+from app.services import roster_index
+from app.services.roster_index import RosterEntry
+
+# get_analytics_data 벡터화/집계 큐브 회귀 테스트:
+# 벡터화 이전 구현(아래 legacy_*)과 현재 구현의 출력을 5만 행 합성 Log_Main으로 비교한다.
+
+N_ROWS = 50_000
+random.seed(20260317)
+
+STUDENTS = [(f"{c}{i:02d}", f"학생{c}{i:02d}") for c in ("21", "22", "31", "41") for i in range(1, 26)]
+BEABLE = {f"B{i}": {"student_code": code, "student_name": name} for i, (code, name) in enumerate(STUDENTS[:60])}
+STATUS = [
+    {"학생코드": code, "학생명": name, "학급": random.choice(["211", "초2-1", "중1-1", "고1-1"]),
+     "재학여부": random.choice(["O", "O", "X"]),
+     "Tier1": "O", "Tier2(CICO)": random.choice(["O", ""]), "Tier2(SST)": "",
+     "Tier3": random.choice(["O", "", "", ""]), "Tier3+": random.choice(["O"] + [""] * 9)}
+    for code, name in STUDENTS[20:]
+]
+
+def _random_row():
+    code, name = random.choice(STUDENTS)
+    pick = random.random()
+    if pick < 0.05:
+        code, name = "", name           # 이름으로만 식별
+    elif pick < 0.08:
+        code, name = "9999", "미등록학생"  # 매핑 없음
+    elif pick < 0.10:
+        code, name = int(code), ""     # 숫자형 코드
+    y, m, d = 2026, random.randint(3, 12), random.randint(1, 28)
+    date = random.choice([f"{y}-{m:02d}-{d:02d}", f"{y}. {m}. {d}.", f"{y}/{m}/{d}"])
+    row = {
+        "학생코드": code,
+        "학생명": name,
+        "행동발생날짜": date,
+        "장소": random.choice(["교실", "급식실", "복도", "운동장", "특별실"]),
+        "시간대": random.choice(["1교시", "2교시", "오전 9시", "오후 1시", "점심시간"]),
+        "행동유형": random.choice(["공격행동", "자해행동", "이탈", "소리지르기", "기물파손", "불순응"]),
+        "강도": random.choice(["1", "2", "3", "4", "5", "5점", " 3 (중간)", "", "강함", 4, 2.0]),
+        "발생횟수": random.choice(["1", "2회", "3", "", "여러 번", 5]),
+        "기능": random.choice(_FUNCTION_CATEGORIES + ["관심", "회피하려고", "sensory", "", "nan", "기타 설명"]),
+        "물리적제지여부": random.choice(["O", "X", "O(개별)", ""]),
+    }
+    if random.random() < 0.02:
+        del row["강도"]                  # 누락 셀
+    return row
+
+ROWS = [_random_row() for _ in range(N_ROWS)]
+ROSTER = {
+    code: RosterEntry(student_code=code, class_code=random.choice(["초1-1", "초2-1"]), name=name,
+                      beable_code=None, tiers=["TIER_1"], enrolled=True)
+    for code, name in STUDENTS
+}
+
+# 시트 접근 대체
+# 캐시된 fetch_all_records()처럼 동일한 리스트 객체를 반환 (집계 큐브는 리스트가 바뀔 때만 재구성)
+RECORDS = [dict(r) for r in ROWS]
+fetch_all_records = lambda: RECORDS
+fetch_student_status = lambda: [dict(s) for s in STATUS]
+get_beable_code_mapping = lambda: BEABLE
+get_enrolled_student_count = lambda: len([s for s in STATUS if s["재학여부"] == "O"])
+for _name in ("fetch_all_records", "fetch_student_status", "get_beable_code_mapping", "get_enrolled_student_count"):
+    setattr(analysis, _name, globals()[_name])
+roster_index.get_roster_index = lambda: ROSTER
+
+
+def aggregate_functions(series) -> list:
+    counts = {cat: 0 for cat in _FUNCTION_CATEGORIES}
+    for val in series:
+        cat = normalize_function(val)
+        counts[cat] = counts.get(cat, 0) + 1
+    result = []
+    for cat in _FUNCTION_CATEGORIES[:-1]:
+        if counts[cat] > 0:
+            result.append({"name": cat, "value": counts[cat]})
+    result.sort(key=lambda x: x["value"], reverse=True)
+    if counts["기타"] > 0:
+        result.append({"name": "기타", "value": counts["기타"]})
+    return result
+
+
+def legacy_get_analytics_data(start_date: str = None, end_date: str = None, class_id: str = None):
+    raw_data = fetch_all_records()
+    
+    empty_res = {
+        "summary": {"total_incidents": 0, "avg_intensity": 0, "risk_student_count": 0},
+        "trends": [], "weekly_trends": [],
+        "big5": {"locations": [], "times": [], "behaviors": [], "weekdays": []},
+        "risk_list": [], "functions": [], "antecedents": [], "consequences": [],
+        "heatmap": [], "safety_alerts": [], "ai_comment": "데이터가 없습니다."
+    }
+
+    if not raw_data:
+        return empty_res
+
+    df = pd.DataFrame(raw_data)
+    
+    # 2. Get BeAble code mapping & TierStatus for O(1) Indexed Lookups
+    all_status = fetch_student_status() or []
+    beable_mapping = get_beable_code_mapping() or {}
+
+    code_map = {}
+    name_map = {}
+    for info in beable_mapping.values():
+        sc = str(info.get('student_code', '')).strip()
+        sn = str(info.get('student_name', '')).strip()
+        if sc: code_map[sc] = info
+        if sn: name_map[sn] = info
+
+    tier_status_cache = {}
+    assigned_tier_cache = {}
+    for s in all_status:
+        sc = str(s.get('학생코드') or s.get('Code') or s.get('학번') or '').strip()
+        sn = str(s.get('학생이름') or s.get('학생명') or s.get('Name') or '').strip()
+        class_val = s.get('학급', s.get('Class', '-'))
+        if sc:
+            tier_status_cache[sc] = class_val
+            # 이미 배정된 최고 지원단계 (상향 검토 대상자 명단에서 이미 배정된 학생을 제외하기 위함)
+            if str(s.get('Tier3+', '')).strip() == 'O':
+                assigned_tier_cache[sc] = 'Tier 3+'
+            elif str(s.get('Tier3', '')).strip() == 'O':
+                assigned_tier_cache[sc] = 'Tier 3'
+            elif str(s.get('Tier2(CICO)', '')).strip() == 'O' or str(s.get('Tier2(SST)', '')).strip() == 'O':
+                assigned_tier_cache[sc] = 'Tier 2'
+            else:
+                assigned_tier_cache[sc] = 'Tier 1'
+            if sc not in code_map:
+                code_map[sc] = {'student_code': sc, 'student_name': sn or sc}
+        if sn and sn not in name_map:
+            name_map[sn] = {'student_code': sc or sn, 'student_name': sn}
+
+    # 3. Filter & Map Data in O(N) instead of O(N * M)
+    resolved_records = []
+    records_list = df.to_dict('records')
+    for row in records_list:
+        s_code = str(row.get('학생코드', '')).strip()
+        s_name = str(row.get('학생명', '')).strip()
+        
+        info = code_map.get(s_code) or name_map.get(s_name)
+        if info:
+            row['student_code'] = info['student_code']
+            row['student_name_labeled'] = info.get('student_name', info['student_code'])
+        else:
+            raw_name = s_name or s_code or "Unknown"
+            row['student_code'] = raw_name
+            row['student_name_labeled'] = raw_name
+            
+        resolved_records.append(row)
+    
+    if not resolved_records:
+        return empty_res
+
+    df = pd.DataFrame(resolved_records)
+    # Ensure columns exist for downstream logic
+    if '학생코드' not in df.columns:
+        df['학생코드'] = df['student_code']
+    
+    # Ensure numeric columns are actually numeric using regex extraction
+    if '강도' in df.columns:
+        df['강도'] = df['강도'].apply(lambda x: extract_numeric(x, 0))
+    if '발생횟수' in df.columns:
+        df['발생횟수'] = df['발생횟수'].apply(lambda x: extract_numeric(x, 1))
+    else:
+        df['발생횟수'] = 1
+
+    # --- Date Filtering ---
+    if '행동발생날짜' in df.columns:
+        df['date_obj'] = robust_parse_dates(df['행동발생날짜'])
+        
+        if start_date:
+            df = df[df['date_obj'] >= pd.to_datetime(start_date)]
+    # --- Class Filtering ---
+    if class_id and not df.empty:
+        try:
+            from app.api.deps import normalize_class_identifier
+            from app.services.roster_index import get_roster_index
+            target_canonical = normalize_class_identifier(class_id)
+            roster = get_roster_index()
+            def _matches_class(sc):
+                sc_str = str(sc).strip()
+                if sc_str.startswith(str(class_id)):
+                    return True
+                entry = roster.get(sc_str)
+                return entry is not None and entry.class_code == target_canonical
+            # Resolve each distinct code once instead of once per log row
+            codes = df['student_code'].astype(str)
+            matches = {sc: _matches_class(sc) for sc in codes.unique()}
+            df = df[codes.map(matches).astype(bool)]
+        except Exception:
+            df = df[df['student_code'].str.startswith(str(class_id), na=False)]
+    
+    # --- Tier 1: Big 5 Analysis ---
+    if not df.empty:
+        # Daily trend: count form submissions per date (not frequency sum)
+        date_counts = df.groupby('행동발생날짜').size().sort_index().to_dict()
+        
+        # Weekly Trend: count submissions per week
+        weekly_counts = {}
+        if 'date_obj' in df.columns:
+            df['week'] = df['date_obj'].dt.isocalendar().week.fillna(-1).astype(int)
+            df['year'] = df['date_obj'].dt.year.fillna(-1).astype(int)
+            # Filter valid dates for weekly
+            valid_df = df[df['year'] > 0]
+            w_grouped = valid_df.groupby(['year', 'week']).size()  # count rows
+            for (y, w), count in w_grouped.items():
+                label = f"{y}-W{w:02d}"
+                weekly_counts[label] = int(count)
+    else:
+        date_counts = {}
+        weekly_counts = {}
+
+    # 3. Location Stats (Big 5) - count submissions per location
+    location_stats = []
+    if '장소' in df.columns:
+        loc_counts = df.groupby('장소').size().sort_values(ascending=False).head(10)
+        location_stats = [{"name": k, "value": int(v)} for k, v in loc_counts.items()]
+
+    # 4. Time Stats (Big 5) - count submissions per time slot
+    time_stats = []
+    if '시간대' in df.columns:
+        t_counts = df.groupby('시간대').size()
+        time_stats = sort_time_slots([{"name": k, "value": int(v)} for k, v in t_counts.items()])
+
+    # 5. Behavior Type Stats (Big 5) - count submissions per behavior type
+    behavior_stats = []
+    if '행동유형' in df.columns:
+        b_counts = df.groupby('행동유형').size().sort_values(ascending=False).head(5)
+        behavior_stats = [{"name": k, "value": int(v)} for k, v in b_counts.items()]
+
+    # --- Tier 2: Screening & Hot Spots ---
+
+    # 6. At Risk Students (Frequency >= 3 OR Intensity >= 5) - Use 학생코드
+    at_risk_list = []
+    
+    if '학생코드' in df.columns:
+        # Group by Student Code (4-digit), sum 발생횟수 for accurate PBIS incident count
+        student_groups = df.groupby('학생코드')
+        for student_code, group in student_groups:
+            freq_count = len(group)  # PBIS: number of submissions (report frequency)
+            max_intensity = group['강도'].max()
+            
+            tier = "Tier 1"
+            if freq_count >= 6 or (pd.notna(max_intensity) and max_intensity >= 5):
+                tier = "Tier 3"
+            elif freq_count >= 3:
+                tier = "Tier 2"
+            
+            # 이미 해당 단계 이상으로 배정된 학생은 "상향 검토 대상자"에서 제외한다
+            # (Tier2 후보는 Tier2 이상 배정자 제외, Tier3 후보는 Tier3 이상 배정자 제외)
+            assigned_tier = assigned_tier_cache.get(str(student_code), 'Tier 1')
+            tier_rank = {"Tier 1": 0, "Tier 2": 1, "Tier 3": 2, "Tier 3+": 3}
+            already_assigned = tier_rank.get(assigned_tier, 0) >= tier_rank.get(tier, 0)
+
+            if tier != "Tier 1" and not already_assigned:
+                student_name_label = group['student_name_labeled'].iloc[0] if 'student_name_labeled' in group.columns else str(student_code)
+                at_risk_list.append({
+                    "name": student_name_label,
+                    "student_code": str(student_code),
+                    "count": freq_count,
+                    "max_intensity": int(max_intensity) if pd.notna(max_intensity) else 0,
+                    "tier": tier,
+                    "class": tier_status_cache.get(str(student_code), '-')
+                })
+    
+    # Sort risk list by Tier (desc) then Count (desc)
+    at_risk_list.sort(key=lambda x: (x['tier'], x['count']), reverse=True)
+
+    # 7. Function Analysis (Why?) - 6개 표준 카테고리로 정규화
+    function_stats = []
+    if '기능' in df.columns:
+        function_stats = aggregate_functions(df['기능'])
+
+    # 8. Heatmap (Location x Time) - Hotspot Analysis using row count
+    heatmap_data = []
+    if '장소' in df.columns and '시간대' in df.columns:
+        ct = df.groupby(['장소', '시간대']).size().unstack(fill_value=0)
+        for loc in ct.index:
+            for time in ct.columns:
+                val = ct.loc[loc, time]
+                if val > 0:
+                    heatmap_data.append({
+                        "y": loc,
+                        "x": time,
+                        "value": int(val)
+                    })
+
+    # --- Tier 3: Safety Alerts (Intensity >= 5) ---
+    safety_alerts = []
+    if '강도' in df.columns:
+        high_intensity_df = df[df['강도'] >= 5]
+        # Sort by date desc
+        if '행동발생날짜' in high_intensity_df.columns:
+            # high_intensity_df.sort_values(by='행동발생날짜', ascending=False, inplace=True)
+            pass
+        
+        for _, row in high_intensity_df.iterrows():
+            raw_int_val = row.get('강도', 5)
+            try:
+                alert_int = int(raw_int_val) if pd.notna(raw_int_val) else 5
+            except Exception:
+                alert_int = 5
+            safety_alerts.append({
+                "date": row.get('행동발생날짜', '-'),
+                "student": row.get('학생코드', row.get('학생명', '-')),  # Use 4-digit student code
+                "location": row.get('장소', '-'),
+                "type": row.get('행동유형', '-'),
+                "intensity": alert_int
+            })
+
+
+
+
+    
+    # Summary Stats — use ROW COUNT (= number of form submissions, not frequency sum)
+    total_incidents = len(df)
+
+    # 개별학생교육지원 건수 (구 명칭: 분리지도) - 물리적 제지/개별학생교육지원이 발생한 기록 수
+    individual_support_count = 0
+    if '물리적제지여부' in df.columns:
+        individual_support_count = int(df['물리적제지여부'].astype(str).str.startswith('O', na=False).sum())
+
+    # Calculate daily average
+    daily_avg = 0.0
+    if start_date and end_date:
+        try:
+            d1 = pd.to_datetime(start_date)
+            d2 = pd.to_datetime(end_date)
+            days = (d2 - d1).days + 1
+            if days > 0:
+                daily_avg = round(total_incidents / days, 1)
+        except Exception:
+            pass
+    elif not df.empty and 'date_obj' in df.columns:
+        # Fallback to unique dates if range not provided
+        days = df['date_obj'].nunique()
+        if days > 0:
+            daily_avg = round(total_incidents / days, 1)
+
+    # Unweighted average intensity (mean across all submission rows)
+    avg_intensity = float(df['강도'].mean()) if not df.empty and '강도' in df.columns else 0.0
+    avg_intensity = round(avg_intensity, 2)
+        
+    risk_student_count = len(at_risk_list)
+    # 9. Weekday Analysis - count submissions per weekday
+    weekday_stats = []
+    weekday_names = ['월', '화', '수', '목', '금', '토', '일']
+    if 'date_obj' in df.columns:
+        df['weekday'] = df['date_obj'].dt.dayofweek
+        wd_counts = df.groupby('weekday').size().sort_index()  # row count
+        for wd, cnt in wd_counts.items():
+             name = weekday_names[int(wd)] if int(wd) < 7 else str(wd)
+             weekday_stats.append({"name": name, "value": int(cnt)})
+
+    # 10. Intensity Distribution (Replacing Antecedent)
+    intensity_dist = []
+    if '강도' in df.columns:
+        i_counts = df.groupby('강도').size().sort_index()
+        intensity_dist = [{"name": f"강도 {int(k)}", "value": int(v)} for k, v in i_counts.items()]
+
+    # 11. Monthly Intensity Trend (Replacing Consequence)
+    intensity_trend = []
+    if 'date_obj' in df.columns and '강도' in df.columns:
+        df['month_label'] = df['date_obj'].dt.strftime('%Y-%m')
+        # Average intensity per month
+        m_intensity = df.groupby('month_label')['강도'].mean().reset_index()
+        intensity_trend = [{"month": row['month_label'], "value": round(float(row['강도']), 2)} for _, row in m_intensity.iterrows()]
+
+
+    # Generate AI Insight with enriched tier data
+    try:
+        all_status = fetch_student_status()
+        # 담임교사는 본인 학급만 봐야 하므로, 전교 TierStatus를 class_id 기준으로 스코프 좁힘
+        if class_id:
+            try:
+                from app.api.deps import normalize_class_identifier
+                target_canonical = normalize_class_identifier(class_id)
+                all_status = [
+                    s for s in all_status
+                    if str(s.get('학생코드', '')).strip().startswith(str(class_id))
+                    or normalize_class_identifier(s.get('학급', '')) == target_canonical
+                ]
+            except Exception:
+                all_status = [s for s in all_status if str(s.get('학생코드', '')).strip().startswith(str(class_id))]
+        enrolled_count = len([s for s in all_status if s.get('재학여부') == 'O']) if class_id else get_enrolled_student_count()
+        enrolled_students = [s for s in all_status if s.get('재학여부') == 'O']
+        
+        t1_count = len([s for s in enrolled_students if s.get('Tier1') == 'O' and s.get('Tier2(CICO)') != 'O' and s.get('Tier2(SST)') != 'O' and s.get('Tier3') != 'O' and s.get('Tier3+') != 'O'])
+        t2c_count = len([s for s in enrolled_students if s.get('Tier2(CICO)') == 'O'])
+        t2c_pure = len([s for s in enrolled_students if s.get('Tier2(CICO)') == 'O' and s.get('Tier3') != 'O' and s.get('Tier3+') != 'O'])
+        t2s_count = len([s for s in enrolled_students if s.get('Tier2(SST)') == 'O'])
+        t3_count = len([s for s in enrolled_students if s.get('Tier3') == 'O'])
+        t3p_count = len([s for s in enrolled_students if s.get('Tier3+') == 'O'])
+        
+        pct = lambda c: round((c / enrolled_count * 100), 1) if enrolled_count > 0 else 0
+        
+        tier_stats = {
+            "enrolled": enrolled_count,
+            "tier1": {"count": t1_count, "pct": pct(t1_count)},
+            "tier2_cico": {"count": t2c_count, "pct": pct(t2c_count), "pure": t2c_pure},
+            "tier2_sst": {"count": t2s_count, "pct": pct(t2s_count)},
+            "tier3": {"count": t3_count, "pct": pct(t3_count)},
+            "tier3_plus": {"count": t3p_count, "pct": pct(t3p_count)},
+        }
+    except Exception:
+        tier_stats = None
+
+    # 대시보드 로딩 속도 최적화: 접속 시 자동 LLM 호출을 제거하고, 사용자가 버튼 클릭 시에만 AI 분석 수행
+    ai_comment = f"총 {total_incidents}건의 행동 기록이 집계되었습니다. (집중지원 대상: {risk_student_count}명)"
+    ai_report = {"briefing_text": ai_comment}
+
+    # Monthly trend — row count per month (for monthly bar chart)
+    monthly_trend = []
+    if 'date_obj' in df.columns:
+        df['month_label'] = df['date_obj'].dt.strftime('%Y-%m')
+        m_counts = df.groupby('month_label').size().reset_index(name='count')
+        monthly_trend = [{"month": row['month_label'], "count": int(row['count'])} for _, row in m_counts.iterrows()]
+
+    # Build tier_distribution for donut chart
+    tier_distribution = []
+    if tier_stats:
+        enr = tier_stats["enrolled"]
+        t1 = tier_stats["tier1"]["count"]
+        t2c = tier_stats["tier2_cico"]["pure"]
+        t2s = tier_stats["tier2_sst"]["count"]
+        t3 = tier_stats["tier3"]["count"]
+        t3p = tier_stats["tier3_plus"]["count"]
+        tier_distribution = [
+            {"name": "Tier 1 (보편)", "value": t1, "color": "#22c55e"},
+            {"name": "Tier 2-CICO (선별)", "value": t2c, "color": "#f59e0b"},
+            {"name": "Tier 2-SST (집중)", "value": t2s, "color": "#f97316"},
+            {"name": "Tier 3 (개별집중)", "value": t3, "color": "#ef4444"},
+            {"name": "Tier 3+ (위기)", "value": t3p, "color": "#7c3aed"},
+        ]
+        tier_distribution = [t for t in tier_distribution if t["value"] > 0]
+
+    return {
+        "summary": {
+            "total_incidents": total_incidents,
+            "daily_avg": daily_avg,
+            "avg_intensity": avg_intensity,
+            "risk_student_count": risk_student_count,
+            "enrolled_count": tier_stats["enrolled"] if tier_stats else 0,
+            "individual_support_count": individual_support_count,
+            # 실배정 원본 카운트 (Tier현황 페이지와 동일 기준 - Tier간 중복 배제하지 않은 raw O 카운트)
+            "tier1_count": tier_stats["tier1"]["count"] if tier_stats else 0,
+            "tier2_cico_count": tier_stats["tier2_cico"]["count"] if tier_stats else 0,
+            "tier2_sst_count": tier_stats["tier2_sst"]["count"] if tier_stats else 0,
+            "tier3_count": tier_stats["tier3"]["count"] if tier_stats else 0,
+            "tier3_plus_count": tier_stats["tier3_plus"]["count"] if tier_stats else 0,
+        },
+        "trends": [{"date": k, "count": v} for k, v in date_counts.items()],
+        "weekly_trends": [{"week": k, "count": v} for k, v in weekly_counts.items()],
+        "monthly_trend": monthly_trend,
+        "tier_distribution": tier_distribution,
+        "big5": {
+            "locations": location_stats,
+            "times": time_stats,
+            "behaviors": behavior_stats,
+            "weekdays": weekday_stats
+        },
+        "risk_list": at_risk_list,
+        "functions": function_stats,
+        "intensity_distribution": intensity_dist,
+        "intensity_trend": intensity_trend,
+        "heatmap": heatmap_data,
+        "safety_alerts": safety_alerts,
+        "ai_comment": ai_comment,
+        "ai_report": ai_report
+    }
+
+
+def _canonical(result):
+    return json.dumps(result, sort_keys=True, ensure_ascii=False, default=str)
+
+
+print("=" * 60)
+print(f"🧪 get_analytics_data 벡터화 회귀 테스트 ({N_ROWS:,}행)")
+print("=" * 60)
+
+failures = 0
+cases = [
+    ("전체 기간", {}),
+    ("기간 지정", {"start_date": "2026-05-01", "end_date": "2026-09-30"}),
+    ("학급 필터", {"class_id": "211"}),
+]
+for label, kwargs in cases:
+    t0 = time.perf_counter()
+    old = legacy_get_analytics_data(**kwargs)
+    t1 = time.perf_counter()
+    new = analysis.get_analytics_data(**kwargs)
+    t2 = time.perf_counter()
+    again = analysis.get_analytics_data(**kwargs)
+    t3 = time.perf_counter()
+    same = _canonical(old) == _canonical(new) == _canonical(again)
+    failures += 0 if same else 1
+    print(f"{label}: 이전 {t1 - t0:.2f}s / 현재 {t2 - t1:.2f}s (재호출 {t3 - t2:.2f}s) -> {'✅ 동일' if same else '❌ 불일치'}")
+    if not same:
+        for key in old:
+            if _canonical(old[key]) != _canonical(new.get(key)):
+                print(f"   - 차이: {key}")
+
+# Log_Main 재동기화에서 새 행이 없으면 같은 레코드 리스트가 돌아와 집계 큐브를 재구성하지 않아야 한다
+from app.services import sheets
+from app.services.analytics_cube import get_analytics_cube
+
+
+class FakeLogWorksheet:
+    """증분 동기화가 쓰는 get_all_values()/batch_get()만 흉내 낸 Log_Main"""
+    title = "Log_Main"
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def get_all_values(self):
+        return [list(r) for r in self.rows]
+
+    def batch_get(self, ranges):
+        out = []
+        for rng in ranges:
+            if rng == "1:1":
+                out.append([list(self.rows[0])])
+            else:
+                start = int(re.findall(r"\d+", rng)[0])
+                out.append([list(r) for r in self.rows[start - 1:]])
+        return out
+
+
+class FakeSpreadsheet:
+    def __init__(self, ws):
+        self.ws = ws
+
+    def worksheets(self):
+        return [self.ws]
+
+
+LOG_HEADERS = ["학생코드", "학생명", "행동발생날짜", "장소", "시간대", "행동유형", "강도", "발생횟수", "기능", "물리적제지여부"]
+log_ws = FakeLogWorksheet([LOG_HEADERS] + [[str(r.get(h, "")) for h in LOG_HEADERS] for r in ROWS[:2000]])
+sheets.get_sheets_client = lambda: object()
+sheets.get_spreadsheet = lambda: FakeSpreadsheet(log_ws)
+sheets.get_beable_code_mapping = lambda: BEABLE
+
+first = sheets._load_all_records()
+cube = get_analytics_cube(first)
+again = sheets._load_all_records()
+reused = again is first and get_analytics_cube(again) is cube
+failures += 0 if reused else 1
+print(f"새 행 없는 재동기화: 레코드·큐브 재사용 -> {'✅ 통과' if reused else '❌ 재구성됨'}")
+
+log_ws.rows.append([str(ROWS[2000].get(h, "")) for h in LOG_HEADERS])
+grown = sheets._load_all_records()
+rebuilt = grown is not first and len(grown) == len(first) + 1 and get_analytics_cube(grown) is not cube
+failures += 0 if rebuilt else 1
+print(f"새 행 1건 추가: 레코드·큐브 갱신 -> {'✅ 통과' if rebuilt else '❌ 갱신되지 않음'}")
+
+print("=" * 60)
+print("🎉 모든 결과가 동일합니다!" if failures == 0 else f"❌ {failures}개 케이스 불일치")
+print("=" * 60)
+sys.exit(1 if failures else 0)
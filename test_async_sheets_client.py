@@ -0,0 +1,258 @@
+import sys
+import os
+import json
+import types
+import asyncio
+import tempfile
+from urllib.parse import unquote
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+
+import gspread
+import httpx
+from app.adapters.sheets import async_client
+from app.adapters.sheets.async_client import AsyncSheetsClient, is_missing_sheet_error, records_from_values
+from app.adapters.sheets.governor import sheets_governor
+
+# 비동기 시트 클라이언트 테스트:
+# httpx MockTransport로 가짜 Sheets API를 띄워 요청 형식, gspread와 같은 결과 형태, 토큰 갱신,
+# 오류 변환, 그리고 거버너 재시도 규칙(읽기는 5xx 재시도, 쓰기는 429/503만)을 네트워크 없이 확인한다.
+
+sheets_governor.backoff = 0.01
+sheets_governor.max_backoff = 0.02
+
+
+class FakeCredentials:
+    """oauth2client ServiceAccountCredentials 대체: 발급 횟수를 센다."""
+
+    def __init__(self):
+        self.issued = 0
+
+    def get_access_token(self):
+        self.issued += 1
+        return types.SimpleNamespace(access_token=f"token-{self.issued}", expires_in=3600)
+
+
+class FakeSheetsAPI:
+    """values get / batchGet / batchUpdate / append 요청을 기록하고, scripted 응답 코드를 먼저 돌려준다."""
+
+    def __init__(self, values):
+        self.values = values  # {title: rows}
+        self.requests = []
+        self.script = []  # 다음 요청들에 돌려줄 상태 코드
+        self.appended = []
+
+    def _error(self, code, message="error"):
+        return httpx.Response(code, json={"error": {"code": code, "message": message, "status": "ERROR"}})
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = unquote(request.url.path)
+        self.requests.append((request.method, path, request.headers.get("Authorization")))
+        if self.script:
+            code = self.script.pop(0)
+            if code == "timeout":
+                raise httpx.ReadTimeout("read timed out", request=request)
+            if code == 401:
+                return self._error(401, "Request had invalid authentication credentials.")
+            if request.method == "POST" and path.endswith(":append") and code >= 500:
+                self.appended.append(json.loads(request.content)["values"])  # 반영된 뒤 응답만 실패
+            return self._error(code)
+        if path.endswith("/values:batchGet"):
+            ranges = request.url.params.get_list("ranges")
+            return httpx.Response(200, json={"valueRanges": [{"range": r, "values": self.values.get(r.split("!")[0].strip("'"), [])}
+                                                             for r in ranges]})
+        if path.endswith("/values:batchUpdate"):
+            body = json.loads(request.content)
+            return httpx.Response(200, json={"totalUpdatedCells": len(body["data"]), "valueInputOption": body["valueInputOption"]})
+        if path.endswith(":append"):
+            self.appended.append(json.loads(request.content)["values"])
+            return httpx.Response(200, json={"updates": {"updatedRows": len(self.appended[-1])}})
+        title = path.rsplit("/values/", 1)[1].split("!")[0].strip("'")
+        if title not in self.values:
+            return self._error(400, f"Unable to parse range: '{title}'")
+        return httpx.Response(200, json={"range": title, "values": self.values[title]})
+
+
+def new_client(api):
+    client = AsyncSheetsClient(FakeCredentials(), "sheet-id")
+    client._http = httpx.AsyncClient(base_url="https://sheets.googleapis.com/v4/spreadsheets/sheet-id",
+                                     transport=httpx.MockTransport(api.handler))
+    return client
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+VALUES = {
+    "TierStatus": [["학생코드", "이름", "점수"], ["2101", "가나", "3"], ["2102", "다라"]],
+    "Dup": [["코드", "", "코드", "비고"], ["1", "x", "2", "메모"]],
+}
+
+print("=" * 60)
+print("🧪 비동기 시트 클라이언트 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. get_all_values/get_all_records: gspread Worksheet와 같은 형태 (짧은 행 패딩, 숫자 변환)
+api = FakeSheetsAPI(VALUES)
+
+
+async def case_reads():
+    client = new_client(api)
+    try:
+        return await client.get_all_values("TierStatus"), await client.get_all_records("TierStatus")
+    finally:
+        await client.aclose()
+
+
+values, records = run(case_reads())
+check("1. gspread와 같은 결과 형태",
+      values == [["학생코드", "이름", "점수"], ["2101", "가나", "3"], ["2102", "다라", ""]]
+      and records == [{"학생코드": 2101, "이름": "가나", "점수": 3}, {"학생코드": 2102, "이름": "다라", "점수": ""}])
+
+# 2. 토큰은 한 번 발급해 재사용, 모든 요청에 Bearer 헤더
+check("2. 액세스 토큰 재사용", [r[2] for r in api.requests] == ["Bearer token-1"] * 2)
+
+# 3. batchGet: 요청 순서대로 ValueRange 1회 요청, 빈 목록은 요청 없음
+api = FakeSheetsAPI(VALUES)
+
+
+async def case_batch_get():
+    client = new_client(api)
+    try:
+        return await client.values_batch_get(["TierStatus!A1:C", "Dup!A1:D"]), await client.values_batch_get([])
+    finally:
+        await client.aclose()
+
+
+ranges, empty = run(case_batch_get())
+check("3. batchGet 1회 + 순서 유지",
+      [r["range"] for r in ranges] == ["TierStatus!A1:C", "Dup!A1:D"] and empty == [] and len(api.requests) == 1)
+
+# 4. 401: 토큰을 한 번 새로 받아 재요청
+api = FakeSheetsAPI(VALUES)
+api.script = [401]
+
+
+async def case_reauth():
+    client = new_client(api)
+    try:
+        return await client.get_all_values("TierStatus"), client.credentials.issued
+    finally:
+        await client.aclose()
+
+
+values, issued = run(case_reauth())
+check("4. 401 후 토큰 갱신 재요청", issued == 2 and values[1][0] == "2101"
+      and [r[2] for r in api.requests] == ["Bearer token-1", "Bearer token-2"])
+
+# 5. 동시 요청은 토큰 발급 1회를 공유
+api = FakeSheetsAPI(VALUES)
+
+
+async def case_concurrent():
+    client = new_client(api)
+    try:
+        await asyncio.gather(*(client.get_all_values("TierStatus") for _ in range(10)))
+        return client.credentials.issued
+    finally:
+        await client.aclose()
+
+
+check("5. 동시 요청 토큰 발급 1회", run(case_concurrent()) == 1 and len(api.requests) == 10)
+
+# 6. 없는 워크시트: gspread APIError(400)로 변환, is_missing_sheet_error로 판별 (재시도 없음)
+api = FakeSheetsAPI(VALUES)
+
+
+async def case_missing():
+    client = new_client(api)
+    try:
+        await client.get_all_values("NoSuchSheet")
+    except gspread.exceptions.APIError as e:
+        return e
+    finally:
+        await client.aclose()
+
+
+error = run(case_missing())
+check("6. 없는 시트 오류 변환", error is not None and error.code == 400 and is_missing_sheet_error(error)
+      and len(api.requests) == 1)
+
+# 7. 읽기는 5xx·타임아웃을 재시도
+api = FakeSheetsAPI(VALUES)
+api.script = [500, "timeout", 503]
+retries_before = sheets_governor.retries
+
+
+async def case_read_retry():
+    client = new_client(api)
+    try:
+        return await client.get_all_values("TierStatus")
+    finally:
+        await client.aclose()
+
+
+values = run(case_read_retry())
+check("7. 읽기 5xx/타임아웃 재시도", values[1][0] == "2101" and len(api.requests) == 4
+      and sheets_governor.retries - retries_before == 3)
+
+# 8. 쓰기: 429는 재전송, 500은 재전송하지 않음 (append 중복 방지)
+api = FakeSheetsAPI(VALUES)
+api.script = [429]
+
+
+async def case_write(rows):
+    client = new_client(api)
+    try:
+        return await client.values_append("TokenLog!A1", rows)
+    except gspread.exceptions.APIError as e:
+        return e
+    finally:
+        await client.aclose()
+
+
+result = run(case_write([["a"]]))
+rejected_ok = isinstance(result, dict) and api.appended == [[["a"]]] and len(api.requests) == 2
+api = FakeSheetsAPI(VALUES)
+api.script = [500]
+result = run(case_write([["b"]]))
+check("8. 쓰기 429만 재전송, 500은 미재전송",
+      rejected_ok and isinstance(result, gspread.exceptions.APIError) and result.code == 500
+      and api.appended == [[["b"]]] and len(api.requests) == 1)
+
+# 9. batchUpdate 요청 본문
+api = FakeSheetsAPI(VALUES)
+
+
+async def case_batch_update():
+    client = new_client(api)
+    try:
+        return await client.values_batch_update([{"range": "A1", "values": [["x"]]}], value_input_option="USER_ENTERED")
+    finally:
+        await client.aclose()
+
+
+check("9. batchUpdate 본문", run(case_batch_update()) == {"totalUpdatedCells": 1, "valueInputOption": "USER_ENTERED"})
+
+# 10. 중복 헤더 시트는 safe_get_all_records와 같은 문자열 dict
+check("10. 중복 헤더 레코드", records_from_values(VALUES["Dup"]) == [{"코드": "2", "비고": "메모"}])
+
+# 11. 실행 중인 이벤트 루프 밖에서는 None (gspread 경로로 대체)
+check("11. 루프 밖에서는 None", async_client.get_async_sheets_client() is None)
+
+print("=" * 60)
+print("🎉 모든 비동기 클라이언트 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
@@ -0,0 +1,155 @@
+import sys
+import os
+import asyncio
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+os.environ.setdefault("CACHE_SNAPSHOTS_ENABLED", "false")
+
+from app.adapters.sheets import batch_loader
+from app.adapters.sheets.batch_loader import RangeLoad, batch_load, abatch_load
+from app.adapters.sheets.client import get_cached, invalidate_cache
+
+# 다중 범위 batchGet 로더 테스트:
+# 가짜 스프레드시트로 여러 캐시 항목을 values.batchGet 한 번에 채우는지, 같은 범위는 한 번만 요청하는지,
+# 없는 워크시트는 요청에서 빼고 None으로 넘기는지, 캐시된 항목은 건너뛰는지, 일괄 읽기가 실패하면
+# 항목별 로더로 돌아가는지를 시트 접근 없이 확인한다.
+
+
+class FakeWorksheet:
+    def __init__(self, title):
+        self.title = title
+
+
+class FakeSpreadsheet:
+    """worksheets()와 values_batch_get()만 흉내 내고 요청한 범위를 기록한다."""
+
+    def __init__(self, values):
+        self.values = values  # {title: rows}
+        self.batch_calls = []
+        self.fail = None
+
+    def worksheets(self):
+        return [FakeWorksheet(t) for t in self.values]
+
+    def values_batch_get(self, ranges):
+        self.batch_calls.append(list(ranges))
+        if self.fail:
+            raise self.fail
+        return {"valueRanges": [{"range": r, "values": self.values[r.split("!")[0].strip("'")]} for r in ranges]}
+
+
+class FakeAsyncClient:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    async def values_batch_get(self, ranges):
+        return self.spreadsheet.values_batch_get(ranges)["valueRanges"]
+
+
+sheet = FakeSpreadsheet({
+    "TierStatus": [["학생코드", "Tier"], ["2101", "2"]],
+    "Users": [["ID", "Role"], ["admin", "admin"]],
+    "Board": [["제목"], ["공지"]],
+})
+batch_loader.get_spreadsheet = lambda: sheet
+batch_loader.get_async_sheets_client = lambda: None
+
+loader_calls = []
+
+
+def values_of(value_ranges):
+    return [None if v is None else v.get("values", []) for v in value_ranges]
+
+
+def make_load(key, ranges, **kwargs):
+    def loader():
+        loader_calls.append(key)
+        return [f"{key} 개별 로드"]
+    return RangeLoad(key, ranges, build=values_of, loader=loader, ttl=60, **kwargs)
+
+
+def loads():
+    return [
+        make_load("test:batch:tier", [("TierStatus", None)]),
+        make_load("test:batch:users", [("Users", "A1:B"), ("TierStatus", None)]),
+        make_load("test:batch:missing", [("NoSuchSheet", None), ("Board", "A:A")]),
+    ]
+
+
+def reset():
+    invalidate_cache("test:batch")
+    sheet.batch_calls.clear()
+    sheet.fail = None
+    loader_calls.clear()
+
+
+print("=" * 60)
+print("🧪 batchGet 로더 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 여러 항목을 batchGet 1회로: 같은 범위는 한 번만, 없는 워크시트는 요청에서 빼고 None
+reset()
+results = batch_load(loads())
+check("1. 한 번의 batchGet으로 채움",
+      sheet.batch_calls == [["'TierStatus'", "'Users'!A1:B", "'Board'!A:A"]] and loader_calls == []
+      and results["test:batch:tier"] == [[["학생코드", "Tier"], ["2101", "2"]]]
+      and results["test:batch:users"][0] == [["ID", "Role"], ["admin", "admin"]]
+      and results["test:batch:missing"] == [None, [["제목"], ["공지"]]])
+
+# 2. 결과는 각 키의 캐시에 저장
+check("2. 키별 캐시 저장", get_cached("test:batch:users") is results["test:batch:users"])
+
+# 3. 이미 메모리에 있는 항목은 요청하지 않음 (모두 있으면 batchGet 없음)
+sheet.batch_calls.clear()
+invalidate_cache("test:batch:users")
+again = batch_load(loads())
+all_cached = batch_load(loads())
+check("3. 캐시된 항목 건너뜀", sheet.batch_calls == [["'Users'!A1:B", "'TierStatus'"]]
+      and again["test:batch:tier"] is results["test:batch:tier"] and all_cached == again)
+
+# 4. force: 캐시가 있어도 다시 읽음
+sheet.batch_calls.clear()
+batch_load(loads(), force=True)
+check("4. force 재적재", len(sheet.batch_calls) == 1 and len(sheet.batch_calls[0]) == 3)
+
+# 5. 일괄 읽기 실패 시 각 항목의 로더로 대체
+reset()
+sheet.fail = RuntimeError("quota")
+results = batch_load(loads())
+check("5. 실패 시 개별 로더", sorted(loader_calls) == ["test:batch:missing", "test:batch:tier", "test:batch:users"]
+      and results["test:batch:tier"] == ["test:batch:tier 개별 로드"])
+
+# 6. cache_if가 거절한 값은 저장하지 않음 (빈 시트 등)
+reset()
+batch_load([make_load("test:batch:empty", [("NoSuchSheet", None)], cache_if=lambda v: v != [None])])
+check("6. cache_if 거절 시 미저장", get_cached("test:batch:empty") is None and sheet.batch_calls == [])
+
+# 7. abatch_load: 비동기 클라이언트의 batchGet 1회, 같은 결과 형태
+reset()
+batch_loader.get_async_sheets_client = lambda: FakeAsyncClient(sheet)
+results = asyncio.run(abatch_load(loads()))
+check("7. 비동기 batchGet", sheet.batch_calls == [["'TierStatus'", "'Users'!A1:B", "'Board'!A:A"]]
+      and results["test:batch:missing"] == [None, [["제목"], ["공지"]]] and loader_calls == [])
+
+# 8. 비동기 클라이언트가 없으면 동기 batch_load로 대체
+reset()
+batch_loader.get_async_sheets_client = lambda: None
+results = asyncio.run(abatch_load(loads()))
+check("8. 비동기 클라이언트 없음", len(sheet.batch_calls) == 1 and results["test:batch:tier"][0][1] == ["2101", "2"])
+
+print("=" * 60)
+print("🎉 모든 batchGet 로더 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
@@ -0,0 +1,164 @@
+import sys
+import os
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+os.environ.setdefault("CACHE_SNAPSHOTS_ENABLED", "false")
+
+import gspread
+from gspread.utils import a1_to_rowcol
+from app.services import sheets
+from app.adapters.sheets.write_queue import SheetWriteQueue
+
+# 월별 CICO 셀 일괄 수정 테스트:
+# 가짜 월 시트로 캐시된 그리드 대비 변경분만 쓰는지, 수행/발생률·달성 여부 재계산, 캐시 그리드를
+# 제자리 수정하지 않고 복사본으로 교체하는지, 쓰기 실패 시 낙관적 반영을 되돌리는지 확인한다.
+
+
+class _Resp:
+    status_code = 400
+    text = ""
+    headers = {}
+
+    def json(self):
+        return {"error": {"code": 400, "message": "bad request", "status": "INVALID_ARGUMENT"}}
+
+
+HEADERS = ["학생명(코드)", "목표행동 유형", "목표 달성 기준", "1", "2", "3", "4", "수행/발생률", "목표 달성 여부"]
+
+
+class FakeMonthWorksheet:
+    """batch_update만 흉내 내고 호출을 기록한다."""
+
+    def __init__(self, title, values):
+        self.title = title
+        self.values = [list(r) for r in values]
+        self.calls = []
+        self.fail_next_write = None
+
+    def batch_update(self, data, value_input_option="RAW"):
+        self.calls.append(sorted((d["range"], d["values"][0][0]) for d in data))
+        if self.fail_next_write:
+            err, self.fail_next_write = self.fail_next_write, None
+            raise err
+        for d in data:
+            r, c = a1_to_rowcol(d["range"])
+            self.values[r - 1][c - 1] = sheets._sheet_cell_text(d["values"][0][0])
+
+
+MONTH = 3
+ws = FakeMonthWorksheet(f"{MONTH}월", [
+    HEADERS,
+    ["가나(2101)", "증가 목표행동", "80% 이상", "O", "O", "", "", "100%", "O"],
+    ["다라(2102)", "감소 목표행동", "20% 이하", "X", "", "", "", "0%", "O"],
+])
+loads = {"raw": 0, "grid": 0}
+
+
+def load_raw(month):
+    loads["raw"] += 1
+    return [list(r) for r in ws.values]
+
+
+def load_grid(month):
+    loads["grid"] += 1
+    return {"students": []}
+
+
+sheets.get_sheets_client = lambda: object()
+sheets.settings.SHEET_URL = "https://docs.google.com/spreadsheets/d/test/edit"
+sheets.get_spreadsheet = lambda: object()
+sheets.get_worksheet_fuzzy = lambda sheet, name: ws if name == ws.title else None
+sheets._load_cico_raw_values = load_raw
+sheets._load_monthly_cico_data = load_grid
+
+year = sheets.now_kst().year
+RAW_KEY = f"sheet:cico:raw:{year}:{MONTH:02d}"
+GRID_KEY = f"sheet:cico:{year}:{MONTH:02d}"
+
+
+def cached_raw():
+    return sheets.get_cached(RAW_KEY, ttl=sheets._cico_cache_ttl(MONTH))
+
+
+def use_queue(**kwargs):
+    kwargs.setdefault("debounce", 60)
+    kwargs.setdefault("max_delay", 60)
+    kwargs.setdefault("backoff", 0.01)
+    sheets.sheet_write_queue = SheetWriteQueue(**kwargs)
+    return sheets.sheet_write_queue
+
+
+print("=" * 60)
+print("🧪 월별 CICO 셀 수정 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 캐시된 값과 같은 쓰기는 버림 (시트 호출 없음)
+q = use_queue()
+r = sheets.update_monthly_cico_cells(MONTH, [{"row": 2, "col": "1", "value": "O"}])
+check("1. 변경 없는 쓰기 생략", r.get("message") == "0 cells updated" and q.depth() == 0 and ws.calls == [])
+
+# 2. 변경 셀 + 재계산된 수행률·달성 여부를 한 번의 batch_update로 (같은 셀은 마지막 값)
+old_grid = cached_raw()
+old_snapshot = [list(row) for row in old_grid]
+sheets.set_cached(GRID_KEY, {"students": ["stale"]}, ttl=60)
+r = sheets.update_monthly_cico_cells(MONTH, [{"col": "3", "value": "O"}, {"col": "3", "value": "X"}],
+                                     student_code_override="2101")
+q.flush()
+check("2. 변경분 + 재계산 1회 전송",
+      r.get("message") == "3 cells updated"
+      and ws.calls == [[("F2", "X"), ("H2", "66%"), ("I2", "X")]])
+
+# 3. 캐시 그리드는 제자리 수정하지 않고 복사본으로 교체, 월 그리드는 요청 안에서 재구성하지 않음
+check("3. 복사 후 교체 + 그리드 무효화",
+      old_grid == old_snapshot and loads["grid"] == 0 and sheets.get_cached(GRID_KEY) is None)
+
+# 4. 쓰기가 반영되면 원본 그리드를 버려 다음 조회는 시트에서 (반영된 값 확인)
+raw_loads = loads["raw"]
+check("4. 반영 후 재조회", cached_raw() is None and sheets.get_cico_raw_sheet_values(MONTH)[1][5] == "X"
+      and loads["raw"] == raw_loads + 1)
+
+# 5. 쓰기 전 조회는 패치된 복사본을 봄 (디바운스 중)
+ws.calls.clear()
+r = sheets.update_monthly_cico_cells(MONTH, [{"row": 3, "col": "2", "value": "X"}])
+patched = cached_raw()
+check("5. 대기 중 패치된 값 제공 + 감소 목표 재계산",
+      r.get("message") == "3 cells updated" and patched[2][4] == "X" and patched[2][7] == "100%"
+      and patched[2][8] == "X" and ws.calls == [] and q.depth() == 3)
+q.flush()
+
+# 6. 큐 활성 상태에서 나중에 실패: 낙관적 반영 되돌림 (캐시 폐기)
+sheets.get_cico_raw_sheet_values(MONTH)
+ws.fail_next_write = gspread.exceptions.APIError(_Resp())
+r = sheets.update_monthly_cico_cells(MONTH, [{"row": 2, "col": "4", "value": "O"}])
+had_patch = cached_raw()[1][6] == "O"
+q.flush()
+check("6. 지연 실패 시 되돌림", "error" not in r and had_patch and cached_raw() is None and ws.values[1][6] == "")
+
+# 7. 큐 비활성(즉시 전송)에서 실패: 오류 반환 + 되돌림
+use_queue(enabled=False)
+sheets.get_cico_raw_sheet_values(MONTH)
+ws.fail_next_write = gspread.exceptions.APIError(_Resp())
+r = sheets.update_monthly_cico_cells(MONTH, [{"row": 2, "col": "4", "value": "O"}])
+check("7. 즉시 전송 실패 시 error 반환", "error" in r and cached_raw() is None and ws.values[1][6] == "")
+
+# 8. 알 수 없는 열·행은 건너뜀
+r = sheets.update_monthly_cico_cells(MONTH, [{"row": 2, "col": "없는열", "value": "O"},
+                                             {"col": "1", "value": "X"}], student_code_override="9999")
+check("8. 알 수 없는 열/행 생략", r.get("message") == "0 cells updated")
+
+print("=" * 60)
+print("🎉 모든 CICO 셀 수정 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
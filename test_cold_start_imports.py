@@ -0,0 +1,104 @@
+import sys
+import os
+import json
+import re
+import subprocess
+import statistics
+
+# 콜드 스타트 벤치마크:
+# `python -X importtime -c "import app.main"` 결과를 패키지별로 집계해 시작 시간 리포트를 출력하고,
+# 가벼운 엔드포인트(/health, /api/v1/auth/me)가 pandas 등 무거운 모듈 없이 응답하는지 검사한다.
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend")
+RUNS = 5
+TOP_N = 15
+
+# import app.main 만으로는 로드되면 안 되는 모듈 (첫 사용 시점에 지연 로드)
+HEAVY_AT_IMPORT = ["pandas", "numpy", "gspread", "oauth2client", "argon2", "httpx", "app.services.sheets"]
+# 가벼운 엔드포인트 첫 요청 후에도 로드되면 안 되는 모듈
+HEAVY_AT_LIGHT_REQUEST = ["pandas", "numpy", "argon2"]
+
+LIGHT_REQUEST_PROBE = """
+import sys, json
+from fastapi.testclient import TestClient
+import app.main
+client = TestClient(app.main.app)
+statuses = {path: client.get(path).status_code for path in ("/health", "/api/health", "/api/v1/auth/me")}
+print(json.dumps({"statuses": statuses, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_AT_LIGHT_REQUEST,)
+
+IMPORT_PROBE = """
+import sys, json
+import app.main
+print(json.dumps([m for m in %r if m in sys.modules]))
+""" % (HEAVY_AT_IMPORT,)
+
+
+def _run(args, env_extra=None):
+    env = dict(os.environ, PYTHONPATH=BACKEND_DIR)
+    env.update(env_extra or {})
+    return subprocess.run([sys.executable] + args, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+
+
+def importtime_report():
+    """(total_us, {top-level package: cumulative_us}, [(self_us, module)]) of one cold `import app.main`."""
+    proc = _run(["-X", "importtime", "-c", "import app.main"])
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        raise SystemExit("import app.main 실패")
+    by_package = {}
+    self_times = []
+    total = 0
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if not m:
+            continue
+        self_us, cumulative_us, indent, module = int(m.group(1)), int(m.group(2)), len(m.group(3)), m.group(4)
+        self_times.append((self_us, module))
+        top = module.split(".")[0] if module.split(".")[0] != "app" else ".".join(module.split(".")[:3])
+        by_package[top] = by_package.get(top, 0) + self_us
+        if indent == 1:
+            total += cumulative_us
+    return total, by_package, sorted(self_times, reverse=True)
+
+
+print("=" * 60)
+print("🧪 콜드 스타트 import 벤치마크 (import app.main)")
+print("=" * 60)
+
+totals = []
+report = None
+for _ in range(RUNS):
+    total, by_package, self_times = importtime_report()
+    totals.append(total)
+    report = (by_package, self_times)
+
+print(f"import app.main: 중앙값 {statistics.median(totals) / 1000:.1f}ms "
+      f"(최소 {min(totals) / 1000:.1f}ms / 최대 {max(totals) / 1000:.1f}ms, {RUNS}회)")
+
+by_package, self_times = report
+print(f"\n[패키지별 자체 import 시간 상위 {TOP_N}]")
+for name, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:TOP_N]:
+    print(f"  {us / 1000:8.1f}ms  {name}")
+print(f"\n[모듈별 자체 import 시간 상위 {TOP_N}]")
+for us, name in self_times[:TOP_N]:
+    print(f"  {us / 1000:8.1f}ms  {name}")
+
+failures = 0
+
+loaded = json.loads(_run(["-c", IMPORT_PROBE]).stdout.strip().splitlines()[-1])
+print(f"\nimport 직후 무거운 모듈: {loaded or '없음'} -> {'✅' if not loaded else '❌'}")
+failures += 1 if loaded else 0
+
+# 인증 정보가 없어도 /auth/me 는 401 로 응답해야 한다 (시트 접근 없이)
+probe = _run(["-c", LIGHT_REQUEST_PROBE], {"GOOGLE_SERVICE_ACCOUNT_JSON": ""})
+result = json.loads(probe.stdout.strip().splitlines()[-1])
+light_ok = not result["loaded"]
+print(f"가벼운 엔드포인트 응답: {result['statuses']}")
+print(f"가벼운 엔드포인트 첫 요청 후 무거운 모듈: {result['loaded'] or '없음'} -> {'✅' if light_ok else '❌'}")
+failures += 0 if light_ok else 1
+
+print("=" * 60)
+print("🎉 콜드 스타트 경로에 무거운 모듈이 없습니다!" if failures == 0 else f"❌ {failures}개 검사 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
@@ -0,0 +1,145 @@
+import sys
+import os
+import random
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+
+import numpy as np
+from app.services import sheets
+from app.services import event_index
+from app.services.event_index import get_event_index, get_beable_code
+from app.services.sheets import normalize_date_string
+
+# EventIndex(날짜·학생코드·이름·학급 색인) 테스트:
+# 무작위 Log_Main 행(빈 날짜, 여러 날짜 형식, 앞뒤 공백, 이름만 있는 행 포함)에 대해 색인 조회 결과가
+# 색인 도입 전의 전체 순회 필터와 같은 행을 같은 순서로 돌려주는지 비교한다.
+
+random.seed(13)
+
+NAMES = ["가나", "다라", " 마바 ", "사아", "자차"]
+CODES = ["2101", "2102", " 2103", "", "3201"]
+DATES = ["2026. 3. {d}.", "2026-03-{d:02d}", "2026/4/{d}", "", "날짜모름", "2025. 12. {d}."]
+
+
+def raw_row(i):
+    student = random.randrange(len(NAMES))
+    return {
+        "학생명": NAMES[student],
+        "학생코드": CODES[student],
+        "행동발생날짜": random.choice(DATES).format(d=random.randint(1, 28)),
+        "시간대": random.choice(["1교시", "점심"]),
+        "장소": random.choice(["교실", "복도"]),
+        "행동유형": random.choice(["공격행동", "이탈"]),
+        "강도": random.randint(1, 5),
+        "Log_ID": f"L{i:04d}",
+    }
+
+
+records = [sheets._map_log_row(raw_row(i), "Log_Main", i)[1] for i in range(600)]
+index = get_event_index(records)
+
+# 색인 도입 전 필터 (analytics._filter_by_date, bip._filter_student_logs, 학급 필터, 이름 부분 일치)
+
+
+def scan_dates(start, end):
+    sd, ed = normalize_date_string(start), normalize_date_string(end)
+    out = []
+    for i, r in enumerate(records):
+        rd = normalize_date_string(r.get("date", r.get("행동발생날짜", r.get("발생날짜", r.get("행동발생 날짜", "")))))
+        if rd and sd <= rd <= ed:
+            out.append(i)
+    return out
+
+
+def scan_keys(codes):
+    out = []
+    for i, r in enumerate(records):
+        sc = str(r.get("student_code", r.get("학생코드", r.get("코드번호", "")))).strip()
+        name = str(r.get("student_name", r.get("학생명", ""))).strip()
+        if sc in codes or name in codes:
+            out.append(i)
+    return out
+
+
+CLASS_OF = {"2101": "2-1", "2102": "2-1", "2103": "2-2", "3201": "3-2"}
+
+
+def class_of(code):
+    return CLASS_OF.get(code)
+
+
+def scan_class(class_code):
+    return [i for i, r in enumerate(records) if class_of(str(r.get("학생코드", "")).strip()) == class_code]
+
+
+print("=" * 60)
+print("🧪 EventIndex 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 날짜 범위: 전체 순회와 같은 행, 같은 순서 (빈 날짜·해석 불가 날짜는 제외)
+ranges = [("2026-03-01", "2026-03-31"), ("2026. 3. 10.", "2026/4/5"), ("2025-01-01", "2027-01-01"),
+          ("2026-05-01", "2026-06-01"), ("2026-03-15", "2026-03-15")]
+check("1. 날짜 범위 동일", all(list(index.rows_in_date_range(normalize_date_string(s), normalize_date_string(e)))
+                              == scan_dates(s, e) for s, e in ranges))
+
+# 2. 학생코드·이름 키: 공백을 제거한 값 기준, 코드와 이름이 같은 행을 가리키면 한 번만
+key_sets = [{"2101"}, {"2103"}, {"마바"}, {"2101", "가나"}, {"다라", "3201", "없는학생"}, {"없는학생"}]
+check("2. 학생 키 조회 동일", all(list(index.rows_for_keys(keys)) == scan_keys(keys) for keys in key_sets))
+
+# 3. 단일 코드 조회
+check("3. 학생코드 조회 동일", list(index.rows_for_code(" 2102 ")) == scan_keys({"2102"}))
+
+# 4. 학급: TierStatus 학급 매핑으로 학생코드를 거쳐 조회
+check("4. 학급 조회 동일", all(list(index.rows_for_class(c, class_of)) == scan_class(c)
+                              for c in ("2-1", "2-2", "3-2", "9-9")))
+
+# 5. 이름 부분 일치: 고유값마다 한 번 평가해도 행 단위 순회와 같음
+matched = list(index.rows_matching("학생명", lambda s: s.str.contains("마", na=False)))
+check("5. 부분 일치 동일", matched == [i for i, r in enumerate(records) if "마" in r["학생명"]])
+
+# 6. 결과 레코드는 원본 리스트의 같은 객체, 같은 레코드 리스트면 같은 색인
+rows = index.rows_for_keys({"가나"})
+check("6. 레코드 재사용", all(a is records[i] for a, i in zip(index.records_at(records, rows), rows))
+      and get_event_index(records) is index and get_event_index(list(records)) is not index)
+
+# 7. 빈 결과는 빈 정수 배열
+empty = index.rows_in_date_range("2030-01-01", "2030-12-31")
+check("7. 빈 결과", len(empty) == 0 and empty.dtype == np.intp and len(index.rows_for_keys([])) == 0)
+
+# 8. BeAble 코드 역조회: 첫 번째 매핑 키, TierStatus가 다시 적재되면 재구성
+mapping = {"B01": {"student_code": "2101"}, "B02": {"student_code": " 2102 "}, "B03": {"student_code": "2101"}}
+status = [{"학생코드": "2101"}]
+sheets.fetch_student_status = lambda: status
+sheets.get_beable_code_mapping = lambda: mapping
+
+
+def scan_beable(target):
+    for bc, info in mapping.items():
+        if str(info.get('student_code', '')).strip() == target:
+            return bc
+    return ""
+
+
+same = all(get_beable_code(c) == scan_beable(c) for c in ("2101", "2102", "9999"))
+mapping = {"B09": {"student_code": "2101"}}
+stale = get_beable_code("2101")
+status = [{"학생코드": "2101"}]
+check("8. BeAble 역조회", same and stale == "B01" and get_beable_code("2101") == "B09"
+      and event_index._beable_source is status)
+
+print("=" * 60)
+print("🎉 모든 EventIndex 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
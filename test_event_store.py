@@ -0,0 +1,147 @@
+import sys
+import os
+import re
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+os.environ.setdefault("CACHE_SNAPSHOTS_ENABLED", "false")
+
+from app.services import sheets
+from app.services.event_store import NormalizedLogCache, fetch_log_events
+from app.services.normalize import normalize_behavior_log
+from app.adapters.sheets.log_main import LogMainAdapter
+
+# Log_Main 단일 이벤트 저장소 테스트:
+# 정규화 메모(NormalizedLogCache)가 normalize_behavior_log와 같은 결과를 주고 한도에서 비워지는지,
+# fetch_log_events()가 공유 수집 상태의 대기 행(pending_events)만 한 번씩 BehaviorEvent로 바꾸는지 확인한다.
+
+
+def raw(i, name="가나", code="2101"):
+    return {"학생명": name, "학생코드": code, "행동발생날짜": f"2026-03-{i % 28 + 1:02d}", "시간대": "1교시",
+            "장소": "교실", "행동유형": "공격행동", "강도": str(i % 5 + 1), "추정기능": "회피",
+            "특기사항": f"메모 {i}", "타임스탬프": "2026. 3. 2. 오전 9:00:00"}
+
+
+class FakeLogWorksheet:
+    """get_all_values()/batch_get()만 흉내 낸다."""
+
+    def __init__(self, title, rows):
+        self.title = title
+        self.rows = [list(r) for r in rows]
+
+    def get_all_values(self):
+        return [list(r) for r in self.rows]
+
+    def batch_get(self, ranges):
+        out = []
+        for rng in ranges:
+            if rng == "1:1":
+                out.append([list(self.rows[0])])
+            else:
+                start = int(re.findall(r"\d+", rng)[0])
+                out.append([list(r) for r in self.rows[start - 1:]])
+        return out
+
+
+class FakeSpreadsheet:
+    def __init__(self, *worksheets):
+        self.list = list(worksheets)
+
+    def worksheets(self):
+        return self.list
+
+
+HEADERS = ["타임스탬프", "학생명", "학생코드", "행동발생날짜", "시간대", "장소", "행동유형", "강도", "Log_ID"]
+
+
+def log_row(i):
+    return ["2026. 3. 2. 오전 9:00:00", "가나", "2101", f"2026. 3. {i % 28 + 1}.", "1교시", "교실", "공격행동",
+            str(i % 5 + 1), f"L{i:04d}"]
+
+
+log_ws = FakeLogWorksheet("Log_Main", [HEADERS] + [log_row(i) for i in range(1, 11)])
+sheets.get_sheets_client = lambda: object()
+sheets.get_spreadsheet = lambda: FakeSpreadsheet(log_ws)
+sheets.get_beable_code_mapping = lambda: {}
+
+normalized_rows = []
+original_normalize = LogMainAdapter._normalize_row.__func__
+
+
+def counting_normalize(cls, row, row_idx):
+    normalized_rows.append(row_idx)
+    return original_normalize(cls, row, row_idx)
+
+
+LogMainAdapter._normalize_row = classmethod(counting_normalize)
+
+
+def ingest_state():
+    state = sheets.get_cached(sheets.CACHE_KEY_LOG_INGEST, ttl=sheets.LOG_FULL_RESYNC_SECONDS)
+    return state["sheets"]["Log_Main"]
+
+
+print("=" * 60)
+print("🧪 Log_Main 이벤트 저장소 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 메모 결과는 normalize_behavior_log와 동일 (학급·Tier는 호출마다 적용)
+cache = NormalizedLogCache(max_entries=3)
+tier_map = {"2101": {"class": "초3-1", "tier": 2}}
+rows = [raw(1), raw(2), raw(1)]
+check("1. normalize_behavior_log와 동일",
+      cache.normalize(rows, tier_map) == [normalize_behavior_log(r, tier_map) for r in rows]
+      and len(cache._bases) == 2)
+
+# 2. 같은 원자료 필드면 정규화 결과를 공유, 반환 객체는 호출마다 새것
+first, second = cache.normalize([raw(1), raw(1)])
+check("2. 같은 필드 재사용", first == second and first is not second
+      and first["time_slots"] is not second["time_slots"])
+
+# 3. 한도를 넘으면 메모를 비우고 새로 시작 (삭제·수정된 행의 고아 항목 정리)
+cache.normalize([raw(3)])
+full = len(cache._bases)
+cache.normalize([raw(4)])
+check("3. 한도 초과 시 비움", full == 3 and [f[10] for f in cache._bases] == ["메모 4"])
+
+# 4. flush()
+cache.flush()
+check("4. flush", len(cache._bases) == 0)
+
+# 5. fetch_log_events: 첫 조회에서 대기 행 전부를 이벤트로 변환하고 대기열을 비움
+events = fetch_log_events()
+check("5. 첫 조회 시 대기 행 변환", len(events) == 10 and normalized_rows == list(range(2, 12))
+      and ingest_state()["pending_events"] == [])
+
+# 6. 새 행이 들어오지 않으면 다시 변환하지 않음 (반환 리스트는 호출마다 복사본)
+again = fetch_log_events()
+check("6. 재조회 시 변환 없음", len(normalized_rows) == 10 and again == events and again is not events)
+
+# 7. 증분 수집된 행만 대기열에 쌓였다가 다음 조회에서 한 번만 변환
+log_ws.rows += [log_row(i) for i in range(11, 14)]
+sheets.invalidate_cache(sheets.CACHE_KEY_RECORDS)
+events = fetch_log_events()
+check("7. 새 행만 변환", len(events) == 13 and normalized_rows[10:] == [12, 13, 14]
+      and [e.student_code for e in events[-3:]] == ["2101"] * 3)
+
+# 8. Log_Main(과 이전 이름의 시트)이 없으면 None (다른 기록 시트만 있는 경우)
+sheets.get_spreadsheet = lambda: FakeSpreadsheet(FakeLogWorksheet("시트1", [HEADERS, log_row(1)]))
+sheets.invalidate_cache(sheets.CACHE_KEY_RECORDS)
+sheets.invalidate_cache(sheets.CACHE_KEY_LOG_INGEST)
+check("8. Log_Main 없음", fetch_log_events() is None)
+
+print("=" * 60)
+print("🎉 모든 이벤트 저장소 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
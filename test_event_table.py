@@ -0,0 +1,118 @@
+import sys
+import os
+import random
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+
+import numpy as np
+import pandas as pd
+from app.services import sheets
+from app.services.event_table import EventTable, get_event_table
+
+# EventTable(열 단위 이벤트 테이블) 테스트:
+# 가짜 Log_Main 행을 _map_log_row로 변환해 frame()이 pd.DataFrame(records)와 같은지, 행/열 부분집합,
+# 위기 상세 사이드 테이블, 문자열 공유(복사 없음), copy-on-write 뷰 재사용을 확인한다.
+
+random.seed(7)
+
+
+def raw_row(i):
+    # 시트에서 읽은 값처럼 셀마다 별도의 문자열 객체
+    row = {
+        "타임스탬프": f"2026. 3. {i % 28 + 1}. 오전 9:{i % 60:02d}:00",
+        "학생명": "".join(["학생", str(i % 7)]),
+        "학생코드": str(2100 + i % 7),
+        "행동발생날짜": f"2026. {i % 12 + 1}. {i % 28 + 1}.",
+        "시간대": "".join(random.choice(["1교시", "2교시", "점심"])),
+        "장소": "".join(random.choice(["교실", "복도", "운동장"])),
+        "행동유형": "".join(random.choice(["공격행동", "이탈", "자해행동"])),
+        "강도": i % 5 + 1,
+        "기능": random.choice(["관심", "회피", ""]),
+        "특기사항": f"메모 {i}",
+        "Log_ID": f"L{i:04d}",
+    }
+    if i % 50 == 0:
+        row["A_배경_선행사건"] = f"선행사건 {i}"
+        row["1차_경위"] = "경위"
+    return row
+
+
+records = [sheets._map_log_row(raw_row(i), "Log_Main", i)[1] for i in range(400)]
+table = EventTable(records)
+expected = pd.DataFrame(records)
+
+print("=" * 60)
+print("🧪 EventTable 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+def same_frame(a, b):
+    try:
+        pd.testing.assert_frame_equal(a, b)
+        return True
+    except AssertionError as e:
+        print(f"   {e}")
+        return False
+
+
+# 1. frame()은 pd.DataFrame(records)와 동일 (열 순서·dtype·위기 상세 dict 포함)
+check("1. 전체 프레임 동일", same_frame(table.frame(), expected))
+
+# 2. 행 부분집합: 해당 위치만 꺼내고 그 위치가 인덱스 (pd.DataFrame(records).iloc[rows]와 동일)
+rows = np.array([3, 50, 51, 399])
+check("2. 행 부분집합 동일", same_frame(table.frame(rows=rows), expected.iloc[rows]))
+
+# 3. 열 부분집합 (없는 열은 무시)
+check("3. 열 부분집합 동일", same_frame(table.frame(columns=["학생명", "강도", "없는열"]), expected[["학생명", "강도"]]))
+
+# 4. 범주형 열: 행당 int32 코드 + 처음 등장 순서의 고유값
+codes, cats = table.codes("장소"), table.categories("장소")
+check("4. 범주 코드", codes.dtype == np.int32 and list(cats.take(codes)) == [r["장소"] for r in records]
+      and table.is_categorical("학생명") and not table.is_categorical("특기사항"))
+
+# 5. 위기 상세는 일부 행만 사이드 테이블에
+crisis = table.crisis_details(50)
+check("5. 위기 상세 사이드 테이블", len(table.crisis_rows) == 8 and crisis["A_배경_선행사건"] == "선행사건 50"
+      and len(crisis) == len(sheets.LOG_CRISIS_HEADERS) and table.crisis_details(51) is None)
+
+# 6. 문자열 복사 없음: 같은 값의 셀은 하나의 객체를 공유하고, 범주도 그 객체
+check("6. 범주 문자열 공유",
+      all(r["장소"] is next(c for c in cats if c == r["장소"]) for r in records)
+      and len({id(r["행동유형"]) for r in records}) == 3
+      and table.column("특기사항")[10] is records[10]["특기사항"])
+
+# 7. 두 번째 frame()은 디코딩 결과를 재사용 (데이터 공유)
+first, second = table.frame(), table.frame()
+check("7. 프레임 재사용", np.shares_memory(first["장소"].to_numpy(), second["장소"].to_numpy()))
+
+# 8. 호출자가 프레임을 수정해도 다음 호출·원본 레코드에 영향 없음 (copy-on-write)
+first["강도"] = 0
+first.loc[0, "장소"] = "수정됨"
+first["date_obj"] = pd.to_datetime(first["행동발생날짜"], errors="coerce")
+after = table.frame()
+check("8. 수정은 호출자 프레임에만", same_frame(after, expected) and records[0]["장소"] != "수정됨"
+      and "date_obj" not in after.columns)
+
+# 9. get_event_table: 같은 레코드 리스트면 같은 테이블, 새 리스트면 재구성
+check("9. 레코드 리스트 단위 재사용", get_event_table(records) is get_event_table(records)
+      and get_event_table(list(records)) is not get_event_table(records))
+
+# 10. 빈 레코드
+empty = EventTable([])
+check("10. 빈 테이블", len(empty) == 0 and empty.frame().empty)
+
+print("=" * 60)
+print("🎉 모든 EventTable 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
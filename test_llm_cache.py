@@ -0,0 +1,143 @@
+import sys
+import os
+import time
+import types
+import threading
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+
+from app.services import llm_cache
+from app.services.llm_cache import LLMResultCache, LLMResultStore, llm_cache_key, regenerating
+
+# AI 분석 결과 캐시 테스트:
+# 가상 시계로 키(프롬프트·모델·max_tokens 해시), TTL, SQLite 영구 저장(콜드 스타트 적중),
+# regenerating() 플래그, 오류 안내문 미저장, 동시 요청 single-flight를 LLM 호출 없이 확인한다.
+
+
+class FakeClock:
+    """llm_cache 모듈의 time.time()만 대체"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+clock = FakeClock()
+llm_cache.time = types.SimpleNamespace(time=clock.time)
+
+
+def counting(result):
+    """호출 횟수를 세는 generate 함수"""
+    def generate():
+        generate.calls += 1
+        return result
+    generate.calls = 0
+    return generate
+
+
+def cacheable(result):
+    return not result.startswith("⚠️")
+
+
+print("=" * 60)
+print("🧪 AI 결과 캐시 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 키: 네 요소가 모두 같을 때만 같은 키 (프롬프트 한 글자, 모델, max_tokens가 다르면 다른 키)
+base = llm_cache_key("시스템", "학생 2101 근거", "local:gemma", 8192)
+check("1. 캐시 키", base == llm_cache_key("시스템", "학생 2101 근거", "local:gemma", 8192.0)
+      and len({base, llm_cache_key("시스템", "학생 2101 근거 ", "local:gemma", 8192),
+               llm_cache_key("시스템", "학생 2101 근거", "cloud:gemini-2.5-flash", 8192),
+               llm_cache_key("시스템", "학생 2101 근거", "local:gemma", 4096),
+               llm_cache_key("시스템학생", " 2101 근거", "local:gemma", 8192)}) == 5)
+
+# 2. 같은 키는 생성 1회, 이후 메모리에서
+cache = LLMResultCache(ttl=100, max_entries=2)
+gen = counting("보고서 A")
+results = [cache.get_or_generate("k1", gen, cacheable) for _ in range(3)]
+check("2. 생성 1회 후 재사용", results == ["보고서 A"] * 3 and gen.calls == 1 and cache.stats()["hits"] == 2)
+
+# 3. TTL: ttl초가 지나면 다시 생성
+clock.now += 101
+cache.get_or_generate("k1", gen, cacheable)
+check("3. TTL 만료 후 재생성", gen.calls == 2)
+
+# 4. regenerating(): 캐시를 건너뛰고 새 결과로 교체, 블록 밖에서는 새 결과를 재사용
+fresh = counting("보고서 A (새로 생성)")
+with regenerating():
+    regenerated = cache.get_or_generate("k1", fresh, cacheable)
+after = cache.get_or_generate("k1", counting("쓰이면 안 됨"), cacheable)
+with regenerating(False):
+    not_forced = cache.get_or_generate("k1", counting("쓰이면 안 됨"), cacheable)
+check("4. 다시 생성 플래그", regenerated == after == not_forced == "보고서 A (새로 생성)"
+      and fresh.calls == 1 and cache.stats()["regenerated"] == 1)
+
+# 5. 오류 안내문은 저장하지 않음
+error_gen = counting("⚠️ 모든 AI 모델 호출에 실패했습니다.")
+cache.get_or_generate("k-error", error_gen, cacheable)
+cache.get_or_generate("k-error", error_gen, cacheable)
+check("5. 오류 안내문 미저장", error_gen.calls == 2 and cache.peek("k-error") is None)
+
+# 6. 메모리 LRU 한도
+cache.put("k2", "B")
+cache.put("k3", "C")
+check("6. LRU 한도", cache.stats()["entries"] == 2 and cache.peek("k1") is None and cache.peek("k3") == "C")
+
+# 7. 영구 저장: 새 프로세스(새 캐시 객체)에서도 적중, TTL이 지난 행은 정리
+store_dir = tempfile.mkdtemp(prefix="pbst_llm_")
+first = LLMResultCache(ttl=100, store=LLMResultStore(store_dir))
+first.get_or_generate("k-disk", counting("저장된 보고서"), cacheable)
+cold = LLMResultCache(ttl=100, store=LLMResultStore(store_dir))
+cold_gen = counting("다시 생성됨")
+from_disk = cold.get_or_generate("k-disk", cold_gen, cacheable)
+clock.now += 101
+later = LLMResultCache(ttl=100, store=LLMResultStore(store_dir))
+check("7. 콜드 스타트 디스크 적중 + 만료", from_disk == "저장된 보고서" and cold_gen.calls == 0
+      and cold.stats()["disk_hits"] == 1 and later.peek("k-disk") is None
+      and later.store.load("k-disk") is None)
+
+# 8. 동시 요청: 같은 키는 LLM 호출 1회를 공유
+cache = LLMResultCache(ttl=100)
+release = threading.Event()
+
+
+def slow_generate():
+    slow_generate.calls += 1
+    release.wait(2)
+    return "공유된 보고서"
+
+
+slow_generate.calls = 0
+shared = []
+threads = [threading.Thread(target=lambda: shared.append(cache.get_or_generate("k-shared", slow_generate, cacheable)))
+           for _ in range(5)]
+for t in threads:
+    t.start()
+deadline = time.monotonic() + 2
+while not cache.stats()["inflight"] and time.monotonic() < deadline:
+    time.sleep(0.01)
+time.sleep(0.05)
+release.set()
+for t in threads:
+    t.join(5)
+check("8. 동시 요청 single-flight", shared == ["공유된 보고서"] * 5 and slow_generate.calls == 1
+      and cache.stats()["shared"] + cache.stats()["hits"] == 4)
+
+print("=" * 60)
+print("🎉 모든 AI 결과 캐시 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
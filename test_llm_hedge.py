@@ -0,0 +1,180 @@
+import sys
+import os
+import time
+import threading
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+
+from app.services import ai_insight
+from app.services import llm_hedge
+from app.services.llm_hedge import Attempt, AttemptResult, run_hedged, llm_deadline, current_deadline
+
+# LLM 헤지 호출 테스트:
+# 가짜 공급자 시도(지연·응답을 스크립트로 지정)로 헤지 시작 시점, 전역 마감 시간에 따른 타임아웃 상한,
+# 429 뒤 같은 그룹 건너뛰기, longer_wins 선택 규칙, 그리고 승자가 정해진 뒤 나머지 시도에 취소 신호가
+# 가서 다음 요청을 보내지 않는지(abandoned/cancelled 통계)를 네트워크 없이 확인한다.
+
+
+def fake(name, delay=0.0, group=None, timeout=10, log=None, **result):
+    """delay초 뒤(중단 불가한 요청처럼) AttemptResult(**result)를 반환하는 시도. 받은 timeout은 log[name]에 기록."""
+    def fn(t, cancel):
+        if log is not None:
+            log[name] = t
+        time.sleep(delay)
+        if delay > t:
+            return AttemptResult(error=f"{name} 시간 초과")
+        return AttemptResult(**result)
+    return Attempt(name, fn, timeout=timeout, group=group)
+
+
+def wait_for(predicate, seconds=2.0):
+    deadline = time.monotonic() + seconds
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+print("=" * 60)
+print("🧪 LLM 헤지 호출 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 1순위가 hedge_delay 안에 답하지 않으면 2순위를 함께 띄우고, 먼저 온 합격 응답을 사용
+started = time.monotonic()
+outcome = run_hedged([fake("local", delay=1.0, text="느린 로컬", complete=True),
+                      fake("gemini", delay=0.05, text="빠른 제미나이", complete=True)],
+                     hedge_delay=0.1, deadline=time.monotonic() + 5)
+elapsed = time.monotonic() - started
+check("1. 헤지 후 빠른 응답 채택", outcome.winner_name == "gemini" and 0.1 <= elapsed < 0.5)
+
+# 2. 실패한 시도는 hedge_delay를 기다리지 않고 바로 다음 순위로
+started = time.monotonic()
+outcome = run_hedged([fake("a", error="HTTP 500"), fake("b", text="ok", complete=True)],
+                     hedge_delay=5, deadline=time.monotonic() + 5)
+check("2. 실패 즉시 다음 순위", outcome.winner_name == "b" and outcome.errors == ["HTTP 500"]
+      and time.monotonic() - started < 0.5)
+
+# 3. 전역 마감: 각 시도의 timeout은 남은 시간으로 제한되고, 마감을 넘겨 기다리지 않음
+log = {}
+started = time.monotonic()
+with llm_deadline(0.3):
+    outcome = run_hedged([fake("slow", delay=1, timeout=110, log=log, text="늦음", complete=True)], hedge_delay=5)
+elapsed = time.monotonic() - started
+check("3. 마감 시간 상한", outcome.timed_out and outcome.winner is None and log["slow"] <= 0.3
+      and elapsed < 0.6)
+
+# 4. llm_deadline 밖에서는 설정값(LLM_DEADLINE_SECONDS)이 기준
+check("4. 기본 마감 시간",
+      abs(current_deadline() - (time.monotonic() + llm_hedge.settings.LLM_DEADLINE_SECONDS)) < 0.5)
+
+# 5. 429를 받은 그룹의 아직 시작하지 않은 시도는 건너뜀 (다른 그룹은 계속)
+log = {}
+outcome = run_hedged([fake("groq:120b", group="groq", log=log, error="429", rate_limited=True),
+                      fake("groq:20b", group="groq", log=log, text="건너뛰어야 함", complete=True),
+                      fake("gemini-lite", group="gemini-lite", log=log, text="대체", complete=True)],
+                     hedge_delay=5, deadline=time.monotonic() + 5)
+check("5. 429 후 같은 그룹 건너뜀", outcome.winner_name == "gemini-lite" and "groq:20b" not in log
+      and outcome.rate_limited == {"groq"})
+
+# 6. longer_wins: 잘린 응답보다 길 때만 즉시 채택, 아니면 가장 긴 후보를 사용
+outcome = run_hedged([fake("gemini", text="잘린 응답" * 10),
+                      fake("groq", text="짧음", complete=True, longer_wins=True)],
+                     hedge_delay=5, deadline=time.monotonic() + 5)
+shorter = (outcome.winner, outcome.best_name)
+outcome = run_hedged([fake("gemini", text="잘린 응답"),
+                      fake("groq", text="더 긴 그록 응답" * 10, complete=True, longer_wins=True)],
+                     hedge_delay=5, deadline=time.monotonic() + 5)
+check("6. longer_wins 선택 규칙", shorter == (None, "gemini") and outcome.winner_name == "groq")
+
+# 7. 승자가 정해지면 나머지에 취소 신호: Gemini는 두 번째 요청 설정을 보내지 않음
+posts = []
+first_request_sent = threading.Event()
+release = threading.Event()
+
+
+class _Resp:
+    status_code = 200
+
+    def json(self):
+        return {"candidates": [{"content": {"parts": [{"text": "짧게 잘린 응답"}]}, "finishReason": "MAX_TOKENS"}]}
+
+
+def fake_post(url, json=None, timeout=None, **kwargs):
+    posts.append(json["generationConfig"].get("thinkingConfig"))
+    first_request_sent.set()
+    release.wait(2)
+    return _Resp()
+
+
+ai_insight.requests.post = fake_post
+before = llm_hedge.hedge_stats.as_dict()
+gemini = Attempt("gemini-2.5-flash",
+                 lambda t, c: ai_insight._gemini_attempt("gemini-2.5-flash", "key", "s", "u", t, c), timeout=10)
+
+
+def local_after_gemini_started(t, cancel):
+    first_request_sent.wait(2)
+    return AttemptResult("로컬 응답", complete=True)
+
+
+outcome = run_hedged([gemini, Attempt("local", local_after_gemini_started, timeout=10)],
+                     hedge_delay=0, deadline=time.monotonic() + 5)
+release.set()
+after = llm_hedge.hedge_stats.as_dict()
+check("7. 패자 취소: 남은 요청 미전송",
+      outcome.winner_name == "local" and after["abandoned"] - before["abandoned"] == 1
+      and wait_for(lambda: llm_hedge.hedge_stats.as_dict()["cancelled"] - before["cancelled"] == 1)
+      and posts == [{"thinkingBudget": 0}])
+
+# 8. 시작 전에 승부가 난 시도는 fn을 호출하지 않음 (다음 Groq 모델 등)
+calls = []
+
+
+def slow_start(t, cancel):
+    calls.append("groq")
+    return AttemptResult("그록", complete=True)
+
+
+original_thread = llm_hedge.threading.Thread
+
+
+class DelayedThread(original_thread):
+    """두 번째로 띄운 시도의 스레드 시작을 run_hedged가 끝날 때까지 미룬다."""
+    started = 0
+
+    def start(self):
+        DelayedThread.started += 1
+        if DelayedThread.started == 2:
+            threading.Timer(0.2, super().start).start()
+        else:
+            super().start()
+
+
+llm_hedge.threading.Thread = DelayedThread
+try:
+    before = llm_hedge.hedge_stats.as_dict()
+    outcome = run_hedged([fake("gemini", delay=0.05, text="제미나이", complete=True),
+                          Attempt("groq:120b", slow_start, timeout=10)],
+                         hedge_delay=0, deadline=time.monotonic() + 5)
+finally:
+    llm_hedge.threading.Thread = original_thread
+check("8. 시작 전 취소된 시도는 호출 안 함",
+      outcome.winner_name == "gemini"
+      and wait_for(lambda: llm_hedge.hedge_stats.as_dict()["cancelled"] - before["cancelled"] == 1)
+      and calls == [])
+
+print("=" * 60)
+print("🎉 모든 LLM 헤지 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
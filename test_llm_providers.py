@@ -0,0 +1,180 @@
+import sys
+import os
+import time
+import types
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+os.environ.pop("LOCAL_LLM_URL", None)
+os.environ.pop("LOCAL_LLM_MODEL", None)
+
+from app.services import llm_providers
+from app.services.llm_providers import OPENAI, OLLAMA, CircuitBreaker, LocalLLMRegistry, local_llm_candidates
+
+# 로컬 LLM 레지스트리 테스트:
+# 가상 시계와 가짜 requests.get으로 후보 엔드포인트 점검(우선순위·단일 점검), 점검 결과 TTL과
+# 백그라운드 재점검, 서킷 브레이커(연속 실패 시 열림 → 쿨다운 후 시험 호출 1회 → 닫힘/재개방)를 확인한다.
+
+
+class FakeClock:
+    """llm_providers 모듈의 time.time()만 대체 (monotonic·sleep은 실제 time 사용)"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+clock = FakeClock()
+llm_providers.time = types.SimpleNamespace(time=clock.time, monotonic=time.monotonic, sleep=time.sleep)
+
+
+class _Resp:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self._data = data or {}
+
+    def json(self):
+        return self._data
+
+
+class FakeEndpoints:
+    """살아있는 base URL -> 모델 id. GET 요청은 모두 기록한다."""
+
+    def __init__(self):
+        self.up = {}
+        self.requests = []
+
+    def get(self, url, timeout=None):
+        self.requests.append(url)
+        for base, model in self.up.items():
+            if url == f"{base}/models":
+                return _Resp(200, {"data": [{"id": model}]})
+            if url == f"{base}/api/tags":
+                return _Resp(200, {"models": []})
+        raise ConnectionError(f"refused: {url}")
+
+
+endpoints = FakeEndpoints()
+llm_providers.requests = types.SimpleNamespace(get=endpoints.get)
+
+
+def new_registry(**kwargs):
+    kwargs.setdefault("ttl", 300)
+    kwargs.setdefault("negative_ttl", 60)
+    kwargs.setdefault("failure_threshold", 2)
+    kwargs.setdefault("cooldown", 120)
+    return LocalLLMRegistry(**kwargs)
+
+
+def settle(registry):
+    thread = registry._refresh_thread
+    if thread is not None:
+        thread.join(5)
+
+
+print("=" * 60)
+print("🧪 로컬 LLM 레지스트리 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 후보 목록: LOCAL_LLM_URL을 /v1로 맞춰 맨 앞에, 중복 제거, Ollama 네이티브는 마지막
+os.environ["LOCAL_LLM_URL"] = "http://localhost:1234/"
+candidates = local_llm_candidates()
+del os.environ["LOCAL_LLM_URL"]
+check("1. 후보 순서·중복 제거", candidates[0] == (OPENAI, "http://localhost:1234/v1")
+      and candidates.count((OPENAI, "http://localhost:1234/v1")) == 1
+      and candidates[-2:] == [(OLLAMA, "http://localhost:11434"), (OLLAMA, "http://127.0.0.1:11434")])
+
+# 2. 첫 호출만 점검, 우선순위가 높은 살아있는 후보 채택 (이후 호출은 네트워크 없음)
+endpoints.up = {"http://127.0.0.1:1234/v1": "gemma-lm", "http://localhost:11434/v1": "gemma-ollama"}
+registry = new_registry()
+provider = registry.resolve()
+requests_after_probe = len(endpoints.requests)
+again = registry.resolve()
+check("2. 점검 1회 + 우선순위", provider.base_url == "http://127.0.0.1:1234/v1" and provider.model == "gemma-lm"
+      and again is provider and len(endpoints.requests) == requests_after_probe and registry.probes == 1)
+
+# 3. TTL이 지나면 이전 결과를 계속 쓰면서 백그라운드에서 재점검
+endpoints.up = {"http://localhost:11434/v1": "gemma-ollama"}
+clock.now += 301
+served = registry.resolve()
+settle(registry)
+check("3. TTL 후 백그라운드 재점검", served is provider and registry.background_probes == 1
+      and registry.resolve().base_url == "http://localhost:11434/v1")
+
+# 4. 살아있는 서버가 없으면 None, 음성 결과는 negative_ttl 동안 유지
+endpoints.up = {}
+registry = new_registry()
+none_first = registry.resolve()
+endpoints.up = {"http://localhost:1234/v1": "gemma"}
+still_none = registry.resolve()
+clock.now += 61
+registry.resolve()
+settle(registry)
+check("4. 음성 결과 TTL", none_first is None and still_none is None and registry.probes == 2
+      and registry.resolve() is not None)
+
+# 5. 연속 실패가 임계값에 닿으면 열림: 로컬 호출을 건너뜀 (peek도 None)
+registry = new_registry()
+provider = registry.resolve()
+registry.record_failure(provider, "HTTP 500")
+settle(registry)
+registry.record_failure(provider, "timeout")
+settle(registry)
+check("5. 연속 실패 시 열림", registry.resolve() is None and registry.peek() is None
+      and registry.stats()["breakers"]["http://localhost:1234/v1"]["state"] == "open" and registry.skipped == 1)
+
+# 6. 열린 엔드포인트는 재점검 후보에서 빠지고 다른 후보가 이어받음
+endpoints.up = {"http://localhost:1234/v1": "gemma", "http://localhost:11434": "gemma-native"}
+endpoints.requests.clear()
+registry.probe()
+check("6. 열린 후보 제외 재점검", registry.resolve().key == (OLLAMA, "http://localhost:11434")
+      and "http://localhost:1234/v1/models" not in endpoints.requests)
+
+# 7. 쿨다운 뒤 반열림: 시험 호출 1회만 허용, 성공하면 닫힘
+breaker = CircuitBreaker(threshold=2, cooldown=120)
+breaker.failure("a")
+breaker.failure("b")
+opened = breaker.state
+clock.now += 121
+trial, second = breaker.allow(), breaker.allow()
+breaker.success()
+check("7. 반열림 시험 호출 후 닫힘", opened == "open" and trial and not second and breaker.state == "closed"
+      and breaker.allow())
+
+# 8. 반열림 시험 호출이 실패하면 다시 쿨다운 동안 열림
+breaker.failure("a")
+breaker.failure("b")
+clock.now += 121
+breaker.allow()
+breaker.failure("still down")
+check("8. 시험 호출 실패 시 재개방", breaker.state == "open" and not breaker.allow()
+      and breaker.last_error == "still down")
+
+# 9. 설정(LOCAL_LLM_URL) 변경 시 즉시 다시 점검, invalidate()는 상태 초기화
+registry = new_registry()
+registry.resolve()
+os.environ["LOCAL_LLM_URL"] = "https://abc.trycloudflare.com"
+endpoints.up = {"https://abc.trycloudflare.com/v1": "gemma-tunnel"}
+tunnel = registry.resolve()
+del os.environ["LOCAL_LLM_URL"]
+registry.invalidate()
+check("9. 설정 변경 재점검 + invalidate", tunnel.location_tag == "Cloudflare Tunnel" and registry.probes == 2
+      and registry.stats()["active"] is None and registry._signature is None)
+
+print("=" * 60)
+print("🎉 모든 로컬 LLM 레지스트리 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
@@ -0,0 +1,178 @@
+import sys
+import os
+import re
+import time
+import types
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+os.environ.setdefault("CACHE_SNAPSHOTS_ENABLED", "false")
+
+from app.services import sheets
+from app.adapters.sheets import cache as cache_module
+
+# Log_Main 증분 수집 테스트:
+# 가짜 Log_Main 워크시트로 첫 동기화만 전체를 읽고, 이후에는 헤더 + 마지막 행부터만 읽는지,
+# 마지막 행 수정·헤더 변경·행 삭제·재동기화 주기에는 전체를 다시 읽는지 확인한다.
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+
+clock = FakeClock()
+cache_module.time = types.SimpleNamespace(time=clock.time, sleep=time.sleep, monotonic=time.monotonic)
+
+
+class FakeLogWorksheet:
+    """get_all_values()/batch_get()만 흉내 내고 호출을 기록한다."""
+
+    def __init__(self, title, rows):
+        self.title = title
+        self.rows = [list(r) for r in rows]
+        self.calls = []
+
+    def get_all_values(self):
+        self.calls.append("get_all_values")
+        return [list(r) for r in self.rows]
+
+    def batch_get(self, ranges):
+        self.calls.append(("batch_get", tuple(ranges)))
+        out = []
+        for rng in ranges:
+            if rng == "1:1":
+                out.append([list(self.rows[0])])
+            else:
+                start = int(re.findall(r"\d+", rng)[0])
+                out.append([list(r) for r in self.rows[start - 1:]])
+        return out
+
+
+class FakeSpreadsheet:
+    def __init__(self, *worksheets):
+        self.list = list(worksheets)
+
+    def worksheets(self):
+        return self.list
+
+
+HEADERS = ["타임스탬프", "학생명", "학생코드", "행동발생날짜", "시간대", "장소", "행동유형", "강도", "Log_ID"]
+
+
+def log_row(i, name="가나", code="2101"):
+    return [f"2026. 3. {i % 28 + 1}. 오전 9:00:00", name, code, f"2026. 3. {i % 28 + 1}.", "1교시", "교실",
+            "공격행동", str(i % 5 + 1), f"L{i:04d}"]
+
+
+log_ws = FakeLogWorksheet("Log_Main", [HEADERS] + [log_row(i) for i in range(1, 101)])
+sheets.get_sheets_client = lambda: object()
+sheets.get_spreadsheet = lambda: FakeSpreadsheet(log_ws)
+sheets.get_beable_code_mapping = lambda: {"B1": {"student_code": "2201", "student_name": "다라"}}
+
+
+def sync():
+    log_ws.calls.clear()
+    return sheets._load_all_records()
+
+
+print("=" * 60)
+print("🧪 Log_Main 증분 수집 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 첫 동기화는 전체 읽기
+records = sync()
+check("1. 첫 동기화 전체 읽기", log_ws.calls == ["get_all_values"] and len(records) == 100)
+
+# 2. 새 행만 추가되면 헤더 + 마지막 행부터 한 번의 batch_get
+log_ws.rows += [log_row(i) for i in range(101, 106)]
+records = sync()
+check("2. 추가 행 증분 수집",
+      log_ws.calls == [("batch_get", ("1:1", "A101:I"))] and len(records) == 105
+      and [r["Log_ID"] for r in records[-5:]] == [f"L{i:04d}" for i in range(101, 106)])
+
+# 3. 변화 없음: batch_get 1회, 같은 리스트 재사용
+again = sync()
+check("3. 변화 없는 재동기화", log_ws.calls == [("batch_get", ("1:1", "A106:I"))] and again is records)
+
+# 4. 학생코드 없는 행은 BeAble 매핑의 이름으로 코드 보완
+log_ws.rows.append(log_row(106, name="다 라", code=""))
+records = sync()
+check("4. 이름으로 학생코드 보완", records[-1]["학생코드"] == "2201" and records[-1]["코드번호"] == "2201")
+
+# 5. 마지막으로 읽은 행이 수정되면 전체 다시 읽기
+log_ws.rows[-1][6] = "자해행동"
+records = sync()
+check("5. 마지막 행 수정 시 전체 재적재",
+      log_ws.calls[-1] == "get_all_values" and records[-1]["행동유형"] == "자해행동" and len(records) == 106)
+
+# 6. 헤더가 바뀌면 전체 다시 읽기
+log_ws.rows[0] = HEADERS + ["비고"]
+records = sync()
+check("6. 헤더 변경 시 전체 재적재", log_ws.calls[-1] == "get_all_values" and len(records) == 106)
+
+# 7. 행이 삭제되면(기준 행 불일치) 전체 다시 읽기
+del log_ws.rows[1:11]
+records = sync()
+check("7. 행 삭제 시 전체 재적재", log_ws.calls[-1] == "get_all_values" and len(records) == 96)
+
+# 8. 중간 행 수정은 증분으로는 보이지 않지만, 재동기화 주기(LOG_FULL_RESYNC_SECONDS)가 지나면 반영
+log_ws.rows[5][1] = "수정된이름"
+records = sync()
+missed = all(r["학생명"] != "수정된이름" for r in records)
+clock.now += sheets.LOG_FULL_RESYNC_SECONDS + 1
+records = sync()
+check("8. 주기적 전체 재동기화로 중간 수정 반영",
+      missed and log_ws.calls == ["get_all_values"] and any(r["학생명"] == "수정된이름" for r in records))
+
+# 9. 여러 워크시트: Log_ID가 같은 행은 우선순위가 높은 시트의 것만 남김
+legacy_ws = FakeLogWorksheet("BehaviorLogs1", [HEADERS] + [log_row(i) for i in range(200, 205)] + [log_row(50)])
+sheets.get_spreadsheet = lambda: FakeSpreadsheet(log_ws, legacy_ws)
+records = sync()
+ids = [r["Log_ID"] for r in records]
+check("9. 워크시트 간 중복 제거", len(ids) == len(set(ids)) == 96 + 5)
+
+# 10. 증분 행 중 하나라도 변환에 실패하면 수집 상태(entries/pending_events/기준 행)는 그대로
+ws_state = sheets._full_load_log_worksheet(log_ws, log_ws.get_all_values())
+before = (len(ws_state["entries"]), len(ws_state["pending_events"]), ws_state["row_count"],
+          ws_state["last_row"], ws_state["generation"])
+original_map = sheets._map_log_row
+
+
+def failing_map(row, ws_title, idx):
+    if row.get("Log_ID") == "L0302":
+        raise ValueError("bad row")
+    return original_map(row, ws_title, idx)
+
+
+sheets._map_log_row = failing_map
+width = len(ws_state["keys"])
+try:
+    sheets._ingest_log_rows(log_ws, ws_state, [log_row(i) + [""] * (width - len(HEADERS)) for i in range(301, 304)])
+    raised = False
+except ValueError:
+    raised = True
+finally:
+    sheets._map_log_row = original_map
+after = (len(ws_state["entries"]), len(ws_state["pending_events"]), ws_state["row_count"],
+         ws_state["last_row"], ws_state["generation"])
+check("10. 변환 실패 시 부분 반영 없음", raised and after == before and before[1] == before[0])
+
+print("=" * 60)
+print("🎉 모든 Log_Main 수집 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
@@ -0,0 +1,272 @@
+import sys
+import os
+import time
+import types
+import asyncio
+import threading
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+
+from app.adapters.sheets import cache as cache_module
+from app.adapters.sheets.cache import SheetCache
+
+# SheetCache 단위 테스트:
+# 가상 시계로 TTL·LRU·의존성 무효화, single-flight 로드, stale-while-revalidate를 시트 접근 없이 검증한다.
+
+
+class FakeClock:
+    """cache 모듈의 time.time()만 대체 (sleep 등은 실제 time 사용)"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+clock = FakeClock()
+cache_module.time = types.SimpleNamespace(time=clock.time, sleep=time.sleep, monotonic=time.monotonic)
+
+print("=" * 60)
+print("🧪 SheetCache 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. TTL: 저장 시 ttl, 조회 시 ttl 재지정, 기본 TTL
+c = SheetCache(default_ttl=60)
+c.set("sheet:a", [1], ttl=10)
+c.set("sheet:b", [2])
+clock.advance(9)
+check("1-1. TTL 이내 조회", c.get("sheet:a") == [1] and c.get("sheet:b") == [2])
+check("1-2. 조회 시 ttl 재지정", c.get("sheet:a", ttl=5) is None and c.get("sheet:a") == [1])
+clock.advance(2)
+check("1-3. TTL 만료 후 None (기본 TTL 항목은 유지)", c.get("sheet:a") is None and c.get("sheet:b") == [2])
+clock.advance(60)
+check("1-4. 기본 TTL 만료", c.get("sheet:b") is None)
+
+# 2. LRU: 최근 조회한 항목은 남고 가장 오래 안 쓴 항목부터 제거
+c = SheetCache(max_entries=3)
+for k in ("k1", "k2", "k3"):
+    c.set(k, k)
+c.get("k1")
+c.set("k4", "k4")
+check("2. LRU 제거", c.get("k2") is None and c.get("k1") == "k1" and c.stats()["evictions"] == 1)
+
+# 3. 의존성 무효화: depends_on은 전이적으로, link()는 접두어 규칙으로 따라간다
+c = SheetCache()
+c.set("sheet:tier-status:raw", ["raw"])
+c.set("sheet:tier-status:students", ["students"], depends_on=["sheet:tier-status:raw"])
+c.set("sheet:report", ["report"], depends_on=["sheet:tier-status:students"])
+c.set("sheet:log-main:records", ["records"])
+c.set("sheet:other", ["other"])
+c.link("sheet:tier-status", "sheet:log-main:records")
+removed = c.invalidate("sheet:tier-status:raw")
+check("3-1. depends_on 전이 무효화 + link 규칙",
+      removed == 4 and all(c.get(k) is None for k in (
+          "sheet:tier-status:raw", "sheet:tier-status:students", "sheet:report", "sheet:log-main:records"))
+      and c.get("sheet:other") == ["other"])
+
+c.set("sheet:cico:raw:2026:03", [3])
+c.set("sheet:cico:raw:2026:04", [4])
+c.invalidate("sheet:cico:raw:2026:03")
+check("3-2. 접두어 무효화는 해당 키만", c.get("sheet:cico:raw:2026:03") is None and c.get("sheet:cico:raw:2026:04") == [4])
+c.invalidate()
+check("3-3. 전체 무효화", c.stats()["entries"] == 0)
+
+# 4. 재적재(set)는 의존 항목을 지우지 않음: 파생 값은 원본 객체 동일성이나 무효화로 갱신해야 한다
+c = SheetCache()
+c.set("sheet:src", ["v1"])
+c.set("sheet:derived", ["d1"], depends_on=["sheet:src"])
+c.set("sheet:src", ["v2"])
+check("4. set()은 연쇄 무효화하지 않음", c.get("sheet:derived") == ["d1"])
+
+# 5. single-flight: 콜드 키에 동시에 몰린 호출은 로더 1회를 공유
+c = SheetCache()
+calls = []
+gate = threading.Event()
+
+
+def slow_loader():
+    calls.append(1)
+    gate.wait(5)
+    return ["rows"]
+
+
+results = []
+threads = [threading.Thread(target=lambda: results.append(c.get_or_load("sheet:cold", slow_loader)))
+           for _ in range(8)]
+for t in threads:
+    t.start()
+time.sleep(0.2)
+gate.set()
+for t in threads:
+    t.join(5)
+check("5. 동시 콜드 로드 1회 공유",
+      len(calls) == 1 and len(results) == 8 and all(r is results[0] for r in results)
+      and c.stats()["coalesced"] == 7)
+
+# 6. 로더 예외는 대기 중인 모든 호출에 전달되고 캐시되지 않음
+c = SheetCache()
+gate = threading.Event()
+errors = []
+
+
+def failing_loader():
+    gate.wait(5)
+    raise RuntimeError("sheet down")
+
+
+def call_failing():
+    try:
+        c.get_or_load("sheet:fail", failing_loader)
+    except RuntimeError as e:
+        errors.append(str(e))
+
+
+threads = [threading.Thread(target=call_failing) for _ in range(4)]
+for t in threads:
+    t.start()
+time.sleep(0.2)
+gate.set()
+for t in threads:
+    t.join(5)
+check("6. 예외 전파 + 다음 호출 재시도",
+      errors == ["sheet down"] * 4 and c.get_or_load("sheet:fail", lambda: ["ok"]) == ["ok"])
+
+# 7. 로드 중 무효화되면 그 결과는 저장하지 않음 (쓰기 전에 읽은 값이 캐시에 남지 않도록)
+c = SheetCache()
+gate = threading.Event()
+holder = []
+t = threading.Thread(target=lambda: holder.append(c.get_or_load("sheet:racy", lambda: gate.wait(5) and ["old"])))
+t.start()
+time.sleep(0.2)
+c.invalidate("sheet:racy")
+gate.set()
+t.join(5)
+check("7. 로드 중 무효화된 결과 미저장", holder == [["old"]] and c.get("sheet:racy") is None)
+
+# 8. cache_if를 통과하지 못한 결과(오류 경로의 빈 리스트)는 저장하지 않음
+c = SheetCache()
+c.get_or_load("sheet:empty", lambda: [], cache_if=bool)
+check("8. cache_if 실패 결과 미저장", c.get("sheet:empty") is None)
+
+# 9. async 호출(aloader)과 동기 호출이 같은 로드를 공유
+c = SheetCache()
+calls = []
+
+
+async def aloader():
+    calls.append("async")
+    await asyncio.sleep(0.3)
+    return ["async rows"]
+
+
+async def mixed():
+    sync_call = asyncio.to_thread(c.get_or_load, "sheet:mixed", lambda: calls.append("sync") or ["sync rows"])
+    first = asyncio.ensure_future(c.aget_or_load("sheet:mixed", lambda: ["unused"], aloader=aloader))
+    await asyncio.sleep(0.1)
+    return await asyncio.gather(first, sync_call)
+
+
+a_result, s_result = asyncio.run(mixed())
+check("9. async/sync 로드 공유", calls == ["async"] and a_result == s_result == ["async rows"])
+
+
+def wait_refresh(cache, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while cache.stats()["in_flight"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+# 10. stale-while-revalidate: soft TTL 이후 hard TTL까지는 기존 값을 즉시 주고 백그라운드에서 1회 갱신
+c = SheetCache()
+c.set_stale_policy("sheet:log-main", 900)
+version = {"n": 1}
+loads = []
+
+
+def versioned_loader():
+    loads.append(version["n"])
+    time.sleep(0.1)
+    return [f"v{version['n']}"]
+
+
+first = c.get_or_load("sheet:log-main:records", versioned_loader, ttl=60)
+version["n"] = 2
+clock.advance(61)
+served = [c.get_or_load("sheet:log-main:records", versioned_loader, ttl=60) for _ in range(3)]
+wait_refresh(c)
+after = c.get_or_load("sheet:log-main:records", versioned_loader, ttl=60)
+check("10. 만료 후 이전 값 즉시 제공 + 백그라운드 갱신 1회",
+      first == ["v1"] and served == [["v1"]] * 3 and after == ["v2"] and loads == [1, 2]
+      and c.stats()["background_refreshes"] == 1)
+
+# 11. hard TTL을 넘으면 호출자가 새 로드를 기다림
+version["n"] = 3
+clock.advance(901)
+check("11. hard TTL 초과 시 동기 로드", c.get_or_load("sheet:log-main:records", versioned_loader, ttl=60) == ["v3"])
+
+# 12. 가장 긴 접두어 정책이 우선: raw 값은 stale 제공 안 함 (파생 키 재구성이 오래된 입력에서 시작하지 않도록)
+c = SheetCache()
+c.set_stale_policy("sheet:tier-status", 900)
+c.set_stale_policy("sheet:tier-status:raw", 0)
+c.set("sheet:tier-status:raw", ["old raw"], ttl=60)
+c.set("sheet:tier-status:students", ["old students"], ttl=60)
+clock.advance(61)
+raw = c.get_or_load("sheet:tier-status:raw", lambda: ["new raw"], ttl=60)
+students = c.get_or_load("sheet:tier-status:students", lambda: ["new students"], ttl=60)
+wait_refresh(c)
+check("12. raw 키는 stale 제외, 파생 키는 stale 제공",
+      raw == ["new raw"] and students == ["old students"] and c.get("sheet:tier-status:students") == ["new students"])
+
+# 13. 명시적 무효화(쓰기 후)는 stale 창과 무관하게 값을 버림
+c.set("sheet:tier-status:students", ["cached"], ttl=60)
+clock.advance(61)
+c.invalidate("sheet:tier-status")
+check("13. 무효화 후 stale 값 미제공",
+      c.get_or_load("sheet:tier-status:students", lambda: ["after write"], ttl=60) == ["after write"])
+
+# 14. 백그라운드 갱신 실패 시 기존 값을 계속 제공
+c = SheetCache()
+c.set_stale_policy("sheet:cico", 900)
+c.set("sheet:cico:report", ["last good"], ttl=60)
+clock.advance(61)
+
+
+def broken_loader():
+    raise RuntimeError("quota")
+
+
+served = c.get_or_load("sheet:cico:report", broken_loader, ttl=60)
+wait_refresh(c)
+check("14. 갱신 실패 시 기존 값 유지",
+      served == ["last good"] and c.get_or_load("sheet:cico:report", broken_loader, ttl=60) == ["last good"])
+
+# 15. peek: 값은 돌려주지만 hit/miss·LRU 순서는 건드리지 않음 (인증 세션 확인용)
+c = SheetCache(max_entries=2)
+c.set("sheet:users", ["u"], ttl=60)
+c.set("sheet:board", ["b"], ttl=60)
+peeked = [c.peek("sheet:users"), c.peek("sheet:missing")]
+before = (c.hits, c.misses)
+c.set("sheet:notes", ["n"], ttl=60)
+check("15. peek은 통계·LRU 불변", peeked == [["u"], None] and before == (0, 0)
+      and c.peek("sheet:users") is None and c.peek("sheet:board") == ["b"])
+
+print("=" * 60)
+print("🎉 모든 SheetCache 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
@@ -0,0 +1,238 @@
+import sys
+import os
+import time
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+
+import gspread
+import requests
+from app.adapters.sheets.write_queue import SheetWriteQueue
+
+# 시트 쓰기 큐 테스트:
+# 가짜 워크시트로 범위 쓰기 병합, 워크시트별 일괄 전송, 재시도 병합, 그리고 이미 반영됐을 수 있는
+# 실패(5xx·타임아웃) 뒤에는 행 추가를 다시 보내지 않는지(중복 행 방지) 확인한다.
+
+
+class _Resp:
+    def __init__(self, code):
+        self.status_code = code
+        self.text = ""
+        self.headers = {}
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": f"HTTP {self.status_code}", "status": "ERROR"}}
+
+
+def api_error(code):
+    return gspread.exceptions.APIError(_Resp(code))
+
+
+class FakeWorksheet:
+    """append_rows/batch_update 호출을 기록한다. fail_*: 다음 호출에서 던질 예외 목록."""
+
+    def __init__(self, title):
+        self.title = title
+        self.rows = []
+        self.cells = {}
+        self.calls = []
+        self.fail_append = []
+        self.fail_update = []
+        self.applied_before_failure = True  # 5xx(503 제외)/타임아웃: 요청은 반영됐지만 응답이 실패
+        self.during_update = None
+
+    def append_rows(self, rows):
+        self.calls.append(("append_rows", len(rows)))
+        error = self.fail_append.pop(0) if self.fail_append else None
+        code = getattr(error, "code", 500)
+        if error is None or (self.applied_before_failure and code >= 500 and code != 503):
+            self.rows.extend(rows)
+        if error is not None:
+            raise error
+
+    def batch_update(self, data, value_input_option="RAW"):
+        self.calls.append(("batch_update", value_input_option, len(data)))
+        if self.during_update:
+            hook, self.during_update = self.during_update, None
+            hook()
+        if self.fail_update:
+            raise self.fail_update.pop(0)
+        for item in data:
+            self.cells[item["range"]] = item["values"][0][0]
+
+
+def new_queue(**kwargs):
+    # debounce를 길게 두고 flush()로 직접 전송 (백그라운드 타이머에 의존하지 않음)
+    kwargs.setdefault("debounce", 60)
+    kwargs.setdefault("max_delay", 60)
+    kwargs.setdefault("backoff", 0.01)
+    return SheetWriteQueue(**kwargs)
+
+
+print("=" * 60)
+print("🧪 시트 쓰기 큐 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 같은 범위 쓰기는 마지막 값으로 병합, 워크시트별 append 1회 + 입력 옵션별 batch_update 1회
+q = new_queue()
+ws = FakeWorksheet("Log_Main")
+flushed = []
+q.append_row(ws, ["r1"])
+q.append_rows(ws, [["r2"], ["r3"]], on_flushed=lambda: flushed.append("rows"))
+q.update(ws, [{"range": "B2", "values": [["X"]]}], on_flushed=lambda: flushed.append("first"))
+q.update(ws, [{"range": "B2", "values": [["O"]]}, {"range": "C2", "values": [["1"]]}],
+         on_flushed=lambda: flushed.append("second"))
+q.update(ws, [{"range": "D2", "values": [["=1+1"]]}], value_input_option="USER_ENTERED")
+q.flush()
+check("1. 병합 + 일괄 전송",
+      ws.calls == [("append_rows", 3), ("batch_update", "RAW", 2), ("batch_update", "USER_ENTERED", 1)]
+      and ws.rows == [["r1"], ["r2"], ["r3"]] and ws.cells == {"B2": "O", "C2": "1", "D2": "=1+1"}
+      and sorted(flushed) == ["first", "rows", "second"] and q.stats()["coalesced"] == 1)
+
+# 2. 디바운스: 워커 스레드가 조용한 구간 뒤 한 번에 전송
+q = SheetWriteQueue(debounce=0.05, max_delay=1)
+ws = FakeWorksheet("MeetingNotes")
+for i in range(5):
+    q.append_row(ws, [f"n{i}"])
+deadline = time.monotonic() + 5
+while q.depth() and time.monotonic() < deadline:
+    time.sleep(0.01)
+time.sleep(0.05)
+check("2. 디바운스 후 1회 전송", ws.calls == [("append_rows", 5)] and len(ws.rows) == 5)
+
+# 3. 429(요청 거부)는 행 추가도 재전송 → 한 번만 기록됨
+q = new_queue()
+ws = FakeWorksheet("TokenLog")
+ws.fail_append = [api_error(429)]
+q.append_rows(ws, [["a"], ["b"]])
+q.flush()
+check("3. 429 후 append 재전송", len(ws.rows) == 2 and ws.calls.count(("append_rows", 2)) == 2
+      and q.stats()["retries"] == 1)
+
+# 4. 500/타임아웃(반영됐을 수 있음)은 append를 다시 보내지 않음 → 중복 행 없음, on_failed 호출
+for label, error in (("500", api_error(500)), ("타임아웃", requests.exceptions.ReadTimeout("read timed out")),
+                     ("연결 끊김", requests.exceptions.ConnectionError("reset"))):
+    q = new_queue()
+    ws = FakeWorksheet("Log_Main")
+    ws.fail_append = [error]
+    dropped = []
+    q.append_rows(ws, [["a"], ["b"]], on_failed=dropped.append)
+    q.flush()
+    check(f"4. {label} 후 append 미재전송", ws.rows == [["a"], ["b"]] and ws.calls == [("append_rows", 2)]
+          and len(dropped) == 1 and q.depth() == 0)
+
+# 5. append가 애매하게 실패해도 같은 버킷의 범위 쓰기(멱등)는 재시도해서 기록
+q = new_queue()
+ws = FakeWorksheet("CICODaily")
+ws.fail_append = [api_error(502)]
+ws.fail_update = [api_error(502)]
+q.append_row(ws, ["row"])
+q.update(ws, [{"range": "E5", "values": [["O"]]}])
+q.flush()
+check("5. append 제외, 범위 쓰기만 재시도", ws.rows == [["row"]] and ws.cells == {"E5": "O"}
+      and ws.calls.count(("append_rows", 1)) == 1)
+
+# 6. 범위 쓰기만 있는 버킷은 5xx에도 재시도
+q = new_queue()
+ws = FakeWorksheet("3월")
+ws.fail_update = [api_error(500), api_error(503)]
+q.update(ws, [{"range": "F7", "values": [["X"]]}])
+q.flush()
+check("6. 범위 쓰기 5xx 재시도", ws.cells == {"F7": "X"} and q.stats()["retries"] == 2)
+
+# 7. 재시도 대기 중 들어온 쓰기: 실패한 배치 뒤에 붙고, 같은 범위는 새 값이 이기며 콜백은 모두 호출
+q = new_queue()
+ws = FakeWorksheet("4월")
+ws.fail_update = [api_error(503)]
+done = []
+ws.during_update = lambda: (
+    q.update(ws, [{"range": "A1", "values": [["new"]]}], on_flushed=lambda: done.append("newer")),
+    q.append_row(ws, ["late"]),
+)
+q.update(ws, [{"range": "A1", "values": [["old"]]}, {"range": "B1", "values": [["keep"]]}],
+         on_flushed=lambda: done.append("older"))
+q.flush()
+check("7. 재시도 병합", ws.cells == {"A1": "new", "B1": "keep"} and ws.rows == [["late"]]
+      and sorted(done) == ["newer", "older"])
+
+# 8. 재시도 한도 초과 시 버림 + on_failed 1회
+q = new_queue(max_retries=2)
+ws = FakeWorksheet("5월")
+ws.fail_update = [api_error(503)] * 5
+errors = []
+q.update(ws, [{"range": "A1", "values": [["x"]]}, {"range": "A2", "values": [["y"]]}], on_failed=errors.append)
+q.flush()
+check("8. 재시도 한도 초과", ws.cells == {} and len(errors) == 1 and q.stats()["failed"] == 2 and q.depth() == 0)
+
+# 9. 재시도 불가 오류(400)는 즉시 버림
+q = new_queue()
+ws = FakeWorksheet("6월")
+ws.fail_update = [api_error(400)]
+errors = []
+q.update(ws, [{"range": "A1", "values": [["x"]]}], on_failed=errors.append)
+q.flush()
+check("9. 400 즉시 버림", len(errors) == 1 and q.stats()["retries"] == 0 and ws.calls == [("batch_update", "RAW", 1)])
+
+# 10. 비활성(서버리스) 모드: 호출마다 즉시 전송
+q = new_queue(enabled=False)
+ws = FakeWorksheet("Board")
+q.append_row(ws, ["inline"])
+check("10. 비활성 모드 즉시 전송", ws.rows == [["inline"]] and q.depth() == 0)
+
+# 11. 즉시 전송(비활성) 모드의 실패는 enqueue 호출이 끝나기 전에 on_failed로 전달, flush()는 오류를 반환
+q = new_queue(enabled=False)
+ws = FakeWorksheet("MeetingNotes")
+ws.fail_append = [api_error(403)]
+failed = []
+q.append_row(ws, ["note"], on_failed=failed.append)
+q2 = new_queue()
+ws2 = FakeWorksheet("Board")
+ws2.fail_update = [api_error(400)]
+q2.update(ws2, [{"range": "A1", "values": [["x"]]}])
+result = q2.flush("Board")
+check("11. 즉시 전송 실패 보고", len(failed) == 1 and failed[0].code == 403 and ws.rows == []
+      and result["depth"] == 0 and len(result["errors"]) == 1)
+
+# 12. 서비스 경로: 큐 비활성 시 협의록 저장 실패는 {"error": ...}로 반환 (성공으로 보고하지 않음)
+from app.services import sheets
+
+
+class FakeNotesWorksheet(FakeWorksheet):
+    def get_all_records(self):
+        self.calls.append("get_all_records")
+        headers = ["Date", "MeetingType", "Content", "Author", "CreatedAt", "StudentCode", "PeriodStart", "PeriodEnd", "UUID"]
+        return [dict(zip(headers, r)) for r in self.rows]
+
+
+notes_ws = FakeNotesWorksheet("MeetingNotes")
+sheets.get_meeting_notes_worksheet = lambda: notes_ws
+sheets.sheet_write_queue = new_queue(enabled=False)
+notes_ws.fail_append = [api_error(403)]
+failed_result = sheets.add_meeting_note({"content": "권한 없음"})
+ok_result = sheets.add_meeting_note({"content": "저장됨"})
+check("12. 즉시 전송 실패 시 error 반환", "error" in failed_result and "uuid" in ok_result
+      and [r[2] for r in notes_ws.rows] == ["저장됨"])
+
+# 13. 큐 활성: 방금 추가한 협의록이 디바운스 전에도 다음 목록 조회에 보임 (조회 전 해당 시트 flush)
+sheets.sheet_write_queue = new_queue()
+before = sheets.fetch_meeting_notes()  # 캐시 적재
+added = sheets.add_meeting_note({"content": "방금 작성"})
+after = sheets.fetch_meeting_notes()
+check("13. 쓰기 직후 조회에 반영", len(before) == 1 and added["uuid"] in [n["uuid"] for n in after]
+      and len(after) == 2 and sheets.sheet_write_queue.depth() == 0)
+
+print("=" * 60)
+print("🎉 모든 쓰기 큐 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
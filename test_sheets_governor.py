@@ -0,0 +1,226 @@
+import sys
+import os
+import types
+import asyncio
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+
+import gspread
+import requests
+from app.adapters.sheets import governor as governor_module
+from app.adapters.sheets.governor import (
+    READ, WRITE, POLL_SECONDS, SheetsGovernor, TokenBucket,
+    is_retryable_error, is_write_retryable_error, request_kind,
+)
+
+# 시트 API 거버너 테스트:
+# 가상 시계로 토큰 버킷 충전·백그라운드 예약분·대기 상한을, 가짜 호출로 읽기/쓰기 재시도 규칙
+# (쓰기는 429/503만 재전송), 429 시 버킷 소진, Retry-After 준수를 실제 대기 없이 확인한다.
+
+
+class FakeClock:
+    """governor 모듈의 time.monotonic()/time.sleep() 대체: sleep은 시계만 앞으로 돌린다."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+clock = FakeClock()
+governor_module.time = types.SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep)
+
+
+class _Resp:
+    def __init__(self, code, headers=None):
+        self.status_code = code
+        self.text = ""
+        self.headers = headers or {}
+
+    def json(self):
+        return {"error": {"code": self.status_code, "message": f"HTTP {self.status_code}", "status": "ERROR"}}
+
+
+def api_error(code, headers=None):
+    return gspread.exceptions.APIError(_Resp(code, headers))
+
+
+def scripted(*outcomes):
+    """호출마다 outcomes를 차례로 소비: 예외면 던지고, 아니면 그 값을 반환. 호출 횟수는 .calls"""
+    queue = list(outcomes)
+
+    def fn():
+        fn.calls += 1
+        outcome = queue.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    fn.calls = 0
+    return fn
+
+
+def new_governor(**kwargs):
+    kwargs.setdefault("backoff", 0.01)
+    kwargs.setdefault("max_backoff", 0.05)
+    return SheetsGovernor(**kwargs)
+
+
+def raises(fn):
+    try:
+        fn()
+    except Exception as e:
+        return e
+    return None
+
+
+print("=" * 60)
+print("🧪 시트 API 거버너 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 토큰 버킷: 1분치 용량을 쓰고 나면 대기 시간 반환, 시간이 지나면 충전
+bucket = TokenBucket(60)
+taken = sum(1 for _ in range(60) if bucket.try_take() == 0)
+wait = bucket.try_take()
+clock.now += 2
+check("1. 버킷 소진 후 대기 + 충전", taken == 60 and abs(wait - 1.0) < 1e-6 and bucket.try_take() == 0
+      and bucket.try_take() == 0 and bucket.try_take() > 0)
+
+# 2. 백그라운드 예약분: 백그라운드는 마지막 20%를 남기고, 대화형은 끝까지 사용
+g = new_governor(reads_per_minute=10, background_reserve=0.2)
+background_taken = sum(1 for _ in range(10) if g._try_acquire(READ, governor_module.BACKGROUND) == 0)
+interactive_taken = sum(1 for _ in range(10) if g._try_acquire(READ, governor_module.INTERACTIVE) == 0)
+check("2. 백그라운드 예약분 보존", background_taken == 8 and interactive_taken == 2)
+
+# 3. 대화형 호출이 토큰을 기다리는 동안 백그라운드는 양보
+g = new_governor(reads_per_minute=60)
+g._waiting[READ] = 1
+check("3. 대화형 대기 중 백그라운드 양보",
+      g._try_acquire(READ, governor_module.BACKGROUND) == POLL_SECONDS
+      and g._try_acquire(READ, governor_module.INTERACTIVE) == 0)
+
+# 4. acquire: 토큰이 없으면 충전될 때까지 대기, max_wait를 넘으면 그냥 진행
+g = new_governor(writes_per_minute=60, max_wait=5)
+for _ in range(60):
+    g.acquire(WRITE)
+clock.sleeps.clear()
+g.acquire(WRITE)
+waited = sum(clock.sleeps)
+g._buckets[WRITE].tokens = -100  # 429 직후처럼 크게 소진된 상태
+clock.sleeps.clear()
+g.acquire(WRITE)
+stats = g.stats()
+check("4. 토큰 대기 + 대기 상한", abs(waited - 1.0) < 1e-6 and abs(sum(clock.sleeps) - 5) < 1e-6
+      and stats["throttle_timeouts"] == 1 and stats["throttled"][WRITE] == 2 and stats["calls"][WRITE] == 62)
+
+# 5. 읽기: 5xx·408·429·타임아웃·연결 오류는 재시도, 400은 즉시 실패
+g = new_governor()
+fn = scripted(api_error(500), api_error(408), requests.exceptions.ReadTimeout("t"),
+              requests.exceptions.ConnectionError("reset"), ["rows"])
+result = g.run(READ, fn)
+bad = scripted(api_error(400))
+error = raises(lambda: g.run(READ, bad))
+check("5. 읽기 재시도 규칙", result == ["rows"] and fn.calls == 5 and g.retries == 4
+      and isinstance(error, gspread.exceptions.APIError) and bad.calls == 1 and g.failures == 1)
+
+# 6. 쓰기: 429/503(요청 거부)만 재전송, 500·타임아웃(이미 반영됐을 수 있음)은 재전송하지 않음
+g = new_governor()
+ok = scripted(api_error(429), api_error(503), {"updates": 1})
+write_result = g.run(WRITE, ok)
+not_resent = []
+for e in (api_error(500), api_error(502), requests.exceptions.ReadTimeout("t"),
+          requests.exceptions.ConnectionError("reset")):
+    fn = scripted(e, {"updates": 1})
+    not_resent.append(raises(lambda: g.run(WRITE, fn)) is e and fn.calls == 1)
+check("6. 쓰기 재시도는 429/503만", write_result == {"updates": 1} and ok.calls == 3 and all(not_resent))
+
+# 7. 재시도 판별 함수
+check("7. 재시도 판별",
+      is_retryable_error(api_error(500)) and not is_write_retryable_error(api_error(500))
+      and is_write_retryable_error(api_error(429)) and is_write_retryable_error(api_error(503))
+      and not is_retryable_error(api_error(403)) and not is_write_retryable_error(TimeoutError()))
+
+# 8. 429는 버킷을 소진시켜 다른 호출도 함께 느려짐
+g = new_governor(reads_per_minute=60)
+g.run(READ, scripted(api_error(429), "ok"))
+check("8. 429 시 버킷 소진", g.stats()["buckets"][READ]["available"] <= 0 and g.rate_limited == 1
+      and g._try_acquire(READ, governor_module.INTERACTIVE) > 0)
+
+# 9. Retry-After 준수 (max_backoff 이내)
+g = new_governor(max_backoff=30)
+clock.sleeps.clear()
+g.run(WRITE, scripted(api_error(429, {"Retry-After": "7"}), "ok"))
+check("9. Retry-After 준수", any(abs(s - 7) < 1e-6 for s in clock.sleeps))
+
+# 10. 재시도 한도를 넘으면 마지막 오류를 그대로 전달
+g = new_governor(max_retries=2)
+fn = scripted(*[api_error(503)] * 5)
+error = raises(lambda: g.run(READ, fn))
+check("10. 재시도 한도 초과", getattr(error, "code", None) == 503 and fn.calls == 3 and g.failures == 1)
+
+# 11. 비활성: 대기·재시도 없이 바로 호출
+g = new_governor(enabled=False, reads_per_minute=1)
+fn = scripted("a", "b", api_error(503))
+results = [g.run(READ, fn), g.run(READ, fn)]
+error = raises(lambda: g.run(READ, fn))
+check("11. 비활성 모드", results == ["a", "b"] and fn.calls == 3 and error is not None and g.retries == 0)
+
+# 12. arun: 비동기 호출에도 같은 재시도 규칙
+g = new_governor()
+
+
+def async_scripted(*outcomes):
+    sync_fn = scripted(*outcomes)
+
+    async def fn():
+        return sync_fn()
+    fn.sync = sync_fn
+    return fn
+
+
+read_fn = async_scripted(api_error(500), "rows")
+write_fn = async_scripted(api_error(500), "dup")
+
+
+async def case_arun():
+    read = await g.arun(READ, read_fn)
+    try:
+        await g.arun(WRITE, write_fn)
+        write_error = None
+    except gspread.exceptions.APIError as e:
+        write_error = e
+    return read, write_error
+
+
+read, write_error = asyncio.run(case_arun())
+check("12. arun 재시도 규칙", read == "rows" and read_fn.sync.calls == 2
+      and write_error is not None and write_fn.sync.calls == 1)
+
+# 13. 요청 종류: GET과 batchGetByDataFilter는 읽기, 나머지 POST/PUT은 쓰기
+check("13. request_kind",
+      request_kind("GET", "/v4/spreadsheets/x/values/A1") == READ
+      and request_kind("post", "/v4/spreadsheets/x/values:batchGetByDataFilter") == READ
+      and request_kind("POST", "/v4/spreadsheets/x/values:batchUpdate") == WRITE
+      and request_kind("PUT", "/v4/spreadsheets/x/values/A1") == WRITE)
+
+print("=" * 60)
+print("🎉 모든 거버너 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
@@ -0,0 +1,139 @@
+import sys
+import os
+import time
+import types
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+
+from app.adapters.sheets import cache as cache_module
+from app.adapters.sheets import snapshot as snapshot_module
+from app.adapters.sheets.cache import SheetCache
+from app.adapters.sheets.snapshot import SnapshotStore
+
+# 시트 스냅샷 복원 테스트:
+# 한 프로세스가 persist=True로 읽은 값을 디스크에 남기고, 새 프로세스(새 SheetCache)가
+# 시트를 읽기 전에 그 스냅샷으로 응답하는지, 만료·무효화 규칙을 지키는지 확인한다.
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = time.time()
+
+    def time(self):
+        return self.now
+
+
+clock = FakeClock()
+fake_time = types.SimpleNamespace(time=clock.time, sleep=time.sleep, monotonic=time.monotonic)
+cache_module.time = fake_time
+snapshot_module.time = fake_time
+
+snapshot_dir = tempfile.mkdtemp(prefix="pbst_snapshots_")
+
+
+def new_process(max_age=21600):
+    """콜드 인스턴스: 메모리는 비어 있고 같은 CACHE_DIR의 스냅샷만 공유"""
+    c = SheetCache()
+    c.set_stale_policy("sheet:log-main", 900)
+    c.snapshot_store = SnapshotStore(snapshot_dir)
+    c.snapshot_max_age = max_age
+    return c
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def wait_idle(c):
+    wait_until(lambda: not c.stats()["in_flight"])
+
+
+KEY = "sheet:log-main:records"
+ROWS = [{"학생명": "가나", "강도": 3}, {"학생명": "다라", "강도": 5}]
+loads = []
+
+
+def loader(value):
+    def load():
+        loads.append(value)
+        return value
+    return load
+
+
+print("=" * 60)
+print("🧪 시트 스냅샷 복원 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. persist=True 로드는 스냅샷을 남김
+warm = new_process()
+warm.get_or_load(KEY, loader(ROWS), ttl=60, persist=True)
+check("1. 로드 결과 스냅샷 저장", wait_until(lambda: warm.snapshot_store.load(KEY) is not None)
+      and warm.snapshot_store.load(KEY)[0] == ROWS)
+
+# 2. 새 프로세스: TTL 이내 스냅샷은 시트를 읽지 않고 그대로 응답
+loads.clear()
+cold = new_process()
+check("2. 콜드 인스턴스 스냅샷 응답", cold.get_or_load(KEY, loader(["fresh"]), ttl=60, persist=True) == ROWS
+      and loads == [] and cold.stats()["snapshot_restores"] == 1)
+
+# 3. TTL이 지난 스냅샷은 즉시 응답 + 백그라운드 갱신, 갱신 결과는 스냅샷에도 반영
+clock.now += 120
+cold = new_process()
+served = cold.get_or_load(KEY, loader(["refreshed"]), ttl=60, persist=True)
+wait_idle(cold)
+check("3. 만료 스냅샷 stale 응답 + 백그라운드 갱신",
+      served == ROWS and loads == [["refreshed"]] and cold.get(KEY) == ["refreshed"]
+      and wait_until(lambda: cold.snapshot_store.load(KEY)[0] == ["refreshed"]))
+
+# 4. snapshot_max_age를 넘은 스냅샷은 쓰지 않고 시트에서 읽음
+loads.clear()
+clock.now += 7 * 3600
+cold = new_process()
+check("4. 너무 오래된 스냅샷 미사용",
+      cold.get_or_load(KEY, loader(["from sheet"]), ttl=60, persist=True) == ["from sheet"] and loads == [["from sheet"]])
+wait_until(lambda: cold.snapshot_store.load(KEY)[0] == ["from sheet"])
+
+# 5. 무효화(쓰기 후)는 스냅샷도 지워 다른 콜드 인스턴스가 옛 값을 되살리지 않음
+cold.invalidate("sheet:log-main")
+loads.clear()
+other = new_process()
+check("5. 무효화 시 스냅샷 삭제",
+      cold.snapshot_store.load(KEY) is None
+      and other.get_or_load(KEY, loader(["after write"]), ttl=60, persist=True) == ["after write"])
+
+# 6. 내용이 같으면 payload는 그대로 두고 가져온 시각만 갱신
+store = SnapshotStore(snapshot_dir)
+store.save("sheet:same", ROWS, fetched_at=100.0)
+store.save("sheet:same", ROWS, fetched_at=200.0)
+check("6. 동일 내용 재저장 시 시각만 갱신", store.load("sheet:same") == (ROWS, 200.0))
+
+# 7. 저장소를 쓸 수 없으면 스냅샷 없이 동작 (요청을 깨뜨리지 않음)
+broken = SheetCache()
+blocker = tempfile.NamedTemporaryFile(delete=False)
+broken.snapshot_store = SnapshotStore(os.path.join(blocker.name, "sub"))
+broken.snapshot_max_age = 21600
+loads.clear()
+check("7. 저장소 오류 시 일반 로드", broken.get_or_load(KEY, loader(["plain"]), ttl=60, persist=True) == ["plain"]
+      and loads == [["plain"]])
+blocker.close()
+os.unlink(blocker.name)
+
+print("=" * 60)
+print("🎉 모든 스냅샷 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
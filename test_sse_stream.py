@@ -0,0 +1,162 @@
+import sys
+import os
+import json
+import asyncio
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+os.environ.setdefault("LLM_CACHE_ENABLED", "true")
+
+from app.api.sse import stream_ai_endpoint, SSE_HEADERS
+from app.services import ai_insight
+from app.services import llm_stream
+from app.services.llm_stream import ThinkFilter, sse_event, stream_llm_events
+from app.services.llm_cache import llm_cache_key, llm_result_cache
+
+# AI 보고서 SSE 스트리밍 테스트:
+# 가짜 공급자(텍스트 조각 생성기)로 SSE 프레이밍(meta → delta… → 모델 태그 → done), <think> 제거,
+# 첫 토큰 전 실패 시 다음 공급자, 도중 실패 시 error 이벤트, 완료 보고서 캐시 저장·재사용,
+# 그리고 stream_ai_endpoint가 일반 엔드포인트와 같은 프롬프트를 스트리밍하는지 네트워크 없이 확인한다.
+
+ai_insight._llm_model_id = lambda: "local:test-model"
+
+
+def parse(frames):
+    """SSE 텍스트 -> [(event, data)] (event 줄이 없으면 None)"""
+    events = []
+    for block in "".join(frames).split("\n\n"):
+        if not block:
+            continue
+        event, data = None, None
+        for line in block.split("\n"):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data = json.loads(line[len("data: "):])
+        events.append((event, data))
+    return events
+
+
+def text_of(events):
+    return "".join(d["delta"] for e, d in events if e is None)
+
+
+def source(*chunks, tag="", fail_after=None):
+    """chunks를 차례로 내보내는 공급자. fail_after개를 보낸 뒤 예외."""
+    def gen(state):
+        state["tag"] = tag
+        for i, chunk in enumerate(chunks):
+            if fail_after is not None and i == fail_after:
+                raise ConnectionError("stream reset")
+            yield chunk
+        if fail_after is not None and fail_after >= len(chunks):
+            raise ConnectionError("stream reset")
+    return gen
+
+
+def use_sources(*named):
+    def fake_sources(system_prompt, user_prompt, max_tokens, state):
+        state["gemini_key"] = "key"
+        for name, gen in named:
+            yield name, gen(state)
+    llm_stream._sources = fake_sources
+
+
+def run_stream(prompt, **kwargs):
+    return parse(list(stream_llm_events("시스템", prompt, 1000, **kwargs)))
+
+
+print("=" * 60)
+print("🧪 SSE 스트리밍 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 이벤트 형식: event 줄(선택) + data 한 줄(JSON, 한글 그대로) + 빈 줄
+check("1. SSE 프레임 형식", sse_event({"delta": "안녕\n하세요"}) == 'data: {"delta": "안녕\\n하세요"}\n\n'
+      and sse_event({"finish": "complete"}, "done") == 'event: done\ndata: {"finish": "complete"}\n\n')
+
+# 2. <think> 블록은 조각 경계에서 태그가 잘려도 제거
+think = ThinkFilter()
+out = "".join(think.feed(c) for c in ["본문 <th", "ink>추론", " 과정</thi", "nk>이어서", " 끝<"]) + think.flush()
+check("2. think 태그 제거", out == "본문 이어서 끝<")
+
+# 3. 정상 스트림: meta(공급자) 1회 → delta들 → 모델 태그 delta → done, 앞 공백 제거
+use_sources(("local", source("  ", "\n첫 문장", " 둘째 문장", tag="\n\n---\n> 모델 태그")))
+events = run_stream("u-normal")
+kinds = [e for e, _ in events]
+check("3. meta → delta → done 순서",
+      kinds == ["meta", None, None, None, "done"] and events[0][1] == {"source": "local", "cached": False}
+      and text_of(events) == "첫 문장 둘째 문장\n\n---\n> 모델 태그"
+      and events[-1][1]["finish"] == "complete" and events[-1][1]["source"] == "local")
+
+# 4. 완료된 보고서는 캐시에 저장, 다음 요청은 캐시 1회 전송(cached=True), regenerate면 다시 스트리밍
+key = llm_cache_key("시스템", "u-normal", "local:test-model", 1000)
+cached_events = run_stream("u-normal")
+use_sources(("local", source("새 보고서")))
+regenerated = run_stream("u-normal", regenerate=True)
+check("4. 캐시 저장·재사용·재생성",
+      llm_result_cache.peek(key) == "새 보고서"
+      and [e for e, _ in cached_events] == ["meta", None, "done"] and cached_events[0][1] == {"cached": True}
+      and text_of(cached_events) == "첫 문장 둘째 문장\n\n---\n> 모델 태그"
+      and text_of(regenerated) == "새 보고서")
+
+# 5. 첫 토큰 전에 실패한 공급자는 조용히 건너뛰고 다음 공급자로 (meta는 실제 공급자 이름)
+use_sources(("local", source("", fail_after=1)), ("gemini-2.5-flash", source("제미나이 보고서")))
+events = run_stream("u-fallback")
+check("5. 첫 토큰 전 실패 시 다음 공급자", events[0] == ("meta", {"source": "gemini-2.5-flash", "cached": False})
+      and text_of(events) == "제미나이 보고서" and events[-1][0] == "done")
+
+# 6. 보고서 도중 끊기면 error 이벤트로 끝내고 다음 공급자로 넘어가지 않음, 캐시 저장 안 함
+use_sources(("local", source("앞부분", " 중간", fail_after=2)), ("gemini-2.5-flash", source("쓰이면 안 됨")))
+events = run_stream("u-broken")
+check("6. 도중 실패 시 error", [e for e, _ in events] == ["meta", None, None, "error"]
+      and "스트리밍이 중단" in events[-1][1]["message"]
+      and llm_result_cache.peek(llm_cache_key("시스템", "u-broken", "local:test-model", 1000)) is None)
+
+# 7. 모든 공급자 실패: error 이벤트 하나
+use_sources(("local", source()))
+events = run_stream("u-none")
+check("7. 전체 실패 시 error", len(events) == 1 and events[0][0] == "error"
+      and events[0][1]["message"].startswith("⚠️"))
+
+
+# 8. stream_ai_endpoint: 일반 엔드포인트를 프롬프트 캡처 상태로 실행해 같은 프롬프트를 스트리밍
+async def handler(req, regenerate=False, current_user=None):
+    analysis = ai_insight._call_llm("시스템", f"근거: {req}", 1000)
+    return {"analysis": analysis}
+
+
+async def no_model_handler(req, regenerate=False, current_user=None):
+    return {"analysis": "데이터 부족으로 분석을 생략합니다."}
+
+
+async def collect(response):
+    return [chunk async for chunk in response.body_iterator]
+
+
+use_sources(("local", source("스트리밍된 보고서")))
+response = asyncio.run(stream_ai_endpoint(handler, "analysis", req="학생 2101"))
+events = parse(asyncio.run(collect(response)))
+plain = asyncio.run(stream_ai_endpoint(no_model_handler, "analysis", req="학생 2101"))
+plain_events = parse(asyncio.run(collect(plain)))
+check("8. 엔드포인트 스트리밍",
+      response.media_type == "text/event-stream" and response.headers["cache-control"] == SSE_HEADERS["Cache-Control"]
+      and text_of(events) == "스트리밍된 보고서"
+      and llm_result_cache.peek(llm_cache_key("시스템", "근거: 학생 2101", "local:test-model", 1000)) == "스트리밍된 보고서"
+      and [e for e, _ in plain_events] == ["meta", None, "done"]
+      and text_of(plain_events) == "데이터 부족으로 분석을 생략합니다.")
+
+print("=" * 60)
+print("🎉 모든 SSE 스트리밍 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)
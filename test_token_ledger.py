@@ -0,0 +1,166 @@
+import sys
+import os
+import re
+import tempfile
+
+# Set path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "backend"))
+os.environ.setdefault("CACHE_DIR", tempfile.mkdtemp(prefix="pbst_test_"))
+
+from app.services import sheets
+from app.services import token_ledger
+from app.adapters.sheets.client import invalidate_cache
+from app.adapters.sheets.write_queue import sheet_write_queue
+
+# 토큰 원장(token_ledger) 테스트:
+# 가짜 TokenBoard/TokenLog 워크시트로 지급 시 최신 행을 다시 읽는지, 새 학생은 append만 하는지,
+# 다른 인스턴스·수기 편집으로 행이 바뀌어도 다른 학생 행을 덮어쓰지 않는지 확인한다.
+
+
+class FakeWorksheet:
+    """gspread Worksheet 대체: 셀 값은 문자열, 호출 횟수를 기록한다."""
+
+    def __init__(self, title, rows, row_count=1000):
+        self.title = title
+        self.rows = [[str(v) for v in r] for r in rows]
+        self.row_count = row_count
+        self.calls = []
+        self.fail_next_write = None
+
+    def _row(self, i):
+        return self.rows[i - 1] if i <= len(self.rows) else []
+
+    def col_values(self, col):
+        self.calls.append("col_values")
+        return [r[col - 1] if col - 1 < len(r) else "" for r in self.rows]
+
+    def batch_get(self, ranges):
+        self.calls.append("batch_get")
+        out = []
+        for rng in ranges:
+            start, end = (int(n) for n in re.findall(r"\d+", rng))
+            out.append([self._row(i) for i in range(start, end + 1) if self._row(i)])
+        return out
+
+    def batch_update(self, data, value_input_option=None):
+        self.calls.append("batch_update")
+        if self.fail_next_write:
+            err, self.fail_next_write = self.fail_next_write, None
+            raise err
+        for item in data:
+            i = int(re.findall(r"\d+", item["range"])[0])
+            while len(self.rows) < i:
+                self.rows.append([])
+            self.rows[i - 1] = [str(v) for v in item["values"][0]]
+
+    def append_rows(self, rows):
+        self.calls.append("append_rows")
+        self.rows.extend([str(v) for v in r] for r in rows)
+
+    def get_all_records(self):
+        headers = self.rows[0]
+        return [dict(zip(headers, r)) for r in self.rows[1:]]
+
+
+HEADERS = ["StudentCode", "ClassID", "TokenCount", "ExchangedCount", "UpdatedAt"]
+board = FakeWorksheet("TokenBoard", [HEADERS, ["2101", "211", 3, 0, ""], ["2102", "211", 9, 1, ""]])
+log = FakeWorksheet("TokenLog", [["Date", "StudentCode", "ClassID", "Category", "Delta", "Author", "CreatedAt"]])
+sheets.ensure_token_board_sheet = lambda: board
+sheets.ensure_token_log_sheet = lambda: log
+
+
+def award(code, delta=1):
+    return token_ledger.award_tokens("211", [{"student_code": code, "category": "칭찬", "delta": delta}], "교사")
+
+
+def row_of(code):
+    return [r for r in board.rows if r and r[0] == code]
+
+
+print("=" * 60)
+print("🧪 토큰 원장 지급 테스트")
+print("=" * 60)
+
+failures = 0
+
+
+def check(label, ok):
+    global failures
+    failures += 0 if ok else 1
+    print(f"{label} -> {'✅ 통과' if ok else '❌ 실패'}")
+
+
+# 1. 기존 학생: 시트의 현재 값에서 시작
+r = award("2101")
+check("1. 기존 학생 지급 (3 -> 4)", r["results"][0]["token_count"] == 4 and row_of("2101")[0][2] == "4")
+
+# 2. 다른 인스턴스가 같은 학생에게 지급(시트 직접 변경): 캐시된 값이 아니라 시트 값에서 이어감
+board.rows[1][2] = "7"
+r = award("2101")
+check("2. 다른 인스턴스 지급 반영 (7 -> 8, 손실 없음)", r["results"][0]["token_count"] == 8)
+
+# 3. 10개 도달 시 자동 교환
+r = award("2102")
+res = r["results"][0]
+check("3. 10개 자동 교환", res["token_count"] == 0 and res["exchanged_count"] == 2 and res["exchanged_now"] == 1)
+
+# 4. 인덱스 캐시 이후 수기로 추가된 행은 새 학생 append에 덮어써지지 않음
+award("2101")  # 인덱스 캐시 적재
+board.rows.append(["2199", "219", "5", "0", "수기"])
+r = award("2103", 2)
+check("4. 수기 행 보존 + 새 학생 append",
+      row_of("2199") == [["2199", "219", "5", "0", "수기"]] and row_of("2103")[0][2] == "2"
+      and len(row_of("2103")) == 1)
+
+# 5. 행 삭제로 위치가 밀려도 해당 학생의 행만 갱신
+del board.rows[1]  # 2101 행 삭제 → 아래 행들이 한 칸씩 올라감
+before_2102 = list(row_of("2102")[0])
+r = award("2103")
+check("5. 행 이동 후 올바른 행 갱신",
+      row_of("2103")[0][2] == "3" and row_of("2102")[0] == before_2102 and len(board.rows) == 4)
+
+# 6. 새 학생이 다른 인스턴스에서 먼저 추가된 경우: 중복 행을 만들지 않고 그 행을 갱신
+board.rows.append(["2104", "211", "4", "0", "다른 인스턴스"])
+r = award("2104")
+check("6. 다른 인스턴스가 추가한 학생 재사용", len(row_of("2104")) == 1 and row_of("2104")[0][2] == "5")
+
+# 7. 학급 일괄 지급: TokenBoard batch_get 1회 + batch_update 1회, TokenLog append 1회
+sheet_write_queue.flush()
+board.calls.clear()
+log.calls.clear()
+r = token_ledger.award_tokens("211", [{"student_code": c, "category": "협동", "delta": 1}
+                                      for c in ("2102", "2103", "2104", "2102")], "교사")
+sheet_write_queue.flush()
+check("7. 일괄 지급 호출 수",
+      board.calls == ["batch_get", "batch_update"] and log.calls == ["append_rows"]
+      and row_of("2102")[0][2] == "2" and len(log.rows) == 1 + 7 + 4)
+
+# 8. TokenBoard 쓰기 실패: 오류 반환, TokenLog 기록 없음
+import gspread
+
+
+class _Resp:
+    status_code = 400
+    text = ""
+    headers = {}
+
+    def json(self):
+        return {"error": {"code": 400, "message": "bad request", "status": "INVALID_ARGUMENT"}}
+
+
+board.fail_next_write = gspread.exceptions.APIError(_Resp())
+log_before = len(log.rows)
+r = award("2102")
+sheet_write_queue.flush()
+check("8. 쓰기 실패 시 오류 반환 + 로그 미기록", "error" in r and len(log.rows) == log_before)
+
+# 9. 학급 보드 조회는 시트 최신 값
+invalidate_cache("sheet:")
+board.rows.append(["3101", "311", "1", "0", ""])
+codes = [rec["StudentCode"] for rec in token_ledger.get_token_board("211")]
+check("9. 학급별 보드 조회", sorted(codes) == ["2102", "2103", "2104"])
+
+print("=" * 60)
+print("🎉 모든 토큰 원장 테스트 통과!" if failures == 0 else f"❌ {failures}개 테스트 실패")
+print("=" * 60)
+sys.exit(1 if failures else 0)